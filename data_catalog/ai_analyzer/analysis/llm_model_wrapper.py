@@ -4,12 +4,69 @@ Legacy-compatible LLM wrapper used by tests.
 Exposes call_llm() and re-exports sample-data helpers so
 patch targets like ai_analyzer.analysis.llm_model_wrapper.call_llm exist.
 """
-from ai_analyzer.model_logic.llm_clients.openai_client import analyze_with_openai
+import logging
+
+from ai_analyzer.analysis.llm_response_cache import as_cache_hit, cache_key, get_response_cache, is_cacheable
+from ai_analyzer.model_logic.llm_clients.openai_client import SYSTEM_PROMPT, analyze_with_openai
+
+
+def _cached_response(cache, key: str, model: str) -> dict | None:
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        logging.warning(f"[CACHE] Lezen mislukt, cache overgeslagen: {e}")
+        return None
+    if cached is None:
+        return None
+    logging.info(f"[CACHE] Hit voor {model} ({key[:12]})")
+    return as_cache_hit(cached)
+
+
+def _store_response(cache, key: str, model: str, result: dict) -> None:
+    if not is_cacheable(result):
+        return
+    try:
+        cache.put(key, model, result)
+    except Exception as e:
+        logging.warning(f"[CACHE] Schrijven mislukt: {e}")
+    result["cache"] = "miss"
 
 
 def call_llm(prompt: str, *, model: str, temperature: float, max_tokens: int) -> dict:
     """Compatibility wrapper delegating to the OpenAI client.
 
-    Returns a dict consistent with analyze_with_openai.
+    Returns a dict consistent with analyze_with_openai, plus "cache": "hit" | "miss"
+    when the response cache is enabled. Cache hits cost no tokens.
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return analyze_with_openai(prompt, model=model, temperature=temperature, max_tokens=max_tokens)
+
+    key = cache_key(model, temperature, max_tokens, SYSTEM_PROMPT, prompt)
+    cached = _cached_response(cache, key, model)
+    if cached is not None:
+        return cached
+
+    result = analyze_with_openai(prompt, model=model, temperature=temperature, max_tokens=max_tokens)
+    _store_response(cache, key, model, result)
+    return result
+
+
+def call_llm_batch(prompts: list[str], *, model: str, temperature: float, max_tokens: int, runner) -> list[dict]:
+    """Like call_llm for a list of prompts: cache hits are answered directly, the rest go out as one batch.
+
+    runner is an OpenAIBatchRunner; results are returned in the order of prompts.
     """
-    return analyze_with_openai(prompt, model=model, temperature=temperature, max_tokens=max_tokens)
+    cache = get_response_cache()
+    keys = [cache_key(model, temperature, max_tokens, SYSTEM_PROMPT, prompt) for prompt in prompts] if cache else []
+    results = [_cached_response(cache, key, model) for key in keys] if cache else [None] * len(prompts)
+
+    misses = [index for index, result in enumerate(results) if result is None]
+    if misses:
+        answers = runner.run([prompts[index] for index in misses], model=model, temperature=temperature,
+                             max_tokens=max_tokens)
+        for index, result in zip(misses, answers):
+            if cache is not None:
+                _store_response(cache, keys[index], model, result)
+            results[index] = result
+    return results
@@ -0,0 +1,153 @@
+"""
+Persistente cache van LLM-antwoorden in een lokaal SQLite-bestand.
+
+De sleutel is een SHA-256 over (model, temperature, max_tokens, system prompt, prompt); een
+identieke prompt op een ongewijzigde tabel wordt dus niet opnieuw betaald. Verlopen entries
+(AI_LLM_CACHE_TTL_DAYS) worden niet meer teruggegeven en bij het schrijven opgeruimd; boven
+AI_LLM_CACHE_MAX_MB worden de langst niet gebruikte entries verwijderd.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DEFAULT_CACHE_PATH = Path(__file__).parents[2] / "logfiles" / "ai_analyzer" / "llm_response_cache.sqlite"
+
+
+def cache_key(model: str, temperature: float, max_tokens: int, system_prompt: str, prompt: str) -> str:
+    payload = json.dumps(
+        [model, temperature, max_tokens, system_prompt, prompt],
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """Thread-safe: elke bewerking opent een eigen SQLite-verbinding (WAL)."""
+
+    def __init__(self, path: str | Path = DEFAULT_CACHE_PATH, ttl_seconds: float = 30 * 86400,
+                 max_bytes: int = 100 * 1024 * 1024):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("""
+                        CREATE TABLE IF NOT EXISTS llm_responses (
+                            cache_key TEXT PRIMARY KEY,
+                            model TEXT,
+                            response TEXT NOT NULL,
+                            size_bytes INTEGER NOT NULL,
+                            created_at REAL NOT NULL,
+                            last_used_at REAL NOT NULL,
+                            hit_count INTEGER NOT NULL DEFAULT 0
+                        )
+                    """)
+                    conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_responses_last_used ON llm_responses (last_used_at)")
+                    conn.commit()
+                    self._initialized = True
+        return conn
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT response FROM llm_responses WHERE cache_key = ? AND created_at > ?",
+                (key, now - self.ttl_seconds),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE llm_responses SET last_used_at = ?, hit_count = hit_count + 1 WHERE cache_key = ?",
+                (now, key),
+            )
+            conn.commit()
+            return json.loads(row[0])
+        finally:
+            conn.close()
+
+    def put(self, key: str, model: str, response: dict) -> None:
+        now = time.time()
+        payload = json.dumps(response, default=str)
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_responses (cache_key, model, response, size_bytes, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, payload, len(payload.encode("utf-8")), now, now),
+            )
+            self._evict(conn, now)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM llm_responses WHERE created_at <= ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM llm_responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Langst niet gebruikte entries eerst, tot de cache weer onder de limiet zit
+        rows = conn.execute("SELECT cache_key, size_bytes FROM llm_responses ORDER BY last_used_at").fetchall()
+        evicted = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM llm_responses WHERE cache_key = ?", evicted)
+        logging.info(f"[CACHE] {len(evicted)} entries verwijderd (limiet {self.max_bytes} bytes)")
+
+
+_cache: LLMResponseCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> LLMResponseCache | None:
+    """Proces-brede cache volgens de AI_LLM_CACHE_* omgevingsvariabelen; None als de cache uit staat."""
+    global _cache
+    if os.getenv("AI_LLM_CACHE", "true").lower() != "true":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                ttl_days = float(os.getenv("AI_LLM_CACHE_TTL_DAYS", 30))
+                max_mb = float(os.getenv("AI_LLM_CACHE_MAX_MB", 100))
+            except ValueError:
+                logging.warning("[WAARSCHUWING] AI_LLM_CACHE_TTL_DAYS/AI_LLM_CACHE_MAX_MB ongeldig — fallback naar defaults")
+                ttl_days, max_mb = 30, 100
+            _cache = LLMResponseCache(
+                os.getenv("AI_LLM_CACHE_PATH") or DEFAULT_CACHE_PATH,
+                ttl_seconds=ttl_days * 86400,
+                max_bytes=int(max_mb * 1024 * 1024),
+            )
+        return _cache
+
+
+def is_cacheable(result: dict) -> bool:
+    """Alleen echte antwoorden: geen fouten en geen simulaties (issues: no_api_key / dry_run_enabled)."""
+    return bool(result) and "result" in result and not result.get("error") and not result.get("issues")
+
+
+def as_cache_hit(cached: dict) -> dict:
+    """Antwoord uit de cache kost geen tokens; het oorspronkelijke verbruik blijft bewaard als cached_tokens."""
+    result = dict(cached)
+    result["cached_tokens"] = cached.get("tokens")
+    result["tokens"] = {"prompt": 0, "completion": 0, "total": 0, "estimated_cost_usd": 0.0}
+    result["cache"] = "hit"
+    return result
@@ -0,0 +1,40 @@
+"""
+Vingerafdruk van de invoer van een tabelanalyse.
+
+De vingerafdruk bestaat uit de kolommetadata uit de catalogus (naam + type, in volgorde) en een
+digest van de sample (of de viewdefinitie). Is die gelijk aan de vingerafdruk van het laatste
+geslaagde resultaat voor hetzelfde analysis_type, dan kan de tabel worden overgeslagen.
+"""
+import hashlib
+import json
+
+
+def _digest(value) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sample_digest(sample) -> str | None:
+    """Digest van een sample als DataFrame of list[dict]; None als er geen sample is."""
+    if sample is None:
+        return None
+    if hasattr(sample, "to_dict"):
+        sample = sample.to_dict(orient="records")
+    return _digest(sample)
+
+
+def compute_table_fingerprint(metadata=None, sample=None, view_definition: str | None = None) -> str:
+    """
+    :param metadata: kolommen zoals get_metadata_with_ids ze teruggeeft (name/type of column_name/data_type)
+    :param sample: sample-data (DataFrame of list[dict])
+    :param view_definition: SQL-definitie voor viewanalyses
+    """
+    columns = [
+        [column.get("name") or column.get("column_name"), column.get("type") or column.get("data_type")]
+        for column in (metadata or [])
+    ]
+    return _digest({
+        "columns": columns,
+        "sample": sample_digest(sample),
+        "view_definition": view_definition,
+    })
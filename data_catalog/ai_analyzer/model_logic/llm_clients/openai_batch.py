@@ -0,0 +1,146 @@
+"""
+OpenAI Batch API als uitvoeringsmodus voor tabelanalyses.
+
+In batchmodus bouwt de table runner eerst alle prompts (met begrensde gelijktijdigheid),
+dient ze daarna als één JSONL-bestand in bij het Batch endpoint en slaat de antwoorden
+vervolgens weer begrensd op. OpenAIBatchRunner doet alleen het indienen, pollen en
+terugvertalen naar het resultaatformaat van analyze_with_openai.
+"""
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from ai_analyzer.model_logic.llm_clients.openai_client import COST_PER_1K, SYSTEM_PROMPT, _get_client
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+# Batch-verzoeken kosten de helft van de gewone tarieven
+BATCH_COST_FACTOR = 0.5
+DEFAULT_BATCH_DIR = str(Path(__file__).parents[3] / "logfiles" / "ai_analyzer" / "batches")
+
+
+class OpenAIBatchRunner:
+    """Voert een lijst chat-completion prompts uit als één batch en wacht op het resultaat."""
+
+    def __init__(
+        self,
+        client,
+        poll_seconds: float = 30.0,
+        timeout_seconds: float = 24 * 3600,
+        batch_dir: str = DEFAULT_BATCH_DIR,
+    ):
+        self.client = client
+        self.poll_seconds = poll_seconds
+        self.timeout_seconds = timeout_seconds
+        self.batch_dir = batch_dir
+        self.batch_ids: list[str] = []
+
+    def run(self, prompts: list[str], *, model: str, temperature: float, max_tokens: int) -> list[dict]:
+        """
+        Geeft per prompt (zelfde volgorde) een resultaat in de vorm van analyze_with_openai.
+        Faalt de batch als geheel, dan krijgt elke prompt een error-resultaat.
+        """
+        batch = [
+            (f"req-{index}", {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+            })
+            for index, prompt in enumerate(prompts, start=1)
+        ]
+        try:
+            results = self._run_batch(batch)
+            failure = None
+        except Exception as e:
+            logging.exception(f"[BATCH] Batch met {len(batch)} verzoeken gefaald: {e}")
+            results, failure = {}, str(e)
+
+        outcomes = []
+        for custom_id, body in batch:
+            result = results.get(custom_id)
+            if result is None:
+                result = {"error": "batch_failed", "details": failure or f"geen resultaat voor {custom_id}"}
+            result.setdefault("model_used", body["model"])
+            outcomes.append(result)
+        return outcomes
+
+    def _run_batch(self, batch: list) -> dict[str, dict]:
+        os.makedirs(self.batch_dir, exist_ok=True)
+        path = os.path.join(self.batch_dir, f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for custom_id, body in batch:
+                f.write(json.dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body},
+                                   ensure_ascii=False) + "\n")
+
+        with open(path, "rb") as f:
+            input_file = self.client.files.create(file=f, purpose="batch")
+        job = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+        )
+        self.batch_ids.append(job.id)
+        logging.info(f"[BATCH] {len(batch)} verzoeken ingediend als {job.id} ({path})")
+
+        deadline = time.monotonic() + self.timeout_seconds
+        while job.status not in BATCH_FINAL_STATUSES:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Batch {job.id} niet klaar binnen {self.timeout_seconds}s (status={job.status})")
+            time.sleep(self.poll_seconds)
+            job = self.client.batches.retrieve(job.id)
+            logging.debug(f"[BATCH] {job.id}: status={job.status}")
+
+        if job.status != "completed":
+            raise RuntimeError(f"Batch {job.id} eindigde met status {job.status}")
+
+        results = {}
+        for file_id in (job.output_file_id, job.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    item = json.loads(line)
+                    results[item["custom_id"]] = batch_line_to_result(item)
+        logging.info(f"[BATCH] {job.id} voltooid: {len(results)} resultaten")
+        return results
+
+
+def batch_line_to_result(item: dict) -> dict:
+    """Zet een regel uit het output- of errorbestand om naar het resultaatformaat van analyze_with_openai."""
+    response = item.get("response") or {}
+    body = response.get("body") or {}
+    if response.get("status_code") != 200 or not body.get("choices"):
+        return {"error": "batch_request_failed", "details": item.get("error") or body.get("error") or body}
+
+    model = body.get("model")
+    usage = body.get("usage") or {}
+    total_tokens = usage.get("total_tokens", 0)
+    cost_rate = COST_PER_1K.get(model, 0.01) * BATCH_COST_FACTOR
+    return {
+        "result": body["choices"][0]["message"]["content"],
+        "model_used": model,
+        "batch_request_id": item.get("id"),
+        "tokens": {
+            "prompt": usage.get("prompt_tokens", 0),
+            "completion": usage.get("completion_tokens", 0),
+            "total": total_tokens,
+            "estimated_cost_usd": round(total_tokens / 1000 * cost_rate, 6),
+        },
+    }
+
+
+def get_batch_runner(**kwargs) -> OpenAIBatchRunner | None:
+    """Runner voor de Batch API; None zonder OpenAI-client (geen API key)."""
+    client = _get_client()
+    if client is None:
+        logging.warning("[BATCH] Geen OpenAI-client beschikbaar — batchmodus uitgeschakeld")
+        return None
+    return OpenAIBatchRunner(client, **kwargs)
@@ -23,6 +23,8 @@ def _get_client():
         _client = None
     return _client
 
+SYSTEM_PROMPT = "Je bent een behulpzame data-analist."
+
 # ⬇️ Tarieven per 1000 tokens
 
 
@@ -71,7 +73,7 @@ def analyze_with_openai(
         response = client.chat.completions.create(
             model=model,
             messages=[
-                {"role": "system", "content": "Je bent een behulpzame data-analist."},
+                {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": prompt}
             ],
             temperature=temperature,
@@ -34,6 +34,23 @@ def update_log_path_for_run(run_id: int, log_path: str):
     except Exception as e:
         logging.warning(f"[FOUT] Kan log_path bijwerken voor run {run_id}: {e}")
 
+def record_cache_stats(run_id: int, cache_hits: int, cache_misses: int):
+    """
+    Slaat de hits/misses van de LLM-responsecache op bij de run.
+    """
+    conn = get_catalog_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "UPDATE catalog.catalog_ai_analysis_runs SET cache_hits = %s, cache_misses = %s WHERE id = %s",
+                (cache_hits, cache_misses, run_id)
+            )
+            conn.commit()
+    except Exception as e:
+        logging.warning(f"[FOUT] Kan cache-tellers niet bijwerken voor run {run_id}: {e}")
+    finally:
+        conn.close()
+
 def create_analysis_run_entry(
     server: str,
     database: str,
@@ -220,6 +237,31 @@ def mark_analysis_run_aborted(run_id: int, reason: str = None):
     finally:
         conn.close()
 
+def get_latest_table_fingerprints(analysis_type: str, table_ids: list[int]) -> dict[int, str]:
+    """
+    Vingerafdruk van het laatste resultaat met status 'ok' per tabel voor dit analysis_type.
+    Tabellen zonder (vingerafdruk bij het) laatste resultaat ontbreken in de dict.
+    """
+    table_ids = [t for t in table_ids if t is not None]
+    if not table_ids:
+        return {}
+    conn = get_catalog_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT DISTINCT ON (table_id) table_id, input_fingerprint
+                FROM catalog.catalog_ai_analysis_results
+                WHERE analysis_type = %s
+                  AND status = 'ok'
+                  AND table_id = ANY(%s)
+                ORDER BY table_id, created_at DESC, id DESC
+            """, (analysis_type, table_ids))
+            rows = cur.fetchall()
+            return {table_id: fingerprint for table_id, fingerprint in rows if fingerprint}
+    finally:
+        conn.close()
+
+
 def store_ai_table_analysis(run_id: int, table: dict, result: dict, analysis_type: str):
     """
     Slaat AI-analyse op inclusief table_id, column_id, schema_id en database_id.
@@ -267,7 +309,8 @@ def store_ai_table_analysis(run_id: int, table: dict, result: dict, analysis_typ
                         result.get("tokens", {}).get("estimated_cost_usd"),
                         now,
                         False,
-                        "pending"
+                        "pending",
+                        result.get("input_fingerprint")
                     )
 
                     cur.execute(""" 
@@ -295,11 +338,12 @@ def store_ai_table_analysis(run_id: int, table: dict, result: dict, analysis_typ
                             estimated_cost_usd,
                             created_at,
                             description_generated,
-                            description_status
+                            description_status,
+                            input_fingerprint
                         )
                         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
                                 %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                                %s, %s, %s, %s)
+                                %s, %s, %s, %s, %s)
                     """, values)
 
                     logging.info(f"[STORE] Kolomanalyse opgeslagen voor {table.get('table_name')}[{column_name}]")
@@ -343,7 +387,8 @@ def store_ai_table_analysis(run_id: int, table: dict, result: dict, analysis_typ
                     result.get("tokens", {}).get("estimated_cost_usd"),
                     now,
                     False,  # description_generated
-                    "pending"
+                    "pending",
+                    result.get("input_fingerprint")
                 )
 
                 cur.execute("""
@@ -371,11 +416,12 @@ def store_ai_table_analysis(run_id: int, table: dict, result: dict, analysis_typ
                         estimated_cost_usd,
                         created_at,
                         description_generated,
-                        description_status
+                        description_status,
+                        input_fingerprint
                     )
                     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
                             %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-                            %s, %s, %s, %s)
+                            %s, %s, %s, %s, %s)
                 """, values)
 
                 logging.info(f"[STORE] Tabelanalyse opgeslagen voor {table.get('table_name')} (analysis_type={analysis_type})")
@@ -0,0 +1,95 @@
+"""
+Bundelt prompts van kleine tabellen (codetabellen, *soorten) in één verzoek.
+
+Elke losse prompt betaalt de vaste overhead van system prompt en request. PromptPacker
+verzamelt kleine prompts en groepeert ze tot een tokenbudget; het gebundelde verzoek vraagt
+om één JSON-object met per tabelsleutel het antwoord, dat split_packed_response weer opdeelt.
+"""
+import json
+import logging
+
+from ai_analyzer.model_logic.llm_clients.openai_parsing import parse_openai_json_block
+from ai_analyzer.runners.llm_executor import estimate_tokens
+
+
+class PromptPacker:
+    """
+    :param token_budget: maximale geschatte prompt-tokens per gebundeld verzoek
+    :param max_table_tokens: prompts boven deze grootte gaan los (niet gebundeld)
+    """
+
+    def __init__(self, token_budget: int, max_table_tokens: int = 500):
+        self.token_budget = token_budget
+        self.max_table_tokens = min(max_table_tokens, token_budget)
+        self.items: list[dict] = []
+
+    def fits(self, prompt: str) -> bool:
+        return estimate_tokens(prompt) <= self.max_table_tokens
+
+    def add(self, key: str, prompt: str, payload: dict) -> None:
+        """payload: alles wat nodig is om het antwoord later per tabel op te slaan."""
+        self.items.append({"key": key, "prompt": prompt, "tokens": estimate_tokens(prompt), "payload": payload})
+
+    def packs(self) -> list[list[dict]]:
+        """Groepeert in volgorde van toevoegen tot het tokenbudget (excl. de vaste instructie)."""
+        packs, current, used = [], [], 0
+        for item in self.items:
+            if current and used + item["tokens"] > self.token_budget:
+                packs.append(current)
+                current, used = [], 0
+            current.append(item)
+            used += item["tokens"]
+        if current:
+            packs.append(current)
+        return packs
+
+
+def build_packed_prompt(items: list[dict]) -> str:
+    keys = ", ".join(f'"{item["key"]}"' for item in items)
+    sections = [
+        f"### Tabel `{item['key']}`\n\n{item['prompt']}"
+        for item in items
+    ]
+    return "\n\n".join([
+        f"""
+Je krijgt {len(items)} tabellen met elk een eigen opdracht. Voer elke opdracht afzonderlijk uit.
+Antwoord met één JSON-object met precies deze sleutels: {keys}.
+De waarde per sleutel is het antwoord voor die tabel: een JSON-object als de opdracht om JSON vraagt, anders tekst.
+        """.strip(),
+        *sections,
+    ])
+
+
+def split_packed_response(raw_response: str, keys: list[str]) -> dict[str, str]:
+    """
+    Deelt het gebundelde antwoord op per tabelsleutel. Waarden worden teruggegeven als tekst
+    (objecten als JSON) zodat ze dezelfde parsing doorlopen als een los antwoord.
+    Ontbrekende of onleesbare sleutels ontbreken in het resultaat.
+    """
+    parsed = parse_openai_json_block(raw_response)
+    if not isinstance(parsed, dict):
+        logging.warning("[PACK] Gebundeld antwoord is geen JSON-object")
+        return {}
+    answers = {}
+    for key in keys:
+        if key not in parsed:
+            logging.warning(f"[PACK] Geen antwoord voor {key} in gebundeld antwoord")
+            continue
+        value = parsed[key]
+        answers[key] = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False)
+    return answers
+
+
+def split_tokens(tokens: dict, items: list[dict]) -> list[dict]:
+    """Verdeelt het tokenverbruik van een gebundeld verzoek naar rato van de promptgrootte."""
+    total_weight = sum(item["tokens"] for item in items) or len(items)
+    shares = []
+    for item in items:
+        share = (item["tokens"] or 1) / total_weight
+        shares.append({
+            "prompt": round((tokens.get("prompt") or 0) * share),
+            "completion": round((tokens.get("completion") or 0) * share),
+            "total": round((tokens.get("total") or 0) * share),
+            "estimated_cost_usd": round((tokens.get("estimated_cost_usd") or 0.0) * share, 6),
+        })
+    return shares
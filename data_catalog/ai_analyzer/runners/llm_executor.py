@@ -0,0 +1,182 @@
+"""
+Gelijktijdige uitvoering van LLM-analyses.
+
+run_concurrently() voert per tabel een analyse uit in een threadpool en levert de resultaten
+op zodra ze klaar zijn. RateBudget bewaakt de requests- en tokens-per-minuut van een model;
+alle runs in hetzelfde proces delen één budget per model (get_rate_budget).
+
+Limieten per model staan optioneel in model_definitions.yaml (max_concurrency,
+requests_per_minute, tokens_per_minute); ontbreken ze, dan gelden de AI_LLM_* omgevingsvariabelen.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import yaml
+
+MODEL_DEFINITIONS_PATH = Path(__file__).parents[1] / "config" / "model_definitions.yaml"
+WINDOW_SECONDS = 60.0
+
+
+def _env_int(name: str, default: int | None) -> int | None:
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logging.warning(f"[WAARSCHUWING] {name} bevat geen geldige integer — fallback naar {default}")
+        return default
+
+
+DEFAULT_MAX_CONCURRENCY = _env_int("AI_LLM_MAX_CONCURRENCY", 4)
+DEFAULT_REQUESTS_PER_MINUTE = _env_int("AI_LLM_REQUESTS_PER_MINUTE", None)
+DEFAULT_TOKENS_PER_MINUTE = _env_int("AI_LLM_TOKENS_PER_MINUTE", None)
+
+
+def get_model_limits(model: str) -> dict:
+    """
+    Haalt max_concurrency, requests_per_minute en tokens_per_minute op voor een model.
+    None betekent: geen limiet.
+    """
+    try:
+        with open(MODEL_DEFINITIONS_PATH, "r") as f:
+            definition = (yaml.safe_load(f) or {}).get("models", {}).get(model) or {}
+    except OSError as e:
+        logging.warning(f"[LIMITS] Kan {MODEL_DEFINITIONS_PATH.name} niet lezen: {e}; gebruik defaults")
+        definition = {}
+
+    return {
+        "max_concurrency": max(1, int(definition.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY)),
+        "requests_per_minute": definition.get("requests_per_minute") or DEFAULT_REQUESTS_PER_MINUTE,
+        "tokens_per_minute": definition.get("tokens_per_minute") or DEFAULT_TOKENS_PER_MINUTE,
+    }
+
+
+def estimate_tokens(prompt: str, max_tokens: int | None = None) -> int:
+    """Grove schatting vóór de aanroep: ~4 tekens per prompt-token plus de maximale completion."""
+    return len(prompt or "") // 4 + (max_tokens or 0)
+
+
+class RateBudget:
+    """
+    Schuivend venster van 60 seconden over requests en tokens.
+
+    acquire() blokkeert tot er ruimte is en reserveert de geschatte tokens; settle() vervangt
+    de schatting door het werkelijke verbruik zodra het antwoord binnen is. Eén request dat op
+    zichzelf groter is dan tokens_per_minute mag door zodra het venster leeg is.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._clock = clock
+        self._sleep = sleep
+        self._window: deque = deque()  # [timestamp, tokens]
+        self._lock = threading.Lock()
+
+    def _purge(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= WINDOW_SECONDS:
+            self._window.popleft()
+
+    def _wait_seconds(self, now: float, tokens: int) -> float:
+        if not self._window:
+            return 0.0
+        if self.requests_per_minute and len(self._window) >= self.requests_per_minute:
+            return self._window[0][0] + WINDOW_SECONDS - now
+        if self.tokens_per_minute:
+            used = sum(entry[1] for entry in self._window)
+            if used + tokens > self.tokens_per_minute:
+                # Wacht tot genoeg oude reserveringen uit het venster vallen
+                for timestamp, entry_tokens in self._window:
+                    used -= entry_tokens
+                    if used + tokens <= self.tokens_per_minute:
+                        return timestamp + WINDOW_SECONDS - now
+                return self._window[-1][0] + WINDOW_SECONDS - now
+        return 0.0
+
+    def acquire(self, tokens: int = 0) -> list:
+        """Reserveert één request met de geschatte tokens; geeft het venster-item terug voor settle()."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._purge(now)
+                delay = self._wait_seconds(now, tokens)
+                if delay <= 0:
+                    entry = [now, tokens]
+                    self._window.append(entry)
+                    return entry
+            logging.debug(f"[RATE] Budget bereikt — wacht {delay:.1f}s")
+            self._sleep(delay)
+
+    def settle(self, entry: list, tokens: int) -> None:
+        with self._lock:
+            entry[1] = tokens
+
+    def release(self, entry: list) -> None:
+        """Geeft een reservering terug, bv. wanneer het antwoord uit de cache kwam."""
+        with self._lock:
+            try:
+                self._window.remove(entry)
+            except ValueError:
+                pass
+
+
+_budgets: dict[str, RateBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def get_rate_budget(model: str) -> RateBudget:
+    """Gedeeld budget per model binnen dit proces."""
+    with _budgets_lock:
+        budget = _budgets.get(model)
+        if budget is None:
+            limits = get_model_limits(model)
+            budget = RateBudget(limits["requests_per_minute"], limits["tokens_per_minute"])
+            _budgets[model] = budget
+        return budget
+
+
+def call_with_budget(call: Callable[..., dict], prompt: str, *, model: str, temperature: float, max_tokens: int) -> dict:
+    """Voert call(prompt, ...) uit binnen het rate budget van het model en boekt het werkelijke tokenverbruik."""
+    budget = get_rate_budget(model)
+    entry = budget.acquire(estimate_tokens(prompt, max_tokens))
+    result = call(prompt, model=model, temperature=temperature, max_tokens=max_tokens)
+    if (result or {}).get("cache") == "hit":
+        budget.release(entry)
+        return result
+    used = ((result or {}).get("tokens") or {}).get("total")
+    if used:
+        budget.settle(entry, used)
+    return result
+
+
+def run_concurrently(
+    items: Iterable[Any],
+    func: Callable[[Any], Any],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> Iterator[tuple[Any, Optional[Any], Optional[BaseException]]]:
+    """
+    Voert func(item) uit met maximaal max_concurrency tegelijk en levert (item, resultaat, fout)
+    in volgorde van afronding. Een fout bij één item stopt de andere niet.
+    """
+    items = list(items)
+    with ThreadPoolExecutor(max_workers=max(1, int(max_concurrency)), thread_name_prefix="llm") as pool:
+        pending = {pool.submit(func, item): item for item in items}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                error = future.exception()
+                yield item, (None if error else future.result()), error
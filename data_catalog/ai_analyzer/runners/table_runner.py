@@ -10,16 +10,22 @@ import logging
 # Catalogusfuncties worden bij aanroep heropgehaald uit het modulepad via runtime resolutie,
 # zodat unittest patches op ai_analyzer.utils.catalog_reader goed doorwerken.
 from ai_analyzer.prompts.prompt_builder import build_prompt_for_table
-from ai_analyzer.analysis.llm_model_wrapper import call_llm
+from ai_analyzer.prompts.prompt_packer import PromptPacker, build_packed_prompt, split_packed_response, split_tokens
+from ai_analyzer.analysis.llm_model_wrapper import call_llm, call_llm_batch
+from ai_analyzer.model_logic.llm_clients.openai_batch import get_batch_runner
+from ai_analyzer.runners.llm_executor import call_with_budget, get_model_limits, run_concurrently
 from ai_analyzer.postprocessor.ai_analysis_writer import store_ai_table_analysis
 from ai_analyzer.analysis.analysis_matrix import ANALYSIS_TYPES
+from ai_analyzer.analysis.table_fingerprint import compute_table_fingerprint
 from ai_analyzer.config.analysis_config_loader import load_analysis_config, merge_analysis_configs
 from ai_analyzer.model_logic.model_config import get_model_config
 from ai_analyzer.postprocessor.ai_analysis_writer import (
     create_analysis_run_entry,
     finalize_and_complete_run,
+    get_latest_table_fingerprints,
     mark_analysis_run_failed,
     mark_analysis_run_aborted,
+    record_cache_stats,
     update_log_path_for_run,
 )
 
@@ -86,6 +92,21 @@ except ValueError:
 
 ALLOW_UNFILTERED_SELECTION: bool = os.getenv("AI_ALLOW_UNFILTERED_SELECTION", "false").lower() == "true"
 
+# Incrementeel: tabellen waarvan metadata en sample niet veranderd zijn sinds het laatste geslaagde resultaat overslaan
+SKIP_UNCHANGED: bool = os.getenv("AI_SKIP_UNCHANGED", "false").lower() == "true"
+
+# "direct" (chat completions per tabel) of "batch" (OpenAI Batch API: goedkoper, maar antwoord binnen 24 uur)
+EXECUTION_MODE: str = os.getenv("AI_EXECUTION_MODE", "direct").lower()
+
+# Prompt packing: kleine tabellen (prompt <= AI_PACK_MAX_TABLE_TOKENS) gebundeld tot AI_PACK_TOKEN_BUDGET; 0 = uit
+try:
+    PACK_TOKEN_BUDGET = int(os.getenv("AI_PACK_TOKEN_BUDGET", 0))
+    PACK_MAX_TABLE_TOKENS = int(os.getenv("AI_PACK_MAX_TABLE_TOKENS", 500))
+except ValueError:
+    PACK_TOKEN_BUDGET, PACK_MAX_TABLE_TOKENS = 0, 500
+    logging.warning("[WAARSCHUWING] AI_PACK_TOKEN_BUDGET/AI_PACK_MAX_TABLE_TOKENS ongeldig — packing uitgeschakeld")
+PACK_MAX_COMPLETION_TOKENS = 4096
+
 
 def get_enabled_table_analysis_types() -> dict:
     """
@@ -114,6 +135,9 @@ def run_batch_tables_by_config(
     author: str,
     dry_run: bool,
     connection_id: int | None = None,
+    skip_unchanged: bool | None = None,
+    execution_mode: str | None = None,
+    pack_token_budget: int | None = None,
 ):
     print("[TEST] run_batch_tables_by_config aangeroepen")
     logging.info("[TEST] LOGGING: run_batch_tables_by_config aangeroepen")
@@ -258,6 +282,7 @@ def run_batch_tables_by_config(
             logging.info(f"[FILTER] {after_count} tabellen toegestaan (type ∈ {allowed_types}), {skipped} overgeslagen")
 
         if aborted_reason is None:
+            batch_tables = []
             for row in tables:
                 logging.debug(f"[DEBUG] Tabeltype voor {row['table_name']}: {row.get('table_type')}")
                 assert row.get("table_type") in ("VIEW", "BASE TABLE", "V", "T"), (
@@ -265,7 +290,7 @@ def run_batch_tables_by_config(
                 )
                 # Fallback mapping voor test patches die enkel table_schema teruggeven
                 schema_name = row.get("schema_name") or row.get("table_schema") or "public"
-                table = {
+                batch_tables.append({
                     "server_name": connection["host"],
                     "database_name": ai_config["ai_database_filter"],
                     "schema_name": schema_name,
@@ -277,26 +302,121 @@ def run_batch_tables_by_config(
                     "main_connector_id": connection["id"],
                     "ai_config_id": ai_config_id,
                     "table_type": row.get("table_type", "BASE TABLE"),
-                }
-                try:
-                    result = run_single_table(
-                        table,
-                        analysis_type,
-                        author,
-                        dry_run,
-                        run_id,
-                        model_used,
-                        temperature,
-                        max_tokens,
-                        analysis_config=analysis_config
-                    )
-                    batch_results.append(result)
-                except Exception as e:
+                })
+
+            if skip_unchanged is None:
+                skip_unchanged = SKIP_UNCHANGED
+            previous_fingerprints = {}
+            if skip_unchanged and not dry_run:
+                previous_fingerprints = get_latest_table_fingerprints(
+                    analysis_type, [t["table_id"] for t in batch_tables]
+                )
+                logging.info(
+                    f"[INCREMENTEEL] {len(previous_fingerprints)} tabellen met vingerafdruk van een eerder resultaat"
+                )
+
+            # Tabellen parallel analyseren; rate limits per model bewaakt call_with_budget
+            execution_mode = (execution_mode or EXECUTION_MODE).lower()
+            use_batch = execution_mode == "batch" and not dry_run
+            max_concurrency = get_model_limits(model_used)["max_concurrency"]
+
+            batch_runner = get_batch_runner() if use_batch else None
+            # Batchmodus: prompts worden eerst verzameld en daarna als één batch ingediend
+            batch_requests = [] if batch_runner is not None else None
+            if batch_runner is not None:
+                logging.info(f"[RUN] {len(batch_tables)} tabellen via de OpenAI Batch API "
+                             f"(prompts bouwen met maximaal {max_concurrency} tegelijk)")
+            else:
+                logging.info(f"[RUN] {len(batch_tables)} tabellen met maximaal {max_concurrency} gelijktijdige analyses")
+
+            # Packing alleen bij directe aanroepen; de Batch API heeft geen last van overhead per request
+            pack_token_budget = PACK_TOKEN_BUDGET if pack_token_budget is None else pack_token_budget
+            packer = None
+            if pack_token_budget and batch_runner is None and not dry_run:
+                packer = PromptPacker(pack_token_budget, PACK_MAX_TABLE_TOKENS)
+
+            def analyse_table(table: dict):
+                return run_single_table(
+                    table,
+                    analysis_type,
+                    author,
+                    dry_run,
+                    run_id,
+                    model_used,
+                    temperature,
+                    max_tokens,
+                    analysis_config=analysis_config,
+                    previous_fingerprint=previous_fingerprints.get(table["table_id"]),
+                    packer=packer,
+                    batch_requests=batch_requests,
+                )
+
+            # Resultaten worden per tabel opgeslagen zodra ze klaar zijn (in run_single_table)
+            for table, result, error in run_concurrently(batch_tables, analyse_table, max_concurrency):
+                if error is not None:
                     issue_counts["exceptions"] += 1
-                    logging.exception(f"[ERROR] Fout bij analyse van {table['table_name']}: {e}")
+                    logging.error(
+                        f"[ERROR] Fout bij analyse van {table['table_name']}: {error}", exc_info=error
+                    )
+                    continue
+                if result.get("status") in ("packed", "queued"):
+                    continue  # resultaat volgt na het gebundelde verzoek of de batch
+                batch_results.append(result)
+                if result.get("status") == "error":
+                    issue_counts["errors"] += 1
+                elif result.get("reason") == "unchanged":
+                    issue_counts["unchanged"] += 1
+
+            if packer is not None and packer.items:
+                packs = packer.packs()
+                logging.info(f"[PACK] {len(packer.items)} kleine tabellen in {len(packs)} gebundelde verzoeken")
+
+                def analyse_pack(pack: list):
+                    return run_packed_tables(pack, analysis_type, run_id, model_used, temperature, max_tokens)
+
+                for pack, summaries, error in run_concurrently(packs, analyse_pack, max_concurrency):
+                    if error is not None:
+                        issue_counts["exceptions"] += len(pack)
+                        logging.error(
+                            f"[ERROR] Fout bij gebundelde analyse van {[item['key'] for item in pack]}: {error}",
+                            exc_info=error,
+                        )
+                        continue
+                    batch_results.extend(summaries)
+                    issue_counts["errors"] += sum(1 for r in summaries if r.get("status") == "error")
+
+            if batch_requests:
+                answers = call_llm_batch(
+                    [item["prompt"] for item in batch_requests],
+                    model=model_used, temperature=temperature, max_tokens=max_tokens, runner=batch_runner,
+                )
+
+                def store_answer(pair: tuple):
+                    item, answer = pair
+                    payload = item["payload"]
+                    return store_table_llm_result(
+                        run_id, payload["table"], analysis_type, item["prompt"], answer, model_used, temperature,
+                        max_tokens, payload["fingerprint"], payload.get("metadata"), payload.get("sample"),
+                        object_type=payload.get("type", "table"),
+                    )
+
+                # Opslaan met dezelfde begrenzing als het bouwen van de prompts
+                for (item, _), summary, error in run_concurrently(zip(batch_requests, answers), store_answer,
+                                                                  max_concurrency):
+                    if error is not None:
+                        issue_counts["exceptions"] += 1
+                        logging.error(f"[ERROR] Fout bij opslaan van {item['key']}: {error}", exc_info=error)
+                        continue
+                    batch_results.append(summary)
         else:
             logging.info(f"[ABORT] Batch-analyse voortijdig afgebroken: {aborted_reason}")
 
+        cache_counts = Counter(r.get("llm_cache") for r in batch_results if r.get("llm_cache"))
+        if cache_counts:
+            logging.info(f"[CACHE] {cache_counts['hit']} hits, {cache_counts['miss']} misses")
+            if not dry_run:
+                record_cache_stats(run_id, cache_counts["hit"], cache_counts["miss"])
+
         if issue_counts:
             total_issues = sum(issue_counts.values())
             logging.info(f"[SUMMARY] {total_issues} tabellen overgeslagen of met fouten:")
@@ -362,7 +482,17 @@ def run_single_table(
     temperature: float | None = None,
     max_tokens: int | None = None,
     analysis_config: dict | None = None,
+    previous_fingerprint: str | None = None,
+    packer: PromptPacker | None = None,
+    batch_requests: list | None = None,
 ):
+    """
+    Analyseert één tabel of view en slaat het resultaat op.
+
+    Met packer gaan kleine prompts naar een gebundeld verzoek (status "packed"); met
+    batch_requests wordt elke prompt alleen verzameld voor de Batch API (status "queued").
+    In beide gevallen volgt de opslag later in run_batch_tables_by_config.
+    """
     logging.info(f"[RUN] Analyse gestart voor {table['table_name']} (run_id={run_id})")
     is_view = table.get("table_type", "").upper() in ("V", "VIEW")
 
@@ -396,6 +526,18 @@ def run_single_table(
                     "prompt": None
                 }
 
+            fingerprint = compute_table_fingerprint(view_definition=view_def)
+            if previous_fingerprint == fingerprint:
+                logging.info(f"[SKIP] Viewdefinitie van {table['table_name']} ongewijzigd sinds laatste analyse")
+                return {
+                    "schema": table["schema_name"],
+                    "table": table["table_name"],
+                    "type": "view",
+                    "status": "skipped",
+                    "reason": "unchanged",
+                    "prompt": None
+                }
+
             prompt = build_prompt_for_table(table, {"definition": view_def}, None, analysis_type)
 
             if dry_run:
@@ -427,7 +569,21 @@ def run_single_table(
                 temperature = temperature if temperature is not None else analysis_config.get("temperature", mc_temp)
                 max_tokens = max_tokens if max_tokens is not None else analysis_config.get("max_tokens", mc_max)
 
-            result = call_llm(prompt, model=model_used, temperature=temperature, max_tokens=max_tokens)
+            if batch_requests is not None:
+                batch_requests.append({
+                    "key": f"{table['schema_name']}.{table['table_name']}",
+                    "prompt": prompt,
+                    "payload": {"table": table, "fingerprint": fingerprint, "type": "view"},
+                })
+                return {
+                    "schema": table["schema_name"],
+                    "table": table["table_name"],
+                    "type": "view",
+                    "status": "queued",
+                    "prompt": prompt
+                }
+
+            result = call_with_budget(call_llm, prompt, model=model_used, temperature=temperature, max_tokens=max_tokens)
             result.update({
                 "analysis_type": analysis_type,
                 "prompt": prompt,
@@ -435,6 +591,8 @@ def run_single_table(
                 "temperature": temperature,
                 "max_tokens": max_tokens
             })
+            if not result.get("error") and not result.get("issues"):
+                result["input_fingerprint"] = fingerprint
             store_ai_table_analysis(run_id, table, result, analysis_type)
             logging.info(f"[OK] Analyse opgeslagen voor {table['table_name']}")
 
@@ -443,7 +601,8 @@ def run_single_table(
                 "table": table["table_name"],
                 "type": "view",
                 "status": "ok",
-                "prompt": prompt
+                "prompt": prompt,
+                "llm_cache": result.get("cache"),
             }
 
         # Zorg voor defaults indien geen analysis_config is doorgegeven (single-table tests)
@@ -541,6 +700,19 @@ def run_single_table(
                 "prompt": None
             }
 
+        # --- INCREMENTEEL ---
+        fingerprint = compute_table_fingerprint(metadata, sample)
+        if previous_fingerprint == fingerprint:
+            logging.info(f"[SKIP] Metadata en sample van {table['table_name']} ongewijzigd sinds laatste analyse")
+            return {
+                "schema": table["schema_name"],
+                "table": table["table_name"],
+                "type": "table",
+                "status": "skipped",
+                "reason": "unchanged",
+                "prompt": None
+            }
+
         # --- PROMPT + AI ---
         prompt = build_prompt_for_table(table, metadata, sample_df if sample_df is not None else sample, analysis_type)
 
@@ -583,42 +755,47 @@ def run_single_table(
             temperature = temperature if temperature is not None else analysis_config.get("temperature", mc_temp)
             max_tokens = max_tokens if max_tokens is not None else analysis_config.get("max_tokens", mc_max)
 
-        result = call_llm(prompt, model=model_used, temperature=temperature, max_tokens=max_tokens)
-        result.update({
-            "analysis_type": analysis_type,
-            "prompt": prompt,
-            "model_used": model_used,
-            "temperature": temperature,
-            "max_tokens": max_tokens
-        })
-
-        if analysis_type == "column_classification":
-            raw_response = result.get("result", "")
-            logging.debug(f"[DEBUG] Ruwe AI-response:\n{raw_response}")
-            parsed = parse_column_classification_response(raw_response)
-            if parsed is not None:
-                result["column_classification"] = parsed
-            else:
-                logging.warning("[PARSER] Kon AI-resultaat niet parseren tot JSON.")
+        rendered_sample = (
+            sample.to_dict(orient="records")
+            if hasattr(sample, "to_dict")
+            else (sample if sample_is_list else None)
+        )
 
-        logging.debug(json.dumps(result, indent=2))
+        if batch_requests is not None:
+            batch_requests.append({
+                "key": f"{table['schema_name']}.{table['table_name']}",
+                "prompt": prompt,
+                "payload": {"table": table, "fingerprint": fingerprint, "metadata": metadata, "sample": rendered_sample},
+            })
+            return {
+                "schema": table["schema_name"],
+                "table": table["table_name"],
+                "type": "table",
+                "status": "queued",
+                "prompt": prompt
+            }
 
-        store_ai_table_analysis(run_id, table, result, analysis_type)
-        logging.info(f"[OK] Analyse opgeslagen voor {table['table_name']}")
+        if packer is not None and packer.fits(prompt):
+            # Kleine tabel: de prompt gaat mee in een gebundeld verzoek (run_packed_tables)
+            packer.add(f"{table['schema_name']}.{table['table_name']}", prompt, {
+                "table": table,
+                "fingerprint": fingerprint,
+                "metadata": metadata,
+                "sample": rendered_sample,
+            })
+            return {
+                "schema": table["schema_name"],
+                "table": table["table_name"],
+                "type": "table",
+                "status": "packed",
+                "prompt": prompt
+            }
 
-        return {
-            "schema": table["schema_name"],
-            "table": table["table_name"],
-            "type": "table",
-            "status": "ok",
-            "prompt": prompt,
-            "metadata": metadata,
-            "sample": (
-                sample.to_dict(orient="records")
-                if hasattr(sample, "to_dict")
-                else (sample if sample_is_list else None)
-            )
-        }
+        result = call_with_budget(call_llm, prompt, model=model_used, temperature=temperature, max_tokens=max_tokens)
+        return store_table_llm_result(
+            run_id, table, analysis_type, prompt, result, model_used, temperature, max_tokens,
+            fingerprint, metadata, rendered_sample
+        )
 
     except Exception as e:
         logging.exception(f"[FAIL] Analyse gefaald voor {table.get('table_name', '?')}: {e}")
@@ -628,3 +805,108 @@ def run_single_table(
             "status": "error",
             "message": str(e)
         }
+
+
+def store_table_llm_result(
+    run_id: int,
+    table: dict,
+    analysis_type: str,
+    prompt: str,
+    result: dict,
+    model_used: str,
+    temperature: float,
+    max_tokens: int,
+    fingerprint: str | None = None,
+    metadata=None,
+    rendered_sample=None,
+    object_type: str = "table",
+) -> dict:
+    """Parseert het LLM-antwoord voor één tabel, slaat het op en geeft de samenvatting voor het runlog terug."""
+    result.update({
+        "analysis_type": analysis_type,
+        "prompt": prompt,
+        "model_used": model_used,
+        "temperature": temperature,
+        "max_tokens": max_tokens
+    })
+
+    if analysis_type == "column_classification":
+        raw_response = result.get("result", "")
+        logging.debug(f"[DEBUG] Ruwe AI-response:\n{raw_response}")
+        parsed = parse_column_classification_response(raw_response)
+        if parsed is not None:
+            result["column_classification"] = parsed
+        else:
+            logging.warning("[PARSER] Kon AI-resultaat niet parseren tot JSON.")
+
+    if fingerprint and not result.get("error") and not result.get("issues"):
+        result["input_fingerprint"] = fingerprint
+
+    logging.debug(json.dumps(result, indent=2))
+
+    store_ai_table_analysis(run_id, table, result, analysis_type)
+    logging.info(f"[OK] Analyse opgeslagen voor {table['table_name']}")
+
+    return {
+        "schema": table["schema_name"],
+        "table": table["table_name"],
+        "type": object_type,
+        "status": "ok",
+        "prompt": prompt,
+        "metadata": metadata,
+        "sample": rendered_sample,
+        "llm_cache": result.get("cache"),
+    }
+
+
+def run_packed_tables(
+    pack: list[dict],
+    analysis_type: str,
+    run_id: int,
+    model_used: str,
+    temperature: float,
+    max_tokens: int,
+) -> list[dict]:
+    """
+    Voert een bundel kleine tabellen uit als één verzoek en slaat het antwoord per tabel op.
+    Tabellen zonder bruikbaar antwoord in de bundel worden alsnog los aangeroepen.
+    """
+    answers, shares, packed = {}, [{} for _ in pack], {}
+    if len(pack) > 1:
+        packed_prompt = build_packed_prompt(pack)
+        packed = call_with_budget(
+            call_llm, packed_prompt, model=model_used, temperature=temperature,
+            max_tokens=min(max_tokens * len(pack), PACK_MAX_COMPLETION_TOKENS),
+        )
+        if not packed.get("error"):
+            answers = split_packed_response(packed.get("result", ""), [item["key"] for item in pack])
+        shares = split_tokens(packed.get("tokens") or {}, pack)
+
+    summaries = []
+    for item, share in zip(pack, shares):
+        payload = item["payload"]
+        table = payload["table"]
+        try:
+            if item["key"] in answers:
+                result = {"result": answers[item["key"]], "tokens": share, "packed_with": len(pack)}
+                if packed.get("cache"):
+                    result["cache"] = packed["cache"]
+            else:
+                if len(pack) > 1:
+                    logging.warning(f"[PACK] Geen antwoord voor {item['key']} in bundel — losse aanroep")
+                result = call_with_budget(
+                    call_llm, item["prompt"], model=model_used, temperature=temperature, max_tokens=max_tokens
+                )
+            summaries.append(store_table_llm_result(
+                run_id, table, analysis_type, item["prompt"], result, model_used, temperature, max_tokens,
+                payload["fingerprint"], payload["metadata"], payload["sample"]
+            ))
+        except Exception as e:
+            logging.exception(f"[FAIL] Analyse gefaald voor {table.get('table_name', '?')}: {e}")
+            summaries.append({
+                "schema": table.get("schema_name"),
+                "table": table.get("table_name"),
+                "status": "error",
+                "message": str(e)
+            })
+    return summaries
@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+try:
+    import asyncpg
+except ImportError:  # optioneel: zonder asyncpg blijft de synchrone psycopg2/pyodbc route actief
+    asyncpg = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 4
+
+# Same queries as the synchronous PostgreSQL path, but per schema instead of per table
+_TABLES_SQL = """
+    SELECT t.table_name, t.table_type, v.definition AS view_definition
+    FROM information_schema.tables t
+    LEFT JOIN pg_views v
+        ON t.table_name = v.viewname
+        AND t.table_schema = v.schemaname
+    WHERE t.table_schema = $1
+    ORDER BY t.table_name
+"""
+
+_COLUMNS_SQL = """
+    SELECT table_name, column_name, data_type, is_nullable, column_default, ordinal_position
+    FROM information_schema.columns
+    WHERE table_schema = $1
+    ORDER BY table_name, ordinal_position
+"""
+
+
+def is_available() -> bool:
+    return asyncpg is not None
+
+
+class AsyncPostgresIntrospector:
+    """
+    Source connection wrapper with an async introspection snapshot (PostgreSQL).
+
+    load() reads tables and columns of the given schemas with concurrent queries
+    over a small asyncpg pool. get_tables()/get_columns() then serve the
+    get_source_tables/get_source_columns contract from memory. Everything else
+    (cursor, rollback, close) goes to the wrapped psycopg2 connection, so the
+    other code paths keep working unchanged.
+    """
+
+    def __init__(self, sync_conn, conn_info: Dict[str, Any], database_name: str, pool_size: int = DEFAULT_POOL_SIZE):
+        if asyncpg is None:
+            raise ImportError("asyncpg is niet geïnstalleerd")
+        self.sync_conn = sync_conn
+        self.conn_info = conn_info
+        self.database_name = database_name
+        self.pool_size = max(1, int(pool_size))
+        self._tables: Dict[str, List[Dict[str, Any]]] = {}
+        self._columns: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+
+    # Connection passthrough -------------------------------------------
+
+    def cursor(self, *args, **kwargs):
+        return self.sync_conn.cursor(*args, **kwargs)
+
+    def commit(self):
+        self.sync_conn.commit()
+
+    def rollback(self):
+        self.sync_conn.rollback()
+
+    def close(self):
+        self.sync_conn.close()
+
+    # Snapshot ------------------------------------------------------------
+
+    def load(self, schemas: Iterable[str]) -> 'AsyncPostgresIntrospector':
+        """Load tables and columns of the given schemas (blocking; runs its own event loop)."""
+        schemas = [s for s in schemas if s not in self._tables]
+        if schemas:
+            asyncio.run(self._load(schemas))
+            logger.info(
+                f"Async introspection of {self.database_name}: {len(schemas)} schemas, "
+                f"{sum(len(self._tables[s]) for s in schemas)} tables (pool size {self.pool_size})"
+            )
+        return self
+
+    async def _load(self, schemas: List[str]) -> None:
+        pool = await asyncpg.create_pool(
+            host=self.conn_info['host'],
+            port=int(self.conn_info['port']),
+            user=self.conn_info['username'],
+            password=self.conn_info['password'],
+            database=self.database_name,
+            min_size=1,
+            max_size=self.pool_size,
+        )
+        try:
+            # The pool bounds the number of queries that actually run at the same time
+            await asyncio.gather(*(self._load_schema(pool, schema) for schema in schemas))
+        finally:
+            await pool.close()
+
+    async def _load_schema(self, pool, schema: str) -> None:
+        table_rows, column_rows = await asyncio.gather(
+            pool.fetch(_TABLES_SQL, schema),
+            pool.fetch(_COLUMNS_SQL, schema),
+        )
+        columns: Dict[str, List[Dict[str, Any]]] = {}
+        for r in column_rows:
+            columns.setdefault(r['table_name'], []).append({
+                'column_name': r['column_name'],
+                'data_type': r['data_type'],
+                'is_nullable': r['is_nullable'] == 'YES',
+                'column_default': r['column_default'],
+                'ordinal_position': r['ordinal_position'],
+            })
+        self._columns[schema] = columns
+        self._tables[schema] = [
+            {
+                'table_name': r['table_name'],
+                'table_type': r['table_type'],
+                'view_definition': r['view_definition'] if r['view_definition'] else None,
+                'connection_type': 'PostgreSQL',
+            }
+            for r in table_rows
+        ]
+
+    def has_schema(self, schema: str) -> bool:
+        return schema in self._tables
+
+    def get_tables(self, schema: str, table_filter: Optional[List[str]] = None, include_views: bool = False) -> List[Dict]:
+        allowed_types = ('BASE TABLE', 'VIEW') if include_views else ('BASE TABLE',)
+        return [
+            dict(t) for t in self._tables.get(schema, [])
+            if t['table_type'] in allowed_types and (not table_filter or t['table_name'] in table_filter)
+        ]
+
+    def get_columns(self, schema: str, table: str) -> List[Dict]:
+        return [dict(c) for c in self._columns.get(schema, {}).get(table, [])]
@@ -0,0 +1,703 @@
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+DEFAULT_PROGRESS_SECONDS = 10.0
+
+# (node_type, qualified_name)
+NodeRef = Tuple[str, str]
+
+
+# Records ---------------------------------------------------------------
+
+@dataclass
+class NodeRecord:
+    """
+    One catalog.nodes row plus its detail row.
+
+    parent refers to a node yielded earlier in the same run (or already in the catalog);
+    its node_id is filled into details[parent_column] by the loader.
+    """
+    node_type: str
+    name: str
+    qualified_name: str
+    detail_table: Optional[str] = None
+    details: Dict[str, Any] = field(default_factory=dict)
+    parent: Optional[NodeRef] = None
+    parent_column: Optional[str] = None
+    props: Optional[Dict[str, Any]] = None
+
+    @property
+    def ref(self) -> NodeRef:
+        return (self.node_type, self.qualified_name)
+
+
+@dataclass
+class EdgeRecord:
+    """A rel.edge row between two nodes; both ends must be yielded before the edge (or exist already)."""
+    src: NodeRef
+    dst: NodeRef
+    edge_type: str
+    weight: Optional[float] = None
+    props: Optional[Dict[str, Any]] = None
+
+
+Record = Union[NodeRecord, EdgeRecord]
+
+
+# Run bookkeeping (catalog.catalog_runs) -------------------------------
+
+def start_catalog_run(catalog_conn, connection_id: int, context: Dict, run_type: str = 'DB_CATALOG') -> int:
+    with catalog_conn.cursor() as cur:
+        cur.execute(
+            """
+            INSERT INTO catalog.catalog_runs
+                (run_type, connection_id, source_label, status, mode, context)
+            VALUES
+                (%s, %s, %s, 'running', 'manual', %s)
+            RETURNING id
+            """,
+            (run_type, connection_id, context.get('source_label'), json.dumps(context))
+        )
+        run_id = cur.fetchone()[0]
+        return run_id
+
+
+def complete_catalog_run(catalog_conn, run_id: int, nodes_created: int, nodes_updated: int, objects_total: int,
+                         nodes_deleted: int = 0, metrics: Optional[Dict] = None):
+    """Mark the run completed; metrics (timings, counters) are merged into catalog_runs.context."""
+    with catalog_conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE catalog.catalog_runs
+               SET completed_at = NOW()
+                 , status       = 'completed'
+                 , nodes_created = %s
+                 , nodes_updated = %s
+                 , nodes_deleted = %s
+                 , objects_total = %s
+                 , context       = context || %s::jsonb
+             WHERE id = %s
+            """,
+            (nodes_created, nodes_updated, nodes_deleted, objects_total,
+             json.dumps({'metrics': metrics} if metrics else {}), run_id)
+        )
+
+
+def fail_catalog_run(catalog_conn, run_id: int, message: str):
+    try:
+        with catalog_conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE catalog.catalog_runs
+                   SET completed_at = NOW()
+                     , status = 'failed'
+                     , error_message = %s
+                 WHERE id = %s
+                """,
+                (message, run_id)
+            )
+    except Exception:
+        pass
+
+
+def setup_run_logging(log_subdir: str, log_prefix: str, run_id: Optional[int]) -> str:
+    """Log to data_catalog/logfiles/<log_subdir>/<log_prefix>_<ts>[_run_<id>].log; returns the path relative to the project root."""
+    script_dir = Path(__file__).parent
+    log_dir = script_dir / 'logfiles' / log_subdir
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+    log_file = log_dir / f"{log_prefix}_{ts}{('_run_'+str(run_id)) if run_id else ''}.log"
+
+    from logging.handlers import RotatingFileHandler
+    handler = RotatingFileHandler(str(log_file), maxBytes=5*1024*1024, backupCount=5)
+    console = logging.StreamHandler()
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s [%(levelname)s] %(message)s',
+                        handlers=[handler, console],
+                        force=True)
+
+    # return path relative to project root
+    project_root = script_dir.parent
+    return str(log_file.relative_to(project_root))
+
+
+# Metrics ---------------------------------------------------------------
+
+class RunTimer:
+    """Accumulates wall-clock seconds per phase."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def timed(self, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - started)
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    def iterate(self, phase: str, iterable: Iterable) -> Iterator:
+        """Yield from iterable, counting the time spent inside it (the extractor) under phase."""
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(phase, time.perf_counter() - started)
+                return
+            self.add(phase, time.perf_counter() - started)
+            yield item
+
+    def as_dict(self) -> Dict[str, float]:
+        return {phase: round(seconds, 3) for phase, seconds in self.seconds.items()}
+
+
+class ProgressThrottle:
+    """Calls callback(stats) at most once per interval_seconds (and always when forced)."""
+
+    def __init__(self, callback: Callable[[Dict[str, int]], None], interval_seconds: float = DEFAULT_PROGRESS_SECONDS):
+        self.callback = callback
+        self.interval_seconds = interval_seconds
+        self._last = time.monotonic()
+
+    def __call__(self, stats: Dict[str, int], force: bool = False) -> None:
+        now = time.monotonic()
+        if force or now - self._last >= self.interval_seconds:
+            self._last = now
+            self.callback(stats)
+
+
+# Loader ----------------------------------------------------------------
+
+def _json_value(value: Any) -> Any:
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+def ensure_loader_tables(cur) -> None:
+    """Staging tables of the loader (per session); rel.edge.last_seen_run_id comes from db/migrations."""
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS tmp_loader_nodes (
+            node_type text,
+            name text,
+            qualified_name text,
+            props jsonb
+        )
+    """)
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS tmp_loader_edges (
+            src_node_id bigint,
+            dst_node_id bigint,
+            edge_type text,
+            weight real,
+            props jsonb
+        )
+    """)
+
+
+def lookup_node_ids(cur, refs: Iterable[NodeRef]) -> Dict[NodeRef, int]:
+    """node_ids of existing nodes, in one query."""
+    refs = list(set(refs))
+    if not refs:
+        return {}
+    rows = execute_values(cur, """
+        SELECT n.node_type, n.qualified_name, n.node_id
+        FROM (VALUES %s) AS r (node_type, qualified_name)
+        JOIN catalog.nodes n ON n.node_type = r.node_type AND n.qualified_name = r.qualified_name
+    """, refs, page_size=len(refs), fetch=True)
+    return {(node_type, qn): node_id for node_type, qn, node_id in rows}
+
+
+# Detail table per node type and its columns after node_id
+NODE_DETAIL_COLUMNS = {
+    'catalog.node_schema': ('database_node_id', 'schema_name'),
+    'catalog.node_table': ('schema_node_id', 'table_name', 'table_type'),
+    'catalog.node_column': ('table_node_id', 'column_name', 'data_type', 'is_nullable'),
+    'catalog.node_dl_container': ('account_name', 'container_name', 'props'),
+    'catalog.node_dl_folder': ('container_node_id', 'folder_path', 'props'),
+    'catalog.node_dl_file': ('folder_node_id', 'file_name', 'file_format', 'size_bytes', 'props'),
+    'catalog.node_pbi_model': ('dataset_name',),
+    'catalog.node_pbi_measure': ('table_node_id', 'measure_name', 'data_type', 'dax_expression', 'format_string',
+                                 'is_hidden'),
+    'catalog.node_pbi_query': ('model_node_id', 'table_node_id', 'query_name', 'source_kind', 'source_path', 'm_code',
+                               'props'),
+}
+
+
+def upsert_nodes_bulk(cur, nodes: List[Tuple[str, str, str, Optional[Dict]]], run_id: int) -> Tuple[Dict[str, int], int]:
+    """
+    Upsert (node_type, name, qualified_name, props) rows in one statement.
+
+    Returns ({qualified_name: node_id}, number of newly created nodes).
+    """
+    # Keyed so a node is never upserted twice in one statement
+    nodes = list({(node_type, qn): (node_type, name, qn, props) for node_type, name, qn, props in nodes}.values())
+    if not nodes:
+        return {}, 0
+    rows = [(node_type, name, qn, json.dumps(props or {}), run_id, run_id) for node_type, name, qn, props in nodes]
+    result = execute_values(
+        cur,
+        """
+        INSERT INTO catalog.nodes
+            (node_type
+            , name
+            , qualified_name
+            , props
+            , created_in_run_id
+            , last_seen_run_id
+            )
+        VALUES %s
+        ON CONFLICT (node_type, qualified_name) DO UPDATE
+           SET name             = EXCLUDED.name
+             , props            = COALESCE(EXCLUDED.props, catalog.nodes.props)
+             , last_seen_run_id = EXCLUDED.last_seen_run_id
+             , updated_at       = NOW()
+             , deleted_in_run_id = NULL
+             , deleted_at        = NULL
+        RETURNING qualified_name, node_id, (xmax = 0) AS inserted
+        """,
+        rows,
+        template="(%s, %s, %s, %s::jsonb, %s, %s)",
+        page_size=len(rows),
+        fetch=True
+    )
+    node_ids = {qn: node_id for qn, node_id, _ in result}
+    created = sum(1 for _, _, inserted in result if inserted)
+    return node_ids, created
+
+
+def upsert_node_details_bulk(cur, detail_table: str, rows: List[Tuple]) -> None:
+    """Upsert (node_id, *detail columns) rows into a node_* detail table in one statement."""
+    if not rows:
+        return
+    columns = NODE_DETAIL_COLUMNS[detail_table]
+    updates = '\n             , '.join(f"{c} = EXCLUDED.{c}" for c in columns)
+    execute_values(
+        cur,
+        f"""
+        INSERT INTO {detail_table} (node_id, {', '.join(columns)})
+        VALUES %s
+        ON CONFLICT (node_id) DO UPDATE
+           SET {updates}
+        """,
+        rows,
+        page_size=len(rows)
+    )
+
+
+def upsert_edges_bulk(cur, rows: List[Tuple], run_id: int) -> int:
+    """
+    Write (src_node_id, dst_node_id, edge_type, weight, props) rows through tmp_loader_edges.
+
+    Existing edges are marked seen in this run, missing ones inserted once per (src, dst, type);
+    returns the number of inserted edges. ensure_loader_tables() must have run in the session.
+    """
+    if not rows:
+        return 0
+    cur.execute("TRUNCATE tmp_loader_edges")
+    execute_values(cur, """
+        INSERT INTO tmp_loader_edges (src_node_id, dst_node_id, edge_type, weight, props) VALUES %s
+    """, rows, page_size=1000)
+    cur.execute("""
+        UPDATE rel.edge e
+           SET last_seen_run_id = %s
+             , weight           = s.weight
+             , props            = s.props
+          FROM tmp_loader_edges s
+         WHERE e.src_node_id = s.src_node_id
+           AND e.dst_node_id = s.dst_node_id
+           AND e.edge_type = s.edge_type
+    """, (run_id,))
+    cur.execute("""
+        INSERT INTO rel.edge (src_node_id, dst_node_id, edge_type, weight, props, last_seen_run_id)
+        SELECT DISTINCT ON (s.src_node_id, s.dst_node_id, s.edge_type)
+               s.src_node_id, s.dst_node_id, s.edge_type, s.weight, s.props, %s
+          FROM tmp_loader_edges s
+         WHERE NOT EXISTS (
+               SELECT 1 FROM rel.edge e
+                WHERE e.src_node_id = s.src_node_id
+                  AND e.dst_node_id = s.dst_node_id
+                  AND e.edge_type = s.edge_type)
+    """, (run_id,))
+    return cur.rowcount
+
+
+class CatalogLoader:
+    """
+    Buffers records from an extractor and writes them in bulk through staging tables.
+
+    Nodes are diffed against catalog.nodes: new nodes are inserted, changed nodes updated,
+    unchanged nodes only get last_seen_run_id, so unchanged metadata causes no row churn.
+    A batch is written level by level (parents before the children that point to them),
+    detail rows are upserted only when they differ, and edges are inserted once per
+    (src, dst, type) and marked seen in this run. Node ids of the run are kept, so children
+    and edges in later batches resolve without a lookup.
+    """
+
+    def __init__(self, catalog_conn, run_id: int, batch_size: int = DEFAULT_BATCH_SIZE,
+                 progress: Optional[ProgressThrottle] = None, timer: Optional[RunTimer] = None):
+        self.catalog_conn = catalog_conn
+        self.run_id = run_id
+        self.batch_size = max(1, int(batch_size))
+        self.progress = progress
+        self.timer = timer or RunTimer()
+        self.node_ids: Dict[NodeRef, int] = {}
+        self.stats = {
+            'records': 0,
+            'nodes_created': 0,
+            'nodes_updated': 0,
+            'nodes_unchanged': 0,
+            'edges_created': 0,
+            'edges_unresolved': 0,
+            'nodes_unresolved_parent': 0,
+            'batches': 0,
+        }
+        self._nodes: Dict[NodeRef, NodeRecord] = {}
+        self._edges: List[EdgeRecord] = []
+        with catalog_conn.cursor() as cur:
+            ensure_loader_tables(cur)
+
+    def add(self, record: Record) -> None:
+        self.stats['records'] += 1
+        if isinstance(record, EdgeRecord):
+            self._edges.append(record)
+        else:
+            # Keyed so a node is never staged twice in one batch
+            self._nodes[record.ref] = record
+        if len(self._nodes) + len(self._edges) >= self.batch_size:
+            self.flush(commit=True)
+
+    def load(self, records: Iterable[Record]) -> None:
+        for record in self.timer.iterate('extract', records):
+            self.add(record)
+        self.flush(commit=True)
+
+    def flush(self, commit: bool = False) -> None:
+        if self._nodes or self._edges:
+            with self.catalog_conn.cursor() as cur:
+                if self._nodes:
+                    for level in self._levels(list(self._nodes.values())):
+                        self._write_nodes(cur, level)
+                if self._edges:
+                    self._write_edges(cur, self._edges)
+            self._nodes, self._edges = {}, []
+            self.stats['batches'] += 1
+        if commit:
+            with self.timer.timed('commit'):
+                self.catalog_conn.commit()
+        if self.progress:
+            self.progress(self.stats)
+
+    def _levels(self, records: List[NodeRecord]) -> List[List[NodeRecord]]:
+        """Split a batch so every record comes after the buffered record it points to."""
+        pending = {record.ref: record for record in records}
+        depth: Dict[NodeRef, int] = {}
+
+        def level_of(record: NodeRecord) -> int:
+            if record.ref not in depth:
+                parent = pending.get(record.parent) if record.parent else None
+                depth[record.ref] = 0
+                depth[record.ref] = level_of(parent) + 1 if parent is not None and parent is not record else 0
+            return depth[record.ref]
+
+        levels: Dict[int, List[NodeRecord]] = {}
+        for record in records:
+            levels.setdefault(level_of(record), []).append(record)
+        return [levels[level] for level in sorted(levels)]
+
+    def _write_nodes(self, cur, records: List[NodeRecord]) -> None:
+        # Parent ids: written earlier in this run, else already in the catalog
+        missing = [r.parent for r in records if r.parent and r.parent not in self.node_ids]
+        if missing:
+            self.node_ids.update(lookup_node_ids(cur, missing))
+
+        with self.timer.timed('write_nodes'):
+            cur.execute("TRUNCATE tmp_loader_nodes")
+            execute_values(cur, "INSERT INTO tmp_loader_nodes (node_type, name, qualified_name, props) VALUES %s", [
+                (r.node_type, r.name, r.qualified_name, json.dumps(r.props) if r.props is not None else None)
+                for r in records
+            ], page_size=1000)
+            cur.execute("""
+                UPDATE catalog.nodes n
+                   SET name              = s.name
+                     , props             = COALESCE(s.props, n.props)
+                     , updated_at        = NOW()
+                     , last_seen_run_id  = %s
+                     , deleted_in_run_id = NULL
+                     , deleted_at        = NULL
+                  FROM tmp_loader_nodes s
+                 WHERE n.node_type = s.node_type
+                   AND n.qualified_name = s.qualified_name
+                   AND (n.name IS DISTINCT FROM s.name
+                        OR (s.props IS NOT NULL AND n.props IS DISTINCT FROM s.props)
+                        OR n.deleted_in_run_id IS NOT NULL)
+            """, (self.run_id,))
+            self.stats['nodes_updated'] += cur.rowcount
+            cur.execute("""
+                UPDATE catalog.nodes n
+                   SET last_seen_run_id = %s
+                  FROM tmp_loader_nodes s
+                 WHERE n.node_type = s.node_type
+                   AND n.qualified_name = s.qualified_name
+                   AND n.last_seen_run_id IS DISTINCT FROM %s
+            """, (self.run_id, self.run_id))
+            self.stats['nodes_unchanged'] += cur.rowcount
+            cur.execute("""
+                INSERT INTO catalog.nodes
+                    (node_type, name, qualified_name, props, created_in_run_id, last_seen_run_id)
+                SELECT s.node_type, s.name, s.qualified_name, COALESCE(s.props, '{}'::jsonb), %s, %s
+                  FROM tmp_loader_nodes s
+                 WHERE NOT EXISTS (
+                       SELECT 1 FROM catalog.nodes n
+                        WHERE n.node_type = s.node_type AND n.qualified_name = s.qualified_name)
+                ON CONFLICT (node_type, qualified_name) DO NOTHING
+            """, (self.run_id, self.run_id))
+            self.stats['nodes_created'] += cur.rowcount
+            cur.execute("""
+                SELECT s.node_type, s.qualified_name, n.node_id
+                  FROM tmp_loader_nodes s
+                  JOIN catalog.nodes n ON n.node_type = s.node_type AND n.qualified_name = s.qualified_name
+            """)
+            self.node_ids.update({(node_type, qn): node_id for node_type, qn, node_id in cur.fetchall()})
+
+        with self.timer.timed('write_details'):
+            groups: Dict[Tuple[str, Tuple[str, ...]], List[Tuple]] = {}
+            for r in records:
+                if not r.detail_table:
+                    continue
+                details = dict(r.details)
+                if r.parent_column:
+                    details[r.parent_column] = self.node_ids.get(r.parent)
+                    if details[r.parent_column] is None:
+                        self.stats['nodes_unresolved_parent'] += 1
+                        logger.warning(f"Parent {r.parent} of {r.qualified_name} not found, detail row skipped")
+                        continue
+                columns = tuple(sorted(details))
+                groups.setdefault((r.detail_table, columns), []).append(
+                    (self.node_ids[r.ref],) + tuple(_json_value(details[c]) for c in columns)
+                )
+            for (detail_table, columns), rows in groups.items():
+                self._upsert_details(cur, detail_table, columns, rows)
+
+    @staticmethod
+    def _upsert_details(cur, detail_table: str, columns: Tuple[str, ...], rows: List[Tuple]) -> None:
+        column_list = ', '.join(columns)
+        updates = '\n                 , '.join(f"{c} = EXCLUDED.{c}" for c in columns)
+        excluded = ', '.join(f"EXCLUDED.{c}" for c in columns)
+        current = ', '.join(f"t.{c}" for c in columns)
+        execute_values(cur, f"""
+            INSERT INTO {detail_table} AS t (node_id, {column_list})
+            VALUES %s
+            ON CONFLICT (node_id) DO UPDATE
+               SET {updates}
+             WHERE ({current}) IS DISTINCT FROM ({excluded})
+        """, rows, page_size=1000)
+
+    def _write_edges(self, cur, edges: List[EdgeRecord]) -> None:
+        missing = [ref for e in edges for ref in (e.src, e.dst) if ref not in self.node_ids]
+        if missing:
+            self.node_ids.update(lookup_node_ids(cur, missing))
+
+        rows = []
+        for e in edges:
+            src_id, dst_id = self.node_ids.get(e.src), self.node_ids.get(e.dst)
+            if src_id is None or dst_id is None:
+                self.stats['edges_unresolved'] += 1
+                continue
+            rows.append((src_id, dst_id, e.edge_type, e.weight, json.dumps(e.props) if e.props is not None else None))
+        if not rows:
+            return
+
+        with self.timer.timed('write_edges'):
+            self.stats['edges_created'] += upsert_edges_bulk(cur, rows, self.run_id)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {'stats': dict(self.stats), 'seconds': self.timer.as_dict()}
+
+
+# Sweeps ----------------------------------------------------------------
+
+# node_type -> (detail table, column pointing to the parent node)
+NODE_PARENT = {
+    'DB_SCHEMA': ('catalog.node_schema', 'database_node_id'),
+    'DB_TABLE': ('catalog.node_table', 'schema_node_id'),
+    'DB_VIEW': ('catalog.node_table', 'schema_node_id'),
+    'DB_COLUMN': ('catalog.node_column', 'table_node_id'),
+    'DL_FOLDER': ('catalog.node_dl_folder', 'container_node_id'),
+    'DL_FILE': ('catalog.node_dl_file', 'folder_node_id'),
+    'DL_COLUMN': ('catalog.node_column', 'table_node_id'),
+}
+
+
+def sweep_node_type(cur, run_id: int, node_type: str, extra_where: str = '', extra_params: Tuple = ()) -> int:
+    """
+    Mark nodes of one type that were not seen in this run as deleted.
+
+    Only children of parents that were seen (or deleted) in this run are in scope,
+    so parts of the catalog outside the run's filters are never touched.
+    """
+    detail_table, parent_column = NODE_PARENT[node_type]
+    cur.execute(
+        f"""
+        UPDATE catalog.nodes n
+           SET deleted_in_run_id = %s
+             , deleted_at        = NOW()
+          FROM {detail_table} d
+          JOIN catalog.nodes p ON p.node_id = d.{parent_column}
+         WHERE d.node_id = n.node_id
+           AND n.node_type = %s
+           AND n.deleted_in_run_id IS NULL
+           AND COALESCE(n.last_seen_run_id, 0) < %s
+           AND (p.last_seen_run_id = %s OR p.deleted_in_run_id = %s)
+           {extra_where}
+        """,
+        (run_id, node_type, run_id, run_id, run_id) + tuple(extra_params)
+    )
+    return cur.rowcount
+
+
+def descendant_prefix(root_qualified_name: str, separator: str = '/') -> str:
+    """Prefix of everything below a root: the root plus its separator, so db/sales never covers db/sales_archive."""
+    return root_qualified_name if root_qualified_name.endswith(separator) else root_qualified_name + separator
+
+
+def sweep_nodes_by_prefix(cur, run_id: int, node_types: List[str], root_qualified_name: str, separator: str = '/') -> int:
+    """Soft-delete nodes of the given types below root_qualified_name that were not seen in this run."""
+    prefix = descendant_prefix(root_qualified_name, separator)
+    cur.execute(
+        """
+        UPDATE catalog.nodes
+           SET deleted_in_run_id = %s
+             , deleted_at        = NOW()
+         WHERE node_type = ANY(%s)
+           AND left(qualified_name, %s) = %s
+           AND deleted_in_run_id IS NULL
+           AND last_seen_run_id IS DISTINCT FROM %s
+        """,
+        (run_id, list(node_types), len(prefix), prefix, run_id)
+    )
+    return cur.rowcount
+
+
+def sweep_edges_by_prefix(cur, run_id: int, edge_types: List[str], root_qualified_name: str, separator: str = '/') -> int:
+    """Delete edges of the given types whose source is below root_qualified_name and that were not seen in this run."""
+    prefix = descendant_prefix(root_qualified_name, separator)
+    cur.execute(
+        """
+        DELETE FROM rel.edge e
+         USING catalog.nodes n
+         WHERE n.node_id = e.src_node_id
+           AND e.edge_type = ANY(%s)
+           AND left(n.qualified_name, %s) = %s
+           AND e.last_seen_run_id IS DISTINCT FROM %s
+        """,
+        (list(edge_types), len(prefix), prefix, run_id)
+    )
+    return cur.rowcount
+
+
+def split_filter(s: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated CLI/config filter to a list; None when empty."""
+    if not s:
+        return None
+    return [p.strip() for p in s.split(',') if p.strip()]
+
+
+# Cataloger base --------------------------------------------------------
+
+class Cataloger(ABC):
+    """
+    Base class for catalogers: subclasses implement extract() and, when they own a part of
+    the catalog, sweep(). run() does the run bookkeeping, logging, loading, progress and timing.
+    """
+
+    run_type = 'CATALOG'
+    log_subdir = 'catalog'
+    log_prefix = 'catalog'
+
+    def __init__(self, connection_id: int, batch_size: int = DEFAULT_BATCH_SIZE,
+                 progress_seconds: float = DEFAULT_PROGRESS_SECONDS):
+        self.connection_id = connection_id
+        self.batch_size = batch_size
+        self.progress_seconds = progress_seconds
+
+    def context(self) -> Dict[str, Any]:
+        """Run context stored in catalog_runs.context; should contain source_label."""
+        return {'source_label': None}
+
+    @abstractmethod
+    def extract(self) -> Iterator[Record]:
+        """Yield the records of this run; a node's parent before the node, both ends before an edge."""
+
+    def sweep(self, cur, run_id: int) -> Dict[str, int]:
+        """Soft-delete what this run owns but did not see; returns deleted counts per type."""
+        return {}
+
+    def get_catalog_connection(self):
+        from data_catalog.connection_handler import get_catalog_connection
+        return get_catalog_connection()
+
+    def report_progress(self, stats: Dict[str, int]) -> None:
+        logger.info(
+            f"Progress: {stats['records']} records, {stats['nodes_created']} nodes created, "
+            f"{stats['nodes_updated']} updated, {stats['nodes_unchanged']} unchanged, "
+            f"{stats['edges_created']} edges created"
+        )
+
+    def run(self) -> int:
+        catalog_conn = self.get_catalog_connection()
+        run_id = start_catalog_run(catalog_conn, self.connection_id, self.context(), run_type=self.run_type)
+        catalog_conn.commit()
+
+        # setup logging and store relative filename
+        rel_log = setup_run_logging(self.log_subdir, self.log_prefix, run_id)
+        with catalog_conn.cursor() as cur:
+            cur.execute("UPDATE catalog.catalog_runs SET log_filename = %s WHERE id = %s", (rel_log, run_id))
+        catalog_conn.commit()
+
+        timer = RunTimer()
+        try:
+            loader = CatalogLoader(catalog_conn, run_id, batch_size=self.batch_size, timer=timer,
+                                   progress=ProgressThrottle(self.report_progress, self.progress_seconds))
+            loader.load(self.extract())
+            self.report_progress(loader.stats)
+
+            with timer.timed('sweep'), catalog_conn.cursor() as cur:
+                deleted = self.sweep(cur, run_id)
+            nodes_deleted = sum(deleted.values())
+            logger.info(f"Soft-deleted: {deleted}")
+
+            stats = loader.stats
+            complete_catalog_run(catalog_conn, run_id, stats['nodes_created'], stats['nodes_updated'],
+                                 stats['records'], nodes_deleted, metrics=loader.metrics())
+            catalog_conn.commit()
+            logger.info(f"Catalog run {run_id} completed in {timer.as_dict()} seconds per phase")
+            return run_id
+
+        except Exception as e:
+            logger.exception("Cataloging failed")
+            catalog_conn.rollback()
+            fail_catalog_run(catalog_conn, run_id, str(e))
+            catalog_conn.commit()
+            raise
+        finally:
+            try:
+                catalog_conn.close()
+            except Exception:
+                pass
@@ -1,8 +1,6 @@
 import json
 import logging
-from datetime import datetime
-from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dotenv import load_dotenv
 
 from data_catalog.connection_handler import (
@@ -11,6 +9,18 @@ from data_catalog.connection_handler import (
     connect_to_source_database,
     get_databases_on_server,
 )
+from data_catalog import async_introspection
+from data_catalog.cataloger_base import (
+    setup_run_logging,
+    start_catalog_run,
+    complete_catalog_run,
+    fail_catalog_run,
+    upsert_nodes_bulk,
+    upsert_node_details_bulk,
+    sweep_node_type,
+    split_filter,
+)
+from data_catalog.async_introspection import AsyncPostgresIntrospector
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -18,24 +28,7 @@ logger = logging.getLogger(__name__)
 # Helpers -------------------------------------------------------------
 
 def setup_logging_with_run_id(run_id: Optional[int]) -> str:
-    script_dir = Path(__file__).parent
-    log_dir = script_dir / 'logfiles' / 'database_server'
-    log_dir.mkdir(parents=True, exist_ok=True)
-
-    ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-    log_file = log_dir / f"db_catalog_{ts}{('_run_'+str(run_id)) if run_id else ''}.log"
-
-    from logging.handlers import RotatingFileHandler
-    handler = RotatingFileHandler(str(log_file), maxBytes=5*1024*1024, backupCount=5)
-    console = logging.StreamHandler()
-    logging.basicConfig(level=logging.INFO,
-                        format='%(asctime)s [%(levelname)s] %(message)s',
-                        handlers=[handler, console],
-                        force=True)
-
-    # return path relative to project root
-    project_root = script_dir.parent
-    return str(log_file.relative_to(project_root))
+    return setup_run_logging('database_server', 'db_catalog', run_id)
 
 
 def _build_conn_info_from_config(connection_id: int) -> Dict:
@@ -58,57 +51,6 @@ def _build_conn_info_from_config(connection_id: int) -> Dict:
     }
 
 
-# Catalog run lifecycle (catalog.catalog_runs) ------------------------
-
-def start_catalog_run(catalog_conn, connection_id: int, context: Dict) -> int:
-    with catalog_conn.cursor() as cur:
-        cur.execute(
-            """
-            INSERT INTO catalog.catalog_runs
-                (run_type, connection_id, source_label, status, mode, context)
-            VALUES
-                ('DB_CATALOG', %s, %s, 'running', 'manual', %s)
-            RETURNING id
-            """,
-            (connection_id, context.get('source_label'), json.dumps(context))
-        )
-        run_id = cur.fetchone()[0]
-        return run_id
-
-
-def complete_catalog_run(catalog_conn, run_id: int, nodes_created: int, nodes_updated: int, objects_total: int):
-    with catalog_conn.cursor() as cur:
-        cur.execute(
-            """
-            UPDATE catalog.catalog_runs
-               SET completed_at = NOW()
-                 , status       = 'completed'
-                 , nodes_created = %s
-                 , nodes_updated = %s
-                 , objects_total = %s
-             WHERE id = %s
-            """,
-            (nodes_created, nodes_updated, objects_total, run_id)
-        )
-
-
-def fail_catalog_run(catalog_conn, run_id: int, message: str):
-    try:
-        with catalog_conn.cursor() as cur:
-            cur.execute(
-                """
-                UPDATE catalog.catalog_runs
-                   SET completed_at = NOW()
-                     , status = 'failed'
-                     , error_message = %s
-                 WHERE id = %s
-                """,
-                (message, run_id)
-            )
-    except Exception:
-        pass
-
-
 # Node upserts --------------------------------------------------------
 
 def upsert_node(cur, node_type: str, name: str, qualified_name: str, run_id: int, props: Optional[Dict] = None) -> int:
@@ -212,6 +154,108 @@ def upsert_column(cur, host: str, database: str, schema: str, table_node_id: int
     return node_id
 
 
+# Bulk node writer -----------------------------------------------------
+
+DEFAULT_NODE_BATCH_SIZE = 5000
+
+class BulkNodeWriter:
+    """
+    Buffers nodes together with their detail row and writes them in bulk.
+
+    flush() writes all buffered nodes (one statement for catalog.nodes, one per
+    detail table) and returns node_ids keyed by qualified_name. A commit is done
+    when asked for, or as soon as batch_size nodes were written since the last one.
+    """
+
+    def __init__(self, catalog_conn, run_id: int, batch_size: int = DEFAULT_NODE_BATCH_SIZE):
+        self.catalog_conn = catalog_conn
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self.created = 0
+        self.updated = 0
+        self._pending: Dict[Tuple[str, str], Tuple] = {}
+        self._uncommitted = 0
+
+    def add(self, node_type: str, name: str, qualified_name: str, detail_table: str,
+            detail_values: Tuple, props: Optional[Dict] = None) -> None:
+        # Keyed so a node is never upserted twice in one statement
+        self._pending[(node_type, qualified_name)] = (name, props, detail_table, detail_values)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def flush(self, commit: bool = False) -> Dict[str, int]:
+        node_ids: Dict[str, int] = {}
+        if self._pending:
+            nodes = [(node_type, name, qn, props) for (node_type, qn), (name, props, _, _) in self._pending.items()]
+            details: Dict[str, List[Tuple]] = {}
+            with self.catalog_conn.cursor() as cur:
+                node_ids, created = upsert_nodes_bulk(cur, nodes, self.run_id)
+                for (_, qn), (_, _, detail_table, detail_values) in self._pending.items():
+                    details.setdefault(detail_table, []).append((node_ids[qn],) + tuple(detail_values))
+                for detail_table, rows in details.items():
+                    upsert_node_details_bulk(cur, detail_table, rows)
+
+            self.created += created
+            self.updated += len(nodes) - created
+            self._uncommitted += len(nodes)
+            self._pending = {}
+
+        if commit or self._uncommitted >= self.batch_size:
+            self.catalog_conn.commit()
+            self._uncommitted = 0
+        return node_ids
+
+
+# Soft-delete sweep ----------------------------------------------------
+
+def sweep_deleted_nodes(cur, run_id: int, host: str,
+                        present_databases: Optional[List[str]] = None,
+                        schema_filter: Optional[List[str]] = None,
+                        table_filter: Optional[List[str]] = None,
+                        include_views: bool = False) -> Dict[str, int]:
+    """
+    End-of-run sweep: one UPDATE per node type, parents before children.
+
+    present_databases is only given when the run covered the whole server; database
+    nodes of this host that are no longer in that list are then deleted as well.
+    Returns the number of deleted nodes per node type.
+    """
+    deleted: Dict[str, int] = {}
+
+    if present_databases is not None:
+        cur.execute(
+            """
+            UPDATE catalog.nodes n
+               SET deleted_in_run_id = %s
+                 , deleted_at        = NOW()
+              FROM catalog.node_database d
+             WHERE d.node_id = n.node_id
+               AND n.node_type = 'DB_DATABASE'
+               AND n.deleted_in_run_id IS NULL
+               AND COALESCE(n.last_seen_run_id, 0) < %s
+               AND d.server_name = %s
+               AND NOT (d.database_name = ANY(%s))
+            """,
+            (run_id, run_id, host, list(present_databases))
+        )
+        deleted['DB_DATABASE'] = cur.rowcount
+
+    if schema_filter:
+        deleted['DB_SCHEMA'] = sweep_node_type(cur, run_id, 'DB_SCHEMA', 'AND d.schema_name = ANY(%s)', (schema_filter,))
+    else:
+        deleted['DB_SCHEMA'] = sweep_node_type(cur, run_id, 'DB_SCHEMA')
+
+    for node_type in (['DB_TABLE', 'DB_VIEW'] if include_views else ['DB_TABLE']):
+        if table_filter:
+            deleted[node_type] = sweep_node_type(cur, run_id, node_type, 'AND d.table_name = ANY(%s)', (table_filter,))
+        else:
+            deleted[node_type] = sweep_node_type(cur, run_id, node_type)
+
+    deleted['DB_COLUMN'] = sweep_node_type(cur, run_id, 'DB_COLUMN')
+    return deleted
+
+
 # Source enumeration ---------------------------------------------------
 
 def get_schemas_in_database(src_conn, connection_type: str) -> List[str]:
@@ -240,6 +284,11 @@ def get_schemas_in_database(src_conn, connection_type: str) -> List[str]:
 
 
 def get_tables_in_schema(src_conn, connection_type: str, schema: str, include_views: bool) -> List[Dict]:
+    if isinstance(src_conn, AsyncPostgresIntrospector) and src_conn.has_schema(schema):
+        return [
+            {'table_name': t['table_name'], 'table_type': 'VIEW' if t['table_type'] == 'VIEW' else 'TABLE'}
+            for t in src_conn.get_tables(schema, include_views=include_views)
+        ]
     if connection_type == 'PostgreSQL':
         with src_conn.cursor() as cur:
             cur.execute(
@@ -292,6 +341,8 @@ def get_tables_in_schema(src_conn, connection_type: str, schema: str, include_vi
 
 
 def get_columns_for_table(src_conn, connection_type: str, schema: str, table: str) -> List[Dict]:
+    if isinstance(src_conn, AsyncPostgresIntrospector) and src_conn.has_schema(schema):
+        return src_conn.get_columns(schema, table)
     if connection_type == 'PostgreSQL':
         with src_conn.cursor() as cur:
             cur.execute(
@@ -344,17 +395,26 @@ def get_columns_for_table(src_conn, connection_type: str, schema: str, table: st
 
 # Orchestration --------------------------------------------------------
 
-def _split_filter(s: Optional[str]) -> Optional[List[str]]:
-    if not s:
-        return None
-    return [p.strip() for p in s.split(',') if p.strip()]
+def _with_async_introspection(src_conn, src_info: Dict, db_name: str, schemas: List[str], pool_size: int):
+    """Load PostgreSQL metadata with async queries; falls back to the synchronous connection."""
+    if src_info['connection_type'] != 'PostgreSQL' or not async_introspection.is_available():
+        logger.info("Async introspection not available for this source, using synchronous queries")
+        return src_conn
+    introspector = AsyncPostgresIntrospector(src_conn, src_info, db_name, pool_size)
+    try:
+        introspector.load(schemas)
+    except Exception as e:
+        logger.warning(f"Async introspection failed for {db_name}, using synchronous queries: {e}")
+    return introspector
 
 
 def run_catalog(connection_id: int,
                 db_filter: Optional[str] = None,
                 schema_filter: Optional[str] = None,
                 table_filter: Optional[str] = None,
-                include_views: bool = False) -> int:
+                include_views: bool = False,
+                batch_size: int = DEFAULT_NODE_BATCH_SIZE,
+                async_pool_size: Optional[int] = None) -> int:
     catalog_conn = get_catalog_connection()
     src_info = _build_conn_info_from_config(connection_id)
 
@@ -375,15 +435,15 @@ def run_catalog(connection_id: int,
         cur.execute("UPDATE catalog.catalog_runs SET log_filename = %s WHERE id = %s", (rel_log, run_id))
     catalog_conn.commit()
 
-    created = 0
-    updated = 0
+    writer = BulkNodeWriter(catalog_conn, run_id, batch_size=batch_size)
     total_objects = 0
 
     try:
         # Discover databases to process
         dbs: List[str]
         dbs = get_databases_on_server(src_info)
-        dbs_f = _split_filter(db_filter)
+        present_dbs = list(dbs)
+        dbs_f = split_filter(db_filter)
         if dbs_f:
             dbs = [d for d in dbs if d in dbs_f]
 
@@ -400,51 +460,58 @@ def run_catalog(connection_id: int,
             try:
                 with catalog_conn.cursor() as cur:
                     db_node_id = upsert_database(cur, src_info['host'], db_name, run_id)
-                catalog_conn.commit()
                 total_objects += 1
 
                 # Schemas
                 schemas = get_schemas_in_database(src_conn, src_info['connection_type'])
-                sch_f = _split_filter(schema_filter)
+                sch_f = split_filter(schema_filter)
                 if sch_f:
                     schemas = [s for s in schemas if s in sch_f]
+                if async_pool_size:
+                    src_conn = _with_async_introspection(src_conn, src_info, db_name, schemas, async_pool_size)
 
+                tbl_f = split_filter(table_filter)
                 for schema in schemas:
                     with catalog_conn.cursor() as cur:
                         schema_node_id = upsert_schema(cur, src_info['host'], db_node_id, db_name, schema, run_id)
-                    catalog_conn.commit()
                     total_objects += 1
 
-                    # Tables/views
+                    # Tables/views: one bulk write per schema
                     tables = get_tables_in_schema(src_conn, src_info['connection_type'], schema, include_views)
-                    tbl_f = _split_filter(table_filter)
                     if tbl_f:
                         tables = [t for t in tables if t['table_name'] in tbl_f]
 
+                    prefix = f"{src_info['host']}/{db_name}.{schema}"
+                    for t in tables:
+                        is_table = t['table_type'] == 'TABLE'
+                        writer.add(
+                            'DB_TABLE' if is_table else 'DB_VIEW',
+                            t['table_name'],
+                            f"{prefix}.{t['table_name']}",
+                            'catalog.node_table',
+                            (schema_node_id, t['table_name'], 'TABLE' if is_table else 'VIEW')
+                        )
+                    table_node_ids = writer.flush()
+                    total_objects += len(tables)
+
+                    # Columns: buffered, written per batch_size and at the end of the schema
                     for t in tables:
                         table_name = t['table_name']
-                        table_type = t['table_type']
-                        with catalog_conn.cursor() as cur:
-                            table_node_id = upsert_table(
-                                cur,
-                                src_info['host'],
-                                db_name,
-                                schema_node_id,
-                                schema,
-                                table_name,
-                                table_type,
-                                run_id
-                            )
-                        catalog_conn.commit()
-                        total_objects += 1
-
-                        # Columns
+                        table_node_id = table_node_ids[f"{prefix}.{table_name}"]
                         columns = get_columns_for_table(src_conn, src_info['connection_type'], schema, table_name)
                         for col in columns:
-                            with catalog_conn.cursor() as cur:
-                                upsert_column(cur, src_info['host'], db_name, schema, table_node_id, table_name, col, run_id)
-                            catalog_conn.commit()
-                            total_objects += 1
+                            writer.add(
+                                'DB_COLUMN',
+                                col['column_name'],
+                                f"{prefix}.{table_name}.{col['column_name']}",
+                                'catalog.node_column',
+                                (table_node_id, col['column_name'], col.get('data_type'), bool(col.get('is_nullable')))
+                            )
+                        total_objects += len(columns)
+                        if len(writer) >= batch_size:
+                            writer.flush()
+
+                    writer.flush(commit=True)
 
             finally:
                 try:
@@ -452,9 +519,24 @@ def run_catalog(connection_id: int,
                 except Exception:
                     pass
 
-        complete_catalog_run(catalog_conn, run_id, created, updated, total_objects)
+        # Mark everything in scope that was not seen in this run as deleted
+        with catalog_conn.cursor() as cur:
+            deleted = sweep_deleted_nodes(
+                cur,
+                run_id,
+                src_info['host'],
+                present_databases=None if dbs_f else present_dbs,
+                schema_filter=split_filter(schema_filter),
+                table_filter=split_filter(table_filter),
+                include_views=include_views,
+            )
+        nodes_deleted = sum(deleted.values())
+        logger.info(f"Soft-deleted nodes: {deleted}")
+
+        # Database and schema nodes are written one by one and not counted in created/updated
+        complete_catalog_run(catalog_conn, run_id, writer.created, writer.updated, total_objects, nodes_deleted)
         catalog_conn.commit()
-        logger.info(f"Catalog run {run_id} completed. Objects processed: {total_objects}")
+        logger.info(f"Catalog run {run_id} completed. Objects processed: {total_objects}, deleted: {nodes_deleted}")
         return run_id
 
     except Exception as e:
@@ -480,6 +562,10 @@ if __name__ == '__main__':
     p.add_argument('--schema-filter', type=str, help='Comma-separated schema names')
     p.add_argument('--table-filter', type=str, help='Comma-separated table names')
     p.add_argument('--include-views', action='store_true', help='Include views')
+    p.add_argument('--batch-size', type=int, default=DEFAULT_NODE_BATCH_SIZE, help='Nodes written per commit')
+    p.add_argument('--async-introspection', type=int, nargs='?', const=async_introspection.DEFAULT_POOL_SIZE,
+                   metavar='POOL_SIZE', help='Introspect PostgreSQL sources with concurrent asyncpg queries')
     args = p.parse_args()
 
-    run_catalog(args.connection_id, args.db_filter, args.schema_filter, args.table_filter, args.include_views)
+    run_catalog(args.connection_id, args.db_filter, args.schema_filter, args.table_filter, args.include_views,
+                batch_size=args.batch_size, async_pool_size=args.async_introspection)
@@ -0,0 +1,249 @@
+import logging
+from typing import Any, Dict, Iterator, List, Optional
+from dotenv import load_dotenv
+
+from data_catalog.connection_handler import get_catalog_connection, fetch_dl_details
+from data_catalog.cataloger_base import DEFAULT_BATCH_SIZE, Cataloger, NodeRecord, Record, split_filter, sweep_node_type
+from data_catalog import dl_storage
+from data_catalog.dl_storage import ArrowStorageBackend
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+# Helpers -------------------------------------------------------------
+
+def build_backend(connection_id: int, include_hidden: bool = False, local_root: Optional[str] = None) -> ArrowStorageBackend:
+    """Storage backend from config.dl_connection_details; local_root overrides it with a local folder."""
+    if local_root:
+        return dl_storage.local_backend(local_root, include_hidden=include_hidden)
+    d = fetch_dl_details(connection_id, with_secret=True)
+    if not d:
+        raise ValueError(f"No DL connection details for connection_id={connection_id}")
+    storage_type = (d.get('storage_type') or '').upper()
+    if storage_type == 'LOCAL':
+        return dl_storage.local_backend(d.get('base_path') or d.get('endpoint_url'),
+                                        container_name=d.get('bucket_or_container'),
+                                        include_hidden=include_hidden)
+    raise ValueError(f"Unsupported storage_type: {storage_type} (only LOCAL is implemented)")
+
+
+def load_dl_catalog_config(catalog_conn, config_id: int) -> Dict[str, Any]:
+    with catalog_conn.cursor() as cur:
+        cur.execute(
+            """
+            SELECT path_filter, format_whitelist, include_hidden_files, infer_schema
+            FROM config.dl_catalog_config
+            WHERE id = %s AND deleted_at IS NULL
+            """,
+            (config_id,)
+        )
+        row = cur.fetchone()
+    if not row:
+        raise ValueError(f"No DL catalog config with id={config_id}")
+    return {'path_filter': row[0], 'format_whitelist': row[1], 'include_hidden': row[2], 'infer_schema': row[3]}
+
+
+def glob_to_like(pattern: str) -> str:
+    """Translate a path glob (* and ?) to a LIKE pattern."""
+    escaped = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return escaped.replace('*', '%').replace('?', '_')
+
+
+# Qualified names ------------------------------------------------------
+#
+# dl/<account>/<container>               DL_CONTAINER
+# dl/<account>/<container>/<folder>/     DL_FOLDER (root folder: dl/<account>/<container>/)
+# dl/<account>/<container>/<path>        DL_FILE
+# dl/<account>/<container>/<path>[col]   DL_COLUMN
+
+def container_qn(backend: ArrowStorageBackend) -> str:
+    return f"dl/{backend.account_name}/{backend.container_name}"
+
+
+def folder_qn(backend: ArrowStorageBackend, folder_path: str) -> str:
+    return f"{container_qn(backend)}/{folder_path}/" if folder_path else f"{container_qn(backend)}/"
+
+
+def file_qn(backend: ArrowStorageBackend, path: str) -> str:
+    return f"{container_qn(backend)}/{path}"
+
+
+# Records ----------------------------------------------------------------
+
+def folder_record(backend: ArrowStorageBackend, folder_path: str) -> NodeRecord:
+    folder_name = folder_path.rsplit('/', 1)[-1] if folder_path else '/'
+    partition = dl_storage.hive_partition(folder_name)
+    props = {'partition': {partition[0]: partition[1]}} if partition else {}
+    return NodeRecord('DL_FOLDER', folder_name, folder_qn(backend, folder_path), 'catalog.node_dl_folder',
+                      {'folder_path': folder_path, 'props': props},
+                      parent=('DL_CONTAINER', container_qn(backend)), parent_column='container_node_id', props=props)
+
+
+def file_records(backend: ArrowStorageBackend, files: List[Dict[str, Any]], infer_schema: bool,
+                 workers: int) -> Iterator[NodeRecord]:
+    """Sample a batch of files; yields the file records first, then their columns."""
+    if infer_schema:
+        sampled = dl_storage.sample_files(backend, files, workers)
+    else:
+        sampled = [(entry, {}) for entry in files]
+
+    for entry, sample in sampled:
+        props = {
+            'compression': entry['compression'],
+            'modified_at': entry['modified_at'],
+        }
+        props.update({key: value for key, value in sample.items() if key != 'columns'})
+        if 'columns' in sample:
+            props['num_columns'] = len(sample['columns'])
+        yield NodeRecord('DL_FILE', entry['file_name'], file_qn(backend, entry['path']), 'catalog.node_dl_file',
+                         {'file_name': entry['file_name'], 'file_format': entry['file_format'],
+                          'size_bytes': entry['size_bytes'], 'props': props},
+                         parent=('DL_FOLDER', folder_qn(backend, entry['folder_path'])), parent_column='folder_node_id',
+                         props=props)
+
+    for entry, sample in sampled:
+        qn = file_qn(backend, entry['path'])
+        for column in sample.get('columns', []):
+            yield NodeRecord('DL_COLUMN', column['column_name'], f"{qn}[{column['column_name']}]", 'catalog.node_column',
+                             {'column_name': column['column_name'], 'data_type': column['data_type'],
+                              'is_nullable': column['is_nullable']},
+                             parent=('DL_FILE', qn), parent_column='table_node_id')
+
+
+def sweep_deleted_dl_nodes(cur, run_id: int, backend: ArrowStorageBackend,
+                           path_patterns: Optional[List[str]] = None,
+                           formats: Optional[List[str]] = None,
+                           infer_schema: bool = True) -> Dict[str, int]:
+    """
+    End-of-run sweep for the container, parents before children.
+
+    Folders are only swept when the whole container was in scope; files only within the
+    path/format filters; columns only when schemas were sampled in this run.
+    """
+    deleted: Dict[str, int] = {}
+    if not path_patterns:
+        deleted['DL_FOLDER'] = sweep_node_type(cur, run_id, 'DL_FOLDER')
+
+    extra_where, extra_params = '', ()
+    if formats:
+        extra_where += ' AND d.file_format = ANY(%s)'
+        extra_params += (list(formats),)
+    if path_patterns:
+        extra_where += ' AND n.qualified_name LIKE ANY(%s)'
+        extra_params += ([glob_to_like(f"{container_qn(backend)}/{p}") for p in path_patterns],)
+    deleted['DL_FILE'] = sweep_node_type(cur, run_id, 'DL_FILE', extra_where, extra_params)
+
+    if infer_schema:
+        deleted['DL_COLUMN'] = sweep_node_type(cur, run_id, 'DL_COLUMN')
+    return deleted
+
+
+# Orchestration --------------------------------------------------------
+
+class DataLakeCataloger(Cataloger):
+    """Lists one container and writes its folders, files and (sampled) file columns as nodes."""
+
+    run_type = 'DL_CATALOG'
+    log_subdir = 'data_lake'
+    log_prefix = 'dl_catalog'
+
+    def __init__(self, connection_id: int, backend: ArrowStorageBackend,
+                 path_patterns: Optional[List[str]] = None,
+                 formats: Optional[List[str]] = None,
+                 infer_schema: bool = True,
+                 config_id: Optional[int] = None,
+                 workers: int = dl_storage.DEFAULT_LIST_WORKERS,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        super().__init__(connection_id, batch_size=batch_size)
+        self.backend = backend
+        self.path_patterns = path_patterns
+        self.formats = formats
+        self.infer_schema = infer_schema
+        self.config_id = config_id
+        self.workers = workers
+
+    def context(self) -> Dict[str, Any]:
+        return {
+            'source_label': container_qn(self.backend),
+            'storage_type': self.backend.storage_type,
+            'root': self.backend.root,
+            'config_id': self.config_id,
+            'path_filter': self.path_patterns,
+            'format_whitelist': self.formats,
+            'include_hidden': self.backend.include_hidden,
+            'infer_schema': self.infer_schema,
+        }
+
+    def extract(self) -> Iterator[Record]:
+        backend = self.backend
+        container_props = {'storage_type': backend.storage_type, 'root': backend.root}
+        yield NodeRecord('DL_CONTAINER', backend.container_name, container_qn(backend), 'catalog.node_dl_container',
+                         {'account_name': backend.account_name, 'container_name': backend.container_name,
+                          'props': container_props},
+                         props=container_props)
+
+        # Listing runs ahead in the pool; files are sampled per batch
+        pending_files: List[Dict[str, Any]] = []
+        folders = 0
+        for folder_path, _, files in dl_storage.walk_storage(backend, self.workers):
+            yield folder_record(backend, folder_path)
+            folders += 1
+            pending_files.extend(f for f in files if dl_storage.matches_filters(f, self.path_patterns, self.formats))
+            if len(pending_files) >= self.batch_size:
+                yield from file_records(backend, pending_files, self.infer_schema, self.workers)
+                pending_files = []
+        yield from file_records(backend, pending_files, self.infer_schema, self.workers)
+        logger.info(f"Listed {folders} folders of {container_qn(backend)}")
+
+    def sweep(self, cur, run_id: int) -> Dict[str, int]:
+        return sweep_deleted_dl_nodes(cur, run_id, self.backend, self.path_patterns, self.formats, self.infer_schema)
+
+
+def run_catalog(connection_id: int,
+                config_id: Optional[int] = None,
+                path_filter: Optional[str] = None,
+                format_whitelist: Optional[str] = None,
+                include_hidden: Optional[bool] = None,
+                infer_schema: Optional[bool] = None,
+                local_root: Optional[str] = None,
+                workers: int = dl_storage.DEFAULT_LIST_WORKERS,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    # Explicit arguments win over the DL catalog config
+    config = {}
+    if config_id:
+        catalog_conn = get_catalog_connection()
+        try:
+            config = load_dl_catalog_config(catalog_conn, config_id)
+        finally:
+            catalog_conn.close()
+    path_patterns = split_filter(path_filter or config.get('path_filter'))
+    formats = split_filter(format_whitelist or config.get('format_whitelist'))
+    formats = [f.lower().lstrip('.') for f in formats] if formats else None
+    include_hidden = bool(config.get('include_hidden')) if include_hidden is None else include_hidden
+    infer_schema = config.get('infer_schema', True) if infer_schema is None else infer_schema
+
+    backend = build_backend(connection_id, include_hidden=include_hidden, local_root=local_root)
+    return DataLakeCataloger(connection_id, backend, path_patterns, formats, infer_schema,
+                             config_id=config_id, workers=workers, batch_size=batch_size).run()
+
+
+if __name__ == '__main__':
+    import argparse
+    p = argparse.ArgumentParser(description='Data lake cataloger (nodes-based)')
+    p.add_argument('--connection-id', type=int, required=True, help='config.connections.id to use')
+    p.add_argument('--config-id', type=int, help='config.dl_catalog_config.id with filters and options')
+    p.add_argument('--path-filter', type=str, help='Comma-separated path globs relative to the container')
+    p.add_argument('--format-whitelist', type=str, help='Comma-separated file formats (e.g. parquet,csv)')
+    p.add_argument('--include-hidden', action='store_true', default=None,
+                   help='Include files and folders starting with . or _')
+    p.add_argument('--no-infer-schema', dest='infer_schema', action='store_false', default=None,
+                   help='Do not read Parquet footers / CSV headers')
+    p.add_argument('--local-root', type=str, help='Catalog this local folder instead of the connection storage')
+    p.add_argument('--workers', type=int, default=dl_storage.DEFAULT_LIST_WORKERS,
+                   help='Concurrent folder listings and file samples')
+    p.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Nodes written per commit')
+    args = p.parse_args()
+
+    run_catalog(args.connection_id, args.config_id, args.path_filter, args.format_whitelist,
+                include_hidden=args.include_hidden, infer_schema=args.infer_schema, local_root=args.local_root,
+                workers=args.workers, batch_size=args.batch_size)
@@ -0,0 +1,198 @@
+import fnmatch
+import logging
+import os
+import socket
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.fs as pa_fs
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIST_WORKERS = 8
+
+# CSV files have no footer: the schema is inferred from the first block only
+CSV_SAMPLE_BYTES = 256 * 1024
+
+FILE_FORMATS = {
+    '.parquet': 'parquet',
+    '.parq': 'parquet',
+    '.csv': 'csv',
+    '.tsv': 'csv',
+    '.json': 'json',
+    '.jsonl': 'json',
+    '.ndjson': 'json',
+    '.avro': 'avro',
+    '.orc': 'orc',
+    '.xlsx': 'excel',
+}
+COMPRESSION_SUFFIXES = {'.gz': 'gzip', '.bz2': 'bz2', '.zst': 'zstd', '.lz4': 'lz4'}
+
+# Same convention as Spark and pyarrow datasets: _SUCCESS, _delta_log, .crc files etc. are not data
+HIDDEN_PREFIXES = ('.', '_')
+
+
+def detect_file_format(file_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return (file_format, compression) from the file extension, e.g. sales.csv.gz -> ('csv', 'gzip')."""
+    stem, ext = os.path.splitext(file_name.lower())
+    compression = COMPRESSION_SUFFIXES.get(ext)
+    if compression:
+        stem, ext = os.path.splitext(stem)
+    return FILE_FORMATS.get(ext, ext.lstrip('.') or None), compression
+
+
+def hive_partition(folder_name: str) -> Optional[Tuple[str, str]]:
+    """Return (key, value) for a Hive-style partition folder such as year=2024."""
+    key, sep, value = folder_name.partition('=')
+    return (key, value) if sep and key else None
+
+
+class ArrowStorageBackend:
+    """
+    Storage hierarchy on top of a pyarrow filesystem.
+
+    root is the folder that maps to the catalog container; all paths handed out are
+    relative to it and use '/'. Only the local filesystem is wired up so far, but the
+    listing and sampling code only uses the pyarrow.fs interface.
+    """
+
+    def __init__(self, filesystem: pa_fs.FileSystem, root: str, storage_type: str, account_name: str,
+                 container_name: str, include_hidden: bool = False):
+        self.filesystem = filesystem
+        self.root = root.replace('\\', '/').rstrip('/')
+        self.storage_type = storage_type
+        self.account_name = account_name
+        self.container_name = container_name
+        self.include_hidden = include_hidden
+
+    def abs_path(self, path: str) -> str:
+        return f"{self.root}/{path}" if path else self.root
+
+    def list_folder(self, folder_path: str) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """List one folder (not recursive); returns (subfolder paths, file entries)."""
+        folders, files = [], []
+        selector = pa_fs.FileSelector(self.abs_path(folder_path), recursive=False)
+        for info in self.filesystem.get_file_info(selector):
+            if not self.include_hidden and info.base_name.startswith(HIDDEN_PREFIXES):
+                continue
+            path = f"{folder_path}/{info.base_name}" if folder_path else info.base_name
+            if info.type == pa_fs.FileType.Directory:
+                folders.append(path)
+            elif info.type == pa_fs.FileType.File:
+                file_format, compression = detect_file_format(info.base_name)
+                files.append({
+                    'path': path,
+                    'folder_path': folder_path,
+                    'file_name': info.base_name,
+                    'file_format': file_format,
+                    'compression': compression,
+                    'size_bytes': info.size,
+                    'modified_at': info.mtime.isoformat() if info.mtime else None,
+                })
+        return sorted(folders), sorted(files, key=lambda f: f['file_name'])
+
+
+def local_backend(root: str, container_name: Optional[str] = None, include_hidden: bool = False) -> ArrowStorageBackend:
+    """Backend over a local (or mounted) directory; the host name is used as account name."""
+    root = os.path.abspath(root)
+    if not os.path.isdir(root):
+        raise ValueError(f"Local data lake root not found: {root}")
+    return ArrowStorageBackend(
+        pa_fs.LocalFileSystem(), root, 'LOCAL', socket.gethostname(),
+        container_name or os.path.basename(root.rstrip(os.sep)), include_hidden=include_hidden
+    )
+
+
+def matches_filters(entry: Dict[str, Any], path_patterns: Optional[List[str]] = None,
+                    formats: Optional[List[str]] = None) -> bool:
+    """path_patterns are globs on the path relative to the container (e.g. sales/*.parquet)."""
+    if formats and entry['file_format'] not in formats:
+        return False
+    return not path_patterns or any(fnmatch.fnmatchcase(entry['path'], p) for p in path_patterns)
+
+
+# Concurrent listing ---------------------------------------------------
+
+def walk_storage(backend: ArrowStorageBackend,
+                 workers: int = DEFAULT_LIST_WORKERS) -> Iterator[Tuple[str, List[str], List[Dict[str, Any]]]]:
+    """
+    Yield (folder_path, subfolders, files) for every folder, starting at the container root ('').
+
+    Folders are listed by at most `workers` threads; subfolders are submitted as soon as their
+    parent is listed, so the order is by completion, not depth-first.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix='dl-list') as pool:
+        pending = {pool.submit(backend.list_folder, ''): ''}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                folder_path = pending.pop(future)
+                subfolders, files = future.result()
+                for subfolder in subfolders:
+                    pending[pool.submit(backend.list_folder, subfolder)] = subfolder
+                yield folder_path, subfolders, files
+
+
+# Header/footer sampling -----------------------------------------------
+
+def _schema_columns(schema: pa.Schema) -> List[Dict[str, Any]]:
+    return [
+        {'column_name': field.name, 'data_type': str(field.type), 'is_nullable': field.nullable}
+        for field in schema
+    ]
+
+
+def _sample_parquet(backend: ArrowStorageBackend, entry: Dict[str, Any]) -> Dict[str, Any]:
+    # ParquetFile only reads the footer; row groups are never fetched
+    with backend.filesystem.open_input_file(backend.abs_path(entry['path'])) as f:
+        metadata = pq.ParquetFile(f).metadata
+        schema = metadata.schema.to_arrow_schema()
+    return {
+        'columns': _schema_columns(schema),
+        'row_count': metadata.num_rows,
+        'row_count_exact': True,
+        'num_row_groups': metadata.num_row_groups,
+        'created_by': metadata.created_by,
+    }
+
+
+def _sample_csv(backend: ArrowStorageBackend, entry: Dict[str, Any]) -> Dict[str, Any]:
+    with backend.filesystem.open_input_stream(backend.abs_path(entry['path']), compression=entry['compression']) as f:
+        head = f.read(CSV_SAMPLE_BYTES)
+    complete = len(head) < CSV_SAMPLE_BYTES
+    if not complete:
+        head = head[:head.rfind(b'\n') + 1]  # drop the partial last line
+
+    delimiter = '\t' if entry['file_name'].lower().endswith(('.tsv', '.tsv.gz')) else ','
+    table = pa_csv.read_csv(pa.BufferReader(head), parse_options=pa_csv.ParseOptions(delimiter=delimiter))
+    sample = {'columns': _schema_columns(table.schema), 'sampled_rows': table.num_rows}
+    if complete:
+        sample.update(row_count=table.num_rows, row_count_exact=True)
+    elif entry['compression'] is None and table.num_rows:
+        # Estimate from the average row size of the sample
+        sample.update(row_count=round(entry['size_bytes'] * table.num_rows / len(head)), row_count_exact=False)
+    return sample
+
+
+def sample_file(backend: ArrowStorageBackend, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema and row count of a Parquet (footer) or CSV (first block) file; {} for other formats."""
+    try:
+        if entry['file_format'] == 'parquet':
+            return _sample_parquet(backend, entry)
+        if entry['file_format'] == 'csv':
+            return _sample_csv(backend, entry)
+    except Exception as e:
+        logger.warning(f"Could not sample {entry['path']}: {e}")
+        return {'sample_error': str(e)}
+    return {}
+
+
+def sample_files(backend: ArrowStorageBackend, entries: Iterable[Dict[str, Any]],
+                 workers: int = DEFAULT_LIST_WORKERS) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Sample files with at most `workers` concurrent reads; returns [(entry, sample)] in input order."""
+    entries = list(entries)
+    with ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix='dl-sample') as pool:
+        return list(zip(entries, pool.map(lambda entry: sample_file(backend, entry), entries)))
@@ -1,21 +1,31 @@
 import psycopg2
 import psycopg2.extras
+import hashlib
+import io
 import json
+import itertools
 import logging
+import operator
+import queue
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 import datetime
 import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
 from dotenv import load_dotenv
 
+from data_catalog import connection_handler
 from data_catalog.connection_handler import (
     get_main_connector_by_name,
-    get_catalog_config_by_main_connector_id,
     connect_to_source_database,
     get_databases_on_server,
     get_catalog_connection,
-    get_catalog_config_by_id
 )
+from data_catalog import async_introspection
+from data_catalog.async_introspection import AsyncPostgresIntrospector
 
 # Load environment variables
 load_dotenv()
@@ -39,7 +49,8 @@ def load_connection_and_config(name_or_host):
     Returned tuple: (main_conn_info, catalog_config) of (dict, dict|None)
     """
     main_conn_info = get_main_connector_by_name(name_or_host)
-    catalog_config = get_catalog_config_by_main_connector_id(main_conn_info['id'])
+    # Resolved at call time: connection_handler does not provide the catalog config lookups (yet)
+    catalog_config = connection_handler.get_catalog_config_by_main_connector_id(main_conn_info['id'])
     return main_conn_info, catalog_config
 
 
@@ -89,6 +100,105 @@ def get_summary_template():
     }
 
 
+# Parallel run support ------------------------------------------------------
+
+DEFAULT_MAX_SOURCE_CONNECTIONS_PER_HOST = 4
+
+
+class WorkerProgress(dict):
+    """Progress dict of one worker; update_run_progress() reports the run-wide totals instead."""
+
+    def __init__(self, run_state):
+        super().__init__(initialize_progress())
+        self.run_state = run_state
+
+
+class ParallelRunState:
+    """Thread-safe aggregation of summary and progress for databases cataloged concurrently."""
+
+    def __init__(self, summary, progress):
+        self.summary = summary
+        self.progress = progress
+        self._lock = threading.Lock()
+        self._worker_progress = []
+
+    def new_worker_progress(self):
+        worker_progress = WorkerProgress(self)
+        with self._lock:
+            self._worker_progress.append(worker_progress)
+        return worker_progress
+
+    def merge_summary(self, worker_summary):
+        with self._lock:
+            update_summary(self.summary, worker_summary)
+
+    def progress_totals(self):
+        # Every worker only mutates its own dict, so summing them never loses increments
+        with self._lock:
+            worker_progress = list(self._worker_progress)
+        totals = initialize_progress()
+        for wp in worker_progress:
+            for key in totals:
+                totals[key] += wp.get(key, 0)
+        return totals
+
+
+class SourceConnectionLimiter:
+    """Caps the number of concurrently open source connections per host."""
+
+    def __init__(self, max_per_host=DEFAULT_MAX_SOURCE_CONNECTIONS_PER_HOST):
+        self.max_per_host = max(1, int(max_per_host))
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    @contextmanager
+    def slot(self, host):
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            yield
+
+
+def catalog_database_task(
+    connection_info,
+    database_name,
+    catalog_run_id,
+    summary,
+    progress,
+    limiter=None,
+    **catalog_options
+):
+    """Connect to one source database and catalog it; returns False when it failed."""
+    try:
+        logger.info(f"Starting cataloging for database: {database_name}")
+
+        db_connection_info = connection_info.copy()
+        db_connection_info['database_name'] = database_name
+
+        with limiter.slot(connection_info['host']) if limiter else nullcontext():
+            source_conn = connect_to_source_database(db_connection_info, database_name)
+            if not source_conn:
+                logger.error(f"Failed to connect to source database: {database_name}")
+                summary['databases_deleted'] += 1
+                return False
+
+            # Closes source_conn and commits its own catalog transaction
+            catalog_single_database(
+                source_conn,
+                db_connection_info,
+                catalog_run_id,
+                summary=summary,
+                progress=progress,
+                **catalog_options
+            )
+        return True
+
+    except Exception as e:
+        logger.error(f"Failed to catalog database {database_name}: {e}")
+        summary['databases_deleted'] += 1
+        return False
+
+
 def catalog_multiple_databases(
     connection_info,
     databases_to_catalog,
@@ -96,11 +206,37 @@ def catalog_multiple_databases(
     table_filter=None,
     catalog_config_id=None,
     include_views=False,
-    include_system_objects=False
+    include_system_objects=False,
+    bulk_extract=False,
+    staged_diff=False,
+    force_full=False,
+    collect_row_counts=False,
+    pipelined=False,
+    async_introspection_pool_size=None,
+    workers=1,
+    max_source_connections_per_host=DEFAULT_MAX_SOURCE_CONNECTIONS_PER_HOST
 ):
-    """Catalog multiple databases for a given connection."""
+    """
+    Catalog multiple databases for a given connection.
+
+    With workers > 1 the databases are cataloged concurrently in a thread pool under
+    the same run id. Each database keeps its own catalog transaction, and the number
+    of open source connections per host is capped by max_source_connections_per_host.
+    """
     summary = get_summary_template()  # Initialize summary for the entire run
     progress = initialize_progress()  # Initialize progress for the entire run
+    catalog_options = dict(
+        schema_filter=schema_filter,
+        table_filter=table_filter,
+        include_views=include_views,
+        include_system_objects=include_system_objects,
+        bulk_extract=bulk_extract,
+        staged_diff=staged_diff,
+        force_full=force_full,
+        collect_row_counts=collect_row_counts,
+        pipelined=pipelined,
+        async_introspection_pool_size=async_introspection_pool_size
+    )
 
     try:
         catalog_conn = get_catalog_connection()
@@ -113,53 +249,84 @@ def catalog_multiple_databases(
         catalog_conn.commit()
 
         setup_logging_with_run_id(catalog_run_id)
+        start_progress_reporter(
+            catalog_conn, catalog_run_id, connection_info,
+            catalog_config_id=catalog_config_id,
+            expected_databases=len(databases_to_catalog)
+        )
 
-        for database_name in databases_to_catalog:
-            try:
-                logger.info(f"Starting cataloging for database: {database_name}")
-
-                db_connection_info = connection_info.copy()
-                db_connection_info['database_name'] = database_name
-
-                source_conn = connect_to_source_database(db_connection_info, database_name)
-                if not source_conn:
-                    logger.error(f"Failed to connect to source database: {database_name}")
-                    summary['databases_deleted'] += 1
-                    continue
-
-                catalog_single_database(
-                    source_conn,
-                    db_connection_info,
-                    catalog_run_id,
-                    schema_filter=schema_filter,
-                    table_filter=table_filter,
-                    summary=summary,
-                    progress=progress,
-                    include_views=include_views,
-                    include_system_objects=include_system_objects
+        if workers and workers > 1 and len(databases_to_catalog) > 1:
+            catalog_databases_parallel(
+                catalog_conn, connection_info, databases_to_catalog, catalog_run_id,
+                summary, progress, workers, max_source_connections_per_host, catalog_options
+            )
+        else:
+            for database_name in databases_to_catalog:
+                catalog_database_task(
+                    connection_info, database_name, catalog_run_id, summary, progress, **catalog_options
                 )
 
-                update_run_progress(catalog_conn, catalog_run_id, progress)
-
-            except Exception as e:
-                logger.error(f"Failed to catalog database {database_name}: {e}")
-                summary['databases_deleted'] += 1
-
         logger.info(f"Completed cataloging for all databases in connection {connection_info['name']}")
 
+        update_run_progress(catalog_conn, catalog_run_id, progress, force=True)
         complete_catalog_run(catalog_conn, catalog_run_id, summary)
         catalog_conn.commit()
 
     except Exception as e:
         logger.error(f"Failed to complete catalog run: {e}")
+        update_run_progress(catalog_conn, catalog_run_id, progress, force=True)
         fail_catalog_run(catalog_conn, catalog_run_id, str(e))
         catalog_conn.rollback()
     finally:
+        stop_progress_reporter(catalog_run_id)
         catalog_conn.close()
 
     return summary
 
 
+def catalog_databases_parallel(
+    catalog_conn, connection_info, databases_to_catalog, catalog_run_id,
+    summary, progress, workers, max_source_connections_per_host, catalog_options
+):
+    """Run catalog_database_task for all databases in a bounded thread pool."""
+    run_state = ParallelRunState(summary, progress)
+    limiter = SourceConnectionLimiter(max_source_connections_per_host)
+    workers = min(workers, len(databases_to_catalog))
+    logger.info(
+        f"Cataloging {len(databases_to_catalog)} databases with {workers} workers "
+        f"(max {limiter.max_per_host} source connections per host)"
+    )
+
+    def run(database_name):
+        worker_summary = get_summary_template()
+        worker_progress = run_state.new_worker_progress()
+        try:
+            return catalog_database_task(
+                connection_info, database_name, catalog_run_id,
+                worker_summary, worker_progress, limiter=limiter, **catalog_options
+            )
+        finally:
+            run_state.merge_summary(worker_summary)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dw-catalog') as executor:
+        futures = {executor.submit(run, database_name): database_name for database_name in databases_to_catalog}
+        for future in as_completed(futures):
+            database_name = futures[future]
+            try:
+                ok = future.result()
+            except Exception as e:  # catalog_database_task already logs; this guards the pool itself
+                ok = False
+                logger.error(f"Worker for database {database_name} crashed: {e}")
+            logger.info(f"Finished database {database_name} ({'ok' if ok else 'failed'})")
+
+            # The main thread's catalog connection is only used from this thread
+            progress.update(run_state.progress_totals())
+            update_run_progress(catalog_conn, catalog_run_id, progress, force=True)
+
+    progress.update(run_state.progress_totals())
+    return summary
+
+
 def setup_logging_with_run_id(catalog_run_id=None):
     """Setup logging with optional run ID in filename"""
     # Clear any existing handlers first
@@ -211,6 +378,39 @@ def main():
         '--catalog-config-id', type=int, required=True,
         help='ID van de catalogusconfiguratie met filters'
     )
+    parser.add_argument(
+        '--bulk-extract', action='store_true',
+        help='Lees schema-, tabel- en kolommetadata per database in enkele set-based queries'
+    )
+    parser.add_argument(
+        '--staged-diff', action='store_true',
+        help='Laad de snapshot in staging-tabellen en bepaal wijzigingen met set-based SQL'
+    )
+    parser.add_argument(
+        '--force-full', action='store_true',
+        help='Catalogiseer alle schema\'s volledig, ook als de DDL-fingerprint ongewijzigd is'
+    )
+    parser.add_argument(
+        '--row-counts', action='store_true',
+        help='Verzamel geschatte rijaantallen van alle tabellen (één query per database)'
+    )
+    parser.add_argument(
+        '--pipelined', action='store_true',
+        help='Lees de bron in een aparte thread terwijl de catalogus wordt geschreven'
+    )
+    parser.add_argument(
+        '--async-introspection', type=int, nargs='?', const=async_introspection.DEFAULT_POOL_SIZE,
+        metavar='POOL_SIZE',
+        help='Lees PostgreSQL-metadata met gelijktijdige asyncpg-queries (optioneel de poolgrootte)'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Aantal databases dat parallel gecatalogiseerd wordt (standaard 1 = sequentieel)'
+    )
+    parser.add_argument(
+        '--max-connections-per-host', type=int, default=DEFAULT_MAX_SOURCE_CONNECTIONS_PER_HOST,
+        help='Maximaal aantal gelijktijdige bronconnecties per host'
+    )
     args = parser.parse_args()
 
     logger.info("Starting catalog extraction process")
@@ -224,7 +424,7 @@ def main():
 
     # Haal de catalogusconfiguratie op
     with get_catalog_connection() as catalog_conn:
-        catalog_config = get_catalog_config_by_id(catalog_conn, args.catalog_config_id)
+        catalog_config = connection_handler.get_catalog_config_by_id(catalog_conn, args.catalog_config_id)
     if not catalog_config:
         logger.error(f"Geen catalog configuratie gevonden voor id {args.catalog_config_id}")
         return
@@ -253,7 +453,15 @@ def main():
         table_filter=table_filter,
         catalog_config_id=args.catalog_config_id,
         include_views=catalog_config.get('include_views', False),
-        include_system_objects=catalog_config.get('include_system_objects', False)
+        include_system_objects=catalog_config.get('include_system_objects', False),
+        bulk_extract=args.bulk_extract,
+        staged_diff=args.staged_diff,
+        force_full=args.force_full,
+        collect_row_counts=args.row_counts,
+        pipelined=args.pipelined,
+        async_introspection_pool_size=args.async_introspection,
+        workers=args.workers,
+        max_source_connections_per_host=args.max_connections_per_host
     )
 
     log_final_summary(summary, schema_filter, table_filter)
@@ -545,9 +753,24 @@ def catalog_single_database(
     summary=None,
     progress=None,
     include_views=False,
-    include_system_objects=False
+    include_system_objects=False,
+    bulk_extract=False,
+    staged_diff=False,
+    force_full=False,
+    collect_row_counts=False,
+    pipelined=False,
+    async_introspection_pool_size=None
 ):
-    """Catalog a single specific database with catalog run tracking."""
+    """
+    Catalog a single specific database with catalog run tracking.
+
+    Schemas whose DDL fingerprint equals the one of the last completed run are
+    skipped, unless force_full is set. collect_row_counts stores estimated row
+    counts of all tables in one source and one catalog query. pipelined reads the
+    source on a separate thread while the catalog is written. With
+    async_introspection_pool_size, PostgreSQL tables and columns are read up front
+    with concurrent queries over an asyncpg pool of that size.
+    """
     if summary is None:
         summary = get_summary_template()
     if progress is None:
@@ -556,9 +779,12 @@ def catalog_single_database(
     logger.info(f"Starting catalog of database: {connection_info['database_name']} on {connection_info['host']}")
 
     catalog_conn = get_catalog_connection()
+    pipeline = None
 
     try:
         database_id = upsert_database_temporal(catalog_conn, connection_info, catalog_run_id, summary)
+        # Progress writes are throttled, so persist the database row explicitly
+        catalog_conn.commit()
         update_run_progress(catalog_conn, catalog_run_id, progress)
 
         if not source_conn:
@@ -573,10 +799,50 @@ def catalog_single_database(
             return summary
         logger.info(f"Found {len(schemas)} schemas in {connection_info['database_name']} matching the filter.")
 
-        for schema_name in schemas:
-            process_schema(
-                catalog_conn,
+        all_schemas = schemas
+        source_fingerprints = {}
+        if not force_full:
+            schemas, source_fingerprints = skip_unchanged_schemas(
+                catalog_conn, source_conn, database_id, schemas, progress, summary,
+                table_filter=table_filter,
+                include_views=include_views,
+                include_system_objects=include_system_objects
+            )
+
+        if async_introspection_pool_size and not bulk_extract:
+            source_conn = use_async_introspection(source_conn, connection_info, schemas, async_introspection_pool_size)
+
+        if bulk_extract:
+            # All tables and columns of the database in a few set-based queries, streamed per schema
+            schema_batches = iter_source_metadata_bulk(
                 source_conn,
+                schemas,
+                table_filter=table_filter,
+                include_views=include_views,
+                include_system_objects=include_system_objects
+            )
+        else:
+            schema_batches = ((schema_name, None) for schema_name in schemas)
+
+        if pipelined:
+            pipeline = MetadataPipeline(
+                source_conn,
+                schema_batches,
+                table_filter=table_filter,
+                include_views=include_views,
+                include_system_objects=include_system_objects
+            ).start()
+            schema_batches = pipeline.schemas()
+
+        if staged_diff:
+            create_snapshot_staging_tables(catalog_conn)
+
+        schema_ids = []
+        walked_fingerprints = []
+        for schema_name, tables in schema_batches:
+            schema_id = process_schema(
+                catalog_conn,
+                None if pipeline else source_conn,  # the pipeline's reader thread owns the source connection
                 schema_name,
                 database_id,
                 catalog_run_id,
@@ -584,22 +850,49 @@ def catalog_single_database(
                 summary,
                 table_filter=table_filter,
                 include_views=include_views,
-                include_system_objects=include_system_objects
+                include_system_objects=include_system_objects,
+                tables=tables,
+                staged_diff=staged_diff
+            )
+            schema_ids.append(schema_id)
+            if schema_name in source_fingerprints:
+                walked_fingerprints.append((schema_id, source_fingerprints[schema_name]))
+
+        if pipeline:
+            pipeline.stop()
+
+        if staged_diff:
+            table_types = ['BASE TABLE', 'VIEW'] if include_views else ['BASE TABLE']
+            apply_snapshot_diff(
+                catalog_conn, catalog_run_id, schema_ids, progress, summary,
+                table_filter=table_filter, table_types=table_types
             )
 
+        save_schema_fingerprints(catalog_conn, walked_fingerprints, catalog_run_id)
+
+        if collect_row_counts:
+            # Counts change without DDL changes, so also for schemas skipped above
+            row_counts = get_table_row_counts_bulk(source_conn, all_schemas, table_filter=table_filter)
+            if row_counts is not None:
+                written = update_table_row_counts_bulk(catalog_conn, database_id, row_counts, catalog_run_id)
+                logger.info(f"Stored row counts for {written} tables in {connection_info['database_name']}")
+
         summary['databases_processed'] += 1
         progress['databases_processed'] += 1
 
-        update_run_progress(catalog_conn, catalog_run_id, progress)
+        update_run_progress(catalog_conn, catalog_run_id, progress, force=True)
 
         catalog_conn.commit()
 
     except Exception as e:
+        update_run_progress(catalog_conn, catalog_run_id, progress, force=True)
         fail_catalog_run(catalog_conn, catalog_run_id, str(e))
         catalog_conn.rollback()
         raise
 
     finally:
+        if pipeline:
+            pipeline.stop()
         catalog_conn.close()
         if source_conn:
             source_conn.close()
@@ -607,6 +900,71 @@ def catalog_single_database(
     return summary
 
 
+def use_async_introspection(source_conn, connection_info, schemas, pool_size):
+    """
+    Wrap a PostgreSQL source connection and load its metadata with async queries.
+
+    SQL Server sources, a missing asyncpg or a failing load keep the synchronous path.
+    """
+    if 'pyodbc' in str(type(source_conn)) or connection_info.get('connection_type') != 'PostgreSQL':
+        logger.info("Async introspection is only available for PostgreSQL sources, using the synchronous path")
+        return source_conn
+    if not async_introspection.is_available():
+        logger.warning("asyncpg not installed, using the synchronous introspection path")
+        return source_conn
+
+    introspector = AsyncPostgresIntrospector(source_conn, connection_info, connection_info['database_name'], pool_size)
+    try:
+        introspector.load(schemas)
+    except Exception as e:
+        logger.warning(f"Async introspection failed, using the synchronous path: {e}")
+    return introspector
+
+
+def skip_unchanged_schemas(
+    catalog_conn, source_conn, database_id, schemas, progress, summary,
+    table_filter=None, include_views=False, include_system_objects=False
+):
+    """
+    Drop schemas with an unchanged DDL fingerprint from the walk.
+
+    Returns (schemas_to_walk, source_fingerprints). Skipped schemas are counted as
+    processed and unchanged. Any failure falls back to a full walk.
+    """
+    # Roll back only the probe on failure, not the catalog writes made earlier in this transaction
+    with catalog_conn.cursor() as cursor:
+        cursor.execute("SAVEPOINT schema_fingerprint_probe")
+    try:
+        source_fingerprints = get_source_schema_fingerprints(
+            source_conn, schemas,
+            table_filter=table_filter,
+            include_views=include_views,
+            include_system_objects=include_system_objects
+        )
+        stored_fingerprints = get_stored_schema_fingerprints(catalog_conn, database_id)
+    except Exception as e:
+        logger.warning(f"Schema fingerprints unavailable, cataloging all schemas: {e}")
+        with catalog_conn.cursor() as cursor:
+            cursor.execute("ROLLBACK TO SAVEPOINT schema_fingerprint_probe")
+        source_conn.rollback()
+        return schemas, {}
+    with catalog_conn.cursor() as cursor:
+        cursor.execute("RELEASE SAVEPOINT schema_fingerprint_probe")
+
+    changed = []
+    for schema_name in schemas:
+        if stored_fingerprints.get(schema_name) == source_fingerprints.get(schema_name):
+            logger.info(f"Schema {schema_name} unchanged since last completed run, skipping")
+            summary['schemas_processed'] += 1
+            summary['schemas_unchanged'] += 1
+            progress['schemas_processed'] += 1
+        else:
+            changed.append(schema_name)
+
+    logger.info(f"{len(schemas) - len(changed)} of {len(schemas)} schemas unchanged, walking {len(changed)}")
+    return changed, source_fingerprints
+
+
 def initialize_progress():
     """Initialize progress tracking dictionary."""
     return {
@@ -628,9 +986,17 @@ def process_schema(
     summary,
     table_filter=None,
     include_views=False,
-    include_system_objects=False
+    include_system_objects=False,
+    tables=None,
+    staged_diff=False
 ):
-    """Process a single schema."""
+    """
+    Process a single schema and return its schema_id.
+
+    Pre-fetched tables (bulk extraction or the metadata pipeline) skip the source
+    lookup. With staged_diff the tables/columns are only staged; apply_snapshot_diff()
+    writes them afterwards.
+    """
     logger.info(f"Processing schema: {schema_name}")
     schema_id = upsert_schema_temporal(catalog_conn, database_id, schema_name, catalog_run_id, summary)
     update_run_progress(catalog_conn, catalog_run_id, progress)
@@ -643,17 +1009,26 @@ def process_schema(
         summary['schemas_unchanged'] += 1
 
     # Process tables and views met filter en flags
-    tables = get_source_tables(
-        source_conn,
-        schema_name,
-        table_filter=table_filter,
-        include_views=include_views,
-        include_system_objects=include_system_objects
-    )
-    if not tables:
+    if tables is None:
+        tables = get_source_tables(
+            source_conn,
+            schema_name,
+            table_filter=table_filter,
+            include_views=include_views,
+            include_system_objects=include_system_objects
+        )
+    if not isinstance(tables, list):
+        pass  # streamed by the metadata pipeline, size not known up front
+    elif not tables:
         logger.warning(f"No tables found in schema: {schema_name} matching the filter.")
-        return
-    logger.info(f"Found {len(tables)} tables in schema {schema_name} matching the filter.")
+        if not staged_diff:
+            return schema_id
+    else:
+        logger.info(f"Found {len(tables)} tables in schema {schema_name} matching the filter.")
+
+    if staged_diff:
+        stage_schema_snapshot(catalog_conn, source_conn, schema_id, schema_name, tables)
+        return schema_id
 
     process_tables_and_views(
         catalog_conn, source_conn, schema_id, tables, schema_name,
@@ -663,6 +1038,8 @@ def process_schema(
     # Update progress after processing the schema
     update_run_progress(catalog_conn, catalog_run_id, progress)
 
+    return schema_id
+
 
 def process_tables_and_views(
     catalog_conn, source_conn, schema_id, tables, schema_name,
@@ -716,6 +1093,8 @@ def process_tables_and_views(
 
 def process_view_definitions_batch(catalog_conn, view_definitions_batch, catalog_run_id, progress, summary):
     """Process a batch of view definitions."""
+    with catalog_conn.cursor() as cursor:
+        cursor.execute("SAVEPOINT view_definitions_batch")
     try:
         logger.debug(f"Processing batch of {len(view_definitions_batch)} view definitions")
 
@@ -729,12 +1108,15 @@ def process_view_definitions_batch(catalog_conn, view_definitions_batch, catalog
         logger.debug(f"Processed batch of {len(view_definitions_batch)} view definitions")
     except Exception as e:
         logger.error(f"Failed to process batch of view definitions: {e}")
-        catalog_conn.rollback()
+        with catalog_conn.cursor() as cursor:
+            cursor.execute("ROLLBACK TO SAVEPOINT view_definitions_batch")
 
 
 def process_columns(catalog_conn, source_conn, schema_name, table_info, table_id, catalog_run_id, progress, summary):
-    """Process columns for a table."""
-    columns = get_source_columns(source_conn, schema_name, table_info['table_name'])
+    """Process columns for a table (uses pre-fetched columns from bulk extraction when present)."""
+    columns = table_info.get('columns')
+    if columns is None:
+        columns = get_source_columns(source_conn, schema_name, table_info['table_name'])
     for column_info in columns:
         upsert_column_temporal(catalog_conn, table_id, column_info, catalog_run_id, summary)
         progress['columns_processed'] += 1
@@ -745,6 +1127,113 @@ def process_columns(catalog_conn, source_conn, schema_name, table_info, table_id
             summary['columns_unchanged'] += 1
 
 
+# Pipelined extraction ------------------------------------------------------
+#
+# In pipelined mode one producer thread owns the source connection and streams
+# tables (with their columns) into a bounded queue; the catalog writes run on the
+# calling thread. A full queue blocks the producer, an error on either side stops
+# the other and ends in fail_catalog_run().
+
+PIPELINE_QUEUE_SIZE = 256  # tables in flight between source reader and catalog writer
+
+_PIPELINE_END_OF_SCHEMA = object()
+_PIPELINE_DONE = object()
+
+
+class MetadataPipeline:
+    """Bounded producer/consumer pipeline between source metadata reads and catalog writes."""
+
+    def __init__(
+        self,
+        source_conn,
+        schema_batches,
+        table_filter=None,
+        include_views=False,
+        include_system_objects=False,
+        maxsize=PIPELINE_QUEUE_SIZE
+    ):
+        self.source_conn = source_conn
+        self.schema_batches = schema_batches
+        self.table_filter = table_filter
+        self.include_views = include_views
+        self.include_system_objects = include_system_objects
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name='dw-catalog-reader', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the producer and wait until it no longer uses the source connection."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def _put(self, item):
+        # Blocks while the queue is full (backpressure), gives up once the consumer stopped
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            for schema_name, tables in self.schema_batches:
+                if tables is None:
+                    tables = get_source_tables(
+                        self.source_conn,
+                        schema_name,
+                        table_filter=self.table_filter,
+                        include_views=self.include_views,
+                        include_system_objects=self.include_system_objects
+                    )
+                for table_info in tables:
+                    if table_info.get('columns') is None:
+                        table_info['columns'] = get_source_columns(self.source_conn, schema_name, table_info['table_name'])
+                    if not self._put((schema_name, table_info)):
+                        return
+                if not self._put((schema_name, _PIPELINE_END_OF_SCHEMA)):
+                    return
+            self._put(_PIPELINE_DONE)
+        except Exception as e:
+            logger.error(f"Source reader failed: {e}")
+            self._put(e)
+
+    def _get(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                if not self._thread.is_alive() and self._queue.empty():
+                    raise RuntimeError("Source reader stopped without finishing")
+                continue
+            if isinstance(item, Exception):
+                raise item
+            return item
+
+    def schemas(self):
+        """Consumer side: yield (schema_name, tables) in source order; tables is a lazy iterator."""
+        while True:
+            item = self._get()
+            if item is _PIPELINE_DONE:
+                return
+            schema_name, first = item
+            tables = self._tables(first)
+            yield schema_name, tables
+            for _ in tables:  # drain whatever the consumer did not read
+                pass
+
+    def _tables(self, item):
+        while item is not _PIPELINE_END_OF_SCHEMA:
+            yield item
+            _, item = self._get()
+
+
 def get_specific_connection(connection_id):
     """Get a specific connection by ID. Raises ValueError if not exactly one found."""
     catalog_conn = get_catalog_connection()
@@ -1092,6 +1581,410 @@ def update_table_row_count_temporal(catalog_conn, table_id, row_count, catalog_r
         """, (table_id, row_count, catalog_run_id))
 
 
+# Schema DDL fingerprints --------------------------------------------------
+#
+# A cheap per-schema hash over the source catalog (pg_class/pg_attribute resp.
+# sys.objects.modify_date). When it equals the fingerprint stored by the last
+# completed run, the table/column walk for that schema is skipped. The table
+# catalog.dw_schema_fingerprints is created by db/migrations.
+
+
+def get_source_schema_fingerprints(source_conn, schemas, table_filter=None, include_views=False, include_system_objects=False):
+    """
+    Return {schema_name: fingerprint} for the given schemas.
+
+    The extraction options are part of the hash, so a run with other filters or
+    flags never reuses the fingerprint of a differently scoped run.
+    """
+    if not schemas:
+        return {}
+
+    if hasattr(source_conn, 'cursor') and 'pyodbc' in str(type(source_conn)):
+        signatures = _get_schema_ddl_signatures_sqlserver(source_conn, schemas)
+    else:
+        signatures = _get_schema_ddl_signatures_postgresql(source_conn, schemas)
+
+    options = json.dumps({
+        'table_filter': sorted(table_filter) if table_filter else None,
+        'include_views': bool(include_views),
+        'include_system_objects': bool(include_system_objects)
+    }, sort_keys=True)
+
+    return {
+        schema_name: hashlib.sha256(f"{options}|{signatures.get(schema_name, '')}".encode('utf-8')).hexdigest()
+        for schema_name in schemas
+    }
+
+
+def _get_schema_ddl_signatures_postgresql(source_conn, schemas):
+    """Per schema an md5 over all relations, their column definitions and view definitions."""
+    with source_conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT n.nspname,
+                   count(*) || ':' || md5(string_agg(
+                       c.relname || ':' || c.relkind || ':' || c.relnatts || ':' || coalesce(cols.signature, '')
+                       || ':' || CASE WHEN c.relkind = 'v' THEN md5(pg_get_viewdef(c.oid)) ELSE '' END,
+                       '|' ORDER BY c.relname
+                   ))
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN LATERAL (
+                SELECT string_agg(
+                           a.attname || ' ' || a.atttypid || ' ' || a.atttypmod || ' ' || a.attnotnull
+                           || ' ' || coalesce(pg_get_expr(ad.adbin, ad.adrelid), ''),
+                           ',' ORDER BY a.attnum
+                       ) AS signature
+                FROM pg_attribute a
+                LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+                WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+            ) cols ON true
+            WHERE n.nspname = ANY (%s)
+              AND c.relkind IN ('r', 'p', 'v')
+            GROUP BY n.nspname
+        """, (list(schemas),))
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def _get_schema_ddl_signatures_sqlserver(source_conn, schemas):
+    """Per schema the object count, a checksum over sys.objects and the latest modify_date."""
+    query = """
+        SELECT s.name,
+               COUNT(*),
+               CHECKSUM_AGG(CHECKSUM(o.object_id, o.name, o.type, o.is_ms_shipped, o.modify_date)),
+               CONVERT(varchar(33), MAX(o.modify_date), 126)
+        FROM sys.objects o
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        WHERE s.name IN ({})
+          AND o.type IN ('U', 'V', 'D')
+        GROUP BY s.name
+    """.format(','.join('?' for _ in schemas))
+
+    with source_conn.cursor() as cursor:
+        cursor.execute(query, list(schemas))
+        return {row[0]: f"{row[1]}:{row[2]}:{row[3]}" for row in cursor.fetchall()}
+
+
+def get_stored_schema_fingerprints(catalog_conn, database_id):
+    """Return {schema_name: fingerprint} stored by completed runs for this database."""
+    with catalog_conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT s.schema_name, f.fingerprint
+            FROM catalog.dw_schema_fingerprints f
+            JOIN catalog.dw_schemas s ON s.id = f.schema_id
+            JOIN catalog.dw_catalog_runs r ON r.id = f.catalog_run_id
+            WHERE s.database_id = %s
+              AND s.is_current = true
+              AND r.run_status = 'completed'
+        """, (database_id,))
+        return {row[0]: row[1] for row in cursor.fetchall()}
+
+
+def save_schema_fingerprints(catalog_conn, schema_fingerprints, catalog_run_id):
+    """Store the fingerprints of the schemas walked in this run; schema_fingerprints is [(schema_id, fingerprint)]."""
+    if not schema_fingerprints:
+        return
+    with catalog_conn.cursor() as cursor:
+        psycopg2.extras.execute_values(cursor, """
+            INSERT INTO catalog.dw_schema_fingerprints (schema_id, fingerprint, catalog_run_id)
+            VALUES %s
+            ON CONFLICT (schema_id) DO UPDATE
+            SET fingerprint = EXCLUDED.fingerprint,
+                catalog_run_id = EXCLUDED.catalog_run_id,
+                computed_at = CURRENT_TIMESTAMP
+        """, [(schema_id, fingerprint, catalog_run_id) for schema_id, fingerprint in schema_fingerprints])
+
+
+# Staging-table diff engine ------------------------------------------------
+#
+# The per-object upserts above cost a SELECT plus an INSERT/UPDATE per table and
+# per column. In staged-diff mode the extracted snapshot of a database is COPY'd
+# into session-local temp tables and compared with catalog.dw_tables /
+# catalog.dw_columns in a handful of set-based statements. The summary counters
+# are taken from the classified staging rows.
+
+def create_snapshot_staging_tables(catalog_conn):
+    """Create (or empty) the temp staging tables for this catalog session."""
+    with catalog_conn.cursor() as cursor:
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS stg_dw_tables (
+                schema_id bigint NOT NULL,
+                table_name text NOT NULL,
+                table_type text,
+                view_definition text,
+                current_id bigint,
+                change_type text
+            ) ON COMMIT PRESERVE ROWS
+        """)
+        cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS stg_dw_columns (
+                schema_id bigint NOT NULL,
+                table_name text NOT NULL,
+                column_name text NOT NULL,
+                data_type text,
+                is_nullable boolean,
+                column_default text,
+                ordinal_position integer,
+                table_id bigint,
+                current_id bigint,
+                change_type text
+            ) ON COMMIT PRESERVE ROWS
+        """)
+        cursor.execute("TRUNCATE stg_dw_tables, stg_dw_columns")
+
+
+def _copy_value(value):
+    """Encode one value for COPY ... FROM STDIN (text format)."""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace('\t', '\\t')
+        .replace('\n', '\\n')
+        .replace('\r', '\\r')
+    )
+
+
+def copy_rows(cursor, table_name, column_names, rows):
+    """COPY a list of tuples into a (staging) table in one round trip."""
+    if not rows:
+        return 0
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write('\t'.join(_copy_value(value) for value in row))
+        buffer.write('\n')
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table_name} ({', '.join(column_names)}) FROM STDIN", buffer)
+    return len(rows)
+
+
+def stage_schema_snapshot(catalog_conn, source_conn, schema_id, schema_name, tables):
+    """Stage the tables and columns of one schema; columns are read per table unless pre-fetched."""
+    table_rows = []
+    column_rows = []
+    for table_info in tables:
+        table_name = table_info['table_name']
+        table_rows.append((schema_id, table_name, table_info.get('table_type'), table_info.get('view_definition')))
+
+        columns = table_info.get('columns')
+        if columns is None:
+            columns = get_source_columns(source_conn, schema_name, table_name)
+        for column_info in columns:
+            column_rows.append((
+                schema_id,
+                table_name,
+                column_info['column_name'],
+                column_info['data_type'],
+                column_info['is_nullable'],
+                column_info['column_default'],
+                column_info['ordinal_position']
+            ))
+
+    with catalog_conn.cursor() as cursor:
+        copy_rows(cursor, 'stg_dw_tables', ['schema_id', 'table_name', 'table_type', 'view_definition'], table_rows)
+        copy_rows(
+            cursor, 'stg_dw_columns',
+            ['schema_id', 'table_name', 'column_name', 'data_type', 'is_nullable', 'column_default', 'ordinal_position'],
+            column_rows
+        )
+
+    logger.debug(f"Staged {len(table_rows)} tables and {len(column_rows)} columns for schema {schema_name}")
+
+
+def _count_change_types(cursor, staging_table):
+    cursor.execute(f"SELECT change_type, COUNT(*) FROM {staging_table} GROUP BY change_type")
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0}
+    counts.update({row[0]: row[1] for row in cursor.fetchall()})
+    return counts
+
+
+def apply_snapshot_diff(
+    catalog_conn, catalog_run_id, schema_ids, progress, summary,
+    table_filter=None, table_types=None
+):
+    """
+    Diff the staged snapshot against the current catalog versions and apply it in bulk.
+
+    Objects missing from the snapshot are only marked deleted within the scope that
+    was extracted: the staged schemas, the extracted table types and the table filter.
+    """
+    if not schema_ids:
+        return summary
+    table_types = table_types or ['BASE TABLE']
+
+    with catalog_conn.cursor() as cursor:
+        # --- Tables ---------------------------------------------------------
+        cursor.execute("""
+            UPDATE stg_dw_tables s
+            SET current_id = t.id,
+                change_type = CASE WHEN t.table_type IS DISTINCT FROM s.table_type
+                                   THEN 'updated' ELSE 'unchanged' END
+            FROM catalog.dw_tables t
+            WHERE t.schema_id = s.schema_id
+              AND t.table_name = s.table_name
+              AND t.date_deleted IS NULL AND t.is_current = true
+        """)
+        cursor.execute("UPDATE stg_dw_tables SET change_type = 'added' WHERE change_type IS NULL")
+
+        cursor.execute("""
+            UPDATE catalog.dw_tables t
+            SET is_current = false,
+                date_updated = CURRENT_TIMESTAMP
+            FROM stg_dw_tables s
+            WHERE t.id = s.current_id AND s.change_type = 'updated'
+        """)
+        cursor.execute("""
+            INSERT INTO catalog.dw_tables
+            (schema_id, table_name, table_type, date_created, is_current, catalog_run_id)
+            SELECT schema_id, table_name, table_type, CURRENT_TIMESTAMP, true, %s
+            FROM stg_dw_tables
+            WHERE change_type IN ('added', 'updated')
+        """, (catalog_run_id,))
+
+        delete_query = """
+            UPDATE catalog.dw_tables t
+            SET is_current = false,
+                date_deleted = CURRENT_TIMESTAMP,
+                date_updated = CURRENT_TIMESTAMP
+            WHERE t.schema_id = ANY (%s)
+              AND t.table_type = ANY (%s)
+              AND t.date_deleted IS NULL AND t.is_current = true
+              AND NOT EXISTS (
+                  SELECT 1 FROM stg_dw_tables s
+                  WHERE s.schema_id = t.schema_id AND s.table_name = t.table_name
+              )
+        """
+        delete_params = [list(schema_ids), list(table_types)]
+        if table_filter:
+            delete_query += " AND t.table_name = ANY (%s)"
+            delete_params.append(list(table_filter))
+        cursor.execute(delete_query + " RETURNING t.id", delete_params)
+        deleted_table_ids = [row[0] for row in cursor.fetchall()]
+
+        table_counts = _count_change_types(cursor, 'stg_dw_tables')
+
+        # --- Columns --------------------------------------------------------
+        cursor.execute("""
+            UPDATE stg_dw_columns c
+            SET table_id = t.id
+            FROM catalog.dw_tables t
+            WHERE t.schema_id = c.schema_id
+              AND t.table_name = c.table_name
+              AND t.date_deleted IS NULL AND t.is_current = true
+        """)
+        cursor.execute("""
+            UPDATE stg_dw_columns s
+            SET current_id = c.id,
+                change_type = CASE
+                    WHEN c.data_type IS DISTINCT FROM s.data_type
+                      OR c.is_nullable IS DISTINCT FROM s.is_nullable
+                      OR c.column_default IS DISTINCT FROM s.column_default
+                      OR c.ordinal_position IS DISTINCT FROM s.ordinal_position
+                    THEN 'updated' ELSE 'unchanged' END
+            FROM catalog.dw_columns c
+            WHERE c.table_id = s.table_id
+              AND c.column_name = s.column_name
+              AND c.date_deleted IS NULL AND c.is_current = true
+        """)
+        cursor.execute("UPDATE stg_dw_columns SET change_type = 'added' WHERE change_type IS NULL")
+
+        cursor.execute("""
+            UPDATE catalog.dw_columns c
+            SET is_current = false,
+                date_updated = CURRENT_TIMESTAMP
+            FROM stg_dw_columns s
+            WHERE c.id = s.current_id AND s.change_type = 'updated'
+        """)
+        cursor.execute("""
+            INSERT INTO catalog.dw_columns
+            (table_id, column_name, data_type, is_nullable, column_default,
+             ordinal_position, date_created, is_current, catalog_run_id)
+            SELECT table_id, column_name, data_type, is_nullable, column_default,
+                   ordinal_position, CURRENT_TIMESTAMP, true, %s
+            FROM stg_dw_columns
+            WHERE change_type IN ('added', 'updated')
+        """, (catalog_run_id,))
+
+        # Columns that disappeared from a staged table, plus all columns of deleted tables
+        cursor.execute("""
+            UPDATE catalog.dw_columns c
+            SET is_current = false,
+                date_deleted = CURRENT_TIMESTAMP,
+                date_updated = CURRENT_TIMESTAMP
+            WHERE c.date_deleted IS NULL AND c.is_current = true
+              AND (
+                  c.table_id IN (
+                      SELECT t.id
+                      FROM catalog.dw_tables t
+                      JOIN stg_dw_tables s ON s.schema_id = t.schema_id AND s.table_name = t.table_name
+                      WHERE t.date_deleted IS NULL AND t.is_current = true
+                  )
+                  OR c.table_id = ANY (%s)
+              )
+              AND NOT EXISTS (
+                  SELECT 1 FROM stg_dw_columns s
+                  WHERE s.table_id = c.table_id AND s.column_name = c.column_name
+              )
+        """, (deleted_table_ids,))
+        columns_deleted = cursor.rowcount
+
+        column_counts = _count_change_types(cursor, 'stg_dw_columns')
+
+        # --- View definitions (existing hash-based batch logic) -------------
+        cursor.execute("""
+            SELECT t.schema_id, t.id, s.table_name, s.view_definition
+            FROM stg_dw_tables s
+            JOIN catalog.dw_tables t
+              ON t.schema_id = s.schema_id AND t.table_name = s.table_name
+             AND t.date_deleted IS NULL AND t.is_current = true
+            WHERE UPPER(s.table_type) IN ('VIEW', 'V')
+        """)
+        views_by_schema = {schema_id: [] for schema_id in schema_ids}
+        for schema_id, table_id, table_name, view_definition in cursor.fetchall():
+            views_by_schema.setdefault(schema_id, []).append((table_id, table_name, view_definition))
+
+    for schema_id, views in views_by_schema.items():
+        view_definitions_batch = [(table_id, definition) for table_id, _, definition in views if definition]
+        if view_definitions_batch:
+            process_view_definitions_batch(catalog_conn, view_definitions_batch, catalog_run_id, progress, summary)
+        mark_deleted_view_definitions_batch(
+            catalog_conn, schema_id, [table_name for _, table_name, _ in views], catalog_run_id, summary
+        )
+
+    tables_total = table_counts['added'] + table_counts['updated'] + table_counts['unchanged']
+    columns_total = column_counts['added'] + column_counts['updated'] + column_counts['unchanged']
+
+    summary['tables_added'] += table_counts['added']
+    summary['tables_updated'] += table_counts['updated']
+    summary['tables_unchanged'] += table_counts['unchanged']
+    summary['tables_deleted'] += len(deleted_table_ids)
+    summary['tables_processed'] += tables_total
+    summary['columns_added'] += column_counts['added']
+    summary['columns_updated'] += column_counts['updated']
+    summary['columns_unchanged'] += column_counts['unchanged']
+    summary['columns_deleted'] += columns_deleted
+    summary['columns_processed'] += columns_total
+    summary['views_unchanged'] = (
+        summary['views_processed']
+        - summary['views_added']
+        - summary['views_updated']
+        - summary['views_deleted']
+    )
+
+    progress['tables_processed'] += tables_total
+    progress['columns_processed'] += columns_total
+
+    logger.info(
+        f"Snapshot diff applied: tables +{table_counts['added']} ~{table_counts['updated']} "
+        f"-{len(deleted_table_ids)} ={table_counts['unchanged']}, columns +{column_counts['added']} "
+        f"~{column_counts['updated']} -{columns_deleted} ={column_counts['unchanged']}"
+    )
+    update_run_progress(catalog_conn, catalog_run_id, progress)
+    return summary
+
+
 # Add helper functions to extract data from source databases
 def get_source_schemas(source_conn):
     """Get list of schemas from source database"""
@@ -1140,6 +2033,8 @@ def get_source_tables(
     :param include_system_objects: boolean, whether to include system tables
     :return: list of dicts with keys: table_name, table_type, view_definition, connection_type
     """
+    if isinstance(source_conn, AsyncPostgresIntrospector) and source_conn.has_schema(schema_name):
+        return source_conn.get_tables(schema_name, table_filter=table_filter, include_views=include_views)
 
     if hasattr(source_conn, 'cursor') and 'pyodbc' in str(type(source_conn)):
         connection_type = 'Azure SQL Server'
@@ -1239,6 +2134,8 @@ def get_source_tables(
 
 def get_source_columns(source_conn, schema_name, table_name):
     """Get list of columns from source table"""
+    if isinstance(source_conn, AsyncPostgresIntrospector) and source_conn.has_schema(schema_name):
+        return source_conn.get_columns(schema_name, table_name)
     if hasattr(source_conn, 'cursor') and 'pyodbc' in str(type(source_conn)):
         # Azure SQL Server
         with source_conn.cursor() as cursor:
@@ -1279,6 +2176,245 @@ def get_source_columns(source_conn, schema_name, table_name):
             ]
 
 
+# Bulk (set-based) extraction ------------------------------------------------
+#
+# Instead of one information_schema round trip per table, the bulk path reads
+# all tables/views of the selected schemas in one query and all columns in a
+# second, streamed query ordered by schema/table. Columns are attached to the
+# table dicts under the 'columns' key, which process_columns() picks up.
+
+BULK_COLUMN_FETCH_SIZE = 5000
+
+
+def iter_source_metadata_bulk(
+    source_conn,
+    schemas,
+    table_filter=None,
+    include_views=False,
+    include_system_objects=False
+):
+    """
+    Stream table/view/column metadata for a whole database with set-based queries.
+
+    Yields (schema_name, tables) per schema; every table dict has the same keys as
+    get_source_tables() plus 'columns' (same shape as get_source_columns()).
+    Schemas without matching tables are yielded with an empty list.
+    """
+    if not schemas:
+        return
+
+    if hasattr(source_conn, 'cursor') and 'pyodbc' in str(type(source_conn)):
+        tables = _get_source_tables_bulk_sqlserver(source_conn, schemas, table_filter, include_views, include_system_objects)
+        column_rows = _iter_source_columns_bulk_sqlserver(source_conn, schemas, table_filter)
+    else:
+        tables = _get_source_tables_bulk_postgresql(source_conn, schemas, table_filter, include_views)
+        column_rows = _iter_source_columns_bulk_postgresql(source_conn, schemas, table_filter)
+
+    tables_by_schema = {schema_name: [] for schema_name in schemas}
+    tables_index = {}
+    for schema_name, table_info in tables:
+        table_info['columns'] = []
+        tables_by_schema.setdefault(schema_name, []).append(table_info)
+        tables_index[(schema_name, table_info['table_name'])] = table_info
+
+    logger.info(f"Bulk extraction: {len(tables_index)} tables/views in {len(schemas)} schemas")
+
+    # Rows arrive ordered by schema, table, ordinal position, so every schema (and
+    # every table within it) forms one contiguous group and can be yielded as soon
+    # as its last column has been read.
+    for schema_name, schema_rows in itertools.groupby(column_rows, key=operator.itemgetter(0)):
+        for table_name, table_rows in itertools.groupby(schema_rows, key=operator.itemgetter(1)):
+            table_info = tables_index.get((schema_name, table_name))
+            if table_info is None:
+                continue  # column of an object that was filtered out (e.g. a view)
+            table_info['columns'] = [
+                {
+                    'column_name': row[2],
+                    'data_type': row[3],
+                    'is_nullable': bool(row[4]),
+                    'column_default': row[5],
+                    'ordinal_position': row[6]
+                }
+                for row in table_rows
+            ]
+
+        if schema_name in tables_by_schema:
+            yield schema_name, tables_by_schema.pop(schema_name)
+
+    # Schemas without any columns (empty schemas or only column-less objects)
+    for schema_name, schema_tables in tables_by_schema.items():
+        yield schema_name, schema_tables
+
+
+def _get_source_tables_bulk_postgresql(source_conn, schemas, table_filter=None, include_views=False):
+    """All tables (and optionally views incl. definition) of the given schemas via pg_catalog."""
+    relkinds = ['r', 'p']
+    if include_views:
+        relkinds.append('v')
+
+    query = """
+        SELECT n.nspname,
+               c.relname,
+               CASE WHEN c.relkind = 'v' THEN 'VIEW' ELSE 'BASE TABLE' END AS table_type,
+               CASE WHEN c.relkind = 'v' THEN pg_get_viewdef(c.oid) END AS view_definition
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = ANY (%s)
+          AND c.relkind = ANY (%s)
+    """
+    params = [list(schemas), relkinds]
+
+    if table_filter:
+        query += " AND c.relname = ANY (%s)"
+        params.append(list(table_filter))
+
+    query += " ORDER BY n.nspname, c.relname"
+
+    with source_conn.cursor() as cursor:
+        cursor.execute(query, params)
+        return [
+            (row[0], {
+                'table_name': row[1],
+                'table_type': row[2],
+                'view_definition': row[3] if row[3] else None,
+                'connection_type': 'PostgreSQL'
+            })
+            for row in cursor.fetchall()
+        ]
+
+
+def _iter_source_columns_bulk_postgresql(source_conn, schemas, table_filter=None):
+    """
+    Stream all columns of the given schemas via pg_catalog using a server-side cursor.
+
+    data_type is mapped to the information_schema.columns spelling so that change
+    detection against previously cataloged columns keeps working.
+    """
+    query = """
+        SELECT n.nspname,
+               c.relname,
+               a.attname,
+               CASE
+                   WHEN t.typtype = 'd' THEN format_type(t.typbasetype, NULL)
+                   WHEN t.typelem <> 0 AND t.typlen = -1 THEN 'ARRAY'
+                   WHEN tn.nspname = 'pg_catalog' THEN format_type(a.atttypid, NULL)
+                   ELSE 'USER-DEFINED'
+               END AS data_type,
+               NOT a.attnotnull AS is_nullable,
+               pg_get_expr(ad.adbin, ad.adrelid) AS column_default,
+               a.attnum AS ordinal_position
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_type t ON t.oid = a.atttypid
+        JOIN pg_namespace tn ON tn.oid = t.typnamespace
+        LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+        WHERE n.nspname = ANY (%s)
+          AND c.relkind IN ('r', 'p', 'v')
+          AND a.attnum > 0
+          AND NOT a.attisdropped
+    """
+    params = [list(schemas)]
+
+    if table_filter:
+        query += " AND c.relname = ANY (%s)"
+        params.append(list(table_filter))
+
+    query += " ORDER BY n.nspname, c.relname, a.attnum"
+
+    # Named cursor = server-side cursor: rows are fetched in batches of itersize
+    with source_conn.cursor(name='dw_bulk_columns') as cursor:
+        cursor.itersize = BULK_COLUMN_FETCH_SIZE
+        cursor.execute(query, params)
+        for row in cursor:
+            yield row
+
+
+def _get_source_tables_bulk_sqlserver(source_conn, schemas, table_filter=None, include_views=False, include_system_objects=False):
+    """All tables (and optionally views incl. full definition) of the given schemas via sys.*"""
+    object_types = ['U']
+    if include_views:
+        object_types.append('V')
+
+    query = """
+        SELECT s.name,
+               o.name,
+               CASE WHEN o.type = 'V' THEN 'VIEW' ELSE 'BASE TABLE' END AS table_type,
+               m.definition AS view_definition
+        FROM sys.objects o
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        LEFT JOIN sys.sql_modules m ON m.object_id = o.object_id
+        WHERE s.name IN ({schemas})
+          AND o.type IN ({types})
+    """.format(
+        schemas=','.join('?' for _ in schemas),
+        types=','.join('?' for _ in object_types)
+    )
+    params = list(schemas) + object_types
+
+    if not include_system_objects:
+        query += " AND o.is_ms_shipped = 0"
+
+    if table_filter:
+        query += " AND o.name IN ({})".format(','.join('?' for _ in table_filter))
+        params.extend(table_filter)
+
+    query += " ORDER BY s.name, o.name"
+
+    with source_conn.cursor() as cursor:
+        cursor.execute(query, params)
+        return [
+            (row[0], {
+                'table_name': row[1],
+                'table_type': row[2],
+                'view_definition': row[3] if row[3] else None,
+                'connection_type': 'Azure SQL Server'
+            })
+            for row in cursor.fetchall()
+        ]
+
+
+def _iter_source_columns_bulk_sqlserver(source_conn, schemas, table_filter=None):
+    """
+    Stream all columns of the given schemas via sys.columns.
+
+    data_type, column_default and ordinal_position follow the information_schema.columns
+    definitions so results are comparable with the per-table path.
+    """
+    query = """
+        SELECT s.name,
+               o.name,
+               c.name,
+               ISNULL(TYPE_NAME(c.system_type_id), t.name) AS data_type,
+               c.is_nullable,
+               CONVERT(nvarchar(4000), OBJECT_DEFINITION(c.default_object_id)) AS column_default,
+               COLUMNPROPERTY(c.object_id, c.name, 'ordinal') AS ordinal_position
+        FROM sys.columns c
+        JOIN sys.objects o ON o.object_id = c.object_id
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        JOIN sys.types t ON t.user_type_id = c.user_type_id
+        WHERE s.name IN ({schemas})
+          AND o.type IN ('U', 'V')
+    """.format(schemas=','.join('?' for _ in schemas))
+    params = list(schemas)
+
+    if table_filter:
+        query += " AND o.name IN ({})".format(','.join('?' for _ in table_filter))
+        params.extend(table_filter)
+
+    query += " ORDER BY s.name, o.name, ordinal_position"
+
+    # Fetch in batches so the full column list is never materialized up front
+    with source_conn.cursor() as cursor:
+        cursor.execute(query, params)
+        while True:
+            rows = cursor.fetchmany(BULK_COLUMN_FETCH_SIZE)
+            if not rows:
+                break
+            for row in rows:
+                yield row
+
+
 def get_table_row_count(source_conn, schema_name, table_name, connection_type):
     """Get estimated row count for table (database-specific implementation)"""
 
@@ -1340,29 +2476,296 @@ def get_table_row_count_sqlserver(source_conn, schema_name, table_name):
         return None
 
 
-def update_run_progress(catalog_conn, catalog_run_id, progress):
-    """Update catalog run progress in real-time"""
+def get_table_row_counts_bulk(source_conn, schemas, table_filter=None):
+    """
+    Estimated row counts of all base tables in the given schemas in one query.
+
+    Returns {(schema_name, table_name): row_count}, or None when the source query fails.
+    """
+    if not schemas:
+        return {}
+
+    if hasattr(source_conn, 'cursor') and 'pyodbc' in str(type(source_conn)):
+        query = """
+            SELECT s.name, t.name, SUM(p.rows)
+            FROM sys.tables t
+            INNER JOIN sys.partitions p ON t.object_id = p.object_id
+            INNER JOIN sys.schemas s ON t.schema_id = s.schema_id
+            WHERE s.name IN ({})
+            AND p.index_id IN (0,1)
+        """.format(','.join('?' for _ in schemas))
+        params = list(schemas)
+        if table_filter:
+            query += " AND t.name IN ({})".format(','.join('?' for _ in table_filter))
+            params.extend(table_filter)
+        query += " GROUP BY s.name, t.name"
+    else:
+        # Same preference as get_table_row_count_postgresql: statistics first, reltuples as fallback
+        query = """
+            SELECT n.nspname, c.relname,
+                   COALESCE(st.n_tup_ins - st.n_tup_del, GREATEST(c.reltuples, 0)::bigint)
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_stat_user_tables st ON st.relid = c.oid
+            WHERE n.nspname = ANY (%s)
+              AND c.relkind IN ('r', 'p')
+        """
+        params = [list(schemas)]
+        if table_filter:
+            query += " AND c.relname = ANY (%s)"
+            params.append(list(table_filter))
+
+    try:
+        with source_conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return {(row[0], row[1]): int(row[2] or 0) for row in cursor.fetchall()}
+    except Exception as e:
+        logger.warning(f"Could not get bulk row counts: {e}")
+        source_conn.rollback()
+        return None
+
+
+def update_table_row_counts_bulk(catalog_conn, database_id, row_counts, catalog_run_id):
+    """
+    Write row counts for a whole database in one statement.
+
+    Updates row_count_estimated of the current catalog.dw_tables versions and logs the
+    same rows in catalog.dw_table_rowcounts. Returns the number of tables written.
+    """
+    if not row_counts:
+        return 0
+
+    schema_names, table_names, counts = [], [], []
+    for (schema_name, table_name), row_count in row_counts.items():
+        schema_names.append(schema_name)
+        table_names.append(table_name)
+        counts.append(row_count)
+
+    with catalog_conn.cursor() as cursor:
+        cursor.execute("""
+            WITH counts AS (
+                SELECT *
+                FROM unnest(%s::text[], %s::text[], %s::bigint[]) AS c(schema_name, table_name, row_count)
+            ), updated AS (
+                UPDATE catalog.dw_tables t
+                SET row_count_estimated = c.row_count,
+                    row_count_updated = CURRENT_TIMESTAMP
+                FROM counts c
+                JOIN catalog.dw_schemas s
+                  ON s.schema_name = c.schema_name
+                 AND s.database_id = %s
+                 AND s.is_current = true
+                WHERE t.schema_id = s.id
+                  AND t.table_name = c.table_name
+                  AND t.is_current = true
+                RETURNING t.id, c.row_count
+            )
+            INSERT INTO catalog.dw_table_rowcounts (table_id, row_count_estimated, collected_at, catalog_run_id)
+            SELECT id, row_count, CURRENT_TIMESTAMP, %s
+            FROM updated
+        """, (schema_names, table_names, counts, database_id, catalog_run_id))
+        return cursor.rowcount
+
+
+# Progress reporting -------------------------------------------------------
+#
+# update_run_progress() is called after nearly every schema and table step. The
+# ProgressReporter of the run coalesces those calls and only writes (and commits)
+# catalog.dw_catalog_runs every PROGRESS_FLUSH_INTERVAL_SECONDS or every
+# PROGRESS_FLUSH_EVERY_OBJECTS objects, plus always when force=True (database
+# completed, run completed or failed).
+
+PROGRESS_FLUSH_INTERVAL_SECONDS = 5.0
+PROGRESS_FLUSH_EVERY_OBJECTS = 1000
+
+_progress_reporters = {}
+_progress_reporters_lock = threading.Lock()
+
+
+class ProgressReporter:
+    """Throttled progress writer for one catalog run, including objects/sec and ETA."""
+
+    def __init__(
+        self,
+        catalog_run_id,
+        expected_objects=None,
+        expected_databases=None,
+        flush_interval=PROGRESS_FLUSH_INTERVAL_SECONDS,
+        flush_every=PROGRESS_FLUSH_EVERY_OBJECTS,
+        metrics_enabled=False
+    ):
+        self.catalog_run_id = catalog_run_id
+        self.expected_objects = expected_objects
+        self.expected_databases = expected_databases
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.metrics_enabled = metrics_enabled
+        self.started_at = time.monotonic()
+        self.flushes = 0
+        self.coalesced = 0
+        self._last_flush_at = None
+        self._last_flush_objects = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def count_objects(progress):
+        return (
+            progress['schemas_processed'] + progress['tables_processed']
+            + progress['views_processed'] + progress['columns_processed']
+        )
+
+    def rate_and_eta(self, progress, now=None):
+        """Return (objects_per_second, eta_seconds); eta is None when it cannot be estimated."""
+        elapsed = (now or time.monotonic()) - self.started_at
+        objects = self.count_objects(progress)
+        rate = objects / elapsed if elapsed > 0 else 0.0
+
+        eta = None
+        if rate > 0 and self.expected_objects and self.expected_objects > objects:
+            eta = (self.expected_objects - objects) / rate
+        elif self.expected_databases and 0 < progress['databases_processed'] < self.expected_databases:
+            # No earlier run to compare with: extrapolate from the completed databases
+            eta = elapsed * (self.expected_databases - progress['databases_processed']) / progress['databases_processed']
+        return round(rate, 2), (int(eta) if eta is not None else None)
+
+    def report(self, catalog_conn, progress, force=False):
+        """Write progress when due (or forced); returns True when a write was done."""
+        now = time.monotonic()
+        objects = self.count_objects(progress)
+        with self._lock:
+            due = (
+                force
+                or self._last_flush_at is None
+                or now - self._last_flush_at >= self.flush_interval
+                or objects - self._last_flush_objects >= self.flush_every
+            )
+            if not due:
+                self.coalesced += 1
+                return False
+            self._last_flush_at = now
+            self._last_flush_objects = objects
+            self.flushes += 1
+
+        rate, eta = self.rate_and_eta(progress, now)
+        self._write(catalog_conn, progress, rate, eta)
+        return True
+
+    def _write(self, catalog_conn, progress, rate, eta):
+        params = [
+            progress['databases_processed'],
+            progress['schemas_processed'],
+            progress['tables_processed'],
+            progress['views_processed'],
+            progress['columns_processed']
+        ]
+        metrics_sql = ""
+        if self.metrics_enabled:
+            metrics_sql = """,
+                    objects_per_second = %s,
+                    eta_seconds = %s,
+                    progress_updated_at = CURRENT_TIMESTAMP"""
+            params.extend([rate, eta])
+        params.append(self.catalog_run_id)
+
+        try:
+            with catalog_conn.cursor() as cursor:
+                cursor.execute(f"""
+                    UPDATE catalog.dw_catalog_runs
+                    SET databases_processed = %s,
+                        schemas_processed = %s,
+                        tables_processed = %s,
+                        views_processed = %s,
+                        columns_processed = %s{metrics_sql}
+                    WHERE id = %s
+                """, params)
+                catalog_conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to update progress: {e}")
+
+
+def has_progress_metric_columns(catalog_conn):
+    """True when the objects/sec and ETA columns of catalog.dw_catalog_runs exist (see db/migrations)."""
     try:
         with catalog_conn.cursor() as cursor:
             cursor.execute("""
-                UPDATE catalog.dw_catalog_runs
-                SET databases_processed = %s,
-                    schemas_processed = %s,
-                    tables_processed = %s,
-                    views_processed = %s,
-                    columns_processed = %s
-                WHERE id = %s
-            """, (
-                progress['databases_processed'],
-                progress['schemas_processed'],
-                progress['tables_processed'],
-                progress['views_processed'],
-                progress['columns_processed'],
-                catalog_run_id
-            ))
-            catalog_conn.commit()
+                SELECT count(*)
+                FROM information_schema.columns
+                WHERE table_schema = 'catalog'
+                  AND table_name = 'dw_catalog_runs'
+                  AND column_name IN ('objects_per_second', 'eta_seconds', 'progress_updated_at')
+            """)
+            available = cursor.fetchone()[0] == 3
     except Exception as e:
-        logger.warning(f"Failed to update progress: {e}")
+        logger.warning(f"Could not check for progress metric columns: {e}")
+        catalog_conn.rollback()
+        return False
+    if not available:
+        logger.warning("Progress metrics (objects/sec, ETA) not available: apply the dw_catalog_runs migration")
+    return available
+
+
+def get_expected_object_count(catalog_conn, connection_id, catalog_config_id):
+    """Number of objects processed by the last completed run with the same connection and config."""
+    try:
+        with catalog_conn.cursor() as cursor:
+            cursor.execute("""
+                SELECT COALESCE(schemas_processed, 0) + COALESCE(tables_processed, 0)
+                       + COALESCE(views_processed, 0) + COALESCE(columns_processed, 0)
+                FROM catalog.dw_catalog_runs
+                WHERE connection_id = %s
+                  AND catalog_config_id IS NOT DISTINCT FROM %s
+                  AND run_status = 'completed'
+                ORDER BY run_started_at DESC
+                LIMIT 1
+            """, (connection_id, catalog_config_id))
+            result = cursor.fetchone()
+            return result[0] if result and result[0] else None
+    except Exception as e:
+        logger.warning(f"Could not determine expected object count: {e}")
+        catalog_conn.rollback()
+        return None
+
+
+def start_progress_reporter(catalog_conn, catalog_run_id, connection_info, catalog_config_id=None, expected_databases=None):
+    """Create and register the ProgressReporter for a catalog run."""
+    reporter = ProgressReporter(
+        catalog_run_id,
+        expected_objects=get_expected_object_count(catalog_conn, connection_info['id'], catalog_config_id),
+        expected_databases=expected_databases,
+        metrics_enabled=has_progress_metric_columns(catalog_conn)
+    )
+    with _progress_reporters_lock:
+        _progress_reporters[catalog_run_id] = reporter
+    return reporter
+
+
+def get_progress_reporter(catalog_run_id):
+    """Return the reporter of the run, creating a plain one when none was started."""
+    with _progress_reporters_lock:
+        reporter = _progress_reporters.get(catalog_run_id)
+        if reporter is None:
+            reporter = _progress_reporters[catalog_run_id] = ProgressReporter(catalog_run_id)
+        return reporter
+
+
+def stop_progress_reporter(catalog_run_id):
+    """Unregister the reporter of a finished run."""
+    with _progress_reporters_lock:
+        reporter = _progress_reporters.pop(catalog_run_id, None)
+    if reporter:
+        logger.info(
+            f"Progress for run {catalog_run_id}: {reporter.flushes} writes, "
+            f"{reporter.coalesced} updates coalesced"
+        )
+
+
+def update_run_progress(catalog_conn, catalog_run_id, progress, force=False):
+    """Report catalog run progress; writes are throttled by the run's ProgressReporter."""
+    run_state = getattr(progress, 'run_state', None)
+    if run_state is not None:
+        # Parallel worker: report the totals over all workers, not just this database
+        progress = run_state.progress_totals()
+    get_progress_reporter(catalog_run_id).report(catalog_conn, progress, force=force)
 
 
 if __name__ == "__main__":
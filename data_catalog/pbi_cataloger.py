@@ -1,4 +1,8 @@
+import json
 import psycopg2
+import psycopg2.pool
+from psycopg2.extras import execute_values
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 import os
 import argparse
@@ -6,8 +10,27 @@ import logging
 from pathlib import Path
 import sys
 import re
+import hashlib
+import threading
+import time
 from dotenv import load_dotenv
 
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # optional: only needed for --watch
+    FileSystemEventHandler = object
+    Observer = None
+
+from cataloger_base import (
+    ensure_loader_tables,
+    sweep_edges_by_prefix,
+    sweep_nodes_by_prefix,
+    upsert_edges_bulk,
+    upsert_node_details_bulk,
+    upsert_nodes_bulk,
+)
+
 # Load environment variables
 load_dotenv()
 
@@ -25,6 +48,15 @@ logger = logging.getLogger(__name__)
 
 ENV_PATTERN = re.compile(r'^\${(.+)}$')
 
+# Multi-project mode: number of parse processes / catalog writer threads
+DEFAULT_PROJECT_WORKERS = 4
+
+# Watch mode: a model is re-cataloged once its files were quiet for WATCH_DEBOUNCE_SECONDS,
+# or WATCH_MAX_DELAY_SECONDS after the first change when saves keep coming in
+WATCH_DEBOUNCE_SECONDS = 2.0
+WATCH_MAX_DELAY_SECONDS = 30.0
+WATCH_POLL_SECONDS = 0.5
+
 
 def _resolve_env(obj):
     if isinstance(obj, dict):
@@ -100,126 +132,269 @@ def extract_dax_expression(lines, start_idx):
     return "\n".join(expr_lines).strip(), i
 
 
-def parse_custom_tables_format(tables_dir):
-    logging.info(f"Parsing tables in directory: {tables_dir}")
-    tables = []
-    for file in os.listdir(tables_dir):
-        if not file.endswith(".tmdl"):
-            continue
-        table = {"columns": [], "measures": []}
-        with open(os.path.join(tables_dir, file), "r", encoding="utf-8") as f:
-            lines = f.readlines()
-        current_table = None
-        current_column = None
-        current_measure = None
-        mode = None
-        i = 0
-        while i < len(lines):
-            line = lines[i].rstrip()
+def _parse_tmdl_measure(lines, i, line):
+    """Parse a '\tmeasure' block starting at line i; returns (measure, next index)."""
+    measure_def = line.split(" ", 1)[1].strip()
+    if "=" in measure_def:
+        name_part, expr_part = measure_def.split("=", 1)
+        measure_name = name_part.strip().strip("'\"`")
+        dax_expr = expr_part.strip().strip("`'''").strip()
+    else:
+        measure_name = measure_def.strip().strip("'\"`")
+        dax_expr = ""
 
-            if line.startswith("table "):
-                if current_column:
-                    table["columns"].append(current_column)
-                    current_column = None
-                if current_measure:
-                    table["measures"].append(current_measure)
-                    current_measure = None
-                current_table = line.split(" ", 1)[1].strip()
-                table["name"] = current_table
-                mode = None
-                i += 1
-                continue
+    measure = {"name": measure_name}
+    i += 1
 
-            elif line.startswith("\tcolumn "):
-                if current_column:
-                    table["columns"].append(current_column)
-                current_column = {"name": line.split(" ", 1)[1].strip()}
-                mode = "column"
+    # DAX expression: inline, or the following (deeper indented) lines
+    if dax_expr:
+        measure["expression"] = dax_expr
+    else:
+        dax_lines = []
+        while i < len(lines):
+            next_line = lines[i].rstrip()
+            # Lege regels zijn toegestaan, maar worden mee opgenomen
+            if next_line.strip() == "":
+                dax_lines.append("")
+                i += 1
+            elif next_line.startswith("\t\t\t"):
+                dax_lines.append(next_line.strip())
                 i += 1
-                continue
+            else:
+                break  # Niet-DAX, dus mogelijk metadata
+        measure["expression"] = "\n".join(dax_lines).strip()
 
-            elif line.startswith("\tmeasure "):
-                if current_measure:
-                    table["measures"].append(current_measure)
+    while i < len(lines) and lines[i].strip() == "":
+        i += 1
 
-                measure_def = line.split(" ", 1)[1].strip()
-                if "=" in measure_def:
-                    name_part, expr_part = measure_def.split("=", 1)
-                    measure_name = name_part.strip().strip("'\"`")
-                    dax_expr = expr_part.strip().strip("`'''").strip()
-                else:
-                    measure_name = measure_def.strip().strip("'\"`")
-                    dax_expr = ""
+    # Measure metadata
+    while i < len(lines):
+        meta_stripped = lines[i].strip()
+        if meta_stripped.startswith("formatString:"):
+            measure["formatString"] = meta_stripped.split(":", 1)[1].strip()
+        elif meta_stripped.startswith("displayFolder:"):
+            measure["displayFolder"] = meta_stripped.split(":", 1)[1].strip()
+        elif meta_stripped.startswith("lineageTag:"):
+            measure["lineageTag"] = meta_stripped.split(":", 1)[1].strip()
+        elif meta_stripped.startswith("annotation"):
+            pass  # ignore
+        elif meta_stripped == "isHidden":
+            measure["isHidden"] = True
+        elif meta_stripped == "isPrivate":
+            measure["isPrivate"] = True
+        elif meta_stripped == "isAvailableInMDX":
+            measure["isAvailableInMDX"] = True
+        else:
+            break
+        i += 1
 
-                current_measure = {"name": measure_name}
-                mode = "measure"
-                i += 1
+    return measure, i
 
-                # DAX expression
-                if dax_expr:
-                    current_measure["expression"] = dax_expr
-                else:
-                    dax_lines = []
-                    while i < len(lines):
-                        next_line = lines[i].rstrip()
-
-                        # Lege regels zijn toegestaan, maar worden mee opgenomen
-                        if next_line.strip() == "":
-                            dax_lines.append("")
-                            i += 1
-                        elif next_line.startswith("\t\t\t"):
-                            dax_lines.append(next_line.strip())
-                            i += 1
-                        else:
-                            break  # Niet-DAX, dus mogelijk metadata
-
-                    current_measure["expression"] = "\n".join(dax_lines).strip()
-
-                # ✅ Deze blokken zijn nu *buiten* if/else → metadata wordt altijd gelezen
-                while i < len(lines) and lines[i].strip() == "":
-                    i += 1
-
-                while i < len(lines):
-                    meta_line = lines[i].rstrip()
-                    meta_stripped = meta_line.lstrip()
-                    logging.debug(f"Metadata parsing at line {i}: '{meta_line}' (stripped: '{meta_stripped}')")
-                    if meta_stripped.startswith("formatString:"):
-                        current_measure["formatString"] = meta_stripped.split(":", 1)[1].strip()
-                    elif meta_stripped.startswith("displayFolder:"):
-                        current_measure["displayFolder"] = meta_stripped.split(":", 1)[1].strip()
-                    elif meta_stripped.startswith("lineageTag:"):
-                        current_measure["lineageTag"] = meta_stripped.split(":", 1)[1].strip()
-                    elif meta_stripped.startswith("annotation"):
-                        pass  # ignore
-                    elif meta_stripped == "isHidden":
-                        current_measure["isHidden"] = True
-                    elif meta_stripped == "isPrivate":
-                        current_measure["isPrivate"] = True
-                    elif meta_stripped == "isAvailableInMDX":
-                        current_measure["isAvailableInMDX"] = True
-                    else:
-                        break
-                    i += 1
-
-                # table["measures"].append(current_measure)
-                continue
-
-            elif mode == "column" and line.startswith("\t\t") and current_column is not None:
-                key_val = line.strip().split(":", 1)
-                if len(key_val) == 2:
-                    k, v = key_val[0].strip(), key_val[1].strip()
-                    current_column[k] = v
-                i += 1
-                continue
 
+def _parse_tmdl_partition(lines, i, stripped):
+    """Parse a 'partition ... = m' block starting at line i; returns (partition, next index)."""
+    partition_name = stripped.split(" = m")[0].replace("partition ", "").strip()
+    if len(partition_name) > 1 and partition_name[0] == partition_name[-1] and partition_name[0] in "'\"":
+        partition_name = partition_name[1:-1]
+
+    partition = {"name": partition_name, "mode": None, "query_group": None, "m_expression": ""}
+    i += 1
+
+    # Partition metadata up to "source ="
+    while i < len(lines) and not lines[i].strip().startswith("source ="):
+        meta = lines[i].strip()
+        if meta.startswith("mode:"):
+            partition["mode"] = meta.split(":", 1)[1].strip()
+        elif meta.startswith("queryGroup:"):
+            partition["query_group"] = meta.split(":", 1)[1].strip().strip("'\"")
+        i += 1
+
+    # M expression: the block after "source =", until the indentation drops back
+    if i < len(lines):
+        i += 1
+        m_lines = []
+        indent_level = None
+        while i < len(lines):
+            line = lines[i].rstrip()
+            if indent_level is None and line.strip():
+                indent_level = len(line) - len(line.lstrip())
+            if line.strip() and len(line) - len(line.lstrip()) <= indent_level - 1:
+                if not line.strip().startswith("let") and not line.strip().startswith("in"):
+                    break
+            if line.strip():
+                m_lines.append(line[indent_level:] if len(line) >= indent_level else line.strip())
+            else:
+                m_lines.append("")
             i += 1
+        partition["m_expression"] = "\n".join(m_lines).strip()
+
+    return partition, i
+
+
+def parse_tmdl_table(lines):
+    """
+    Parse the lines of one table .tmdl file in a single pass.
+
+    Returns {"name", "properties", "display_folder", "is_hidden", "columns",
+    "measures", "partitions"}; partitions carry the M-code (see extract_m_code_from_tmdl).
+    """
+    table = {"name": None, "properties": {}, "columns": [], "measures": [], "partitions": []}
+    current_column = None
+    mode = None
+    i = 0
+    while i < len(lines):
+        line = lines[i].rstrip()
+        stripped = line.strip()
+
+        if line.startswith("table "):
+            table["name"] = line.split(" ", 1)[1].strip()
+            mode = "table"
+        elif line.startswith("\tcolumn "):
+            if current_column:
+                table["columns"].append(current_column)
+            current_column = {"name": line.split(" ", 1)[1].strip()}
+            mode = "column"
+        elif line.startswith("\tmeasure "):
+            measure, i = _parse_tmdl_measure(lines, i, line)
+            table["measures"].append(measure)
+            mode = None
+            continue
+        elif stripped.startswith("partition ") and " = m" in stripped:
+            partition, i = _parse_tmdl_partition(lines, i, stripped)
+            table["partitions"].append(partition)
+            mode = None
+            continue
+        elif mode == "column" and line.startswith("\t\t") and current_column is not None:
+            key_val = stripped.split(":", 1)
+            if len(key_val) == 2:
+                current_column[key_val[0].strip()] = key_val[1].strip()
+        elif line.startswith("\t") and not line.startswith("\t\t") and stripped:
+            if mode == "table":
+                # Table-level property: "key: value" or a bare flag such as isHidden
+                key_val = stripped.split(":", 1)
+                table["properties"][key_val[0].strip()] = key_val[1].strip() if len(key_val) == 2 else True
+            else:
+                mode = None  # other table child (hierarchy, annotation, ...), not part of a column
+        i += 1
+
+    if current_column:
+        table["columns"].append(current_column)
+
+    table["display_folder"] = table["properties"].get("displayFolder")
+    table["is_hidden"] = True if table["properties"].get("isHidden") else None
+    return table
+
+
+def read_tmdl_file(file_path):
+    """Read a .tmdl file once; returns (lines, sha256 of the raw content)."""
+    with open(file_path, "rb") as f:
+        content = f.read()
+    return content.decode("utf-8").splitlines(), hashlib.sha256(content).hexdigest()
+
+
+# TMDL file manifest ----------------------------------------------------
+#
+# Per model the size, mtime and content hash of every table .tmdl file of the
+# last successful run. A file whose size and mtime are unchanged is skipped
+# without reading it; otherwise it is read once and skipped when its hash is
+# unchanged. Manifest rows are written in the same transaction as the catalog
+# changes, so a failed run never marks files as processed. The manifest table is
+# created by db/migrations.
 
-        if current_column:
-            table["columns"].append(current_column)
+def load_tmdl_manifest(cur, model_id):
+    """Return {file_name: (file_size, file_mtime, content_hash, canonical_hash)} for a model."""
+    cur.execute("""
+        SELECT file_name, file_size, file_mtime, content_hash, canonical_hash
+        FROM catalog.pbi_tmdl_manifest
+        WHERE model_id = %s
+    """, (model_id,))
+    return {row[0]: (row[1], row[2], row[3], row[4]) for row in cur.fetchall()}
+
+
+def save_tmdl_manifest(cur, model_id, entries, removed_files, catalog_run_id):
+    """Upsert manifest entries {file_name: (size, mtime, hash, canonical_hash)} and drop removed files."""
+    for file_name, (file_size, file_mtime, content_hash, canonical_hash) in entries.items():
+        cur.execute("""
+            INSERT INTO catalog.pbi_tmdl_manifest
+            (model_id, file_name, file_size, file_mtime, content_hash, canonical_hash, catalog_run_id)
+            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (model_id, file_name) DO UPDATE
+            SET file_size = EXCLUDED.file_size,
+                file_mtime = EXCLUDED.file_mtime,
+                content_hash = EXCLUDED.content_hash,
+                canonical_hash = EXCLUDED.canonical_hash,
+                catalog_run_id = EXCLUDED.catalog_run_id,
+                date_updated = CURRENT_TIMESTAMP
+        """, (model_id, file_name, file_size, file_mtime, content_hash, canonical_hash, catalog_run_id))
+    if removed_files:
+        cur.execute("""
+            DELETE FROM catalog.pbi_tmdl_manifest
+            WHERE model_id = %s AND file_name = ANY(%s)
+        """, (model_id, list(removed_files)))
+
+
+def _canonical(value):
+    """Order-independent form of parsed TMDL objects: lists are sorted, file names left out."""
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items() if key != "file_name"}
+    if isinstance(value, (list, tuple)):
+        return sorted((_canonical(item) for item in value), key=lambda item: json.dumps(item, sort_keys=True, default=str))
+    return value
+
+
+def canonical_digest(value):
+    """sha256 of the canonical JSON form of a parsed table, relationship list or model."""
+    canonical = json.dumps(_canonical(value), sort_keys=True, default=str, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def parse_changed_tmdl_tables(tables_dir, manifest, force_full=False, file_names=None):
+    """
+    Parse only the table files that changed since the manifest was written.
+
+    Returns (tables, new_entries, removed_files, skipped_count); every parsed table
+    dict has a "file_name" key. Entries without a canonical hash (written before model
+    snapshots existed) are parsed again so the hash gets filled in. file_names limits the
+    check to those files (watch mode); a listed file that no longer exists is removed.
+    """
+    tables = []
+    new_entries = {}
+    skipped = 0
+    present = set()
+
+    if file_names is None:
+        file_paths = sorted(Path(tables_dir).glob("*.tmdl"))
+        candidates = set(manifest)
+    else:
+        file_paths = sorted(path for path in (Path(tables_dir) / name for name in file_names) if path.is_file())
+        candidates = set(manifest) & set(file_names)
+
+    for file_path in file_paths:
+        file_name = file_path.name
+        present.add(file_name)
+        stat = file_path.stat()
+        known = None if force_full else manifest.get(file_name)
+        if known and known[3] is None:
+            known = None
+
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime:
+            skipped += 1
+            continue
+
+        lines, content_hash = read_tmdl_file(file_path)
+        if known and known[2] == content_hash:
+            # Touched but not changed: only refresh size/mtime
+            new_entries[file_name] = (stat.st_size, stat.st_mtime, content_hash, known[3])
+            skipped += 1
+            continue
+
+        table = parse_tmdl_table(lines)
+        table["file_name"] = file_name
         tables.append(table)
+        new_entries[file_name] = (stat.st_size, stat.st_mtime, content_hash, canonical_digest(table))
 
-    logging.info(f"Finished parsing tables in directory: {tables_dir}")
-    return tables
+    removed_files = candidates - present
+    return tables, new_entries, removed_files, skipped
 
 
 def parse_relationships(path):
@@ -368,409 +543,676 @@ def insert_model(cur, name, catalog_run_id):
         return model_id
 
 
-def upsert_semantic_tables_temporal_with_summary(catalog_conn, model_id, table_info, catalog_run_id):
-    """Upsert semantic table with temporal versioning and return operation type"""
-    with catalog_conn.cursor() as cursor:
-        table_name = table_info.get("name")
-
-        # Check for existing current record
-        cursor.execute("""
-            SELECT id, display_folder, is_hidden, source_table
-            FROM catalog.pbi_tables
-            WHERE model_id = %s AND table_name = %s AND is_current = true
-        """, (model_id, table_name))
-
-        existing = cursor.fetchone()
-
-        if existing:
-            existing_id, existing_display_folder, existing_is_hidden, existing_source_table = existing
-
-            # Check if anything changed
-            current_display_folder = table_info.get("display_folder")
-            current_is_hidden = table_info.get("is_hidden")
-            current_source_table = table_info.get("source_table")
-
-            if (existing_display_folder != current_display_folder or
-                    existing_is_hidden != current_is_hidden or
-                    existing_source_table != current_source_table):
-
-                # Mark old record as not current
-                cursor.execute("""
-                    UPDATE catalog.pbi_tables
-                    SET is_current = false, date_updated = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (existing_id,))
-
-                # Insert new record
-                cursor.execute("""
-                    INSERT INTO catalog.pbi_tables
-                    (model_id, table_name, display_folder, is_hidden, source_table, catalog_run_id, is_current)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id
-                """, (
-                    model_id, table_name, current_display_folder, current_is_hidden,
-                    current_source_table, catalog_run_id, True
-                ))
-
-                new_id = cursor.fetchone()[0]
-                logger.info(f"Updated semantic table: {table_name} (old ID: {existing_id}, new ID: {new_id})")
-                return new_id, 'updated'  # Add operation type
-            else:
-                # No changes, just update catalog_run_id
-                cursor.execute("""
-                    UPDATE catalog.pbi_tables
-                    SET catalog_run_id = %s, date_updated = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (catalog_run_id, existing_id))
-
-                logger.debug(f"No changes for semantic table: {table_name} (ID: {existing_id})")
-                return existing_id, 'unchanged'  # Add operation type
-        else:
-            # New table
-            cursor.execute("""
-                INSERT INTO catalog.pbi_tables
-                (model_id, table_name, display_folder, is_hidden, source_table, catalog_run_id, is_current)
-                VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING id
-            """, (
-                model_id, table_name, table_info.get("display_folder"),
-                table_info.get("is_hidden"), table_info.get("source_table"),
-                catalog_run_id, True
-            ))
-
-            new_id = cursor.fetchone()[0]
-            logger.info(f"Inserted new semantic table: {table_name} (ID: {new_id})")
-            return new_id, 'added'
-
-
-def upsert_semantic_columns_temporal_with_summary(catalog_conn, semantic_table_id, column_info, catalog_run_id):
-    """Upsert semantic column with temporal versioning and return operation type"""
-    with catalog_conn.cursor() as cursor:
-        column_name = column_info.get("name")
-
-        # Check for existing current record
-        cursor.execute("""
-            SELECT id, data_type, is_hidden, format_string, display_folder
-            FROM catalog.pbi_columns
-            WHERE semantic_table_id = %s AND column_name = %s AND is_current = true
-        """, (semantic_table_id, column_name))
-
-        existing = cursor.fetchone()
-
-        if existing:
-            (existing_id, existing_data_type, existing_is_hidden,
-             existing_format_string, existing_display_folder) = existing
-
-            # Check if anything changed
-            current_data_type = column_info.get("dataType")
-            current_is_hidden = column_info.get("is_hidden")
-            current_format_string = column_info.get("format_string")
-            current_display_folder = column_info.get("display_folder")
-
-            if (existing_data_type != current_data_type or
-                    existing_is_hidden != current_is_hidden or
-                    existing_format_string != current_format_string or
-                    existing_display_folder != current_display_folder):
-
-                # Mark old record as not current
-                cursor.execute("""
-                    UPDATE catalog.pbi_columns
-                    SET is_current = false, date_updated = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (existing_id,))
-
-                # Insert new record
-                cursor.execute("""
-                    INSERT INTO catalog.pbi_columns
-                    (semantic_table_id, column_name, data_type, is_hidden,
-                     format_string, display_folder, catalog_run_id, is_current)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id
-                """, (semantic_table_id, column_name, current_data_type,
-                      current_is_hidden, current_format_string,
-                      current_display_folder, catalog_run_id, True))
-
-                new_id = cursor.fetchone()[0]
-                logger.info(f"Updated semantic column: {column_name} (old ID: {existing_id}, new ID: {new_id})")
-                return new_id, 'updated'
-            else:
-                # No changes, just update catalog_run_id
-                cursor.execute("""
-                    UPDATE catalog.pbi_columns
-                    SET catalog_run_id = %s, date_updated = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (catalog_run_id, existing_id))
-        else:
-            # New column
-            cursor.execute("""
-                INSERT INTO catalog.pbi_columns
-                (semantic_table_id, column_name, data_type, is_hidden,
-                 format_string, display_folder, catalog_run_id, is_current)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s) RETURNING id
-            """, (semantic_table_id, column_name, column_info.get("dataType"),
-                  column_info.get("is_hidden"), column_info.get("format_string"),
-                  column_info.get("display_folder"), catalog_run_id, True))
-
-            new_id = cursor.fetchone()[0]
-            logger.info(f"Inserted new semantic column: {column_name} (ID: {new_id})")
-            return new_id, 'added'
-
-
-def upsert_semantic_measures_temporal_with_summary(catalog_conn, semantic_table_id, measure_info, catalog_run_id):
-    """Upsert semantic measure with temporal versioning and return operation type"""
-    with catalog_conn.cursor() as cursor:
-        measure_name = measure_info.get("name")
-
-        # Check for existing current record
-        cursor.execute("""
-            SELECT id, dax_expression, format_string, display_folder, lineage_tag, is_hidden, is_private
-            , is_available_in_mdx FROM catalog.pbi_measures
-            WHERE semantic_table_id = %s AND measure_name = %s AND is_current = true
-        """, (semantic_table_id, measure_name))
-
-        existing = cursor.fetchone()
-
-        if existing:
-            (existing_id, existing_dax, existing_format, existing_folder,
-             existing_lineage, existing_hidden, existing_private,
-             existing_mdx) = existing
-
-            # Check if anything changed
-            current_dax = measure_info.get("expression")
-            current_format = measure_info.get("formatString")
-            current_folder = measure_info.get("displayFolder")
-            current_lineage = measure_info.get("lineageTag")
-            current_hidden = measure_info.get("isHidden", False)
-            current_private = measure_info.get("isPrivate", False)
-            current_mdx = measure_info.get("isAvailableInMDX", False)
-
-            if (existing_dax != current_dax or existing_format != current_format or
-                    existing_folder != current_folder or existing_lineage != current_lineage or
-                    existing_hidden != current_hidden or existing_private != current_private or
-                    existing_mdx != current_mdx):
+# Bulk temporal upserts ----
+# Stage the parsed objects of one kind in a temp table, diff them against the current rows
+# in SQL and apply the added/updated/unchanged/deleted sets with a handful of statements.
+
+PBI_BULK_SPECS = {
+    'tables': {
+        'target': 'catalog.pbi_tables',
+        'parent': 'model_id',
+        'keys': ['table_name'],
+        'attributes': [('display_folder', 'text'), ('is_hidden', 'boolean'), ('source_table', 'text')],
+    },
+    'columns': {
+        'target': 'catalog.pbi_columns',
+        'parent': 'semantic_table_id',
+        'keys': ['column_name'],
+        'attributes': [('data_type', 'text'), ('is_hidden', 'boolean'),
+                       ('format_string', 'text'), ('display_folder', 'text')],
+    },
+    'measures': {
+        'target': 'catalog.pbi_measures',
+        'parent': 'semantic_table_id',
+        'keys': ['measure_name'],
+        'attributes': [('dax_expression', 'text'), ('format_string', 'text'), ('display_folder', 'text'),
+                       ('lineage_tag', 'text'), ('is_hidden', 'boolean'), ('is_private', 'boolean'),
+                       ('is_available_in_mdx', 'boolean')],
+    },
+    'relationships': {
+        'target': 'catalog.pbi_relationships',
+        'parent': 'model_id',
+        'keys': ['from_table', 'from_column', 'to_table', 'to_column'],
+        'attributes': [('is_active', 'boolean'), ('relationship_type', 'text'), ('cross_filter', 'text')],
+    },
+}
 
-                # Mark old record as not current
-                cursor.execute("""
-                    UPDATE catalog.pbi_measures
-                    SET is_current = false, date_updated = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (existing_id,))
 
-                # Insert new record
-                cursor.execute("""
-                    INSERT INTO catalog.pbi_measures
-                    (semantic_table_id, measure_name, dax_expression, format_string, display_folder,
-                     lineage_tag, is_hidden, is_private, is_available_in_mdx, catalog_run_id, is_current)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id
-                """, (semantic_table_id, measure_name, current_dax, current_format, current_folder,
-                      current_lineage, current_hidden, current_private, current_mdx, catalog_run_id, True))
+def bulk_upsert_temporal_with_summary(cur, kind, model_id, rows, catalog_run_id, table_names=None):
+    """
+    Temporal upsert of one object kind of PBI_BULK_SPECS (tables, columns, measures or relationships).
+
+    rows are tuples in the order (parent_id, [table_name,] keys..., attributes...) of PBI_BULK_SPECS[kind];
+    column and measure rows carry the table name so they match current rows of any version of their table.
+    When a key has several current rows (children left on a superseded table version) the newest one is
+    compared and the others are closed. Current rows that are not staged are marked deleted. table_names
+    limits that comparison to the given semantic tables (None compares the whole model).
+
+    Returns ({'added', 'updated', 'unchanged', 'deleted', 'total_processed'}, [(deleted_id, keys...)]).
+    """
+    spec = PBI_BULK_SPECS[kind]
+    target = spec['target']
+    per_table = spec['parent'] == 'semantic_table_id'
+    match = (['table_name'] if per_table else []) + spec['keys']
+    attributes = [name for name, _ in spec['attributes']]
+    key_defs = [f"{name} text" for name in match]
+    attribute_defs = [f"{name} {sql_type}" for name, sql_type in spec['attributes']]
+
+    cur.execute(f"""
+        CREATE TEMP TABLE tmp_pbi_stage (
+            parent_id integer, {', '.join(key_defs + attribute_defs)}
+        ) ON COMMIT DROP
+    """)
+    if rows:
+        execute_values(cur, "INSERT INTO tmp_pbi_stage VALUES %s", rows, page_size=1000)
+
+    # Current rows in scope
+    if per_table:
+        existing_sql = f"""
+            SELECT x.id, t.table_name, {', '.join('x.' + c for c in spec['keys'] + attributes)}
+            FROM {target} x
+            JOIN catalog.pbi_tables t ON t.id = x.semantic_table_id
+            WHERE t.model_id = %s AND x.is_current = true
+        """
+        scope_column = 't.table_name'
+    else:
+        existing_sql = f"""
+            SELECT x.id, {', '.join('x.' + c for c in spec['keys'] + attributes)}
+            FROM {target} x
+            WHERE x.model_id = %s AND x.is_current = true
+        """
+        scope_column = 'x.table_name'
+    params = [model_id]
+    if table_names is not None:
+        existing_sql += f" AND {scope_column} = ANY(%s)"
+        params.append(list(table_names))
+    cur.execute(f"CREATE TEMP TABLE tmp_pbi_current ON COMMIT DROP AS {existing_sql}", params)
+
+    # One current row per key: the newest; older duplicates are closed so they cannot match twice
+    cur.execute(f"""
+        CREATE TEMP TABLE tmp_pbi_existing ON COMMIT DROP AS
+        SELECT DISTINCT ON ({', '.join(match)}) *
+        FROM tmp_pbi_current
+        ORDER BY {', '.join(match)}, id DESC
+    """)
+    cur.execute(f"""
+        UPDATE {target} x
+        SET is_current = false, date_updated = CURRENT_TIMESTAMP
+        FROM tmp_pbi_current c
+        WHERE x.id = c.id
+          AND NOT EXISTS (SELECT 1 FROM tmp_pbi_existing e WHERE e.id = c.id)
+    """)
+    if cur.rowcount:
+        logger.warning(f"Bulk upsert {kind}: closed {cur.rowcount} duplicate current rows")
+
+    # Classify staged and existing rows
+    join_on = ' AND '.join(f"e.{c} = s.{c}" for c in match)
+    cur.execute(f"""
+        CREATE TEMP TABLE tmp_pbi_diff ON COMMIT DROP AS
+        SELECT s.*, e.id AS existing_id,
+               CASE WHEN e.id IS NULL THEN 'added'
+                    WHEN ({', '.join('s.' + c for c in attributes)})
+                         IS DISTINCT FROM ({', '.join('e.' + c for c in attributes)}) THEN 'updated'
+                    ELSE 'unchanged'
+               END AS operation
+        FROM tmp_pbi_stage s
+        LEFT JOIN tmp_pbi_existing e ON {join_on}
+    """)
+    cur.execute(f"""
+        INSERT INTO tmp_pbi_diff ({', '.join(match)}, existing_id, operation)
+        SELECT {', '.join('e.' + c for c in match)}, e.id, 'deleted'
+        FROM tmp_pbi_existing e
+        WHERE NOT EXISTS (SELECT 1 FROM tmp_pbi_stage s WHERE {join_on})
+    """)
+
+    # Apply: close changed versions, mark deletions, touch unchanged rows, insert new versions
+    cur.execute(f"""
+        UPDATE {target} x
+        SET is_current = false, date_updated = CURRENT_TIMESTAMP
+        FROM tmp_pbi_diff d
+        WHERE x.id = d.existing_id AND d.operation = 'updated'
+    """)
+    cur.execute(f"""
+        UPDATE {target} x
+        SET is_current = false, date_deleted = CURRENT_TIMESTAMP,
+            deleted_by_catalog_run_id = %s, date_updated = CURRENT_TIMESTAMP
+        FROM tmp_pbi_diff d
+        WHERE x.id = d.existing_id AND d.operation = 'deleted'
+    """, (catalog_run_id,))
+    # Unchanged rows follow a new version of their table
+    cur.execute(f"""
+        UPDATE {target} x
+        SET catalog_run_id = %s, date_updated = CURRENT_TIMESTAMP, {spec['parent']} = d.parent_id
+        FROM tmp_pbi_diff d
+        WHERE x.id = d.existing_id AND d.operation = 'unchanged'
+    """, (catalog_run_id,))
+    insert_columns = [spec['parent']] + spec['keys'] + attributes
+    cur.execute(f"""
+        INSERT INTO {target}
+        ({', '.join(insert_columns)}, catalog_run_id, is_current)
+        SELECT {', '.join(['parent_id'] + spec['keys'] + attributes)}, %s, true
+        FROM tmp_pbi_diff
+        WHERE operation IN ('added', 'updated')
+    """, (catalog_run_id,))
+
+    cur.execute("SELECT operation, count(*) FROM tmp_pbi_diff GROUP BY operation")
+    summary = {'added': 0, 'updated': 0, 'unchanged': 0, 'deleted': 0}
+    summary.update({operation: count for operation, count in cur.fetchall()})
+    summary['total_processed'] = len(rows)
+
+    cur.execute(f"SELECT existing_id, {', '.join(match)} FROM tmp_pbi_diff WHERE operation = 'deleted'")
+    deleted = cur.fetchall()
+
+    cur.execute("DROP TABLE tmp_pbi_stage, tmp_pbi_current, tmp_pbi_existing, tmp_pbi_diff")
+
+    logger.info(
+        f"Bulk upsert {kind}: {summary['added']} added, {summary['updated']} updated, "
+        f"{summary['unchanged']} unchanged, {summary['deleted']} deleted"
+    )
+    return summary, deleted
 
-                new_id = cursor.fetchone()[0]
-                logger.info(f"Updated semantic measure: {measure_name} (old ID: {existing_id}, new ID: {new_id})")
-                return new_id, 'updated'
-            else:
-                # No changes, just update catalog_run_id
-                cursor.execute("""
-                    UPDATE catalog.pbi_measures
-                    SET catalog_run_id = %s, date_updated = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (catalog_run_id, existing_id))
 
-                logger.debug(f"No changes for semantic measure: {measure_name} (ID: {existing_id})")
-                return existing_id, 'unchanged'
+def get_current_table_ids(cur, model_id, table_names):
+    """Return {table_name: id} of the current versions of the given semantic tables."""
+    cur.execute("""
+        SELECT table_name, id
+        FROM catalog.pbi_tables
+        WHERE model_id = %s AND is_current = true AND table_name = ANY(%s)
+    """, (model_id, list(table_names)))
+    return dict(cur.fetchall())
+
+
+# DAX dependencies ----
+
+DAX_TOKEN_RE = re.compile(r"""
+      (?P<comment>//[^\n]*|--[^\n]*|/\*.*?\*/)
+    | (?P<string>"(?:[^"]|"")*")
+    | (?P<quoted>'(?:[^']|'')*')
+    | (?P<bracket>\[(?:[^\]]|\]\])*\])
+    | (?P<word>[A-Za-z_][A-Za-z0-9_.]*)
+    | (?P<other>\S)
+""", re.VERBOSE | re.DOTALL)
+
+# Words that can directly precede a [reference] without being its table
+DAX_KEYWORDS = {'RETURN', 'VAR', 'IN', 'NOT', 'AND', 'OR', 'ASC', 'DESC', 'DEFINE', 'EVALUATE', 'MEASURE', 'ORDER', 'BY'}
+
+
+def tokenize_dax(expression):
+    """Split a DAX expression into (kind, text) tokens; comments and whitespace are dropped."""
+    return [
+        (match.lastgroup, match.group())
+        for match in DAX_TOKEN_RE.finditer(expression or '')
+        if match.lastgroup != 'comment'
+    ]
+
+
+def extract_dax_references(expression):
+    """
+    Return the distinct references in a DAX expression as (table, name) tuples, in order of appearance.
+
+    table is None for unqualified [Name] references: a measure, or a column of the measure's own table.
+    """
+    references = []
+    previous = None
+    for kind, text in tokenize_dax(expression):
+        if kind == 'bracket':
+            table = None
+            if previous and previous[0] == 'quoted':
+                table = previous[1][1:-1].replace("''", "'")
+            elif previous and previous[0] == 'word' and previous[1].upper() not in DAX_KEYWORDS:
+                table = previous[1]
+            reference = (table, text[1:-1].replace(']]', ']'))
+            if reference not in references:
+                references.append(reference)
+        previous = (kind, text)
+    return references
+
+
+def resolve_dax_references(home_table, references, measures_by_name, column_keys):
+    """
+    Resolve references of a measure in home_table to ('measure', table, name) / ('column', table, name).
+
+    measures_by_name maps lower-cased measure names to (table, measure); column_keys maps
+    (table.lower(), column.lower()) to (table, column). Returns (resolved, unresolved_count).
+    """
+    resolved = []
+    unresolved = 0
+    for table, name in references:
+        target = None
+        if table is None:
+            if name.lower() in measures_by_name:
+                target = ('measure',) + measures_by_name[name.lower()]
+            elif (home_table.lower(), name.lower()) in column_keys:
+                target = ('column',) + column_keys[(home_table.lower(), name.lower())]
+        elif (table.lower(), name.lower()) in column_keys:
+            target = ('column',) + column_keys[(table.lower(), name.lower())]
+        elif name.lower() in measures_by_name:
+            # Table[Measure] is valid DAX as well
+            target = ('measure',) + measures_by_name[name.lower()]
+
+        if target is None:
+            unresolved += 1
+        elif target not in resolved:
+            resolved.append(target)
+    return resolved, unresolved
+
+
+# M-code source lineage ----
+# Lightweight Power Query M parser: resolves Sql.Database / Sql.Databases / PostgreSQL.Database sources,
+# {[Schema=..., Item=...]} / {[Name=...]} navigation and native SQL (Value.NativeQuery, [Query=...])
+# to the (server, database, schema, table) objects a partition reads.
+
+M_SOURCE_FUNCTIONS = {
+    'Sql.Database': 'sqlserver',
+    'Sql.Databases': 'sqlserver',
+    'PostgreSQL.Database': 'postgresql',
+}
+M_DEFAULT_SCHEMA = {'sqlserver': 'dbo', 'postgresql': 'public'}
+
+M_STRING_OR_COMMENT_RE = re.compile(r'"(?:[^"]|"")*"|//[^\n]*|/\*.*?\*/', re.DOTALL)
+M_STRING_RE = re.compile(r'"((?:[^"]|"")*)"')
+M_SOURCE_CALL_RE = re.compile(r'\b(Sql\.Databases?|PostgreSQL\.Database)\s*\(')
+M_NATIVE_QUERY_RE = re.compile(r'\bValue\.NativeQuery\s*\(')
+M_NAVIGATION_RE = re.compile(r'\{\s*\[([^\[\]{}]*)\]\s*\}')
+M_NAVIGATION_FIELD_RE = re.compile(r'(\w+)\s*=\s*"((?:[^"]|"")*)"')
+M_IDENTIFIER_END_RE = re.compile(r'(#"(?:[^"]|"")*"|[A-Za-z_][\w.]*)\s*$')
+M_QUERY_OPTION_RE = re.compile(r'\bQuery\s*=\s*"((?:[^"]|"")*)"')
+
+SQL_COMMENT_RE = re.compile(r'--[^\n]*|/\*.*?\*/', re.DOTALL)
+SQL_IDENTIFIER = r'(?:\[[^\]]+\]|"[^"]+"|`[^`]+`|[A-Za-z_#@][\w$#@]*)'
+SQL_TABLE_RE = re.compile(
+    r'\b(?:FROM|JOIN)\s+(' + SQL_IDENTIFIER + r'(?:\s*\.\s*' + SQL_IDENTIFIER + r'){0,3})(\s*\()?',
+    re.IGNORECASE
+)
+SQL_CTE_RE = re.compile(r'(?:\bWITH|,)\s*(' + SQL_IDENTIFIER + r')\s+AS\s*\(', re.IGNORECASE)
+
+
+def _mask_m_strings(text):
+    """Blank out the contents of string literals so structure can be searched without false hits."""
+    return M_STRING_RE.sub(lambda match: '"' + ' ' * (len(match.group()) - 2) + '"', text)
+
+
+def _m_unquote(literal):
+    return literal.strip()[1:-1].replace('""', '"')
+
+
+def _m_step_name(name):
+    name = name.strip()
+    return _m_unquote(name[1:]) if name.startswith('#"') else name
+
+
+def _split_m_top_level(text, masked, start, end, separator=','):
+    """Split text[start:end] on separators outside brackets (masked has string contents blanked)."""
+    parts = []
+    depth = 0
+    part_start = start
+    for i in range(start, end):
+        c = masked[i]
+        if c in '([{':
+            depth += 1
+        elif c in ')]}':
+            depth -= 1
+        elif c == separator and depth == 0:
+            parts.append((part_start, i))
+            part_start = i + 1
+    parts.append((part_start, end))
+    return parts
+
+
+def _m_closing_paren(masked, open_index):
+    depth = 0
+    for i in range(open_index, len(masked)):
+        if masked[i] in '([{':
+            depth += 1
+        elif masked[i] in ')]}':
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(masked)
+
+
+def _m_call_arguments(text, masked, open_index):
+    """Return the argument texts of the call whose '(' is at open_index."""
+    close_index = _m_closing_paren(masked, open_index)
+    return [text[a:b].strip() for a, b in _split_m_top_level(text, masked, open_index + 1, close_index)]
+
+
+def _m_string_value(argument):
+    argument = argument.strip()
+    if len(argument) >= 2 and argument.startswith('"') and argument.endswith('"'):
+        return _m_unquote(argument)
+    return None
+
+
+def extract_sql_tables(sql, default_schema=None):
+    """Return the distinct (database, schema, table) objects read by a SQL statement (FROM/JOIN)."""
+    sql = SQL_COMMENT_RE.sub(' ', sql or '')
+    ctes = {name.strip('[]"`').lower() for name in SQL_CTE_RE.findall(sql)}
+    tables = []
+    for match in SQL_TABLE_RE.finditer(sql):
+        if match.group(2):
+            continue  # table-valued function
+        parts = [part.strip().strip('[]"`') for part in re.findall(SQL_IDENTIFIER, match.group(1))]
+        if parts[-1].lower() in ctes or parts[-1].startswith(('#', '@')):
+            continue
+        if len(parts) == 1:
+            table = (None, default_schema, parts[0])
         else:
-            # New measure
-            cursor.execute("""
-                INSERT INTO catalog.pbi_measures
-                (semantic_table_id, measure_name, dax_expression, format_string, display_folder,
-                 lineage_tag, is_hidden, is_private, is_available_in_mdx, catalog_run_id, is_current)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id
-            """, (semantic_table_id, measure_info.get("name"), measure_info.get("expression"),
-                  measure_info.get("formatString"), measure_info.get("displayFolder"),
-                  measure_info.get("lineageTag"), measure_info.get("isHidden", False),
-                  measure_info.get("isPrivate", False), measure_info.get("isAvailableInMDX", False),
-                  catalog_run_id, True))
-
-            new_id = cursor.fetchone()[0]
-            logger.info(f"Inserted new semantic measure: {measure_info.get('name')} (ID: {new_id})")
-            return new_id, 'added'
-
-
-def upsert_semantic_relationships_temporal_with_summary(catalog_conn, model_id, relationship_info, catalog_run_id):
-    """Upsert semantic relationship with temporal versioning and return operation type"""
-    with catalog_conn.cursor() as cursor:
-        from_table = relationship_info["fromTable"]
-        from_column = relationship_info["fromColumn"]
-        to_table = relationship_info["toTable"]
-        to_column = relationship_info["toColumn"]
-
-        # Check for existing current record
-        cursor.execute("""
-            SELECT id, is_active, relationship_type, cross_filter
-            FROM catalog.pbi_relationships
-            WHERE model_id = %s AND from_table = %s AND from_column = %s
-            AND to_table = %s AND to_column = %s AND is_current = true
-        """, (model_id, from_table, from_column, to_table, to_column))
-
-        existing = cursor.fetchone()
-
-        if existing:
-            existing_id, existing_active, existing_type, existing_filter = existing
-
-            # Check if anything changed
-            current_active = relationship_info.get("isActive", True)
-            current_type = relationship_info.get("relationship_type")
-            current_filter = relationship_info.get("cross_filter")
-
-            if (existing_active != current_active or existing_type != current_type or
-                    existing_filter != current_filter):
-
-                # Mark old record as not current
-                cursor.execute("""
-                    UPDATE catalog.pbi_relationships
-                    SET is_current = false, date_updated = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (existing_id,))
-
-                # Insert new record
-                cursor.execute("""
-                    INSERT INTO catalog.pbi_relationships
-                    (model_id, from_table, from_column, to_table, to_column, is_active,
-                     relationship_type, cross_filter, catalog_run_id, is_current)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id
-                """, (model_id, from_table, from_column, to_table, to_column, current_active,
-                      current_type, current_filter, catalog_run_id, True))
+            table = (parts[-3] if len(parts) >= 3 else None, parts[-2], parts[-1])
+        if table not in tables:
+            tables.append(table)
+    return tables
 
-                new_id = cursor.fetchone()[0]
-                logger.info(
-                    f"Updated semantic relationship: {from_table}.{from_column} -> "
-                    f"{to_table}.{to_column} (old ID: {existing_id}, new ID: {new_id})"
-                )
-                return new_id, 'updated'
-            else:
-                # No changes, just update catalog_run_id
-                cursor.execute("""
-                    UPDATE catalog.pbi_relationships
-                    SET catalog_run_id = %s, date_updated = CURRENT_TIMESTAMP
-                    WHERE id = %s
-                """, (catalog_run_id, existing_id))
 
-                logger.debug(
-                    f"No changes for semantic relationship: {from_table}.{from_column} -> "
-                    f"{to_table}.{to_column} (ID: {existing_id})"
-                )
-                return existing_id, 'unchanged'
+def _apply_m_navigation(binding, fields):
+    """Apply one {[...]} navigation step; returns (new_binding, table_or_None)."""
+    if binding is None:
+        return None, None
+    binding = dict(binding)
+    if 'Item' in fields:
+        schema = fields.get('Schema') or binding.get('schema') or M_DEFAULT_SCHEMA.get(binding['source_kind'])
+        if binding.get('database'):
+            return binding, (binding['database'], schema, fields['Item'])
+        return binding, None
+    if 'Name' in fields:
+        if not binding.get('database'):
+            binding['database'] = fields['Name']
+        elif not binding.get('schema'):
+            if fields.get('Kind', '').lower() in ('table', 'view'):
+                return binding, (binding['database'], M_DEFAULT_SCHEMA.get(binding['source_kind']), fields['Name'])
+            binding['schema'] = fields['Name']
         else:
-            # New relationship
-            cursor.execute("""
-                INSERT INTO catalog.pbi_relationships
-                (model_id, from_table, from_column, to_table, to_column, is_active,
-                 relationship_type, cross_filter, catalog_run_id, is_current)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id
-            """, (
-                model_id, from_table, from_column, to_table, to_column,
-                relationship_info.get("isActive", True),
-                relationship_info.get("relationship_type"),
-                relationship_info.get("cross_filter"),
-                catalog_run_id, True
-            ))
+            return binding, (binding['database'], binding['schema'], fields['Name'])
+    return binding, None
+
+
+def parse_m_sources(m_code):
+    """
+    Resolve the relational sources of a Power Query M expression.
+
+    Returns {'source_kind', 'server', 'database', 'tables': [(server, database, schema, table)],
+    'native_queries'}; tables is empty when nothing could be resolved.
+    """
+    text = M_STRING_OR_COMMENT_RE.sub(lambda match: match.group() if match.group().startswith('"') else ' ', m_code or '')
+    masked = _mask_m_strings(text)
+    result = {'source_kind': None, 'server': None, 'database': None, 'tables': [], 'native_queries': 0}
+
+    # let <step>, <step>, ... in <expression>
+    let_match = re.match(r'\s*let\b', masked)
+    if let_match:
+        in_positions = [m.start() for m in re.finditer(r'\bin\b', masked)]
+        body_end = in_positions[-1] if in_positions else len(masked)
+        spans = _split_m_top_level(text, masked, let_match.end(), body_end)
+    else:
+        spans = [(0, len(text))]
+
+    steps = {}
+
+    def add_table(binding, table):
+        database, schema, name = table
+        entry = (binding.get('server'), database or binding.get('database'), schema, name)
+        if entry[1] and entry[2] and entry not in result['tables']:
+            result['tables'].append(entry)
+
+    def add_sql(binding, sql):
+        result['native_queries'] += 1
+        for table in extract_sql_tables(sql, M_DEFAULT_SCHEMA.get(binding['source_kind'])):
+            add_table(binding, table)
+
+    for span_start, span_end in spans:
+        step_masked = masked[span_start:span_end]
+        assignment = re.match(r'\s*(#"[^"]*"|[A-Za-z_][\w.]*)\s*=(?!=)', step_masked)
+        name = _m_step_name(text[span_start + assignment.start(1):span_start + assignment.end(1)]) if assignment else None
+        expr_start = span_start + (assignment.end() if assignment else 0)
+        expr_masked = masked[expr_start:span_end]
+        binding = None
+
+        call = M_SOURCE_CALL_RE.search(expr_masked)
+        if call:
+            arguments = _m_call_arguments(text, masked, expr_start + call.end() - 1)
+            binding = {
+                'source_kind': M_SOURCE_FUNCTIONS[call.group(1)],
+                'server': _m_string_value(arguments[0]) if arguments else None,
+                'database': _m_string_value(arguments[1]) if call.group(1) != 'Sql.Databases' and len(arguments) > 1 else None,
+                'schema': None
+            }
+            for key in ('source_kind', 'server', 'database'):
+                result[key] = result[key] or binding[key]
+            if len(arguments) > 2:
+                query = M_QUERY_OPTION_RE.search(arguments[2])
+                if query:
+                    add_sql(binding, query.group(1).replace('""', '"'))
+
+        previous_end = 0
+        for navigation in M_NAVIGATION_RE.finditer(expr_masked):
+            # Navigation on a step reference starts from that step's binding, otherwise it chains
+            base = M_IDENTIFIER_END_RE.search(expr_masked[previous_end:navigation.start()])
+            if base:
+                offset = expr_start + previous_end
+                base_name = _m_step_name(text[offset + base.start(1):offset + base.end(1)])
+                if base_name in steps:
+                    binding = steps[base_name]
+            record = text[expr_start + navigation.start(1):expr_start + navigation.end(1)]
+            fields = {key: value.replace('""', '"') for key, value in M_NAVIGATION_FIELD_RE.findall(record)}
+            binding, table = _apply_m_navigation(binding, fields)
+            if table:
+                add_table(binding, table)
+            previous_end = navigation.end()
+
+        for native in M_NATIVE_QUERY_RE.finditer(expr_masked):
+            arguments = _m_call_arguments(text, masked, expr_start + native.end() - 1)
+            target = steps.get(_m_step_name(arguments[0])) if arguments else None
+            sql = _m_string_value(arguments[1]) if len(arguments) > 1 else None
+            if target and sql:
+                add_sql(target, sql)
+
+        if name and binding:
+            steps[name] = binding
+
+    return result
+
+
+def _normalize_server(server):
+    """Lower-case host without protocol prefix and port: 'tcp:Srv.x.net,1433' -> 'srv.x.net'."""
+    server = (server or '').strip().lower()
+    if server.startswith('tcp:'):
+        server = server[4:]
+    return re.split(r'[,:]', server)[0]
+
+
+def resolve_m_source_tables(cur, sources):
+    """
+    Resolve (server, database, schema, table) sources to DB_TABLE/DB_VIEW node_ids.
+
+    A table matches on database/schema/table name (case-insensitive); when several servers have it the
+    server must match as well (full host name or its first label). Returns {source: node_id}.
+    """
+    if not sources:
+        return {}
+    keys = sorted({(database, schema, table) for _, database, schema, table in sources})
+    candidates = execute_values(cur, """
+        SELECT v.database_name, v.schema_name, v.table_name, n.node_id, d.server_name
+        FROM (VALUES %s) AS v(database_name, schema_name, table_name)
+        JOIN catalog.node_database d ON lower(d.database_name) = lower(v.database_name)
+        JOIN catalog.node_schema s ON s.database_node_id = d.node_id AND lower(s.schema_name) = lower(v.schema_name)
+        JOIN catalog.node_table t ON t.schema_node_id = s.node_id AND lower(t.table_name) = lower(v.table_name)
+        JOIN catalog.nodes n ON n.node_id = t.node_id
+        WHERE n.node_type IN ('DB_TABLE', 'DB_VIEW') AND n.deleted_in_run_id IS NULL
+    """, keys, page_size=len(keys), fetch=True)
+
+    by_key = {}
+    for database, schema, table, node_id, server_name in candidates:
+        by_key.setdefault((database, schema, table), []).append((node_id, _normalize_server(server_name)))
+
+    resolved = {}
+    for source in sources:
+        server, database, schema, table = source
+        options = by_key.get((database, schema, table), [])
+        wanted = _normalize_server(server)
+        matches = [node_id for node_id, host in options if host == wanted]
+        if not matches and wanted:
+            matches = [node_id for node_id, host in options if host.split('.')[0] == wanted.split('.')[0]]
+        if not matches and len(options) == 1:
+            matches = [options[0][0]]
+        if len(matches) == 1:
+            resolved[source] = matches[0]
+    return resolved
+
+
+# Node graph ----
+# The current state of a semantic model is projected onto catalog.nodes (PBI_MODEL, PBI_TABLE,
+# PBI_COLUMN, PBI_MEASURE, PBI_QUERY) so dependencies can be stored as rel.edge rows.
+
+DAX_EDGE_TYPES = ('DAX_MEASURE_REF', 'DAX_COLUMN_REF')
+M_SOURCE_EDGE_TYPE = 'M_SOURCE_TABLE'
+
+
+def pbi_qualified_name(model_name, table_name=None, object_name=None):
+    """pbi/<model>, pbi/<model>/<table> and pbi/<model>/<table>[<column or measure>]; queries use <table>/<partition>"""
+    qualified_name = f"pbi/{model_name}"
+    if table_name is not None:
+        qualified_name += f"/{table_name}"
+    if object_name is not None:
+        qualified_name += f"[{object_name}]"
+    return qualified_name
+
+
+def load_current_model_objects(cur, model_id):
+    """Return (tables, columns, measures, partitions) of the current version of a semantic model."""
+    cur.execute("""
+        SELECT table_name, is_hidden
+        FROM catalog.pbi_tables
+        WHERE model_id = %s AND is_current = true
+    """, (model_id,))
+    tables = cur.fetchall()
+    cur.execute("""
+        SELECT t.table_name, c.column_name, c.data_type
+        FROM catalog.pbi_columns c
+        JOIN catalog.pbi_tables t ON t.id = c.semantic_table_id
+        WHERE t.model_id = %s AND t.is_current = true AND c.is_current = true
+    """, (model_id,))
+    columns = cur.fetchall()
+    cur.execute("""
+        SELECT t.table_name, m.measure_name, m.dax_expression, m.format_string, m.is_hidden
+        FROM catalog.pbi_measures m
+        JOIN catalog.pbi_tables t ON t.id = m.semantic_table_id
+        WHERE t.model_id = %s AND t.is_current = true AND m.is_current = true
+    """, (model_id,))
+    measures = cur.fetchall()
+    cur.execute("""
+        SELECT t.table_name, p.partition_name, p.m_expression
+        FROM catalog.pbi_m_code p
+        JOIN catalog.pbi_tables t ON t.id = p.semantic_table_id
+        WHERE t.model_id = %s AND t.is_current = true AND p.is_current = true
+    """, (model_id,))
+    partitions = cur.fetchall()
+    return tables, columns, measures, partitions
+
+
+def write_pbi_model_graph(cur, model_id, model_name, catalog_run_id):
+    """
+    Project the current semantic model onto catalog.nodes and write its DAX dependency edges.
+
+    Measures get DAX_MEASURE_REF / DAX_COLUMN_REF edges (rel.edge, measure -> referenced object);
+    M-code partitions become PBI_QUERY nodes with M_SOURCE_TABLE edges to the DW tables they read.
+    Nodes of the model that are no longer present are marked deleted. Returns a summary dict.
+    """
+    tables, columns, measures, partitions = load_current_model_objects(cur, model_id)
+    model_qn = pbi_qualified_name(model_name)
+    partition_sources = {
+        (table, partition): parse_m_sources(m_expression) for table, partition, m_expression in partitions
+    }
 
-            new_id = cursor.fetchone()[0]
-            logger.info(
-                f"Inserted new semantic relationship: {from_table}.{from_column} -> "
-                f"{to_table}.{to_column} (ID: {new_id})"
-            )
-            return new_id, 'added'
+    nodes = [('PBI_MODEL', model_name, model_qn, None)]
+    nodes += [('PBI_TABLE', table, pbi_qualified_name(model_name, table), None) for table, _ in tables]
+    nodes += [('PBI_COLUMN', column, pbi_qualified_name(model_name, table, column), None) for table, column, _ in columns]
+    nodes += [('PBI_MEASURE', measure, pbi_qualified_name(model_name, table, measure), None) for table, measure, *_ in measures]
+    nodes += [('PBI_QUERY', partition, f"{pbi_qualified_name(model_name, table)}/{partition}", None)
+              for table, partition, _ in partitions]
+    node_ids, _ = upsert_nodes_bulk(cur, nodes, catalog_run_id)
+
+    model_node_id = node_ids[model_qn]
+    table_node_ids = {table: node_ids[pbi_qualified_name(model_name, table)] for table, _ in tables}
+    upsert_node_details_bulk(cur, 'catalog.node_pbi_model', [(model_node_id, model_name)])
+    upsert_node_details_bulk(cur, 'catalog.node_table', [
+        (table_node_ids[table], model_node_id, table, 'PBI_TABLE') for table, _ in tables
+    ])
+    upsert_node_details_bulk(cur, 'catalog.node_column', [
+        (node_ids[pbi_qualified_name(model_name, table, column)], table_node_ids[table], column, data_type or 'unknown', None)
+        for table, column, data_type in columns if table in table_node_ids
+    ])
+    upsert_node_details_bulk(cur, 'catalog.node_pbi_measure', [
+        (node_ids[pbi_qualified_name(model_name, table, measure)], table_node_ids[table],
+         measure, 'unknown', dax or '', format_string, is_hidden)
+        for table, measure, dax, format_string, is_hidden in measures if table in table_node_ids
+    ])
+    query_details = []
+    for table, partition, m_expression in partitions:
+        sources = partition_sources[(table, partition)]
+        source_path = '/'.join(part for part in (sources['server'], sources['database']) if part) or None
+        query_details.append((
+            node_ids[f"{pbi_qualified_name(model_name, table)}/{partition}"], model_node_id,
+            table_node_ids.get(table), partition, sources['source_kind'], source_path, m_expression,
+            json.dumps({'tables': [list(source) for source in sources['tables']],
+                        'native_queries': sources['native_queries']})
+        ))
+    upsert_node_details_bulk(cur, 'catalog.node_pbi_query', query_details)
+
+    # DAX dependencies of all measures of the model
+    measures_by_name = {measure.lower(): (table, measure) for table, measure, *_ in measures}
+    column_keys = {(table.lower(), column.lower()): (table, column) for table, column, _ in columns}
+    edges = []
+    unresolved = 0
+    for table, measure, dax, *_ in measures:
+        src_node_id = node_ids[pbi_qualified_name(model_name, table, measure)]
+        resolved, missing = resolve_dax_references(table, extract_dax_references(dax), measures_by_name, column_keys)
+        unresolved += missing
+        for kind, ref_table, ref_name in resolved:
+            dst_node_id = node_ids[pbi_qualified_name(model_name, ref_table, ref_name)]
+            if dst_node_id != src_node_id:
+                edges.append((src_node_id, dst_node_id, f'DAX_{kind.upper()}_REF', None, None))
+
+    # M-code lineage: partition -> DW table
+    all_sources = {source for sources in partition_sources.values() for source in sources['tables']}
+    source_node_ids = resolve_m_source_tables(cur, all_sources)
+    unresolved_sources = len(all_sources) - len(source_node_ids)
+    source_edges = 0
+    for (table, partition), sources in partition_sources.items():
+        src_node_id = node_ids[f"{pbi_qualified_name(model_name, table)}/{partition}"]
+        for dst_node_id in dict.fromkeys(source_node_ids[s] for s in sources['tables'] if s in source_node_ids):
+            edges.append((src_node_id, dst_node_id, M_SOURCE_EDGE_TYPE, None, None))
+            source_edges += 1
+
+    # Edges are marked seen in this run; the model's edges that were not seen are removed
+    ensure_loader_tables(cur)
+    upsert_edges_bulk(cur, edges, catalog_run_id)
+    sweep_edges_by_prefix(cur, catalog_run_id, list(DAX_EDGE_TYPES) + [M_SOURCE_EDGE_TYPE], model_qn)
+
+    # Objects that left the model
+    nodes_deleted = sweep_nodes_by_prefix(cur, catalog_run_id, ['PBI_TABLE', 'PBI_COLUMN', 'PBI_MEASURE', 'PBI_QUERY'], model_qn)
+
+    graph_summary = {
+        'nodes': len(nodes),
+        'nodes_deleted': nodes_deleted,
+        'measure_edges': sum(1 for edge in edges if edge[2] == 'DAX_MEASURE_REF'),
+        'column_edges': sum(1 for edge in edges if edge[2] == 'DAX_COLUMN_REF'),
+        'unresolved_references': unresolved,
+        'source_edges': source_edges,
+        'unresolved_sources': unresolved_sources
+    }
+    logger.info(
+        f"Node graph for {model_name}: {graph_summary['nodes']} nodes ({nodes_deleted} deleted), "
+        f"{graph_summary['measure_edges']} measure and {graph_summary['column_edges']} column references, "
+        f"{unresolved} unresolved"
+    )
+    logger.info(f"M-code lineage for {model_name}: {source_edges} source table edges, {unresolved_sources} sources not in the catalog")
+    return graph_summary
 
 
 def extract_m_code_from_tmdl(file_path):
     """Extract M-code partition information from .tmdl file"""
-    logger.debug(f"Extracting M-code from: {file_path}")
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    logger.debug(f"File has {len(lines)} lines")
-
-    partitions = []
-    i = 0
-
-    while i < len(lines):
-        line = lines[i].strip()
-
-        # Look for partition definition
-        if line.startswith("partition ") and " = m" in line:
-            partition_name = line.split(" = m")[0].replace("partition ", "").strip()
-
-            # Remove quotes if present
-            if partition_name.startswith("'") and partition_name.endswith("'"):
-                partition_name = partition_name[1:-1]
-            elif partition_name.startswith('"') and partition_name.endswith('"'):
-                partition_name = partition_name[1:-1]
-
-            logger.debug(f"Found partition: '{partition_name}' at line {i}")
-
-            partition_info = {
-                "name": partition_name,
-                "mode": None,
-                "query_group": None,
-                "m_expression": ""
-            }
-
-            i += 1
-
-            # Parse partition metadata
-            while i < len(lines) and not lines[i].strip().startswith("source ="):
-                line = lines[i].strip()
-
-                if line.startswith("mode:"):
-                    partition_info["mode"] = line.split(":", 1)[1].strip()
-                    logger.debug(f"  Mode: {partition_info['mode']}")
-                elif line.startswith("queryGroup:"):
-                    # Remove quotes from queryGroup
-                    query_group = line.split(":", 1)[1].strip().strip("'\"")
-                    partition_info["query_group"] = query_group
-                    logger.debug(f"  Query Group: {partition_info['query_group']}")
-
-                i += 1
-
-            # Extract M expression (starts after "source =")
-            if i < len(lines) and lines[i].strip().startswith("source ="):
-                logger.debug(f"  Found 'source =' at line {i}")
-                i += 1  # Skip "source =" line
-
-                m_lines = []
-                indent_level = None
-
-                while i < len(lines):
-                    line = lines[i].rstrip()
-
-                    # Determine initial indentation
-                    if indent_level is None and line.strip():
-                        indent_level = len(line) - len(line.lstrip())
-                        logger.debug(f"  M-code indent level: {indent_level}")
-
-                    # Check if we've reached the end of the M expression
-                    if line.strip() and len(line) - len(line.lstrip()) <= indent_level - 1:
-                        if not line.strip().startswith("let") and not line.strip().startswith("in"):
-                            logger.debug(f"  End of M-code at line {i}")
-                            break
-
-                    # Add line to M expression (remove base indentation)
-                    if line.strip():
-                        if len(line) >= indent_level:
-                            m_lines.append(line[indent_level:])
-                        else:
-                            m_lines.append(line.strip())
-                    else:
-                        m_lines.append("")
-
-                    i += 1
-
-                partition_info["m_expression"] = "\n".join(m_lines).strip()
-                logger.debug(f"  M-code length: {len(partition_info['m_expression'])} characters")
-
-            partitions.append(partition_info)
-        else:
-            i += 1
-
+    lines, _ = read_tmdl_file(file_path)
+    partitions = parse_tmdl_table(lines)["partitions"]
     logger.debug(f"Total partitions found in {file_path}: {len(partitions)}")
     return partitions
 
@@ -894,8 +1336,13 @@ def upsert_semantic_m_code_temporal_with_summary(
             return new_id, "added"
 
 
-def process_m_code_for_model_with_summary(catalog_conn, table_ids, tables_dir, catalog_run_id):
-    """Process M-code partitions for all tables with change tracking and return summary"""
+def process_m_code_for_model_with_summary(catalog_conn, table_ids, tables_dir, catalog_run_id, partitions_by_table=None):
+    """
+    Process M-code partitions for all tables with change tracking and return summary
+
+    partitions_by_table holds partitions that were already parsed (single-pass parser);
+    without it the partitions are read from <tables_dir>/<table>.tmdl.
+    """
 
     summary = {'added': 0, 'updated': 0, 'deleted': 0, 'total_processed': 0}
 
@@ -914,9 +1361,12 @@ def process_m_code_for_model_with_summary(catalog_conn, table_ids, tables_dir, c
         tmdl_file = Path(tables_dir) / f"{table_name}.tmdl"
         current_partitions = set()
 
-        if tmdl_file.exists():
+        if partitions_by_table is not None or tmdl_file.exists():
             try:
-                partitions = extract_m_code_from_tmdl(tmdl_file)
+                if partitions_by_table is not None:
+                    partitions = partitions_by_table.get(table_name, [])
+                else:
+                    partitions = extract_m_code_from_tmdl(tmdl_file)
 
                 for partition in partitions:
                     partition_name = partition.get("name")
@@ -961,8 +1411,11 @@ def get_catalog_connection():
         raise
 
 
-def start_powerbi_catalog_run(catalog_conn, connection_info, project_folder):
-    """Start a PowerBI catalog run"""
+def start_powerbi_catalog_run(catalog_conn, connection_info, project_folder, models_count=None, log_filename=None):
+    """
+    Start a PowerBI catalog run; models_count is set for a multi-project run over a root folder.
+    log_filename is given when the caller already set up logging (watch mode); the run only records it.
+    """
     with catalog_conn.cursor() as cursor:
         cursor.execute("""
             INSERT INTO catalog.pbi_catalog_runs
@@ -976,14 +1429,15 @@ def start_powerbi_catalog_run(catalog_conn, connection_info, project_folder):
             'Power BI Semantic Model',
             project_folder,  # Use project folder as "host"
             None,  # No port for PowerBI
-            f'PowerBI Project: {Path(project_folder).name}',
-            1  # One "database" (the PowerBI project)
+            f'PowerBI Project: {Path(project_folder).name}' if models_count is None
+            else f'PowerBI Projects under: {Path(project_folder).name}',
+            1 if models_count is None else models_count  # One "database" per PowerBI project
         ))
 
         run_id = cursor.fetchone()[0]
 
         # Setup logging with run ID (returns relative path)
-        relative_log_filename = setup_logging_with_run_id(run_id)
+        relative_log_filename = log_filename or setup_logging_with_run_id(run_id)
 
         # Store relative log filename in database
         cursor.execute("""
@@ -998,7 +1452,7 @@ def start_powerbi_catalog_run(catalog_conn, connection_info, project_folder):
         return run_id
 
 
-def complete_powerbi_catalog_run(catalog_conn, run_id, processed_counts):
+def complete_powerbi_catalog_run(catalog_conn, run_id, processed_counts, models_processed=1):
     """Mark PowerBI catalog run as completed with processed counts"""
     try:
         with catalog_conn.cursor() as cursor:
@@ -1006,7 +1460,7 @@ def complete_powerbi_catalog_run(catalog_conn, run_id, processed_counts):
                 UPDATE catalog.pbi_catalog_runs
                 SET run_completed_at = CURRENT_TIMESTAMP,
                     run_status = 'completed',
-                    databases_processed = 1,
+                    databases_processed = %s,
                     models_processed = %s,
                     tables_processed = %s,
                     columns_processed = %s,
@@ -1015,7 +1469,8 @@ def complete_powerbi_catalog_run(catalog_conn, run_id, processed_counts):
                     m_code_processed = %s
                 WHERE id = %s
             """, (
-                1,  # models_processed - always 1 for successful PowerBI cataloging
+                models_processed,
+                models_processed,
                 processed_counts.get('tables_processed', 0),
                 processed_counts.get('columns_processed', 0),
                 processed_counts.get('measures_processed', 0),
@@ -1058,12 +1513,9 @@ def fail_catalog_run(catalog_conn, run_id, error_message):
             pass
 
 
-def process_powerbi_project(project_folder, catalog_run_id):
-    """Process PowerBI project files using upsert functions with temporal versioning"""
-    logger.info(f"Processing PowerBI project folder: {project_folder}")
-
-    # Initialize summary counters
-    summary = {
+def get_empty_pbi_summary():
+    """Summary counters (added/updated/deleted) for one semantic model."""
+    return {
         'tables_added': 0,
         'tables_updated': 0,
         'tables_deleted': 0,
@@ -1081,7 +1533,9 @@ def process_powerbi_project(project_folder, catalog_run_id):
         'm_code_deleted': 0
     }
 
-    processed_counts = {
+
+def get_empty_processed_counts():
+    return {
         'tables_processed': 0,
         'columns_processed': 0,
         'measures_processed': 0,
@@ -1089,29 +1543,302 @@ def process_powerbi_project(project_folder, catalog_run_id):
         'm_code_processed': 0
     }
 
-    try:
-        # Build expected folder structure
-        project_path = Path(project_folder)
-        project_name = project_path.name  # e.g., "SSM_postgres"
 
-        # PowerBI project structure: SSM_postgres\SSM_postgres.SemanticModel\definition\tables
-        semantic_model_path = project_path / f"{project_name}.SemanticModel"
-        definition_path = semantic_model_path / "definition"
-        tables_dir = definition_path / "tables"
-        relationships_file = definition_path / "relationships.tmdl"
+def locate_semantic_model(project_folder):
+    """Return (model_name, definition_path) for a PowerBI project folder; raises if the structure is missing."""
+    project_path = Path(project_folder)
+    project_name = project_path.name  # e.g., "SSM_postgres"
+
+    # PowerBI project structure: SSM_postgres\SSM_postgres.SemanticModel\definition\tables
+    semantic_model_path = project_path / f"{project_name}.SemanticModel"
+    definition_path = semantic_model_path / "definition"
+    tables_dir = definition_path / "tables"
+
+    logger.info(f"Expected tables directory: {tables_dir}")
+    logger.info(f"Expected relationships file: {definition_path / 'relationships.tmdl'}")
+
+    # Verify folder structure exists
+    if not semantic_model_path.exists():
+        raise Exception(f"Semantic model folder not found: {semantic_model_path}")
+
+    if not definition_path.exists():
+        raise Exception(f"Definition folder not found: {definition_path}")
+
+    if not tables_dir.exists():
+        raise Exception(f"Tables folder not found: {tables_dir}")
+
+    return project_name, definition_path
+
+
+def parse_semantic_model(definition_path, manifest=None, force_full=False,
+                         include_tables=True, include_relationships=True, table_files=None):
+    """
+    Parse a semantic model definition folder without touching the catalog.
+
+    Pure CPU work, so it can run in a worker process. Returns a dict with the changed
+    tables, the new manifest entries, removed files, skipped file count and relationships.
+    include_tables / include_relationships leave the table files or relationships.tmdl
+    out entirely, table_files only checks the named table files (watch mode);
+    write_semantic_model then leaves the other objects alone.
+    """
+    definition_path = Path(definition_path)
+    tables_dir = definition_path / "tables"
+    relationships_file = definition_path / "relationships.tmdl"
+
+    tables, manifest_entries, removed_files, skipped_files = [], {}, set(), 0
+    if include_tables and tables_dir.exists():
+        tables, manifest_entries, removed_files, skipped_files = parse_changed_tmdl_tables(
+            tables_dir, manifest or {}, force_full=force_full, file_names=table_files
+        )
+
+    relationships = None
+    if include_relationships and relationships_file.exists():
+        relationships = parse_relationships(str(relationships_file))
+
+    # Canonical digests for the model snapshot; files that were not parsed keep their manifest digest
+    manifest = manifest or {}
+    if include_tables:
+        table_digests = {
+            file_name: entry[3] for file_name, entry in manifest.items()
+            if file_name not in removed_files and entry[3] is not None
+        }
+        table_digests.update({file_name: entry[3] for file_name, entry in manifest_entries.items()})
+    else:
+        table_digests = {file_name: entry[3] for file_name, entry in manifest.items()}
+
+    return {
+        'tables_dir': str(tables_dir),
+        'tables': tables,
+        'manifest_entries': manifest_entries,
+        'removed_files': removed_files,
+        'skipped_files': skipped_files,
+        # Every table file was parsed, so tables missing from the result are gone
+        'tables_complete': include_tables and table_files is None and skipped_files == 0,
+        'relationships': relationships,
+        'relationships_parsed': include_relationships,
+        'table_digests': table_digests,
+        'relationships_digest': canonical_digest(relationships or []) if include_relationships else None,
+        'force_full': force_full
+    }
 
-        logger.info(f"Expected tables directory: {tables_dir}")
-        logger.info(f"Expected relationships file: {relationships_file}")
 
-        # Verify folder structure exists
-        if not semantic_model_path.exists():
-            raise Exception(f"Semantic model folder not found: {semantic_model_path}")
+def compute_model_snapshot(cur, model_id, parsed):
+    """
+    Return (snapshot_hash, relationships_hash, previous_snapshot_hash) for a parsed model.
 
-        if not definition_path.exists():
-            raise Exception(f"Definition folder not found: {definition_path}")
+    The snapshot is an order-independent hash over the canonical digests of all table files and the
+    relationships; parts that were not parsed in this run are taken from the manifest / previous run.
+    """
+    cur.execute("""
+        SELECT snapshot_hash, relationships_hash
+        FROM catalog.pbi_models
+        WHERE id = %s
+    """, (model_id,))
+    previous_hash, previous_relationships_hash = cur.fetchone() or (None, None)
+    relationships_hash = parsed['relationships_digest'] or previous_relationships_hash
+    if relationships_hash is None or None in parsed['table_digests'].values():
+        return None, relationships_hash, previous_hash
+    snapshot_hash = canonical_digest({
+        'tables': sorted(parsed['table_digests'].values()),
+        'relationships': relationships_hash
+    })
+    return snapshot_hash, relationships_hash, previous_hash
+
+
+def write_semantic_model(conn, model_id, model_name, parsed, catalog_run_id):
+    """
+    Write a parsed semantic model with temporal versioning; returns (summary, processed_counts, unchanged).
+    Does not commit.
+
+    When the model snapshot hash equals the one of the previous run (and force_full is off) only the
+    TMDL manifest and the run id on catalog.pbi_models are updated. Otherwise every object kind is written
+    with bulk_upsert_temporal_with_summary. Tables, columns and measures are only compared for the table
+    files parsed in this run (plus removed files); when every file was parsed the whole model is compared,
+    so deleted tables are detected exactly.
+    """
+    summary = get_empty_pbi_summary()
+    processed_counts = get_empty_processed_counts()
+
+    with conn.cursor() as cur:
+        snapshot_hash, relationships_hash, previous_hash = compute_model_snapshot(cur, model_id, parsed)
+        if snapshot_hash and snapshot_hash == previous_hash and not parsed['force_full']:
+            save_tmdl_manifest(cur, model_id, parsed['manifest_entries'], parsed['removed_files'], catalog_run_id)
+            cur.execute("""
+                UPDATE catalog.pbi_models
+                SET catalog_run_id = %s, snapshot_status = 'unchanged'
+                WHERE id = %s
+            """, (catalog_run_id, model_id))
+            logger.info(f"Semantic model {model_name} unchanged since the previous run (snapshot {snapshot_hash[:12]})")
+            return summary, processed_counts, True
+
+    tables = parsed['tables']
+    parsed_names = [table.get("name") for table in tables]
+
+    if not parsed['tables_complete']:
+        table_scope = set(parsed_names)
+        table_scope.update(Path(file_name).stem for file_name in parsed['removed_files'])
+        table_scope.update(Path(table["file_name"]).stem for table in tables if table.get("file_name"))
+    else:
+        table_scope = None
+
+    def add_summary(kind, kind_summary):
+        for operation in ('added', 'updated', 'deleted'):
+            summary[f'{kind}_{operation}'] += kind_summary[operation]
+        processed_counts[f'{kind}_processed'] += kind_summary['total_processed']
+
+    with conn.cursor() as cur:
+        # Tables
+        table_summary, deleted_tables = bulk_upsert_temporal_with_summary(
+            cur, 'tables', model_id,
+            [(model_id, table.get("name"), table.get("display_folder"), table.get("is_hidden"),
+              table.get("source_table")) for table in tables],
+            catalog_run_id, table_names=table_scope
+        )
+        add_summary('tables', table_summary)
+        table_ids = get_current_table_ids(cur, model_id, parsed_names)
+        logger.info(f"Processed {len(table_ids)} tables with temporal versioning")
+
+        # Columns and measures of the parsed tables; those of deleted tables are marked deleted too
+        child_scope = set(parsed_names) | {row[1] for row in deleted_tables}
+        column_rows = [
+            (table_ids[table.get("name")], table.get("name"), column.get("name"), column.get("dataType"),
+             column.get("is_hidden"), column.get("format_string"), column.get("display_folder"))
+            for table in tables if table.get("name") in table_ids
+            for column in table.get("columns", [])
+        ]
+        column_summary, _ = bulk_upsert_temporal_with_summary(
+            cur, 'columns', model_id, column_rows, catalog_run_id, table_names=child_scope
+        )
+        add_summary('columns', column_summary)
+
+        measure_rows = [
+            (table_ids[table.get("name")], table.get("name"), measure.get("name"), measure.get("expression"),
+             measure.get("formatString"), measure.get("displayFolder"), measure.get("lineageTag"),
+             measure.get("isHidden", False), measure.get("isPrivate", False),
+             measure.get("isAvailableInMDX", False))
+            for table in tables if table.get("name") in table_ids
+            for measure in table.get("measures", [])
+        ]
+        measure_summary, _ = bulk_upsert_temporal_with_summary(
+            cur, 'measures', model_id, measure_rows, catalog_run_id, table_names=child_scope
+        )
+        add_summary('measures', measure_summary)
+
+    # Process M-code partitions with summary; partitions of deleted tables are marked deleted
+    m_code_table_ids = dict(table_ids)
+    m_code_table_ids.update({row[1]: row[0] for row in deleted_tables})
+    m_code_summary = process_m_code_for_model_with_summary(
+        conn, m_code_table_ids, parsed['tables_dir'], catalog_run_id,
+        partitions_by_table={table.get("name"): table.get("partitions", []) for table in tables}
+    )
+    summary['m_code_added'] += m_code_summary['added']
+    summary['m_code_updated'] += m_code_summary['updated']
+    summary['m_code_deleted'] += m_code_summary['deleted']
+    processed_counts['m_code_processed'] += m_code_summary['total_processed']
+
+    with conn.cursor() as cur:
+        save_tmdl_manifest(cur, model_id, parsed['manifest_entries'], parsed['removed_files'], catalog_run_id)
+
+        # Relationships: relationships.tmdl is parsed as a whole, so the whole model is compared
+        if parsed['relationships_parsed']:
+            relationship_rows = [
+                (model_id, relationship.get("fromTable"), relationship.get("fromColumn"),
+                 relationship.get("toTable"), relationship.get("toColumn"),
+                 relationship.get("isActive", True), relationship.get("relationship_type"),
+                 relationship.get("cross_filter"))
+                for relationship in parsed['relationships'] or []
+            ]
+            relationship_summary, _ = bulk_upsert_temporal_with_summary(
+                cur, 'relationships', model_id, relationship_rows, catalog_run_id
+            )
+            add_summary('relationships', relationship_summary)
+
+        write_pbi_model_graph(cur, model_id, model_name, catalog_run_id)
+
+        cur.execute("""
+            UPDATE catalog.pbi_models
+            SET snapshot_hash = %s, relationships_hash = %s, snapshot_status = 'changed'
+            WHERE id = %s
+        """, (snapshot_hash, relationships_hash, model_id))
+
+    return summary, processed_counts, False
 
-        if not tables_dir.exists():
-            raise Exception(f"Tables folder not found: {tables_dir}")
+
+def log_pbi_summary(summary, processed_counts):
+    """Log the cataloging summary of a semantic model."""
+    logger.info("=" * 60)
+    logger.info("POWERBI SEMANTIC MODEL CATALOGING SUMMARY")
+    logger.info("=" * 60)
+    logger.info(
+        f"Tables - Added: {summary['tables_added']}, "
+        f"Updated: {summary['tables_updated']}, "
+        f"Deleted: {summary['tables_deleted']}"
+    )
+    logger.info(
+        f"Columns - Added: {summary['columns_added']}, "
+        f"Updated: {summary['columns_updated']}, "
+        f"Deleted: {summary['columns_deleted']}"
+    )
+    logger.info(
+        f"Measures - Added: {summary['measures_added']}, "
+        f"Updated: {summary['measures_updated']}, "
+        f"Deleted: {summary['measures_deleted']}"
+    )
+    logger.info(
+        f"Relationships - Added: {summary['relationships_added']}, "
+        f"Updated: {summary['relationships_updated']}, "
+        f"Deleted: {summary['relationships_deleted']}"
+    )
+    logger.info(
+        f"M-Code - Added: {summary['m_code_added']}, "
+        f"Updated: {summary['m_code_updated']}, "
+        f"Deleted: {summary['m_code_deleted']}"
+    )
+    logger.info("=" * 60)
+
+    # Show what actually happened
+    actual_changes = sum(summary.values())
+    total_processed = sum(processed_counts.values())
+
+    logger.info(f"Actual changes: {actual_changes}")
+    logger.info(f"Total items processed: {total_processed}")
+
+
+def catalog_semantic_model(conn, model_name, definition_path, catalog_run_id, force_full=False,
+                           include_tables=True, include_relationships=True, table_files=None):
+    """Register, parse and write one semantic model in the caller's transaction; returns (summary, processed_counts)."""
+    # 1. Insert the semantic model
+    model_id = insert_model(conn.cursor(), model_name, catalog_run_id)
+    logger.info(f"Processed semantic model: {model_name} with ID: {model_id}")
+
+    # 2. Parse changed .tmdl files and write them
+    with conn.cursor() as cur:
+        manifest = load_tmdl_manifest(cur, model_id)
+    parsed = parse_semantic_model(
+        definition_path, manifest, force_full=force_full,
+        include_tables=include_tables, include_relationships=include_relationships, table_files=table_files
+    )
+    logger.info(
+        f"Parsed {len(parsed['tables'])} changed tables from .tmdl files, "
+        f"skipped {parsed['skipped_files']} unchanged files"
+    )
+    summary, processed_counts, _ = write_semantic_model(conn, model_id, model_name, parsed, catalog_run_id)
+    return summary, processed_counts
+
+
+def process_powerbi_project(project_folder, catalog_run_id, force_full=False):
+    """
+    Process PowerBI project files using upsert functions with temporal versioning
+
+    Table files that are unchanged according to the model's TMDL manifest are skipped,
+    unless force_full is set.
+    """
+    logger.info(f"Processing PowerBI project folder: {project_folder}")
+
+    try:
+        project_path = Path(project_folder)
+        model_name, definition_path = locate_semantic_model(project_folder)
+        tables_dir = definition_path / "tables"
 
         # Find PowerBI project files
         pbip_files = list(project_path.rglob("*.pbip"))
@@ -1138,162 +1865,13 @@ def process_powerbi_project(project_folder, catalog_run_id):
         # Get database connection for processing
         conn = get_catalog_connection()
         try:
-            # 1. Insert the semantic model
-            model_name = project_name
-            model_id = insert_model(conn.cursor(), model_name, catalog_run_id)
-            logger.info(f"Processed semantic model: {model_name} with ID: {model_id}")
-
-            # 2. Parse and process tables from .tmdl files
-            if tables_dir.exists():
-                tables = parse_custom_tables_format(str(tables_dir))
-                logger.info(f"Parsed {len(tables)} tables from .tmdl files")
-
-                # Process tables with temporal versioning and count operations
-                table_ids = {}
-                for table in tables:
-                    table_info = {
-                        "name": table.get("name"),
-                        "display_folder": table.get("display_folder"),
-                        "is_hidden": table.get("is_hidden"),
-                        "source_table": table.get("source_table")
-                    }
-                    table_id, operation = upsert_semantic_tables_temporal_with_summary(
-                        conn, model_id, table_info, catalog_run_id
-                    )
-                    table_ids[table.get("name")] = table_id
-                    processed_counts['tables_processed'] += 1
-                    if operation != 'unchanged':
-                        summary[f'tables_{operation}'] += 1
-
-                logger.info(f"Processed {len(table_ids)} tables with temporal versioning")
-
-                # Process M-code partitions with summary
-                m_code_summary = process_m_code_for_model_with_summary(conn, table_ids, str(tables_dir), catalog_run_id)
-                summary['m_code_added'] += m_code_summary['added']
-                summary['m_code_updated'] += m_code_summary['updated']
-                summary['m_code_deleted'] += m_code_summary['deleted']
-                processed_counts['m_code_processed'] += m_code_summary['total_processed']
-
-                # Process columns with summary
-                for table in tables:
-                    table_name = table.get("name")
-                    table_id = table_ids.get(table_name)
-                    if table_id:
-                        for column in table.get("columns", []):
-                            column_info = {
-                                "name": column.get("name"),
-                                "dataType": column.get("dataType"),
-                                "is_hidden": column.get("is_hidden"),
-                                "format_string": column.get("format_string"),
-                                "display_folder": column.get("display_folder")
-                            }
-                            _, operation = upsert_semantic_columns_temporal_with_summary(
-                                conn, table_id, column_info, catalog_run_id
-                            )
-                            processed_counts['columns_processed'] += 1
-                            if operation != 'unchanged':
-                                summary[f'columns_{operation}'] += 1
-
-                # Process measures with summary
-                for table in tables:
-                    table_name = table.get("name")
-                    table_id = table_ids.get(table_name)
-                    if table_id:
-                        for measure in table.get("measures", []):
-                            measure_info = {
-                                "name": measure.get("name"),
-                                "expression": measure.get("expression"),
-                                "formatString": measure.get("formatString"),
-                                "displayFolder": measure.get("displayFolder"),
-                                "lineageTag": measure.get("lineageTag"),
-                                "isHidden": measure.get("isHidden", False),
-                                "isPrivate": measure.get("isPrivate", False),
-                                "isAvailableInMDX": measure.get("isAvailableInMDX", False)
-                            }
-                            _, operation = upsert_semantic_measures_temporal_with_summary(
-                                conn, table_id, measure_info, catalog_run_id
-                            )
-                            processed_counts['measures_processed'] += 1
-                            if operation != 'unchanged':
-                                summary[f'measures_{operation}'] += 1
-
-            # Process relationships with summary
-            if relationships_file.exists():
-                relationships = parse_relationships(str(relationships_file))
-                if relationships:
-                    for relationship in relationships:
-                        relationship_info = {
-                            "fromTable": relationship.get("fromTable"),
-                            "fromColumn": relationship.get("fromColumn"),
-                            "toTable": relationship.get("toTable"),
-                            "toColumn": relationship.get("toColumn"),
-                            "isActive": relationship.get("isActive", True),
-                            "relationship_type": relationship.get("relationship_type"),
-                            "cross_filter": relationship.get("cross_filter")
-                        }
-                        _, operation = upsert_semantic_relationships_temporal_with_summary(
-                            conn, model_id, relationship_info, catalog_run_id
-                        )
-                        processed_counts['relationships_processed'] += 1
-                        if operation != 'unchanged':
-                            summary[f'relationships_{operation}'] += 1
+            summary, processed_counts = catalog_semantic_model(
+                conn, model_name, definition_path, catalog_run_id, force_full=force_full
+            )
 
             # Commit all changes
             conn.commit()
-
-            # Log final summary
-            logger.info("=" * 60)
-            logger.info("POWERBI SEMANTIC MODEL CATALOGING SUMMARY")
-            logger.info("=" * 60)
-            logger.info(
-                f"Tables - Added: {summary['tables_added']}, "
-                f"Updated: {summary['tables_updated']}, "
-                f"Deleted: {summary['tables_deleted']}"
-            )
-            logger.info(
-                f"Columns - Added: {summary['columns_added']}, "
-                f"Updated: {summary['columns_updated']}, "
-                f"Deleted: {summary['columns_deleted']}"
-            )
-            logger.info(
-                f"Measures - Added: {summary['measures_added']}, "
-                f"Updated: {summary['measures_updated']}, "
-                f"Deleted: {summary['measures_deleted']}"
-            )
-            logger.info(
-                f"Relationships - Added: {summary['relationships_added']}, "
-                f"Updated: {summary['relationships_updated']}, "
-                f"Deleted: {summary['relationships_deleted']}"
-            )
-            logger.info(
-                f"M-Code - Added: {summary['m_code_added']}, "
-                f"Updated: {summary['m_code_updated']}, "
-                f"Deleted: {summary['m_code_deleted']}"
-            )
-            logger.info("=" * 60)
-
-            # Show what actually happened
-            actual_changes = (
-                summary['tables_added'] + summary['tables_updated'] +
-                summary['tables_deleted'] + summary['columns_added'] +
-                summary['columns_updated'] + summary['columns_deleted'] +
-                summary['measures_added'] + summary['measures_updated'] +
-                summary['measures_deleted'] + summary['relationships_added'] +
-                summary['relationships_updated'] +
-                summary['relationships_deleted'] + summary['m_code_added'] +
-                summary['m_code_updated'] + summary['m_code_deleted']
-            )
-
-            total_processed = (
-                processed_counts['tables_processed'] +
-                processed_counts['columns_processed'] +
-                processed_counts['measures_processed'] +
-                processed_counts['relationships_processed'] +
-                processed_counts['m_code_processed']
-            )
-
-            logger.info(f"Actual changes: {actual_changes}")
-            logger.info(f"Total items processed: {total_processed}")
+            log_pbi_summary(summary, processed_counts)
 
         finally:
             conn.close()
@@ -1306,6 +1884,374 @@ def process_powerbi_project(project_folder, catalog_run_id):
         raise
 
 
+# Multi-project mode ----
+
+def discover_semantic_models(root_folder):
+    """Find all *.SemanticModel/definition folders under root_folder; returns [(model_name, definition_path)]."""
+    models = []
+    for semantic_model_path in sorted(Path(root_folder).rglob("*.SemanticModel")):
+        definition_path = semantic_model_path / "definition"
+        if semantic_model_path.is_dir() and definition_path.is_dir():
+            models.append((semantic_model_path.name[:-len(".SemanticModel")], definition_path))
+    return models
+
+
+def record_project_status(cur, catalog_run_id, project_folder, model_name, status,
+                          model_id=None, processed_counts=None, error_message=None):
+    """Insert or update the status ('running', 'completed', 'unchanged', 'failed') of one project within a run."""
+    counts = processed_counts or {}
+    cur.execute("""
+        INSERT INTO catalog.pbi_catalog_run_projects
+        (catalog_run_id, project_folder, model_name, model_id, status, error_message,
+         tables_processed, columns_processed, measures_processed, relationships_processed, m_code_processed,
+         completed_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                CASE WHEN %s = 'running' THEN NULL ELSE CURRENT_TIMESTAMP END)
+        ON CONFLICT (catalog_run_id, project_folder) DO UPDATE
+        SET model_id = COALESCE(EXCLUDED.model_id, catalog.pbi_catalog_run_projects.model_id),
+            status = EXCLUDED.status,
+            error_message = EXCLUDED.error_message,
+            tables_processed = EXCLUDED.tables_processed,
+            columns_processed = EXCLUDED.columns_processed,
+            measures_processed = EXCLUDED.measures_processed,
+            relationships_processed = EXCLUDED.relationships_processed,
+            m_code_processed = EXCLUDED.m_code_processed,
+            completed_at = EXCLUDED.completed_at
+    """, (
+        catalog_run_id, str(project_folder), model_name, model_id, status, error_message,
+        counts.get('tables_processed', 0),
+        counts.get('columns_processed', 0),
+        counts.get('measures_processed', 0),
+        counts.get('relationships_processed', 0),
+        counts.get('m_code_processed', 0),
+        status
+    ))
+
+
+def _write_project(conn_pool, project, parsed, catalog_run_id):
+    """Writer thread: write one parsed project in its own transaction on a pooled connection."""
+    conn = conn_pool.getconn()
+    try:
+        summary, processed_counts, unchanged = write_semantic_model(
+            conn, project['model_id'], project['model_name'], parsed, catalog_run_id
+        )
+        with conn.cursor() as cur:
+            record_project_status(
+                cur, catalog_run_id, project['definition_path'], project['model_name'],
+                'unchanged' if unchanged else 'completed',
+                model_id=project['model_id'], processed_counts=processed_counts
+            )
+        conn.commit()
+        logger.info(
+            f"Project {project['model_name']}: {len(parsed['tables'])} changed tables, "
+            f"{parsed['skipped_files']} unchanged files skipped"
+        )
+        return summary, processed_counts
+    except Exception as e:
+        conn.rollback()
+        # Record the failure on the connection this writer already holds
+        _record_project_failure(conn, project, catalog_run_id, str(e))
+        raise
+    finally:
+        conn_pool.putconn(conn)
+
+
+def _record_project_failure(conn, project, catalog_run_id, error_message):
+    try:
+        with conn.cursor() as cur:
+            record_project_status(
+                cur, catalog_run_id, project['definition_path'], project['model_name'], 'failed',
+                model_id=project.get('model_id'), error_message=error_message
+            )
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Failed to record failure of project {project['model_name']}: {e}")
+
+
+def _mark_project_failed(conn_pool, project, catalog_run_id, error_message):
+    try:
+        conn = conn_pool.getconn()
+    except psycopg2.pool.PoolError as e:
+        logger.error(f"Failed to record failure of project {project['model_name']}: {e}")
+        return
+    try:
+        _record_project_failure(conn, project, catalog_run_id, error_message)
+    finally:
+        conn_pool.putconn(conn)
+
+
+def process_powerbi_projects(models, catalog_run_id, workers=DEFAULT_PROJECT_WORKERS, force_full=False):
+    """
+    Catalog several semantic models under one catalog run.
+
+    models is the output of discover_semantic_models(). Parsing runs in a process pool,
+    writing in a thread pool that shares one catalog connection pool; every project is
+    its own transaction and gets a row in catalog.pbi_catalog_run_projects.
+    Returns (summary, processed_counts, models_completed, models_failed).
+    """
+    workers = max(1, int(workers))
+    summary = get_empty_pbi_summary()
+    processed_counts = get_empty_processed_counts()
+    models_completed = 0
+    models_failed = 0
+
+    # One connection per writer thread plus one for the main thread's status writes
+    conn_pool = psycopg2.pool.ThreadedConnectionPool(1, workers + 1, **CATALOG_DB_CONFIG)
+    try:
+        # 1. Register models and load manifests (sequential, main process)
+        projects = []
+        seen_names = set()
+        conn = conn_pool.getconn()
+        try:
+            with conn.cursor() as cur:
+                for model_name, definition_path in models:
+                    project = {'model_name': model_name, 'definition_path': str(definition_path), 'model_id': None}
+                    if model_name in seen_names:
+                        # pbi_models is keyed on model_name, a second folder would overwrite the first
+                        record_project_status(cur, catalog_run_id, definition_path, model_name, 'failed',
+                                              error_message=f"Duplicate semantic model name: {model_name}")
+                        logger.warning(f"Skipping {definition_path}: duplicate semantic model name {model_name}")
+                        models_failed += 1
+                        continue
+                    seen_names.add(model_name)
+                    project['model_id'] = insert_model(cur, model_name, catalog_run_id)
+                    project['manifest'] = load_tmdl_manifest(cur, project['model_id'])
+                    record_project_status(cur, catalog_run_id, definition_path, model_name, 'running',
+                                          model_id=project['model_id'])
+                    projects.append(project)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn_pool.putconn(conn)
+
+        logger.info(f"Cataloging {len(projects)} semantic models with {workers} workers")
+
+        # 2. Parse in processes, write in threads as soon as a parse finishes
+        with ProcessPoolExecutor(max_workers=workers) as parse_pool, \
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix='pbi-writer') as write_pool:
+            parse_futures = {
+                parse_pool.submit(parse_semantic_model, project['definition_path'], project['manifest'], force_full): project
+                for project in projects
+            }
+            write_futures = {}
+            for future in as_completed(parse_futures):
+                project = parse_futures[future]
+                try:
+                    parsed = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to parse project {project['model_name']}: {e}")
+                    _mark_project_failed(conn_pool, project, catalog_run_id, f"Parse error: {e}")
+                    models_failed += 1
+                    continue
+                write_futures[write_pool.submit(_write_project, conn_pool, project, parsed, catalog_run_id)] = project
+
+            for future in as_completed(write_futures):
+                project = write_futures[future]
+                try:
+                    project_summary, project_counts = future.result()
+                except Exception as e:
+                    # _write_project already recorded the 'failed' status
+                    logger.error(f"Failed to write project {project['model_name']}: {e}")
+                    models_failed += 1
+                    continue
+                for key, value in project_summary.items():
+                    summary[key] += value
+                for key, value in project_counts.items():
+                    processed_counts[key] += value
+                models_completed += 1
+
+    finally:
+        conn_pool.closeall()
+
+    log_pbi_summary(summary, processed_counts)
+    logger.info(f"Semantic models completed: {models_completed}, failed: {models_failed}")
+    return summary, processed_counts, models_completed, models_failed
+
+
+# Watch mode ----
+
+def locate_definition_folder(path):
+    """Return (definition_path, path relative to it) for a file under <name>.SemanticModel/definition, else None."""
+    path = Path(path)
+    for parent in path.parents:
+        if parent.name == "definition" and parent.parent.name.endswith(".SemanticModel"):
+            return parent, path.relative_to(parent)
+    return None
+
+
+class ModelChangeDebouncer:
+    """
+    Collects .tmdl changes per semantic model and releases them after a quiet period.
+
+    Only table files and relationships.tmdl are tracked, since those are what the cataloger reads.
+    """
+
+    def __init__(self, quiet_seconds=WATCH_DEBOUNCE_SECONDS, max_delay_seconds=WATCH_MAX_DELAY_SECONDS):
+        self.quiet_seconds = quiet_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def add(self, path, now=None):
+        """Register a changed path; returns False when the path is not relevant."""
+        if Path(path).suffix.lower() != ".tmdl":
+            return False
+        located = locate_definition_folder(path)
+        if not located:
+            return False
+        definition_path, relative = located
+        if relative.parts == ("relationships.tmdl",):
+            change = ("relationships", None)
+        elif len(relative.parts) == 2 and relative.parts[0] == "tables":
+            change = ("tables", relative.parts[1])
+        else:
+            return False
+
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._pending.setdefault(str(definition_path), {
+                'tables': set(), 'relationships': False, 'first_event': now, 'last_event': now
+            })
+            if change[0] == "relationships":
+                entry['relationships'] = True
+            else:
+                entry['tables'].add(change[1])
+            entry['last_event'] = now
+        return True
+
+    def pop_ready(self, now=None):
+        """Return {definition_path: changes} for models whose burst of saves is over."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            ready = {
+                definition_path: entry for definition_path, entry in self._pending.items()
+                if now - entry['last_event'] >= self.quiet_seconds
+                or now - entry['first_event'] >= self.max_delay_seconds
+            }
+            for definition_path in ready:
+                del self._pending[definition_path]
+        return ready
+
+
+class TmdlEventHandler(FileSystemEventHandler):
+    """Forwards file system events to a ModelChangeDebouncer."""
+
+    IGNORED_EVENTS = ('opened', 'closed_no_write')
+
+    def __init__(self, debouncer):
+        super().__init__()
+        self.debouncer = debouncer
+
+    def on_any_event(self, event):
+        if event.is_directory or event.event_type in self.IGNORED_EVENTS:
+            return
+        for path in (event.src_path, getattr(event, 'dest_path', None)):
+            if path:
+                self.debouncer.add(os.fsdecode(path))
+
+
+def get_watch_roots(catalog_conn, connection_ids=None):
+    """Return [(connection_info, folder_path)] for the active local PowerBI connections."""
+    with catalog_conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.id, c.connection_name, c.connection_type, d.folder_path
+            FROM config.pbi_local_connection_details d
+            JOIN config.connections c ON c.id = d.connection_id
+            WHERE c.is_active = true
+              AND c.deleted_at IS NULL
+              AND (%s IS NULL OR c.id = ANY(%s))
+            ORDER BY c.id
+        """, (connection_ids, connection_ids))
+        return [
+            ({'id': row[0], 'name': row[1], 'connection_type': row[2], 'folder_path': row[3]}, row[3])
+            for row in cursor.fetchall()
+        ]
+
+
+def recatalog_changed_model(connection_info, definition_path, changes, log_filename=None):
+    """Catalog the changed files of one semantic model in its own catalog run, logging to log_filename."""
+    definition_path = Path(definition_path)
+    model_name = definition_path.parent.name[:-len(".SemanticModel")]
+    logger.info(
+        f"Change detected in {model_name}: {len(changes['tables'])} table files"
+        f"{', relationships.tmdl' if changes['relationships'] else ''}"
+    )
+
+    conn = get_catalog_connection()
+    catalog_run_id = None
+    try:
+        catalog_run_id = start_powerbi_catalog_run(conn, connection_info, str(definition_path.parent.parent),
+                                                   log_filename=log_filename)
+        conn.commit()
+        summary, processed_counts = catalog_semantic_model(
+            conn, model_name, definition_path, catalog_run_id,
+            include_tables=bool(changes['tables']), include_relationships=changes['relationships'],
+            table_files=changes['tables']
+        )
+        conn.commit()
+        log_pbi_summary(summary, processed_counts)
+        complete_powerbi_catalog_run(conn, catalog_run_id, processed_counts)
+        return summary, processed_counts
+    except Exception as e:
+        conn.rollback()
+        logger.error(f"Re-cataloging {model_name} failed: {e}")
+        if catalog_run_id:
+            fail_catalog_run(conn, catalog_run_id, str(e))
+        return None
+    finally:
+        conn.close()
+
+
+def watch_powerbi_folders(roots, debounce_seconds=WATCH_DEBOUNCE_SECONDS, stop_event=None):
+    """
+    Watch the given (connection_info, folder_path) roots and re-catalog semantic models as they change.
+
+    Runs until interrupted (or until stop_event is set). Only the changed table files are parsed,
+    relationships.tmdl only when it changed itself. Logging is set up once; every change gets its
+    own catalog run that points at the same log file.
+    """
+    if Observer is None:
+        raise ImportError("watchdog is not installed; it is required for --watch")
+
+    log_filename = setup_logging_with_run_id()
+
+    debouncer = ModelChangeDebouncer(debounce_seconds)
+    handler = TmdlEventHandler(debouncer)
+    observer = Observer()
+    watched = []
+    for connection_info, folder_path in roots:
+        if not folder_path or not os.path.isdir(folder_path):
+            logger.warning(f"Skipping watch root of connection {connection_info['id']}: folder not found: {folder_path}")
+            continue
+        observer.schedule(handler, folder_path, recursive=True)
+        watched.append((Path(folder_path).resolve(), connection_info))
+        logger.info(f"Watching {folder_path} (connection {connection_info['name']})")
+    if not watched:
+        raise Exception("No existing folders to watch")
+    # Most specific root first, for nested roots
+    watched.sort(key=lambda item: len(item[0].parts), reverse=True)
+
+    stop_event = stop_event or threading.Event()
+    observer.start()
+    try:
+        while not stop_event.wait(WATCH_POLL_SECONDS):
+            for definition_path, changes in debouncer.pop_ready().items():
+                resolved = Path(definition_path).resolve()
+                connection_info = next(
+                    (info for root, info in watched if root == resolved or root in resolved.parents), None
+                )
+                if connection_info:
+                    recatalog_changed_model(connection_info, definition_path, changes, log_filename=log_filename)
+    except KeyboardInterrupt:
+        logger.info("Watch mode stopped")
+    finally:
+        observer.stop()
+        observer.join()
+
+
 def get_connection_info(connection_id):
     """Get connection info from database"""
     try:
@@ -1335,12 +2281,42 @@ def get_connection_info(connection_id):
 def main():
     """Main PowerBI cataloging process"""
     parser = argparse.ArgumentParser(description='Catalog PowerBI semantic models')
-    parser.add_argument('--connection-id', type=int, required=True, help='Connection ID for this cataloging run')
+    parser.add_argument('--connection-id', type=int,
+                        help='Connection ID for this cataloging run (required unless --watch is used)')
     parser.add_argument('--project-folder', type=str,
                         help='Path to PowerBI project folder (optional - will use connection '
                              'folder_path if not provided)')
+    parser.add_argument('--root-folder', type=str,
+                        help='Catalog every *.SemanticModel/definition folder under this folder in one run '
+                             '(multi-project mode, overrides --project-folder)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_PROJECT_WORKERS,
+                        help=f'Parse processes and catalog writer connections in multi-project mode '
+                             f'(default: {DEFAULT_PROJECT_WORKERS})')
+    parser.add_argument('--force-full', action='store_true',
+                        help='Parse all .tmdl files, also when unchanged since the last run')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running and re-catalog models when their .tmdl files change; watches the '
+                             'folder_path of all local PowerBI connections, or only of --connection-id')
+    parser.add_argument('--debounce', type=float, default=WATCH_DEBOUNCE_SECONDS,
+                        help=f'Watch mode: seconds without file changes before a model is re-cataloged '
+                             f'(default: {WATCH_DEBOUNCE_SECONDS})')
     args = parser.parse_args()
 
+    if args.watch:
+        conn = get_catalog_connection()
+        try:
+            roots = get_watch_roots(conn, [args.connection_id] if args.connection_id else None)
+        finally:
+            conn.close()
+        if not roots:
+            logger.error("No local PowerBI connections to watch")
+            sys.exit(1)
+        watch_powerbi_folders(roots, debounce_seconds=args.debounce)
+        return
+
+    if args.connection_id is None:
+        parser.error('--connection-id is required unless --watch is used')
+
     logger.info("Starting PowerBI semantic model cataloging")
 
     # Get connection info from database
@@ -1350,7 +2326,18 @@ def main():
         sys.exit(1)
 
     # Determine project folder
-    if args.project_folder:
+    models = None
+    if args.root_folder:
+        project_folder = args.root_folder
+        if not os.path.isdir(project_folder):
+            logger.error(f"❌ Root folder not found: {project_folder}")
+            sys.exit(1)
+        models = discover_semantic_models(project_folder)
+        logger.info(f"Found {len(models)} semantic models under root folder: {project_folder}")
+        if not models:
+            logger.error(f"❌ No *.SemanticModel/definition folders found under: {project_folder}")
+            sys.exit(1)
+    elif args.project_folder:
         project_folder = args.project_folder
         logger.info(f"Using project folder from command line: {project_folder}")
     else:
@@ -1364,7 +2351,10 @@ def main():
     # Start catalog run
     catalog_conn = get_catalog_connection()
     try:
-        catalog_run_id = start_powerbi_catalog_run(catalog_conn, connection_info, project_folder)
+        catalog_run_id = start_powerbi_catalog_run(
+            catalog_conn, connection_info, project_folder,
+            models_count=len(models) if models is not None else None
+        )
         catalog_conn.commit()
         logger.info(f"PowerBI catalog run {catalog_run_id} started")
     except Exception as e:
@@ -1379,12 +2369,23 @@ def main():
 
     # Process PowerBI project
     try:
-        summary, processed_counts = process_powerbi_project(project_folder, catalog_run_id)
+        if models is not None:
+            summary, processed_counts, models_processed, models_failed = process_powerbi_projects(
+                models, catalog_run_id, workers=args.workers, force_full=args.force_full
+            )
+            if models_processed == 0:
+                raise Exception(f"All {models_failed} semantic models failed")
+            if models_failed:
+                logger.warning(f"{models_failed} semantic models failed, see catalog.pbi_catalog_run_projects")
+        else:
+            summary, processed_counts = process_powerbi_project(project_folder, catalog_run_id, force_full=args.force_full)
+            models_processed = 1
 
         # Complete the run
         complete_conn = get_catalog_connection()
         try:
-            complete_powerbi_catalog_run(complete_conn, catalog_run_id, processed_counts)
+            complete_powerbi_catalog_run(complete_conn, catalog_run_id, processed_counts,
+                                         models_processed=models_processed)
             complete_conn.commit()
             logger.info(f"Successfully completed PowerBI catalog run {catalog_run_id}")
         finally:
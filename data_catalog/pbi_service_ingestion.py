@@ -0,0 +1,547 @@
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+import httpx
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+from pbi_cataloger import (
+    canonical_digest,
+    complete_powerbi_catalog_run,
+    fail_catalog_run,
+    get_catalog_connection,
+    get_empty_pbi_summary,
+    get_empty_processed_counts,
+    insert_model,
+    log_pbi_summary,
+    record_project_status,
+    setup_logging_with_run_id,
+    start_powerbi_catalog_run,
+    write_semantic_model,
+)
+
+logger = logging.getLogger(__name__)
+
+PBI_API_BASE_URL = "https://api.powerbi.com/v1.0/myorg"
+PBI_AUTHORITY_URL = "https://login.microsoftonline.com"
+PBI_SCOPE = "https://analysis.windows.net/powerbi/api/.default"
+
+# Concurrent HTTP requests (all threads together) and scans in flight
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_TIMEOUT_SECONDS = 60.0
+
+# Retry/backoff for throttling (429) and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 60.0
+
+# Scanner API limits: at most 100 workspaces per getInfo call, admin/groups pages of up to 5000
+SCAN_BATCH_SIZE = 100
+WORKSPACE_PAGE_SIZE = 5000
+SCAN_POLL_SECONDS = 5.0
+SCAN_TIMEOUT_SECONDS = 30 * 60.0
+SCAN_OPTIONS = {
+    'lineage': 'True',
+    'datasourceDetails': 'True',
+    'datasetSchema': 'True',
+    'datasetExpressions': 'True',
+}
+
+
+class PowerBIServiceError(Exception):
+    """HTTP or scan failure of the Power BI REST API; status_code is None for scan failures."""
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _is_retryable(error):
+    if isinstance(error, httpx.TransportError):
+        return True
+    return isinstance(error, PowerBIServiceError) and error.status_code in RETRYABLE_STATUS_CODES
+
+
+def _parse_retry_after(value):
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _wait_retry_after(fallback):
+    """tenacity wait: the Retry-After of a throttled response when given, else the fallback backoff."""
+    def wait_strategy(retry_state):
+        error = retry_state.outcome.exception()
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after is not None:
+            return min(retry_after, MAX_BACKOFF_SECONDS)
+        return fallback(retry_state)
+    return wait_strategy
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+# REST client ----
+
+class PowerBIServiceClient:
+    """
+    Thin client for the Power BI admin REST API (workspaces and scanner API).
+
+    Every HTTP request holds a slot of one semaphore, so max_concurrency bounds the requests in
+    flight over all threads; the backoff sleeps between retries do not hold a slot. base_url can
+    point at a local stub server that replays recorded responses.
+    """
+
+    def __init__(self, access_token, base_url=PBI_API_BASE_URL, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 max_attempts=DEFAULT_MAX_ATTEMPTS, backoff_seconds=DEFAULT_BACKOFF_SECONDS,
+                 scan_poll_seconds=SCAN_POLL_SECONDS, scan_timeout_seconds=SCAN_TIMEOUT_SECONDS,
+                 timeout=DEFAULT_TIMEOUT_SECONDS):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.scan_poll_seconds = scan_poll_seconds
+        self.scan_timeout_seconds = scan_timeout_seconds
+        self._semaphore = threading.BoundedSemaphore(self.max_concurrency)
+        self._http = httpx.Client(
+            base_url=base_url.rstrip('/') + '/',
+            headers={'Authorization': f'Bearer {access_token}'},
+            timeout=timeout
+        )
+        self._retrying = Retrying(
+            stop=stop_after_attempt(max_attempts),
+            wait=_wait_retry_after(wait_exponential(multiplier=backoff_seconds, max=MAX_BACKOFF_SECONDS)),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        )
+
+    def close(self):
+        self._http.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _send(self, method, path, params=None, json_body=None):
+        with self._semaphore:
+            response = self._http.request(method, path, params=params, json=json_body)
+        if response.status_code >= 400:
+            raise PowerBIServiceError(
+                f"{method} {path} returned HTTP {response.status_code}: {response.text[:200]}",
+                status_code=response.status_code,
+                retry_after=_parse_retry_after(response.headers.get('Retry-After'))
+            )
+        return response.json() if response.content else {}
+
+    def request(self, method, path, params=None, json_body=None):
+        """Send one request with retry/backoff; returns the decoded JSON body."""
+        return self._retrying.copy()(self._send, method, path, params, json_body)
+
+    def iter_workspaces(self, page_size=WORKSPACE_PAGE_SIZE):
+        """Page through admin/groups; yields the workspaces that are not deleted."""
+        skip = 0
+        while True:
+            page = self.request('GET', 'admin/groups', params={'$top': page_size, '$skip': skip}).get('value', [])
+            for workspace in page:
+                if workspace.get('state') != 'Deleted':
+                    yield workspace
+            if len(page) < page_size:
+                return
+            skip += page_size
+
+    def scan_workspaces(self, workspace_ids):
+        """Run one scanner API scan (getInfo, poll scanStatus, scanResult) and return the scan result."""
+        scan = self.request('POST', 'admin/workspaces/getInfo', params=SCAN_OPTIONS,
+                            json_body={'workspaces': list(workspace_ids)})
+        scan_id = scan['id']
+        deadline = time.monotonic() + self.scan_timeout_seconds
+        while scan.get('status') != 'Succeeded':
+            if scan.get('status') == 'Failed':
+                raise PowerBIServiceError(f"Scan {scan_id} failed: {scan.get('error')}")
+            if time.monotonic() > deadline:
+                raise PowerBIServiceError(f"Scan {scan_id} did not finish within {self.scan_timeout_seconds}s")
+            time.sleep(self.scan_poll_seconds)
+            scan = self.request('GET', f'admin/workspaces/scanStatus/{scan_id}')
+        logger.info(f"Scan {scan_id} of {len(workspace_ids)} workspaces succeeded")
+        return self.request('GET', f'admin/workspaces/scanResult/{scan_id}')
+
+    def scan(self, workspace_ids, batch_size=SCAN_BATCH_SIZE, on_scan_failed=None):
+        """
+        Stream scanned workspaces.
+
+        workspace_ids may be a lazy iterable (iter_workspaces); batches are submitted as they fill
+        and at most max_concurrency scans are in flight. Workspaces are yielded per finished scan,
+        so the caller can write them while later scans are still running. A failed scan (status
+        Failed, timeout, or an HTTP error that is not retried) is logged and skipped; on_scan_failed
+        (workspace_ids, error) is then called with the workspaces of that batch.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='pbi-scan') as pool:
+            batches = {}
+            for batch in _batched(workspace_ids, batch_size):
+                batches[pool.submit(self.scan_workspaces, batch)] = batch
+                if len(batches) < self.max_concurrency:
+                    continue
+                done, _ = wait(set(batches), return_when=FIRST_COMPLETED)
+                yield from self._scanned_workspaces(done, batches, on_scan_failed)
+            while batches:
+                done, _ = wait(set(batches), return_when=FIRST_COMPLETED)
+                yield from self._scanned_workspaces(done, batches, on_scan_failed)
+
+    @staticmethod
+    def _scanned_workspaces(done, batches, on_scan_failed):
+        for future in done:
+            batch = batches.pop(future)
+            try:
+                workspaces = future.result().get('workspaces', [])
+            except Exception as e:
+                logger.error(f"Scan of workspaces {', '.join(batch)} failed: {e}")
+                if on_scan_failed:
+                    on_scan_failed(batch, e)
+                continue
+            yield from workspaces
+
+    def iter_datasets(self, workspace_ids=None, batch_size=SCAN_BATCH_SIZE, on_scan_failed=None):
+        """Yield (workspace, dataset) from the scan results; all workspaces when workspace_ids is None."""
+        if workspace_ids is None:
+            workspace_ids = (workspace['id'] for workspace in self.iter_workspaces())
+        for workspace in self.scan(workspace_ids, batch_size=batch_size, on_scan_failed=on_scan_failed):
+            for dataset in workspace.get('datasets') or []:
+                yield workspace, dataset
+
+
+def get_access_token(tenant_id, client_id, client_secret, authority_url=PBI_AUTHORITY_URL):
+    """Service principal token (client credentials flow) for the Power BI REST API."""
+    response = httpx.post(
+        f"{authority_url.rstrip('/')}/{tenant_id}/oauth2/v2.0/token",
+        data={
+            'grant_type': 'client_credentials',
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'scope': PBI_SCOPE
+        },
+        timeout=DEFAULT_TIMEOUT_SECONDS
+    )
+    if response.status_code >= 400:
+        raise PowerBIServiceError(f"Token request failed with HTTP {response.status_code}: {response.text[:200]}",
+                                  status_code=response.status_code)
+    return response.json()['access_token']
+
+
+# Scanner result -> parsed semantic model ----
+
+def service_model_name(workspace, dataset):
+    """Catalog model name of a service dataset; dataset names are only unique within a workspace."""
+    return f"{workspace.get('name') or workspace['id']}.{dataset.get('name') or dataset['id']}"
+
+
+def service_dataset_path(workspace, dataset):
+    """Stand-in for the project folder in catalog.pbi_catalog_run_projects."""
+    return f"powerbi://{workspace['id']}/{dataset['id']}"
+
+
+def service_workspace_path(workspace_id):
+    """Row in catalog.pbi_catalog_run_projects for a workspace whose scan failed."""
+    return f"powerbi://{workspace_id}"
+
+
+def scanner_dataset_to_parsed(dataset, force_full=False):
+    """
+    Convert a scanner API dataset into the dict returned by parse_semantic_model.
+
+    The scan result always holds the complete model, so tables_complete is set and missing tables
+    are marked deleted. Relationships are only compared when the scan result contains them.
+    Returns None when the scan carries no schema for the dataset (no tables key), because an empty
+    model would otherwise delete everything cataloged for it before.
+    """
+    if dataset.get('tables') is None:
+        return None
+
+    tables = []
+    for table in dataset['tables']:
+        table_name = table.get('name')
+        tables.append({
+            'name': table_name,
+            'display_folder': None,
+            'is_hidden': True if table.get('isHidden') else None,
+            'columns': [
+                {
+                    'name': column.get('name'),
+                    'dataType': column.get('dataType'),
+                    'is_hidden': True if column.get('isHidden') else None,
+                    'format_string': column.get('formatString'),
+                    'display_folder': column.get('displayFolder')
+                }
+                for column in table.get('columns') or []
+            ],
+            'measures': [
+                {
+                    'name': measure.get('name'),
+                    'expression': measure.get('expression'),
+                    'formatString': measure.get('formatString'),
+                    'displayFolder': measure.get('displayFolder'),
+                    'lineageTag': measure.get('lineageTag'),
+                    'isHidden': bool(measure.get('isHidden', False)),
+                    'isPrivate': False,
+                    'isAvailableInMDX': False
+                }
+                for measure in table.get('measures') or []
+            ],
+            # The scanner returns the partition sources without partition names
+            'partitions': [
+                {
+                    'name': table_name if index == 0 else f"{table_name}-{index}",
+                    'mode': source.get('mode'),
+                    'query_group': None,
+                    'm_expression': source.get('expression') or ''
+                }
+                for index, source in enumerate(table.get('source') or [])
+            ]
+        })
+
+    relationships = None
+    if dataset.get('relationships') is not None:
+        relationships = [
+            {
+                'id': relationship.get('name'),
+                'fromTable': relationship.get('fromTable'),
+                'fromColumn': relationship.get('fromColumn'),
+                'toTable': relationship.get('toTable'),
+                'toColumn': relationship.get('toColumn'),
+                'isActive': relationship.get('isActive', True),
+                'cross_filter': relationship.get('crossFilteringBehavior')
+            }
+            for relationship in dataset['relationships']
+        ]
+
+    return {
+        'tables_dir': '',
+        'tables': tables,
+        'manifest_entries': {},
+        'removed_files': set(),
+        'skipped_files': 0,
+        'tables_complete': True,
+        'relationships': relationships,
+        'relationships_parsed': relationships is not None,
+        'table_digests': {table['name']: canonical_digest(table) for table in tables},
+        'relationships_digest': canonical_digest(relationships) if relationships is not None else None,
+        'force_full': force_full
+    }
+
+
+# Catalog writes ----
+
+def write_service_dataset(conn, workspace, dataset, parsed, catalog_run_id):
+    """Write one scanned dataset through write_semantic_model; does not commit. Returns (summary, counts)."""
+    model_name = service_model_name(workspace, dataset)
+    with conn.cursor() as cur:
+        model_id = insert_model(cur, model_name, catalog_run_id)
+    summary, processed_counts, unchanged = write_semantic_model(conn, model_id, model_name, parsed, catalog_run_id)
+    with conn.cursor() as cur:
+        record_project_status(
+            cur, catalog_run_id, service_dataset_path(workspace, dataset), model_name,
+            'unchanged' if unchanged else 'completed',
+            model_id=model_id, processed_counts=processed_counts
+        )
+    return summary, processed_counts
+
+
+def process_powerbi_service(client, catalog_run_id, workspace_ids=None, force_full=False, batch_size=SCAN_BATCH_SIZE):
+    """
+    Catalog the datasets of the scanned workspaces under one catalog run.
+
+    Datasets are written while later scans are still running; every dataset is its own
+    transaction and gets a row in catalog.pbi_catalog_run_projects, a failing dataset does not
+    stop the run. Neither does a failed scan: each workspace of that batch gets a 'failed' row
+    and counts as a failed model. Returns (summary, processed_counts, models_completed, models_failed).
+    """
+    summary = get_empty_pbi_summary()
+    processed_counts = get_empty_processed_counts()
+    models_completed = 0
+    models_failed = 0
+    seen_names = set()
+
+    conn = get_catalog_connection()
+
+    def record_failed_scan(batch, error):
+        nonlocal models_failed
+        with conn.cursor() as cur:
+            for workspace_id in batch:
+                record_project_status(cur, catalog_run_id, service_workspace_path(workspace_id), None, 'failed',
+                                      error_message=f"Scan failed: {error}")
+        conn.commit()
+        models_failed += len(batch)
+
+    try:
+        for workspace, dataset in client.iter_datasets(workspace_ids, batch_size=batch_size,
+                                                       on_scan_failed=record_failed_scan):
+            model_name = service_model_name(workspace, dataset)
+            dataset_path = service_dataset_path(workspace, dataset)
+            parsed = scanner_dataset_to_parsed(dataset, force_full=force_full)
+            if parsed is None or model_name in seen_names:
+                status = 'skipped' if parsed is None else 'failed'
+                error_message = ("No dataset schema in the scan result" if parsed is None
+                                 else f"Duplicate semantic model name: {model_name}")
+                logger.warning(f"Skipping dataset {model_name}: {error_message}")
+                with conn.cursor() as cur:
+                    record_project_status(cur, catalog_run_id, dataset_path, model_name, status,
+                                          error_message=error_message)
+                conn.commit()
+                models_failed += status == 'failed'
+                continue
+            seen_names.add(model_name)
+
+            try:
+                dataset_summary, dataset_counts = write_service_dataset(conn, workspace, dataset, parsed, catalog_run_id)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Failed to write dataset {model_name}: {e}")
+                with conn.cursor() as cur:
+                    record_project_status(cur, catalog_run_id, dataset_path, model_name, 'failed',
+                                          error_message=str(e))
+                conn.commit()
+                models_failed += 1
+                continue
+
+            for key, value in dataset_summary.items():
+                summary[key] += value
+            for key, value in dataset_counts.items():
+                processed_counts[key] += value
+            models_completed += 1
+            logger.info(f"Dataset {model_name}: {len(parsed['tables'])} tables written")
+    finally:
+        conn.close()
+
+    log_pbi_summary(summary, processed_counts)
+    logger.info(f"Datasets completed: {models_completed}, failed: {models_failed}")
+    return summary, processed_counts, models_completed, models_failed
+
+
+def get_service_connection(catalog_conn, connection_id):
+    """Connection info plus service principal details (secret resolved) of a Power BI service connection."""
+    with catalog_conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.id, c.connection_name, c.connection_type,
+                   d.tenant_id, d.client_id, d.auth_method, s.secret_value,
+                   d.default_workspace_id, d.default_workspace_name
+            FROM config.pbi_service_connection_details d
+            JOIN config.connections c ON c.id = d.connection_id
+            LEFT JOIN security.secrets_plain s ON s.ref_key = d.secret_ref
+            WHERE d.connection_id = %s
+        """, (connection_id,))
+        row = cursor.fetchone()
+    if not row:
+        return None
+    return {
+        'id': row[0],
+        'name': row[1],
+        'connection_type': row[2],
+        'tenant_id': row[3],
+        'client_id': row[4],
+        'auth_method': row[5],
+        'client_secret': row[6],
+        'default_workspace_id': row[7],
+        'default_workspace_name': row[8]
+    }
+
+
+def main():
+    """Catalog the semantic models of a Power BI service tenant via the scanner API"""
+    parser = argparse.ArgumentParser(description='Catalog Power BI service datasets via the scanner API')
+    parser.add_argument('--connection-id', type=int, required=True,
+                        help='Power BI service connection (config.pbi_service_connection_details)')
+    parser.add_argument('--workspace-id', action='append', dest='workspace_ids',
+                        help='Only scan this workspace (repeatable); default: the default workspace of the '
+                             'connection, or all workspaces when it has none')
+    parser.add_argument('--all-workspaces', action='store_true',
+                        help='Scan all workspaces, also when the connection has a default workspace')
+    parser.add_argument('--base-url', type=str, default=os.getenv('PBI_API_BASE_URL', PBI_API_BASE_URL),
+                        help='Power BI REST API base URL (e.g. a local stub server)')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help=f'Concurrent HTTP requests and scans (default: {DEFAULT_MAX_CONCURRENCY})')
+    parser.add_argument('--force-full', action='store_true',
+                        help='Write all datasets, also when unchanged since the last run')
+    args = parser.parse_args()
+
+    setup_logging_with_run_id()
+    logger.info("Starting Power BI service cataloging")
+
+    catalog_conn = get_catalog_connection()
+    try:
+        connection_info = get_service_connection(catalog_conn, args.connection_id)
+    finally:
+        catalog_conn.close()
+    if not connection_info:
+        logger.error(f"Power BI service connection {args.connection_id} not found")
+        sys.exit(1)
+
+    workspace_ids = args.workspace_ids
+    if not workspace_ids and not args.all_workspaces and connection_info['default_workspace_id']:
+        workspace_ids = [connection_info['default_workspace_id']]
+
+    # PBI_ACCESS_TOKEN skips the token request (stub servers, tokens from az cli)
+    access_token = os.getenv('PBI_ACCESS_TOKEN')
+    if not access_token:
+        if connection_info['auth_method'] != 'CLIENT_SECRET':
+            logger.error(f"Auth method {connection_info['auth_method']} is not supported, use CLIENT_SECRET "
+                         f"or set PBI_ACCESS_TOKEN")
+            sys.exit(1)
+        access_token = get_access_token(
+            connection_info['tenant_id'], connection_info['client_id'], connection_info['client_secret']
+        )
+
+    source = f"powerbi-service/{connection_info['default_workspace_name'] or connection_info['tenant_id']}"
+    catalog_conn = get_catalog_connection()
+    try:
+        catalog_run_id = start_powerbi_catalog_run(catalog_conn, connection_info, source)
+        catalog_conn.commit()
+    except Exception as e:
+        catalog_conn.rollback()
+        logger.error(f"Failed to create catalog run: {e}")
+        sys.exit(1)
+    finally:
+        catalog_conn.close()
+
+    try:
+        with PowerBIServiceClient(access_token, base_url=args.base_url, max_concurrency=args.max_concurrency) as client:
+            summary, processed_counts, models_processed, models_failed = process_powerbi_service(
+                client, catalog_run_id, workspace_ids=workspace_ids, force_full=args.force_full
+            )
+        if models_failed and models_processed == 0:
+            raise Exception(f"All {models_failed} datasets failed")
+        if models_failed:
+            logger.warning(f"{models_failed} datasets failed, see catalog.pbi_catalog_run_projects")
+
+        complete_conn = get_catalog_connection()
+        try:
+            complete_powerbi_catalog_run(complete_conn, catalog_run_id, processed_counts,
+                                         models_processed=models_processed)
+        finally:
+            complete_conn.close()
+
+    except Exception as e:
+        fail_conn = get_catalog_connection()
+        try:
+            fail_catalog_run(fail_conn, catalog_run_id, str(e))
+        finally:
+            fail_conn.close()
+        logger.error(f"Power BI service cataloging failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
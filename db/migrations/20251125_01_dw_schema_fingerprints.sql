@@ -0,0 +1,10 @@
+-- Per-schema DDL fingerprints of the last walked catalog run; dw_cataloger skips schemas whose
+-- fingerprint is unchanged unless --force-full is given.
+-- Written by save_schema_fingerprints(); without this table every schema is walked.
+
+CREATE TABLE IF NOT EXISTS catalog.dw_schema_fingerprints (
+    schema_id integer PRIMARY KEY,
+    fingerprint text NOT NULL,
+    catalog_run_id integer NOT NULL,
+    computed_at timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
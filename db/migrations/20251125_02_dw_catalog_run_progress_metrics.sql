@@ -0,0 +1,7 @@
+-- Throughput reported by dw_cataloger's ProgressReporter and shown on the Catalog execution page.
+-- Without these columns the cataloger still reports processed counts, only without objects/sec and ETA.
+
+ALTER TABLE catalog.dw_catalog_runs
+    ADD COLUMN IF NOT EXISTS objects_per_second numeric,
+    ADD COLUMN IF NOT EXISTS eta_seconds integer,
+    ADD COLUMN IF NOT EXISTS progress_updated_at timestamp;
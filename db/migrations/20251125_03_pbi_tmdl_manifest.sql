@@ -0,0 +1,13 @@
+-- Per semantic model the size, mtime and content hash of every table .tmdl file of the last
+-- successful pbi_cataloger run; unchanged files are skipped on the next run.
+
+CREATE TABLE IF NOT EXISTS catalog.pbi_tmdl_manifest (
+    model_id integer NOT NULL,
+    file_name text NOT NULL,
+    file_size bigint NOT NULL,
+    file_mtime double precision NOT NULL,
+    content_hash text NOT NULL,
+    catalog_run_id integer,
+    date_updated timestamp DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model_id, file_name)
+);
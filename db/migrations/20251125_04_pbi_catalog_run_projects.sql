@@ -0,0 +1,19 @@
+-- Status per semantic model project within a multi-project pbi_cataloger run
+-- ('running', 'completed', 'unchanged', 'failed').
+
+CREATE TABLE IF NOT EXISTS catalog.pbi_catalog_run_projects (
+    catalog_run_id integer NOT NULL,
+    project_folder text NOT NULL,
+    model_name text,
+    model_id integer,
+    status varchar(20) NOT NULL,
+    error_message text,
+    tables_processed integer DEFAULT 0,
+    columns_processed integer DEFAULT 0,
+    measures_processed integer DEFAULT 0,
+    relationships_processed integer DEFAULT 0,
+    m_code_processed integer DEFAULT 0,
+    started_at timestamp DEFAULT CURRENT_TIMESTAMP,
+    completed_at timestamp,
+    PRIMARY KEY (catalog_run_id, project_folder)
+);
@@ -0,0 +1,18 @@
+-- Deleted Power BI tables, columns, measures and relationships are marked the same way as
+-- deleted M-code partitions (bulk temporal upserts in pbi_cataloger).
+
+ALTER TABLE catalog.pbi_tables
+    ADD COLUMN IF NOT EXISTS date_deleted timestamp,
+    ADD COLUMN IF NOT EXISTS deleted_by_catalog_run_id integer;
+
+ALTER TABLE catalog.pbi_columns
+    ADD COLUMN IF NOT EXISTS date_deleted timestamp,
+    ADD COLUMN IF NOT EXISTS deleted_by_catalog_run_id integer;
+
+ALTER TABLE catalog.pbi_measures
+    ADD COLUMN IF NOT EXISTS date_deleted timestamp,
+    ADD COLUMN IF NOT EXISTS deleted_by_catalog_run_id integer;
+
+ALTER TABLE catalog.pbi_relationships
+    ADD COLUMN IF NOT EXISTS date_deleted timestamp,
+    ADD COLUMN IF NOT EXISTS deleted_by_catalog_run_id integer;
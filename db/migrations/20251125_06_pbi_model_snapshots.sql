@@ -0,0 +1,10 @@
+-- Model snapshot hashes used by pbi_cataloger to skip semantic models that did not change,
+-- and the canonical (formatting-insensitive) hash per .tmdl file in the manifest.
+
+ALTER TABLE catalog.pbi_models
+    ADD COLUMN IF NOT EXISTS snapshot_hash text,
+    ADD COLUMN IF NOT EXISTS relationships_hash text,
+    ADD COLUMN IF NOT EXISTS snapshot_status text;
+
+ALTER TABLE catalog.pbi_tmdl_manifest
+    ADD COLUMN IF NOT EXISTS canonical_hash text;
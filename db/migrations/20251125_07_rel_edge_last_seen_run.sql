@@ -0,0 +1,5 @@
+-- Last catalog run that saw an edge; the shared cataloger loader sweeps edges of a source
+-- that were not seen in the current run.
+
+ALTER TABLE rel.edge
+    ADD COLUMN IF NOT EXISTS last_seen_run_id bigint;
@@ -0,0 +1,5 @@
+-- Hits and misses of the LLM response cache per AI analysis run.
+
+ALTER TABLE catalog.catalog_ai_analysis_runs
+    ADD COLUMN IF NOT EXISTS cache_hits integer,
+    ADD COLUMN IF NOT EXISTS cache_misses integer;
@@ -0,0 +1,5 @@
+-- Fingerprint of the metadata and sample (or view definition) an AI table analysis was based on.
+-- With AI_SKIP_UNCHANGED, tables whose fingerprint equals the last 'ok' result are skipped.
+
+ALTER TABLE catalog.catalog_ai_analysis_results
+    ADD COLUMN IF NOT EXISTS input_fingerprint text;
@@ -585,6 +585,40 @@ def get_current_run_info(connection_id):
         except Exception:
             pass
 
+def get_run_throughput(connection_id):
+    """Get processed counts, objects/sec and ETA of the latest run (None when not reported)"""
+    try:
+        conn = ch.get_catalog_connection()
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT schemas_processed, tables_processed, columns_processed,
+                       objects_per_second, eta_seconds
+                FROM catalog.dw_catalog_runs
+                WHERE connection_id = %s
+                ORDER BY run_started_at DESC
+                LIMIT 1
+            """, (connection_id,))
+            return cur.fetchone()
+    except Exception:
+        return None
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+def format_eta(eta_seconds):
+    """Format an ETA in seconds as h/m/s text"""
+    if eta_seconds is None:
+        return "-"
+    minutes, seconds = divmod(int(eta_seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes}m"
+    if minutes:
+        return f"{minutes}m {seconds}s"
+    return f"{seconds}s"
+
 def get_latest_database_log():
     """Get the latest database server cataloging log content"""
     try:
@@ -835,6 +869,20 @@ with tab1:
                 st.warning("🔄 **POWERBI CATALOGING PROCESS IS ACTIVE!**")
             else:
                 st.warning("🔄 **DATABASE CATALOGING PROCESS IS ACTIVE!**")
+
+                # Throughput as reported (throttled) by the cataloger
+                throughput = get_run_throughput(connection_id) if connection_id else None
+                if throughput:
+                    schema_count, table_count, column_count, objects_per_second, eta_seconds = throughput
+                    tp_col1, tp_col2, tp_col3, tp_col4 = st.columns(4)
+                    with tp_col1:
+                        st.metric("📂 Schemas", schema_count or 0)
+                    with tp_col2:
+                        st.metric("📋 Tables", table_count or 0)
+                    with tp_col3:
+                        st.metric("⚡ Objects/sec", f"{float(objects_per_second or 0):.1f}")
+                    with tp_col4:
+                        st.metric("⏳ ETA", format_eta(eta_seconds))
             
             # Simple controls - just stop monitoring and line selector
             col1, col2, col3 = st.columns([3, 2, 3])
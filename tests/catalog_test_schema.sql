@@ -0,0 +1,303 @@
+-- Subset of the catalog schema (db/migrations dump + migrations) used by the SQL tests.
+-- Created by the catalog_conn fixture in tests/conftest.py and dropped again afterwards.
+
+CREATE SCHEMA catalog;
+CREATE SCHEMA rel;
+
+CREATE TABLE catalog.catalog_runs (
+    id bigserial PRIMARY KEY,
+    run_type text NOT NULL,
+    connection_id bigint NOT NULL,
+    source_label text,
+    started_at timestamp with time zone DEFAULT now() NOT NULL,
+    completed_at timestamp with time zone,
+    status text DEFAULT 'running' NOT NULL,
+    mode text DEFAULT 'manual' NOT NULL,
+    triggered_by text,
+    objects_total integer,
+    nodes_created integer,
+    nodes_updated integer,
+    nodes_deleted integer,
+    context jsonb DEFAULT '{}'::jsonb NOT NULL,
+    error_message text,
+    log_filename text
+);
+
+CREATE TABLE catalog.nodes (
+    node_id bigserial PRIMARY KEY,
+    node_type text NOT NULL,
+    name text NOT NULL,
+    qualified_name text NOT NULL,
+    props jsonb,
+    created_at timestamp with time zone DEFAULT now(),
+    updated_at timestamp with time zone DEFAULT now(),
+    is_current boolean DEFAULT true NOT NULL,
+    created_in_run_id bigint,
+    last_seen_run_id bigint,
+    deleted_in_run_id bigint,
+    deleted_at timestamp with time zone,
+    UNIQUE (node_type, qualified_name)
+);
+
+CREATE TABLE catalog.node_database (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    server_name text NOT NULL,
+    database_name text NOT NULL,
+    UNIQUE (server_name, database_name)
+);
+
+CREATE TABLE catalog.node_schema (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    database_node_id bigint NOT NULL REFERENCES catalog.nodes (node_id),
+    schema_name text NOT NULL,
+    UNIQUE (database_node_id, schema_name)
+);
+
+CREATE TABLE catalog.node_table (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    schema_node_id bigint NOT NULL REFERENCES catalog.nodes (node_id),
+    table_name text NOT NULL,
+    table_type text NOT NULL CHECK (table_type = ANY (ARRAY['TABLE', 'VIEW', 'PBI_TABLE', 'DL_TABLE'])),
+    UNIQUE (schema_node_id, table_name)
+);
+
+CREATE TABLE catalog.node_column (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    table_node_id bigint NOT NULL REFERENCES catalog.nodes (node_id),
+    column_name text NOT NULL,
+    data_type text NOT NULL,
+    is_nullable boolean,
+    UNIQUE (table_node_id, column_name)
+);
+
+CREATE TABLE catalog.node_dl_container (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    account_name text,
+    container_name text NOT NULL,
+    props jsonb
+);
+
+CREATE TABLE catalog.node_dl_folder (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    container_node_id bigint NOT NULL REFERENCES catalog.nodes (node_id),
+    folder_path text NOT NULL,
+    props jsonb
+);
+
+CREATE TABLE catalog.node_dl_file (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    folder_node_id bigint NOT NULL REFERENCES catalog.nodes (node_id),
+    file_name text NOT NULL,
+    file_format text,
+    size_bytes bigint,
+    props jsonb
+);
+
+CREATE TABLE catalog.node_pbi_model (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    workspace_name text,
+    dataset_name text,
+    props jsonb
+);
+
+CREATE TABLE catalog.node_pbi_measure (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    table_node_id bigint NOT NULL REFERENCES catalog.nodes (node_id),
+    measure_name text NOT NULL,
+    data_type text NOT NULL,
+    dax_expression text NOT NULL,
+    format_string text,
+    is_hidden boolean
+);
+
+CREATE TABLE catalog.node_pbi_query (
+    node_id bigint PRIMARY KEY REFERENCES catalog.nodes (node_id) ON DELETE CASCADE,
+    model_node_id bigint,
+    table_node_id bigint,
+    query_name text NOT NULL,
+    source_kind text,
+    source_path text,
+    m_code text,
+    props jsonb
+);
+
+CREATE TABLE rel.edge (
+    edge_id bigserial PRIMARY KEY,
+    src_node_id bigint NOT NULL REFERENCES catalog.nodes (node_id),
+    dst_node_id bigint NOT NULL REFERENCES catalog.nodes (node_id),
+    edge_type text NOT NULL,
+    weight real,
+    props jsonb,
+    created_at timestamp with time zone DEFAULT now(),
+    last_seen_run_id bigint
+);
+
+-- Power BI semantic models (pbi_cataloger)
+
+CREATE TABLE catalog.pbi_models (
+    id serial PRIMARY KEY,
+    model_name text NOT NULL,
+    catalog_run_id integer,
+    snapshot_hash text,
+    relationships_hash text,
+    snapshot_status text
+);
+
+CREATE TABLE catalog.pbi_tables (
+    id serial PRIMARY KEY,
+    model_id integer NOT NULL,
+    table_name text NOT NULL,
+    display_folder text,
+    is_hidden boolean,
+    source_table text,
+    catalog_run_id integer,
+    is_current boolean DEFAULT true,
+    date_created timestamp DEFAULT CURRENT_TIMESTAMP,
+    date_updated timestamp,
+    date_deleted timestamp,
+    deleted_by_catalog_run_id integer
+);
+
+CREATE TABLE catalog.pbi_columns (
+    id serial PRIMARY KEY,
+    semantic_table_id integer NOT NULL,
+    column_name text NOT NULL,
+    data_type text,
+    is_hidden boolean,
+    format_string text,
+    display_folder text,
+    catalog_run_id integer,
+    is_current boolean DEFAULT true,
+    date_created timestamp DEFAULT CURRENT_TIMESTAMP,
+    date_updated timestamp,
+    date_deleted timestamp,
+    deleted_by_catalog_run_id integer
+);
+
+CREATE TABLE catalog.pbi_measures (
+    id serial PRIMARY KEY,
+    semantic_table_id integer NOT NULL,
+    measure_name text NOT NULL,
+    dax_expression text,
+    format_string text,
+    display_folder text,
+    lineage_tag text,
+    is_hidden boolean,
+    is_private boolean,
+    is_available_in_mdx boolean,
+    catalog_run_id integer,
+    is_current boolean DEFAULT true,
+    date_created timestamp DEFAULT CURRENT_TIMESTAMP,
+    date_updated timestamp,
+    date_deleted timestamp,
+    deleted_by_catalog_run_id integer
+);
+
+CREATE TABLE catalog.pbi_relationships (
+    id serial PRIMARY KEY,
+    model_id integer NOT NULL,
+    from_table text,
+    from_column text,
+    to_table text,
+    to_column text,
+    is_active boolean,
+    relationship_type text,
+    cross_filter text,
+    catalog_run_id integer,
+    is_current boolean DEFAULT true,
+    date_created timestamp DEFAULT CURRENT_TIMESTAMP,
+    date_updated timestamp,
+    date_deleted timestamp,
+    deleted_by_catalog_run_id integer
+);
+
+CREATE TABLE catalog.pbi_m_code (
+    id serial PRIMARY KEY,
+    semantic_table_id integer NOT NULL,
+    partition_name text,
+    mode text,
+    query_group text,
+    m_expression text,
+    catalog_run_id integer,
+    is_current boolean DEFAULT true,
+    date_created timestamp DEFAULT CURRENT_TIMESTAMP,
+    date_updated timestamp,
+    date_deleted timestamp,
+    deleted_by_catalog_run_id integer
+);
+
+CREATE TABLE catalog.pbi_tmdl_manifest (
+    model_id integer NOT NULL,
+    file_name text NOT NULL,
+    file_size bigint NOT NULL,
+    file_mtime double precision NOT NULL,
+    content_hash text NOT NULL,
+    canonical_hash text,
+    catalog_run_id integer,
+    date_updated timestamp DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (model_id, file_name)
+);
+
+CREATE TABLE catalog.pbi_catalog_run_projects (
+    catalog_run_id integer NOT NULL,
+    project_folder text NOT NULL,
+    model_name text,
+    model_id integer,
+    status varchar(20) NOT NULL,
+    error_message text,
+    tables_processed integer DEFAULT 0,
+    columns_processed integer DEFAULT 0,
+    measures_processed integer DEFAULT 0,
+    relationships_processed integer DEFAULT 0,
+    m_code_processed integer DEFAULT 0,
+    started_at timestamp DEFAULT CURRENT_TIMESTAMP,
+    completed_at timestamp,
+    PRIMARY KEY (catalog_run_id, project_folder)
+);
+
+CREATE TABLE catalog.pbi_catalog_runs (
+    id serial PRIMARY KEY,
+    connection_id integer,
+    connection_name text,
+    connection_type text,
+    connection_host text,
+    connection_port text,
+    databases_to_catalog text,
+    databases_count integer,
+    databases_processed integer,
+    models_processed integer,
+    tables_processed integer,
+    columns_processed integer,
+    measures_processed integer,
+    relationships_processed integer,
+    m_code_processed integer,
+    run_started_at timestamp,
+    run_completed_at timestamp,
+    run_status text,
+    error_message text,
+    log_filename text
+);
+
+CREATE TABLE catalog.dw_schemas (
+    id serial PRIMARY KEY,
+    database_id integer NOT NULL,
+    schema_name text NOT NULL,
+    is_current boolean DEFAULT true
+);
+
+CREATE TABLE catalog.dw_tables (
+    id serial PRIMARY KEY,
+    schema_id integer NOT NULL,
+    table_name text NOT NULL,
+    is_current boolean DEFAULT true,
+    row_count_estimated bigint,
+    row_count_updated timestamp
+);
+
+CREATE TABLE catalog.dw_table_rowcounts (
+    id serial PRIMARY KEY,
+    table_id integer NOT NULL,
+    row_count_estimated bigint,
+    collected_at timestamp,
+    catalog_run_id integer
+);
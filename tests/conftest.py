@@ -0,0 +1,37 @@
+import os
+from pathlib import Path
+
+import pytest
+
+CATALOG_SCHEMA_SQL = Path(__file__).with_name('catalog_test_schema.sql')
+
+
+@pytest.fixture
+def catalog_dsn():
+    """DSN of a scratch Postgres database for the SQL tests (CATALOG_TEST_DSN); skipped when not set."""
+    dsn = os.getenv('CATALOG_TEST_DSN')
+    if not dsn:
+        pytest.skip("CATALOG_TEST_DSN not set")
+    return dsn
+
+
+@pytest.fixture
+def catalog_conn(catalog_dsn):
+    """Connection with the catalog and rel schemas of catalog_test_schema.sql; both are dropped afterwards."""
+    psycopg2 = pytest.importorskip('psycopg2')
+    conn = psycopg2.connect(catalog_dsn)
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regnamespace('catalog') IS NOT NULL OR to_regnamespace('rel') IS NOT NULL")
+        if cur.fetchone()[0]:
+            conn.close()
+            pytest.skip("CATALOG_TEST_DSN must point at a scratch database without catalog/rel schemas")
+        cur.execute(CATALOG_SCHEMA_SQL.read_text())
+    conn.commit()
+    try:
+        yield conn
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("DROP SCHEMA catalog, rel CASCADE")
+        conn.commit()
+        conn.close()
@@ -0,0 +1,82 @@
+import threading
+import time
+
+from ai_analyzer.runners.llm_executor import RateBudget, call_with_budget, run_concurrently
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_run_concurrently_bounds_concurrency_and_isolates_errors():
+    lock = threading.Lock()
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    def analyse(name):
+        with lock:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            time.sleep(0.05)
+            if name == "broken":
+                raise RuntimeError("LLM timeout")
+            return {"table": name, "status": "ok"}
+        finally:
+            with lock:
+                state["in_flight"] -= 1
+
+    tables = ["a", "b", "broken", "c", "d", "e"]
+    started = time.monotonic()
+    outcomes = {item: (result, error) for item, result, error in run_concurrently(tables, analyse, max_concurrency=3)}
+    elapsed = time.monotonic() - started
+
+    assert set(outcomes) == set(tables)
+    assert isinstance(outcomes["broken"][1], RuntimeError)
+    assert all(outcomes[t][0]["status"] == "ok" for t in tables if t != "broken")
+    assert state["max_in_flight"] == 3
+    assert elapsed < 0.05 * len(tables)  # sequential would take 0.3s
+
+
+def test_rate_budget_waits_for_requests_per_minute():
+    clock = FakeClock()
+    budget = RateBudget(requests_per_minute=2, clock=clock, sleep=clock.sleep)
+
+    budget.acquire()
+    budget.acquire()
+    assert clock.now == 0
+    budget.acquire()
+    assert clock.now == 60
+
+
+def test_rate_budget_settles_actual_tokens():
+    clock = FakeClock()
+    budget = RateBudget(tokens_per_minute=1000, clock=clock, sleep=clock.sleep)
+
+    entry = budget.acquire(800)
+    budget.settle(entry, 300)  # the response used less than estimated
+    clock.now = 10
+    budget.acquire(600)
+    assert clock.now == 10
+
+    budget.acquire(400)  # 900 used: waits until the first request leaves the window
+    assert clock.now == 60
+
+
+def test_call_with_budget_passes_model_parameters():
+    calls = []
+
+    def fake_llm(prompt, *, model, temperature, max_tokens):
+        calls.append((prompt, model, temperature, max_tokens))
+        return {"result": "{}", "tokens": {"total": 42}}
+
+    result = call_with_budget(fake_llm, "Beschrijf tabel", model="test-model", temperature=0.2, max_tokens=100)
+
+    assert result["tokens"]["total"] == 42
+    assert calls == [("Beschrijf tabel", "test-model", 0.2, 100)]
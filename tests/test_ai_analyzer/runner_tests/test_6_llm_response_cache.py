@@ -0,0 +1,54 @@
+from unittest.mock import patch
+
+from ai_analyzer.analysis.llm_model_wrapper import call_llm
+from ai_analyzer.analysis.llm_response_cache import LLMResponseCache, cache_key
+
+openai_response = {
+    "result": '{"id": "PRIMARY_KEY"}',
+    "model_used": "gpt-4",
+    "tokens": {"prompt": 120, "completion": 30, "total": 150, "estimated_cost_usd": 0.0135},
+}
+
+
+def test_identical_prompt_is_served_from_cache(tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache.sqlite")
+    with patch("ai_analyzer.analysis.llm_model_wrapper.get_response_cache", return_value=cache), \
+         patch("ai_analyzer.analysis.llm_model_wrapper.analyze_with_openai", return_value=dict(openai_response)) as llm:
+        first = call_llm("Classificeer kolommen", model="gpt-4", temperature=0.2, max_tokens=500)
+        second = call_llm("Classificeer kolommen", model="gpt-4", temperature=0.2, max_tokens=500)
+        other = call_llm("Classificeer kolommen", model="gpt-4", temperature=0.7, max_tokens=500)
+
+    assert llm.call_count == 2  # the temperature change is a different key
+    assert first["cache"] == "miss" and other["cache"] == "miss"
+    assert second["cache"] == "hit"
+    assert second["result"] == openai_response["result"]
+    assert second["tokens"]["total"] == 0 and second["tokens"]["estimated_cost_usd"] == 0.0
+    assert second["cached_tokens"]["total"] == 150
+
+
+def test_simulated_and_failed_responses_are_not_cached(tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache.sqlite")
+    simulated = {"result": "[simulatie]", "issues": ["no_api_key"], "tokens": {"total": 0}}
+    with patch("ai_analyzer.analysis.llm_model_wrapper.get_response_cache", return_value=cache), \
+         patch("ai_analyzer.analysis.llm_model_wrapper.analyze_with_openai", return_value=simulated) as llm:
+        call_llm("p", model="gpt-4", temperature=0.2, max_tokens=500)
+        result = call_llm("p", model="gpt-4", temperature=0.2, max_tokens=500)
+
+    assert llm.call_count == 2
+    assert "cache" not in result
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    cache = LLMResponseCache(tmp_path / "cache.sqlite", ttl_seconds=60, max_bytes=300)
+    keys = [cache_key("gpt-4", 0.2, 500, "system", f"prompt {i}") for i in range(3)]
+
+    with patch("ai_analyzer.analysis.llm_response_cache.time.time", return_value=1000.0):
+        cache.put(keys[0], "gpt-4", openai_response)
+    with patch("ai_analyzer.analysis.llm_response_cache.time.time", return_value=1030.0):
+        assert cache.get(keys[0]) is not None
+    with patch("ai_analyzer.analysis.llm_response_cache.time.time", return_value=1040.0):
+        cache.put(keys[1], "gpt-4", openai_response)  # over 300 bytes: least recently used goes
+        assert cache.get(keys[0]) is None
+        assert cache.get(keys[1]) is not None
+    with patch("ai_analyzer.analysis.llm_response_cache.time.time", return_value=1101.0):
+        assert cache.get(keys[1]) is None  # expired
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from ai_analyzer.analysis.table_fingerprint import compute_table_fingerprint
+
+metadata = [
+    {"column_id": 1, "name": "id", "type": "int"},
+    {"column_id": 2, "name": "value", "type": "numeric"},
+]
+sample = [{"id": 1, "value": 10}, {"id": 2, "value": 20}]
+
+
+def test_fingerprint_is_stable_for_unchanged_input():
+    recataloged = [dict(column, column_id=column["column_id"] + 100) for column in metadata]
+
+    assert compute_table_fingerprint(metadata, sample) == compute_table_fingerprint(recataloged, list(sample))
+    # DataFrame and list[dict] samples give the same digest
+    assert compute_table_fingerprint(metadata, pd.DataFrame(sample)) == compute_table_fingerprint(metadata, sample)
+
+
+def test_fingerprint_changes_with_structure_or_data():
+    base = compute_table_fingerprint(metadata, sample)
+
+    assert compute_table_fingerprint(metadata[:1], sample) != base
+    assert compute_table_fingerprint([metadata[0], dict(metadata[1], type="text")], sample) != base
+    assert compute_table_fingerprint(metadata, sample + [{"id": 3, "value": 30}]) != base
+    assert compute_table_fingerprint(view_definition="SELECT 1") != compute_table_fingerprint(view_definition="SELECT 2")
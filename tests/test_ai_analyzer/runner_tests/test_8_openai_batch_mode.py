@@ -0,0 +1,166 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from openai import OpenAI
+
+from ai_analyzer.analysis.llm_model_wrapper import call_llm_batch
+from ai_analyzer.analysis.llm_response_cache import LLMResponseCache
+from ai_analyzer.model_logic.llm_clients.openai_batch import OpenAIBatchRunner
+from ai_analyzer.model_logic.llm_clients.openai_parsing import parse_column_classification_response
+
+
+class BatchStub(ThreadingHTTPServer):
+    """Minimal /v1/files + /v1/batches endpoint: answers every request after one in_progress poll."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), BatchStubHandler)
+        self.uploads = []
+        self.batches = {}
+        self.files = {}
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def complete(self, input_lines):
+        output, errors = [], []
+        for line in input_lines:
+            request = json.loads(line)
+            prompt = request["body"]["messages"][-1]["content"]
+            if "kapot" in prompt:
+                errors.append({"id": f"resp-{request['custom_id']}", "custom_id": request["custom_id"],
+                               "response": {"status_code": 500, "body": {"error": {"message": "server error"}}}})
+                continue
+            table = prompt.split()[-1]
+            body = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "model": request["body"]["model"],
+                "choices": [{"index": 0, "message": {"role": "assistant",
+                                                     "content": json.dumps({f"{table}_id": "PRIMARY_KEY"})}}],
+                "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+            }
+            output.append({"id": f"resp-{request['custom_id']}", "custom_id": request["custom_id"],
+                           "response": {"status_code": 200, "body": body}, "error": None})
+        return output, errors
+
+
+class BatchStubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _json(self, payload, status=200):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _batch(self, batch_id):
+        return {"id": batch_id, "object": "batch", "endpoint": "/v1/chat/completions", "completion_window": "24h",
+                "created_at": 0, **self.server.batches[batch_id]}
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            if self.path == "/v1/files":
+                # multipart upload: keep only the JSONL request lines
+                lines = [line.decode("utf-8") for line in body.split(b"\n") if line.startswith(b'{"custom_id"')]
+                file_id = f"file-in-{len(self.server.uploads)}"
+                self.server.uploads.append(lines)
+                self.server.files[file_id] = lines
+                return self._json({"id": file_id, "object": "file", "bytes": len(body), "created_at": 0,
+                                   "filename": "batch.jsonl", "purpose": "batch", "status": "processed"})
+            if self.path == "/v1/batches":
+                request = json.loads(body)
+                batch_id = f"batch-{len(self.server.batches)}"
+                self.server.batches[batch_id] = {"input_file_id": request["input_file_id"], "status": "validating",
+                                                 "polls": 0}
+                return self._json(self._batch(batch_id))
+        self._json({"error": {"message": "not found"}}, status=404)
+
+    def do_GET(self):
+        with self.server.lock:
+            if self.path.startswith("/v1/batches/"):
+                batch = self.server.batches[self.path.rsplit("/", 1)[-1]]
+                batch["polls"] += 1
+                if batch["polls"] > 1 and batch["status"] != "completed":
+                    output, errors = self.server.complete(self.server.files[batch["input_file_id"]])
+                    self.server.files["file-out"] = [json.dumps(line) for line in output]
+                    self.server.files["file-err"] = [json.dumps(line) for line in errors]
+                    batch.update(status="completed", output_file_id="file-out", error_file_id="file-err")
+                else:
+                    batch["status"] = batch["status"] if batch["status"] == "completed" else "in_progress"
+                return self._json(self._batch(self.path.rsplit("/", 1)[-1]))
+            if self.path.startswith("/v1/files/") and self.path.endswith("/content"):
+                data = "\n".join(self.server.files[self.path.split("/")[3]]).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/jsonl")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+        self._json({"error": {"message": "not found"}}, status=404)
+
+
+@pytest.fixture
+def stub():
+    server = BatchStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_batch_mode_submits_prompts_as_one_batch(stub, tmp_path):
+    client = OpenAI(api_key="test-key", base_url=stub.base_url, max_retries=0)
+    runner = OpenAIBatchRunner(client, poll_seconds=0, batch_dir=str(tmp_path))
+    tables = ["klant", "order", "kapot", "product"]
+
+    with patch("ai_analyzer.analysis.llm_model_wrapper.get_response_cache", return_value=None), \
+         patch("ai_analyzer.analysis.llm_model_wrapper.analyze_with_openai") as direct_call:
+        results = call_llm_batch([f"Classificeer kolommen van {table}" for table in tables],
+                                 model="gpt-4o", temperature=0, max_tokens=200, runner=runner)
+
+    direct_call.assert_not_called()
+    assert len(stub.uploads) == 1 and len(stub.uploads[0]) == len(tables)
+    assert runner.batch_ids == ["batch-0"]
+    assert len(list(tmp_path.glob("batch_*.jsonl"))) == 1
+
+    outcomes = dict(zip(tables, results))
+    assert parse_column_classification_response(outcomes["order"]["result"]) == {"order_id": "PRIMARY_KEY"}
+    assert outcomes["order"]["tokens"]["total"] == 120
+    assert outcomes["order"]["tokens"]["estimated_cost_usd"] == pytest.approx(120 / 1000 * 0.02 * 0.5)
+    assert outcomes["kapot"]["error"] == "batch_request_failed"
+
+
+def test_cache_hits_are_not_submitted(stub, tmp_path):
+    client = OpenAI(api_key="test-key", base_url=stub.base_url, max_retries=0)
+    runner = OpenAIBatchRunner(client, poll_seconds=0, batch_dir=str(tmp_path))
+    cache = LLMResponseCache(str(tmp_path / "cache.sqlite"))
+    prompts = ["Classificeer kolommen van a", "Classificeer kolommen van b"]
+
+    with patch("ai_analyzer.analysis.llm_model_wrapper.get_response_cache", return_value=cache):
+        first = call_llm_batch(prompts[:1], model="gpt-4o", temperature=0, max_tokens=200, runner=runner)
+        second = call_llm_batch(prompts, model="gpt-4o", temperature=0, max_tokens=200, runner=runner)
+
+    assert first[0]["cache"] == "miss"
+    assert second[0]["cache"] == "hit" and second[0]["result"] == first[0]["result"]
+    assert second[1]["cache"] == "miss" and second[1]["result"] == json.dumps({"b_id": "PRIMARY_KEY"})
+    assert [len(upload) for upload in stub.uploads] == [1, 1]
+
+
+def test_failed_batch_returns_an_error_per_prompt(tmp_path):
+    client = OpenAI(api_key="test-key", base_url="http://127.0.0.1:9/v1", max_retries=0)
+    runner = OpenAIBatchRunner(client, poll_seconds=0, batch_dir=str(tmp_path))
+
+    results = runner.run(["a", "b"], model="gpt-4o", temperature=0, max_tokens=200)
+
+    assert [result["error"] for result in results] == ["batch_failed", "batch_failed"]
+    assert all(result["model_used"] == "gpt-4o" for result in results)
@@ -0,0 +1,43 @@
+import json
+
+from ai_analyzer.model_logic.llm_clients.openai_parsing import parse_column_classification_response
+from ai_analyzer.prompts.prompt_packer import PromptPacker, build_packed_prompt, split_packed_response, split_tokens
+
+
+def small_prompt(table):
+    return f'Doel: Classificeer de kolommen van de tabel. Antwoord als JSON: {{ "kolomnaam": "LABEL" }}\n\n{table}'
+
+
+def test_small_prompts_are_grouped_up_to_the_token_budget():
+    packer = PromptPacker(token_budget=60, max_table_tokens=40)
+    large_prompt = "x" * 400
+
+    assert not packer.fits(large_prompt)
+    for table in ["ods_alias_landcodes", "ods_alias_valutacodes", "artikelsoorten", "ordersoorten"]:
+        assert packer.fits(small_prompt(table))
+        packer.add(f"dbo.{table}", small_prompt(table), {"table": table})
+
+    packs = packer.packs()
+    assert len(packs) == 2
+    assert [item["key"] for pack in packs for item in pack] == [item["key"] for item in packer.items]
+    assert all(sum(item["tokens"] for item in pack) <= 60 for pack in packs)
+
+
+def test_packed_response_is_split_per_table():
+    items = [{"key": "dbo.landcodes", "prompt": small_prompt("landcodes"), "tokens": 30},
+             {"key": "dbo.soorten", "prompt": small_prompt("soorten"), "tokens": 10}]
+    prompt = build_packed_prompt(items)
+    assert '"dbo.landcodes", "dbo.soorten"' in prompt and "### Tabel `dbo.soorten`" in prompt
+
+    raw = "```json\n" + json.dumps({
+        "dbo.landcodes": {"code": "PRIMARY_KEY", "omschrijving": "DIMENSION"},
+        "dbo.soorten": {"soort_id": "PRIMARY_KEY"},
+    }) + "\n```"
+    answers = split_packed_response(raw, ["dbo.landcodes", "dbo.soorten", "dbo.ontbreekt"])
+
+    assert set(answers) == {"dbo.landcodes", "dbo.soorten"}
+    assert parse_column_classification_response(answers["dbo.soorten"]) == {"soort_id": "PRIMARY_KEY"}
+    assert split_packed_response("geen json", ["dbo.landcodes"]) == {}
+
+    shares = split_tokens({"prompt": 80, "completion": 20, "total": 100, "estimated_cost_usd": 0.002}, items)
+    assert [share["total"] for share in shares] == [75, 25]
@@ -0,0 +1,121 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from data_catalog import async_introspection
+from data_catalog.async_introspection import AsyncPostgresIntrospector
+
+CONN_INFO = {'host': 'pg01', 'port': '5432', 'username': 'reader', 'password': 'secret'}
+
+TABLES = {
+    'sales': [
+        {'table_name': 'big_orders', 'table_type': 'VIEW', 'view_definition': ' SELECT id FROM orders;'},
+        {'table_name': 'orders', 'table_type': 'BASE TABLE', 'view_definition': None},
+    ],
+}
+COLUMNS = {
+    'sales': [
+        {'table_name': 'big_orders', 'column_name': 'id', 'data_type': 'integer', 'is_nullable': 'YES',
+         'column_default': None, 'ordinal_position': 1},
+        {'table_name': 'orders', 'column_name': 'id', 'data_type': 'integer', 'is_nullable': 'NO',
+         'column_default': "nextval('orders_id_seq'::regclass)", 'ordinal_position': 1},
+        {'table_name': 'orders', 'column_name': 'amount', 'data_type': 'numeric', 'is_nullable': 'YES',
+         'column_default': None, 'ordinal_position': 2},
+    ],
+}
+
+
+class FakePool:
+    """asyncpg pool stand-in: at most max_size queries at a time, records the peak."""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self.active = 0
+        self.peak = 0
+        self.queries = []
+        self.closed = False
+        self._slots = asyncio.Semaphore(max_size)
+
+    async def fetch(self, sql, schema):
+        async with self._slots:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.queries.append(schema)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+        rows = TABLES if 'information_schema.tables' in sql else COLUMNS
+        return rows.get(schema, [])
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def pools(monkeypatch):
+    created = []
+
+    async def create_pool(**kwargs):
+        pool = FakePool(kwargs['max_size'])
+        created.append((kwargs, pool))
+        return pool
+    monkeypatch.setattr(async_introspection, 'asyncpg', SimpleNamespace(create_pool=create_pool))
+    return created
+
+
+def test_rows_are_mapped_to_the_source_metadata_contract(pools):
+    introspector = AsyncPostgresIntrospector(None, CONN_INFO, 'dw').load(['sales', 'empty'])
+
+    assert introspector.has_schema('empty') and introspector.get_tables('empty') == []
+    assert introspector.get_tables('sales') == [
+        {'table_name': 'orders', 'table_type': 'BASE TABLE', 'view_definition': None, 'connection_type': 'PostgreSQL'},
+    ]
+    assert [t['table_name'] for t in introspector.get_tables('sales', include_views=True)] == ['big_orders', 'orders']
+    assert introspector.get_tables('sales', table_filter=['big_orders'], include_views=True)[0]['view_definition'] == \
+        ' SELECT id FROM orders;'
+    assert introspector.get_columns('sales', 'orders') == [
+        {'column_name': 'id', 'data_type': 'integer', 'is_nullable': False,
+         'column_default': "nextval('orders_id_seq'::regclass)", 'ordinal_position': 1},
+        {'column_name': 'amount', 'data_type': 'numeric', 'is_nullable': True, 'column_default': None,
+         'ordinal_position': 2},
+    ]
+    assert introspector.get_columns('sales', 'missing') == []
+
+    (kwargs, pool), = pools
+    assert (kwargs['host'], kwargs['port'], kwargs['user'], kwargs['database']) == ('pg01', 5432, 'reader', 'dw')
+    assert pool.closed
+
+
+def test_returned_metadata_is_a_copy(pools):
+    introspector = AsyncPostgresIntrospector(None, CONN_INFO, 'dw').load(['sales'])
+    introspector.get_tables('sales')[0]['columns'] = []
+    introspector.get_columns('sales', 'orders')[0]['data_type'] = 'bigint'
+
+    assert 'columns' not in introspector.get_tables('sales')[0]
+    assert introspector.get_columns('sales', 'orders')[0]['data_type'] == 'integer'
+
+
+def test_queries_run_concurrently_up_to_the_pool_size(pools):
+    AsyncPostgresIntrospector(None, CONN_INFO, 'dw', pool_size=3).load([f"schema_{i}" for i in range(10)])
+
+    (kwargs, pool), = pools
+    assert kwargs['max_size'] == 3
+    assert len(pool.queries) == 20
+    assert pool.peak == 3
+
+
+def test_loaded_schemas_are_not_queried_again(pools):
+    introspector = AsyncPostgresIntrospector(None, CONN_INFO, 'dw').load(['sales'])
+    introspector.load(['sales'])
+    assert len(pools) == 1
+
+
+def test_pool_size_is_at_least_one(pools):
+    assert AsyncPostgresIntrospector(None, CONN_INFO, 'dw', pool_size=0).pool_size == 1
+
+
+def test_requires_asyncpg(monkeypatch):
+    monkeypatch.setattr(async_introspection, 'asyncpg', None)
+    assert not async_introspection.is_available()
+    with pytest.raises(ImportError):
+        AsyncPostgresIntrospector(None, CONN_INFO, 'dw')
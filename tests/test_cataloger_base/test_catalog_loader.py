@@ -0,0 +1,158 @@
+import psycopg2
+import pytest
+
+from data_catalog import cataloger_base
+from data_catalog.cataloger_base import (
+    Cataloger,
+    NodeRecord,
+    descendant_prefix,
+    split_filter,
+    sweep_edges_by_prefix,
+    sweep_nodes_by_prefix,
+    upsert_edges_bulk,
+    upsert_nodes_bulk,
+)
+
+
+def schema_record(name):
+    return NodeRecord('DB_SCHEMA', name, f"db/srv/sales/{name}", 'catalog.node_schema', {'schema_name': name},
+                      parent=('DB_DATABASE', 'db/srv/sales'), parent_column='database_node_id')
+
+
+class SchemaCataloger(Cataloger):
+    """Catalogs fixed schemas of database db/srv/sales; sweeps the schemas it did not see."""
+
+    run_type = 'TEST_CATALOG'
+
+    def __init__(self, dsn, schemas, fail=False):
+        super().__init__(connection_id=1, batch_size=2)
+        self.dsn = dsn
+        self.schemas = schemas
+        self.fail = fail
+
+    def context(self):
+        return {'source_label': 'srv/sales'}
+
+    def extract(self):
+        yield NodeRecord('DB_DATABASE', 'sales', 'db/srv/sales')
+        for name in self.schemas:
+            yield schema_record(name)
+        if self.fail:
+            raise RuntimeError("source went away")
+
+    def sweep(self, cur, run_id):
+        return {'DB_SCHEMA': sweep_nodes_by_prefix(cur, run_id, ['DB_SCHEMA'], 'db/srv/sales')}
+
+    def get_catalog_connection(self):
+        return psycopg2.connect(self.dsn)
+
+
+@pytest.fixture
+def no_run_logging(monkeypatch):
+    monkeypatch.setattr(cataloger_base, 'setup_run_logging', lambda *args: 'data_catalog/logfiles/test.log')
+
+
+def fetch_run(conn, run_id):
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT status, nodes_created, nodes_updated, nodes_deleted, objects_total, error_message,
+                   log_filename, context
+            FROM catalog.catalog_runs WHERE id = %s
+        """, (run_id,))
+        return cur.fetchone()
+
+
+def live_schemas(conn):
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT n.name FROM catalog.nodes n
+            JOIN catalog.node_schema d ON d.node_id = n.node_id
+            WHERE n.deleted_in_run_id IS NULL
+            ORDER BY n.name
+        """)
+        return [name for name, in cur.fetchall()]
+
+
+def test_cataloger_requires_extract():
+    with pytest.raises(TypeError):
+        Cataloger(connection_id=1)
+
+
+def test_descendant_prefix_ends_at_separator():
+    assert descendant_prefix('db/srv/sales') == 'db/srv/sales/'
+    assert descendant_prefix('db/srv/sales/') == 'db/srv/sales/'
+    assert descendant_prefix('pbi/Sales', separator='[') == 'pbi/Sales['
+
+
+def test_split_filter():
+    assert split_filter(' dbo, staging ,,') == ['dbo', 'staging']
+    assert split_filter('') is None
+    assert split_filter(None) is None
+
+
+def test_run_records_start_and_completion(catalog_conn, catalog_dsn, no_run_logging):
+    run_id = SchemaCataloger(catalog_dsn, ['dbo', 'staging', 'mart']).run()
+
+    status, created, updated, deleted, total, error, log_filename, context = fetch_run(catalog_conn, run_id)
+    assert (status, created, updated, deleted, total, error) == ('completed', 4, 0, 0, 4, None)
+    assert log_filename == 'data_catalog/logfiles/test.log'
+    assert context['source_label'] == 'srv/sales'
+    assert context['metrics']['stats']['batches'] == 2
+    assert live_schemas(catalog_conn) == ['dbo', 'mart', 'staging']
+
+
+def test_rerun_leaves_unchanged_nodes_and_sweeps_missing_ones(catalog_conn, catalog_dsn, no_run_logging):
+    SchemaCataloger(catalog_dsn, ['dbo', 'staging']).run()
+    run_id = SchemaCataloger(catalog_dsn, ['dbo']).run()
+
+    status, created, updated, deleted, *_ = fetch_run(catalog_conn, run_id)
+    assert (status, created, updated, deleted) == ('completed', 0, 0, 1)
+    assert live_schemas(catalog_conn) == ['dbo']
+
+
+def test_failed_extract_marks_run_failed(catalog_conn, catalog_dsn, no_run_logging):
+    with pytest.raises(RuntimeError):
+        SchemaCataloger(catalog_dsn, ['dbo'], fail=True).run()
+
+    with catalog_conn.cursor() as cur:
+        cur.execute("SELECT status, error_message FROM catalog.catalog_runs")
+        assert cur.fetchall() == [('failed', 'source went away')]
+
+
+def test_sweeps_stay_below_the_root(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        node_ids, _ = upsert_nodes_bulk(cur, [
+            ('DB_TABLE', 'orders', 'db/srv/sales/dbo/orders', None),
+            ('DB_TABLE', 'orders', 'db/srv/sales_archive/dbo/orders', None),
+            ('DB_TABLE', 'sales', 'db/srv/sales', None),
+        ], run_id=1)
+        cataloger_base.ensure_loader_tables(cur)
+        upsert_edges_bulk(cur, [
+            (node_ids['db/srv/sales/dbo/orders'], node_ids['db/srv/sales'], 'TEST_REF', None, None),
+            (node_ids['db/srv/sales_archive/dbo/orders'], node_ids['db/srv/sales'], 'TEST_REF', None, None),
+        ], run_id=1)
+
+        assert sweep_edges_by_prefix(cur, 2, ['TEST_REF'], 'db/srv/sales') == 1
+        assert sweep_nodes_by_prefix(cur, 2, ['DB_TABLE'], 'db/srv/sales') == 1
+
+        cur.execute("SELECT qualified_name FROM catalog.nodes WHERE deleted_in_run_id = 2")
+        assert cur.fetchall() == [('db/srv/sales/dbo/orders',)]
+        cur.execute("""
+            SELECT n.qualified_name FROM rel.edge e JOIN catalog.nodes n ON n.node_id = e.src_node_id
+        """)
+        assert cur.fetchall() == [('db/srv/sales_archive/dbo/orders',)]
+
+
+def test_edges_seen_again_are_kept(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        node_ids, _ = upsert_nodes_bulk(cur, [
+            ('PBI_MEASURE', 'Margin', 'pbi/Sales/Sales[Margin]', None),
+            ('PBI_MEASURE', 'Total', 'pbi/Sales/Sales[Total]', None),
+        ], run_id=1)
+        cataloger_base.ensure_loader_tables(cur)
+        edge = (node_ids['pbi/Sales/Sales[Margin]'], node_ids['pbi/Sales/Sales[Total]'], 'DAX_MEASURE_REF', None, None)
+        assert upsert_edges_bulk(cur, [edge, edge], run_id=1) == 1
+        assert upsert_edges_bulk(cur, [edge], run_id=2) == 0
+        assert sweep_edges_by_prefix(cur, 2, ['DAX_MEASURE_REF'], 'pbi/Sales') == 0
+        cur.execute("SELECT count(*), max(last_seen_run_id) FROM rel.edge")
+        assert cur.fetchone() == (1, 2)
@@ -0,0 +1,83 @@
+import psycopg2
+import pytest
+
+from data_catalog.db_cataloger import BulkNodeWriter, upsert_database, upsert_schema
+
+
+@pytest.fixture
+def writer_conn(catalog_conn, catalog_dsn):
+    conn = psycopg2.connect(catalog_dsn)
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+def schema_node(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        database_id = upsert_database(cur, 'sql01', 'sales', 1)
+        schema_id = upsert_schema(cur, 'sql01', database_id, 'sales', 'dbo', 1)
+    catalog_conn.commit()
+    return schema_id
+
+
+def add_table(writer, schema_id, name):
+    writer.add('DB_TABLE', name, f"sql01/sales.dbo.{name}", 'catalog.node_table', (schema_id, name, 'TABLE'))
+
+
+def committed_tables(catalog_conn):
+    catalog_conn.rollback()  # fresh snapshot: only what the writer committed
+    with catalog_conn.cursor() as cur:
+        cur.execute("""
+            SELECT n.name, t.table_type FROM catalog.nodes n JOIN catalog.node_table t ON t.node_id = n.node_id
+            ORDER BY n.name
+        """)
+        return cur.fetchall()
+
+
+def test_writer_commits_per_batch(catalog_conn, writer_conn):
+    schema_id = schema_node(catalog_conn)
+    writer = BulkNodeWriter(writer_conn, run_id=1, batch_size=3)
+
+    add_table(writer, schema_id, 'orders')
+    add_table(writer, schema_id, 'orders')  # buffered once
+    add_table(writer, schema_id, 'customers')
+    assert len(writer) == 2
+    node_ids = writer.flush()
+    assert (len(writer), sorted(node_ids)) == (0, ['sql01/sales.dbo.customers', 'sql01/sales.dbo.orders'])
+    assert committed_tables(catalog_conn) == []  # below batch_size: not committed yet
+
+    add_table(writer, schema_id, 'targets')
+    writer.flush()
+    assert [name for name, _ in committed_tables(catalog_conn)] == ['customers', 'orders', 'targets']
+
+    add_table(writer, schema_id, 'returns')
+    writer.flush(commit=True)
+    assert len(committed_tables(catalog_conn)) == 4
+    assert (writer.created, writer.updated) == (4, 0)
+
+
+def test_writer_counts_updates_and_writes_details(catalog_conn, writer_conn):
+    schema_id = schema_node(catalog_conn)
+    writer = BulkNodeWriter(writer_conn, run_id=1)
+    add_table(writer, schema_id, 'orders')
+    table_id = writer.flush(commit=True)['sql01/sales.dbo.orders']
+
+    rerun = BulkNodeWriter(writer_conn, run_id=2)
+    add_table(rerun, schema_id, 'orders')
+    rerun.add('DB_COLUMN', 'id', 'sql01/sales.dbo.orders.id', 'catalog.node_column', (table_id, 'id', 'integer', False))
+    node_ids = rerun.flush(commit=True)
+
+    assert node_ids['sql01/sales.dbo.orders'] == table_id
+    assert (rerun.created, rerun.updated) == (1, 1)
+    with catalog_conn.cursor() as cur:
+        cur.execute("SELECT qualified_name, last_seen_run_id FROM catalog.nodes WHERE node_type <> 'DB_DATABASE' "
+                    "AND node_type <> 'DB_SCHEMA' ORDER BY qualified_name")
+        assert cur.fetchall() == [('sql01/sales.dbo.orders', 2), ('sql01/sales.dbo.orders.id', 2)]
+        cur.execute("SELECT table_node_id, column_name, data_type, is_nullable FROM catalog.node_column")
+        assert cur.fetchall() == [(table_id, 'id', 'integer', False)]
+
+
+def test_flush_without_nodes_writes_nothing(catalog_conn, writer_conn):
+    writer = BulkNodeWriter(writer_conn, run_id=1)
+    assert writer.flush(commit=True) == {}
+    assert (writer.created, writer.updated) == (0, 0)
@@ -0,0 +1,55 @@
+from data_catalog.db_cataloger import sweep_deleted_nodes, upsert_database, upsert_schema, upsert_table
+
+
+def catalog_tables(cur, host, database, tables, run_id):
+    """Upsert {schema: [table]} of one database as seen in run_id."""
+    database_id = upsert_database(cur, host, database, run_id)
+    for schema, schema_tables in tables.items():
+        schema_id = upsert_schema(cur, host, database_id, database, schema, run_id)
+        for table in schema_tables:
+            upsert_table(cur, host, database, schema_id, schema, table, 'TABLE', run_id)
+
+
+def deleted(cur, run_id):
+    cur.execute("SELECT qualified_name FROM catalog.nodes WHERE deleted_in_run_id = %s ORDER BY qualified_name", (run_id,))
+    return [qualified_name for qualified_name, in cur.fetchall()]
+
+
+def test_sweep_stays_within_the_databases_of_the_run(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        catalog_tables(cur, 'sql01', 'sales', {'dbo': ['orders', 'customers'], 'stage': ['orders']}, 1)
+        catalog_tables(cur, 'sql01', 'sales_archive', {'dbo': ['orders', 'customers']}, 1)
+        catalog_tables(cur, 'sql011', 'sales', {'dbo': ['customers']}, 1)
+
+        # Run 2 only covers database sales on sql01: customers and schema stage are gone
+        catalog_tables(cur, 'sql01', 'sales', {'dbo': ['orders']}, 2)
+        counts = sweep_deleted_nodes(cur, 2, 'sql01')
+
+        # Children of a deleted parent follow it
+        assert deleted(cur, 2) == ['sql01/sales.dbo.customers', 'sql01/sales.stage', 'sql01/sales.stage.orders']
+        assert (counts['DB_SCHEMA'], counts['DB_TABLE'], counts['DB_COLUMN']) == (1, 2, 0)
+        assert 'DB_DATABASE' not in counts
+
+
+def test_full_server_run_deletes_missing_databases_of_that_host_only(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        catalog_tables(cur, 'sql01', 'sales', {'dbo': ['orders']}, 1)
+        catalog_tables(cur, 'sql01', 'sales_archive', {'dbo': ['orders']}, 1)
+        catalog_tables(cur, 'sql011', 'sales_archive', {'dbo': ['orders']}, 1)
+
+        catalog_tables(cur, 'sql01', 'sales', {'dbo': ['orders']}, 2)
+        counts = sweep_deleted_nodes(cur, 2, 'sql01', present_databases=['sales'])
+
+        assert deleted(cur, 2) == ['sql01/sales_archive', 'sql01/sales_archive.dbo', 'sql01/sales_archive.dbo.orders']
+        assert counts['DB_DATABASE'] == 1
+
+
+def test_filtered_run_only_sweeps_the_filtered_objects(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        catalog_tables(cur, 'sql01', 'sales', {'dbo': ['orders', 'customers'], 'stage': ['orders']}, 1)
+
+        # Run 2 only looked at schema dbo, table orders
+        catalog_tables(cur, 'sql01', 'sales', {'dbo': ['orders']}, 2)
+        sweep_deleted_nodes(cur, 2, 'sql01', schema_filter=['dbo'], table_filter=['orders'])
+
+        assert deleted(cur, 2) == []
@@ -0,0 +1,76 @@
+import gzip
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from data_catalog import dl_storage
+
+
+@pytest.fixture
+def lake(tmp_path):
+    sales = tmp_path / "sales" / "year=2024"
+    sales.mkdir(parents=True)
+    table = pa.table({"order_id": pa.array(range(1000), pa.int64()), "amount": pa.array([1.5] * 1000)})
+    pq.write_table(table, sales / "part-0.parquet", row_group_size=250)
+    (sales / "_SUCCESS").write_text("")
+    (tmp_path / "sales" / "_delta_log").mkdir()
+    (tmp_path / "sales" / "_delta_log" / "00000.json").write_text("{}")
+
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    (raw / "customers.csv").write_text("id,name\n1,Alice\n2,Bob\n")
+    rows = "".join(f"{i:05d},item-{i:05d}\n" for i in range(40000))
+    (raw / "items.csv").write_text("id,name\n" + rows)
+    with gzip.open(raw / "items.csv.gz", "wt") as f:
+        f.write("id,name\n" + rows)
+    (tmp_path / ".cache").mkdir()
+    (tmp_path / "readme.md").write_text("# lake")
+    return dl_storage.local_backend(str(tmp_path), container_name="lake")
+
+
+def test_walk_storage_lists_all_folders_and_skips_hidden(lake):
+    listed = {folder: files for folder, _, files in dl_storage.walk_storage(lake, workers=2)}
+
+    assert set(listed) == {"", "sales", "sales/year=2024", "raw"}
+    assert [f["path"] for f in listed["sales/year=2024"]] == ["sales/year=2024/part-0.parquet"]
+    assert [f["file_name"] for f in listed["raw"]] == ["customers.csv", "items.csv", "items.csv.gz"]
+    assert listed[""][0]["file_format"] == "md"
+
+
+def test_parquet_sample_reads_footer(lake):
+    _, files = lake.list_folder("sales/year=2024")
+    sample = dl_storage.sample_file(lake, files[0])
+
+    assert sample["row_count"] == 1000 and sample["row_count_exact"] is True
+    assert sample["num_row_groups"] == 4
+    assert [(c["column_name"], c["data_type"]) for c in sample["columns"]] == [("order_id", "int64"), ("amount", "double")]
+
+
+def test_csv_sample_reads_first_block_only(lake):
+    _, files = lake.list_folder("raw")
+    samples = {entry["file_name"]: sample for entry, sample in dl_storage.sample_files(lake, files, workers=2)}
+
+    assert samples["customers.csv"]["row_count"] == 2 and samples["customers.csv"]["row_count_exact"] is True
+    assert [c["data_type"] for c in samples["customers.csv"]["columns"]] == ["int64", "string"]
+
+    estimated = samples["items.csv"]
+    assert estimated["row_count_exact"] is False
+    assert estimated["sampled_rows"] < 40000
+    assert abs(estimated["row_count"] - 40000) < 400
+
+    # Compressed: schema from the first decompressed block, no row count estimate
+    assert "row_count" not in samples["items.csv.gz"]
+    assert [c["column_name"] for c in samples["items.csv.gz"]["columns"]] == ["id", "name"]
+
+
+def test_file_format_and_filters():
+    assert dl_storage.detect_file_format("part-0.PARQUET") == ("parquet", None)
+    assert dl_storage.detect_file_format("items.csv.gz") == ("csv", "gzip")
+    assert dl_storage.hive_partition("year=2024") == ("year", "2024")
+    assert dl_storage.hive_partition("2024") is None
+
+    entry = {"path": "sales/year=2024/part-0.parquet", "file_format": "parquet"}
+    assert dl_storage.matches_filters(entry, ["sales/*"], ["parquet"])
+    assert not dl_storage.matches_filters(entry, ["raw/*"])
+    assert not dl_storage.matches_filters(entry, None, ["csv"])
@@ -0,0 +1,83 @@
+import psycopg2
+import pytest
+
+from data_catalog import dw_cataloger
+from data_catalog.dw_cataloger import iter_source_metadata_bulk
+
+
+def table(name, table_type='BASE TABLE'):
+    return {'table_name': name, 'table_type': table_type, 'view_definition': None, 'connection_type': 'PostgreSQL'}
+
+
+def column_row(schema_name, table_name, column_name, ordinal_position):
+    return (schema_name, table_name, column_name, 'integer', True, None, ordinal_position)
+
+
+@pytest.fixture
+def source_rows(monkeypatch):
+    tables = [('sales', table('orders')), ('sales', table('customers')), ('hr', table('staff'))]
+    columns = [
+        column_row('hr', 'staff', 'id', 1),
+        column_row('sales', 'customers', 'id', 1),
+        column_row('sales', 'order_view', 'id', 1),  # view left out of the tables query
+        column_row('sales', 'orders', 'id', 1),
+        column_row('sales', 'orders', 'customer_id', 2),
+    ]
+    monkeypatch.setattr(dw_cataloger, '_get_source_tables_bulk_postgresql', lambda *args: tables)
+    monkeypatch.setattr(dw_cataloger, '_iter_source_columns_bulk_postgresql', lambda *args: iter(columns))
+
+
+def test_bulk_metadata_is_grouped_per_schema_and_table(source_rows):
+    schemas = list(iter_source_metadata_bulk(object(), ['hr', 'sales', 'staging']))
+
+    assert [schema_name for schema_name, _ in schemas] == ['hr', 'sales', 'staging']
+    tables = {(schema_name, t['table_name']): [c['column_name'] for c in t['columns']]
+              for schema_name, schema_tables in schemas for t in schema_tables}
+    assert tables == {
+        ('hr', 'staff'): ['id'],
+        ('sales', 'orders'): ['id', 'customer_id'],
+        ('sales', 'customers'): ['id'],
+    }
+    # Empty schemas are still yielded
+    assert schemas[2] == ('staging', [])
+
+
+def test_bulk_metadata_without_schemas_queries_nothing(source_rows):
+    assert list(iter_source_metadata_bulk(object(), [])) == []
+
+
+@pytest.fixture
+def source_conn(catalog_dsn):
+    conn = psycopg2.connect(catalog_dsn)
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE SCHEMA dw_src_sales;
+            CREATE SCHEMA dw_src_empty;
+            CREATE TABLE dw_src_sales.orders (id integer NOT NULL, amount numeric DEFAULT 0, tags text[]);
+            CREATE VIEW dw_src_sales.big_orders AS SELECT id FROM dw_src_sales.orders WHERE amount > 100;
+        """)
+    conn.commit()
+    try:
+        yield conn
+    finally:
+        conn.rollback()
+        with conn.cursor() as cur:
+            cur.execute("DROP SCHEMA dw_src_sales, dw_src_empty CASCADE")
+        conn.commit()
+        conn.close()
+
+
+def test_bulk_metadata_from_postgres(source_conn):
+    schemas = dict(iter_source_metadata_bulk(source_conn, ['dw_src_sales', 'dw_src_empty'], include_views=True))
+
+    assert schemas['dw_src_empty'] == []
+    tables = {t['table_name']: t for t in schemas['dw_src_sales']}
+    assert (tables['orders']['table_type'], tables['big_orders']['table_type']) == ('BASE TABLE', 'VIEW')
+    assert 'amount > ' in tables['big_orders']['view_definition']
+    assert tables['orders']['columns'] == [
+        {'column_name': 'id', 'data_type': 'integer', 'is_nullable': False, 'column_default': None, 'ordinal_position': 1},
+        {'column_name': 'amount', 'data_type': 'numeric', 'is_nullable': True, 'column_default': '0',
+         'ordinal_position': 2},
+        {'column_name': 'tags', 'data_type': 'ARRAY', 'is_nullable': True, 'column_default': None, 'ordinal_position': 3},
+    ]
+    assert [c['column_name'] for c in tables['big_orders']['columns']] == ['id']
@@ -0,0 +1,46 @@
+from data_catalog.dw_cataloger import _copy_value, copy_rows
+
+TRICKY_TEXT = 'C:\\temp\\new\tline\r\nend'
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.copies = []
+
+    def copy_expert(self, sql, buffer):
+        self.copies.append((sql, buffer.read()))
+
+
+def test_copy_value_escapes_the_text_format():
+    assert _copy_value(None) == '\\N'
+    assert (_copy_value(True), _copy_value(False)) == ('t', 'f')
+    assert _copy_value(42) == '42'
+    assert _copy_value(TRICKY_TEXT) == 'C:\\\\temp\\\\new\\tline\\r\\nend'
+    # A literal backslash-N is data, not NULL
+    assert _copy_value('\\N') == '\\\\N'
+
+
+def test_copy_rows_writes_one_line_per_row():
+    cursor = RecordingCursor()
+
+    assert copy_rows(cursor, 'stg_dw_tables', ['schema_id', 'table_name', 'view_definition'],
+                     [(1, 'orders', None), (1, 'order\tview', 'SELECT 1')]) == 2
+    assert cursor.copies == [(
+        "COPY stg_dw_tables (schema_id, table_name, view_definition) FROM STDIN",
+        "1\torders\t\\N\n1\torder\\tview\tSELECT 1\n"
+    )]
+
+
+def test_copy_rows_skips_empty_input():
+    cursor = RecordingCursor()
+    assert copy_rows(cursor, 'stg_dw_tables', ['schema_id'], []) == 0
+    assert cursor.copies == []
+
+
+def test_copy_rows_round_trip(catalog_conn):
+    rows = [(1, TRICKY_TEXT, None, True), (2, '\\N', 'SELECT 1', False)]
+    with catalog_conn.cursor() as cur:
+        cur.execute("CREATE TEMP TABLE copy_test (id int, name text, definition text, flag boolean)")
+        copy_rows(cur, 'copy_test', ['id', 'name', 'definition', 'flag'], rows)
+        cur.execute("SELECT id, name, definition, flag FROM copy_test ORDER BY id")
+        assert cur.fetchall() == rows
@@ -0,0 +1,78 @@
+import pytest
+
+from data_catalog import dw_cataloger
+from data_catalog.dw_cataloger import MetadataPipeline
+
+SOURCE = {
+    'dbo': ['orders', 'customers'],
+    'empty': [],
+    'sales': ['targets'],
+}
+
+
+@pytest.fixture
+def source(monkeypatch):
+    monkeypatch.setattr(dw_cataloger, 'get_source_tables', lambda source_conn, schema_name, **kwargs: [
+        {'table_name': name} for name in SOURCE[schema_name]
+    ])
+    monkeypatch.setattr(dw_cataloger, 'get_source_columns', lambda source_conn, schema_name, table_name: [
+        {'column_name': f"{table_name}_id"}
+    ])
+
+
+def read_all(pipeline):
+    return [(schema_name, [t['table_name'] for t in tables]) for schema_name, tables in pipeline.schemas()]
+
+
+def test_pipeline_yields_schemas_and_tables_in_source_order(source):
+    pipeline = MetadataPipeline(None, [(name, None) for name in SOURCE], maxsize=1).start()
+    try:
+        assert read_all(pipeline) == [('dbo', ['orders', 'customers']), ('empty', []), ('sales', ['targets'])]
+    finally:
+        pipeline.stop()
+
+
+def test_pipeline_reads_columns_only_when_not_prefetched(source):
+    prefetched = [{'table_name': 'orders', 'columns': [{'column_name': 'bulk'}]}]
+    pipeline = MetadataPipeline(None, [('dbo', prefetched), ('sales', None)]).start()
+    try:
+        columns = {t['table_name']: t['columns'] for _, tables in pipeline.schemas() for t in tables}
+    finally:
+        pipeline.stop()
+    assert columns == {'orders': [{'column_name': 'bulk'}], 'targets': [{'column_name': 'targets_id'}]}
+
+
+def test_unread_tables_are_drained_before_the_next_schema(source):
+    pipeline = MetadataPipeline(None, [(name, None) for name in SOURCE], maxsize=1).start()
+    try:
+        names = []
+        for schema_name, tables in pipeline.schemas():
+            names.append((schema_name, next(tables, {}).get('table_name')))
+    finally:
+        pipeline.stop()
+    assert names == [('dbo', 'orders'), ('empty', None), ('sales', 'targets')]
+
+
+def test_reader_error_reaches_the_consumer(source, monkeypatch):
+    def failing_columns(source_conn, schema_name, table_name):
+        if table_name == 'customers':
+            raise ConnectionError("source connection lost")
+        return []
+    monkeypatch.setattr(dw_cataloger, 'get_source_columns', failing_columns)
+    pipeline = MetadataPipeline(None, [(name, None) for name in SOURCE]).start()
+    seen = []
+    try:
+        with pytest.raises(ConnectionError, match="source connection lost"):
+            for schema_name, tables in pipeline.schemas():
+                seen.extend(t['table_name'] for t in tables)
+    finally:
+        pipeline.stop()
+    assert seen == ['orders']
+
+
+def test_stop_ends_a_blocked_reader(source):
+    pipeline = MetadataPipeline(None, [(name, None) for name in SOURCE], maxsize=1).start()
+    schemas = pipeline.schemas()
+    next(schemas)
+    pipeline.stop()
+    assert not pipeline._thread.is_alive()
@@ -0,0 +1,72 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from data_catalog.dw_cataloger import (
+    ParallelRunState,
+    SourceConnectionLimiter,
+    get_summary_template,
+    initialize_progress,
+)
+
+
+def test_merge_summary_adds_worker_summaries():
+    state = ParallelRunState(get_summary_template(), initialize_progress())
+    worker_summary = dict(get_summary_template(), tables_added=2, columns_added=10, databases_processed=1)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(state.merge_summary, [worker_summary] * 200))
+
+    assert (state.summary['tables_added'], state.summary['columns_added']) == (400, 2000)
+    assert state.summary['databases_processed'] == 200
+    assert state.summary['views_added'] == 0
+
+
+def test_progress_totals_sum_the_workers():
+    state = ParallelRunState(get_summary_template(), initialize_progress())
+    first, second = state.new_worker_progress(), state.new_worker_progress()
+    first['tables_processed'] += 3
+    second['tables_processed'] += 4
+    second['columns_processed'] += 20
+
+    totals = state.progress_totals()
+    assert (totals['tables_processed'], totals['columns_processed'], totals['schemas_processed']) == (7, 20, 0)
+
+
+def test_connection_limiter_caps_each_host():
+    limiter = SourceConnectionLimiter(max_per_host=2)
+    lock = threading.Lock()
+    open_connections = {'sql01': 0, 'sql02': 0}
+    peak = {'sql01': 0, 'sql02': 0}
+
+    def connect(host):
+        with limiter.slot(host):
+            with lock:
+                open_connections[host] += 1
+                peak[host] = max(peak[host], open_connections[host])
+            time.sleep(0.05)
+            with lock:
+                open_connections[host] -= 1
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(connect, ['sql01'] * 6 + ['sql02'] * 2))
+
+    assert peak == {'sql01': 2, 'sql02': 2}
+
+
+def test_connection_limiter_does_not_block_other_hosts():
+    limiter = SourceConnectionLimiter(max_per_host=1)
+    with limiter.slot('sql01'):
+        entered = threading.Event()
+
+        def connect():
+            with limiter.slot('sql02'):
+                entered.set()
+        thread = threading.Thread(target=connect)
+        thread.start()
+        assert entered.wait(timeout=2)
+        thread.join()
+
+
+def test_connection_limiter_allows_at_least_one():
+    assert SourceConnectionLimiter(max_per_host=0).max_per_host == 1
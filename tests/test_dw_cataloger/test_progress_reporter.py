@@ -0,0 +1,79 @@
+import pytest
+
+from data_catalog import dw_cataloger
+from data_catalog.dw_cataloger import ProgressReporter, initialize_progress
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.writes = []
+        self.commits = 0
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.writes.append(params)
+
+    def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(dw_cataloger.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def progress(tables=0, columns=0, databases=0):
+    return dict(initialize_progress(), tables_processed=tables, columns_processed=columns,
+                databases_processed=databases)
+
+
+def test_report_coalesces_until_interval_or_object_count(clock):
+    reporter = ProgressReporter(1, flush_interval=5.0, flush_every=100)
+    conn = RecordingConnection()
+
+    assert reporter.report(conn, progress(tables=1)) is True  # first report always writes
+    clock[0] += 1
+    assert reporter.report(conn, progress(tables=2, columns=50)) is False
+    assert reporter.report(conn, progress(tables=3, columns=101)) is True  # 100 objects since the last write
+    clock[0] += 1
+    assert reporter.report(conn, progress(tables=4, columns=101)) is False
+    clock[0] += 5
+    assert reporter.report(conn, progress(tables=5, columns=101)) is True  # interval passed
+    assert reporter.report(conn, progress(tables=5, columns=101, databases=1), force=True) is True
+
+    assert (reporter.flushes, reporter.coalesced, conn.commits) == (4, 2, 4)
+    assert conn.writes[-1] == [1, 0, 5, 0, 101, 1]
+
+
+def test_report_writes_rate_and_eta_when_the_columns_exist(clock):
+    reporter = ProgressReporter(7, expected_objects=300, metrics_enabled=True)
+    conn = RecordingConnection()
+    clock[0] += 10
+
+    reporter.report(conn, progress(tables=20, columns=80))
+
+    assert conn.writes == [[0, 0, 20, 0, 80, 10.0, 20, 7]]
+
+
+def test_rate_and_eta(clock):
+    reporter = ProgressReporter(1, expected_objects=1000)
+    assert reporter.rate_and_eta(progress(), now=1000.0) == (0.0, None)
+    assert reporter.rate_and_eta(progress(tables=100, columns=150), now=1025.0) == (10.0, 75)
+    # Past the expected count there is no estimate
+    assert reporter.rate_and_eta(progress(columns=1200), now=1025.0) == (48.0, None)
+
+
+def test_eta_from_completed_databases_without_an_earlier_run(clock):
+    reporter = ProgressReporter(1, expected_databases=4)
+    assert reporter.rate_and_eta(progress(databases=1), now=1030.0) == (0.0, 90)
+    assert reporter.rate_and_eta(progress(databases=4), now=1030.0) == (0.0, None)
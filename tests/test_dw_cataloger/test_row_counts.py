@@ -0,0 +1,71 @@
+from data_catalog.dw_cataloger import get_table_row_counts_bulk, update_table_row_counts_bulk
+
+
+class FakeSourceConnection:
+    """psycopg2-like source connection that returns canned rows or raises on execute."""
+
+    def __init__(self, rows=None, error=None):
+        self.rows = rows
+        self.error = error
+        self.queries = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.queries.append((sql, params))
+        if self.error:
+            raise self.error
+
+    def fetchall(self):
+        return self.rows
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_row_counts_are_read_in_one_query():
+    source_conn = FakeSourceConnection(rows=[('sales', 'orders', 120), ('sales', 'empty', None)])
+
+    counts = get_table_row_counts_bulk(source_conn, ['sales', 'hr'], table_filter=['orders', 'empty'])
+
+    assert counts == {('sales', 'orders'): 120, ('sales', 'empty'): 0}
+    assert len(source_conn.queries) == 1
+    assert source_conn.queries[0][1] == [['sales', 'hr'], ['orders', 'empty']]
+
+
+def test_failed_row_count_query_returns_none():
+    source_conn = FakeSourceConnection(error=RuntimeError("permission denied for pg_stat_user_tables"))
+
+    assert get_table_row_counts_bulk(source_conn, ['sales']) is None
+    assert source_conn.rollbacks == 1
+    assert get_table_row_counts_bulk(FakeSourceConnection(), []) == {}
+
+
+def test_row_counts_update_current_tables_of_the_database(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        cur.execute("""
+            INSERT INTO catalog.dw_schemas (id, database_id, schema_name, is_current) VALUES
+            (1, 10, 'sales', false), (2, 10, 'sales', true), (3, 20, 'sales', true)
+        """)
+        cur.execute("""
+            INSERT INTO catalog.dw_tables (id, schema_id, table_name, is_current) VALUES
+            (1, 2, 'orders', false), (2, 2, 'orders', true), (3, 2, 'customers', true), (4, 3, 'orders', true)
+        """)
+
+        written = update_table_row_counts_bulk(
+            catalog_conn, 10, {('sales', 'orders'): 120, ('sales', 'customers'): 7, ('sales', 'gone'): 3}, 5)
+
+        assert written == 2
+        cur.execute("SELECT id, row_count_estimated FROM catalog.dw_tables ORDER BY id")
+        assert cur.fetchall() == [(1, None), (2, 120), (3, 7), (4, None)]
+        cur.execute("SELECT table_id, row_count_estimated, catalog_run_id FROM catalog.dw_table_rowcounts ORDER BY table_id")
+        assert cur.fetchall() == [(2, 120, 5), (3, 7, 5)]
+        assert update_table_row_counts_bulk(catalog_conn, 10, {}, 6) == 0
@@ -0,0 +1,79 @@
+from data_catalog import dw_cataloger
+from data_catalog.dw_cataloger import (
+    get_source_schema_fingerprints,
+    get_summary_template,
+    initialize_progress,
+    skip_unchanged_schemas,
+)
+
+
+class RecordingConnection:
+    """Catalog/source connection stand-in that records statements and rollbacks."""
+
+    def __init__(self):
+        self.statements = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def use_fingerprints(monkeypatch, source, stored):
+    monkeypatch.setattr(dw_cataloger, 'get_source_schema_fingerprints', lambda *args, **kwargs: source)
+    monkeypatch.setattr(dw_cataloger, 'get_stored_schema_fingerprints', lambda *args: stored)
+
+
+def test_only_changed_schemas_are_walked(monkeypatch):
+    use_fingerprints(monkeypatch, {'dbo': 'a', 'sales': 'b2', 'new': 'c'}, {'dbo': 'a', 'sales': 'b1'})
+    catalog_conn, summary, progress = RecordingConnection(), get_summary_template(), initialize_progress()
+
+    schemas, fingerprints = skip_unchanged_schemas(
+        catalog_conn, RecordingConnection(), 1, ['dbo', 'sales', 'new'], progress, summary)
+
+    assert schemas == ['sales', 'new']
+    assert fingerprints == {'dbo': 'a', 'sales': 'b2', 'new': 'c'}
+    assert (summary['schemas_processed'], summary['schemas_unchanged'], progress['schemas_processed']) == (1, 1, 1)
+    assert catalog_conn.statements == ["SAVEPOINT schema_fingerprint_probe", "RELEASE SAVEPOINT schema_fingerprint_probe"]
+
+
+def test_failed_probe_walks_every_schema(monkeypatch):
+    def unavailable(*args, **kwargs):
+        raise RuntimeError("relation catalog.dw_schema_fingerprints does not exist")
+    monkeypatch.setattr(dw_cataloger, 'get_source_schema_fingerprints', lambda *args, **kwargs: {'dbo': 'a'})
+    monkeypatch.setattr(dw_cataloger, 'get_stored_schema_fingerprints', unavailable)
+    catalog_conn, source_conn, summary = RecordingConnection(), RecordingConnection(), get_summary_template()
+
+    schemas, fingerprints = skip_unchanged_schemas(catalog_conn, source_conn, 1, ['dbo'], initialize_progress(), summary)
+
+    assert (schemas, fingerprints, summary['schemas_unchanged']) == (['dbo'], {}, 0)
+    # Only the probe is rolled back on the catalog; earlier writes of the transaction stay
+    assert catalog_conn.statements == ["SAVEPOINT schema_fingerprint_probe", "ROLLBACK TO SAVEPOINT schema_fingerprint_probe"]
+    assert (catalog_conn.rollbacks, source_conn.rollbacks) == (0, 1)
+
+
+def test_fingerprint_depends_on_ddl_and_extraction_options(monkeypatch):
+    monkeypatch.setattr(dw_cataloger, '_get_schema_ddl_signatures_postgresql',
+                        lambda source_conn, schemas: {'dbo': 'orders:id int', 'sales': 'orders:id int'})
+    source_conn = RecordingConnection()
+
+    plain = get_source_schema_fingerprints(source_conn, ['dbo', 'sales', 'empty'])
+    with_views = get_source_schema_fingerprints(source_conn, ['dbo'], include_views=True)
+    filtered = get_source_schema_fingerprints(source_conn, ['dbo'], table_filter=['orders'])
+
+    assert plain['dbo'] == plain['sales'] != plain['empty']
+    assert len({plain['dbo'], with_views['dbo'], filtered['dbo']}) == 3
+    assert get_source_schema_fingerprints(source_conn, ['dbo'], table_filter=['b', 'a']) == \
+        get_source_schema_fingerprints(source_conn, ['dbo'], table_filter=['a', 'b'])
+    assert get_source_schema_fingerprints(source_conn, []) == {}
@@ -0,0 +1,113 @@
+from pbi_cataloger import bulk_upsert_temporal_with_summary, get_current_table_ids
+
+
+def table_row(model_id, name, display_folder=None):
+    return (model_id, name, display_folder, False, None)
+
+
+def column_row(table_id, table_name, name, data_type='string'):
+    return (table_id, table_name, name, data_type, False, None, None)
+
+
+def add_model(cur):
+    cur.execute("INSERT INTO catalog.pbi_models (model_name) VALUES ('Sales') RETURNING id")
+    return cur.fetchone()[0]
+
+
+def current_rows(cur, sql, params):
+    cur.execute(sql, params)
+    return sorted(cur.fetchall())
+
+
+def current_tables(cur, model_id):
+    return current_rows(cur, """
+        SELECT table_name, display_folder, catalog_run_id FROM catalog.pbi_tables
+        WHERE model_id = %s AND is_current
+    """, (model_id,))
+
+
+def current_columns(cur, model_id):
+    return current_rows(cur, """
+        SELECT t.table_name, c.column_name, c.data_type, c.semantic_table_id
+        FROM catalog.pbi_columns c JOIN catalog.pbi_tables t ON t.id = c.semantic_table_id
+        WHERE t.model_id = %s AND c.is_current
+    """, (model_id,))
+
+
+def test_tables_added_updated_unchanged_and_deleted(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        model_id = add_model(cur)
+        summary, deleted = bulk_upsert_temporal_with_summary(
+            cur, 'tables', model_id, [table_row(model_id, 'Sales'), table_row(model_id, 'Date'),
+                                      table_row(model_id, 'Customer')], 1)
+        assert summary == {'added': 3, 'updated': 0, 'unchanged': 0, 'deleted': 0, 'total_processed': 3}
+        assert deleted == []
+
+        summary, deleted = bulk_upsert_temporal_with_summary(
+            cur, 'tables', model_id, [table_row(model_id, 'Sales', 'Facts'), table_row(model_id, 'Date'),
+                                      table_row(model_id, 'Product')], 2)
+        assert summary == {'added': 1, 'updated': 1, 'unchanged': 1, 'deleted': 1, 'total_processed': 3}
+        assert [name for _, name in deleted] == ['Customer']
+        assert current_tables(cur, model_id) == [('Date', None, 2), ('Product', None, 2), ('Sales', 'Facts', 2)]
+        cur.execute("""
+            SELECT deleted_by_catalog_run_id FROM catalog.pbi_tables WHERE table_name = 'Customer'
+        """)
+        assert cur.fetchall() == [(2,)]
+
+
+def test_table_names_limit_the_comparison(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        model_id = add_model(cur)
+        bulk_upsert_temporal_with_summary(
+            cur, 'tables', model_id, [table_row(model_id, 'Sales'), table_row(model_id, 'Date')], 1)
+
+        # Only Sales.tmdl was parsed: Date is out of scope and must not be marked deleted
+        summary, deleted = bulk_upsert_temporal_with_summary(
+            cur, 'tables', model_id, [table_row(model_id, 'Sales', 'Facts')], 2, table_names={'Sales'})
+        assert (summary['updated'], summary['deleted'], deleted) == (1, 0, [])
+        assert current_tables(cur, model_id) == [('Date', None, 1), ('Sales', 'Facts', 2)]
+
+
+def test_unchanged_columns_follow_the_new_table_version(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        model_id = add_model(cur)
+        bulk_upsert_temporal_with_summary(cur, 'tables', model_id, [table_row(model_id, 'Sales')], 1)
+        old_id = get_current_table_ids(cur, model_id, ['Sales'])['Sales']
+        bulk_upsert_temporal_with_summary(
+            cur, 'columns', model_id, [column_row(old_id, 'Sales', 'Amount'), column_row(old_id, 'Sales', 'Qty')], 1)
+
+        bulk_upsert_temporal_with_summary(cur, 'tables', model_id, [table_row(model_id, 'Sales', 'Facts')], 2)
+        new_id = get_current_table_ids(cur, model_id, ['Sales'])['Sales']
+        assert new_id != old_id
+        summary, _ = bulk_upsert_temporal_with_summary(
+            cur, 'columns', model_id,
+            [column_row(new_id, 'Sales', 'Amount'), column_row(new_id, 'Sales', 'Qty', 'int64')], 2)
+
+        assert summary == {'added': 0, 'updated': 1, 'unchanged': 1, 'deleted': 0, 'total_processed': 2}
+        assert current_columns(cur, model_id) == [('Sales', 'Amount', 'string', new_id), ('Sales', 'Qty', 'int64', new_id)]
+
+
+def test_stranded_child_of_an_older_table_version_matches_once(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        model_id = add_model(cur)
+        cur.execute("""
+            INSERT INTO catalog.pbi_tables (model_id, table_name, is_current) VALUES (%s, 'Sales', false) RETURNING id
+        """, (model_id,))
+        old_id = cur.fetchone()[0]
+        cur.execute("INSERT INTO catalog.pbi_tables (model_id, table_name) VALUES (%s, 'Sales') RETURNING id", (model_id,))
+        new_id = cur.fetchone()[0]
+        # Amount is current under both table versions
+        for table_id in (old_id, new_id):
+            cur.execute("""
+                INSERT INTO catalog.pbi_columns (semantic_table_id, column_name, data_type, is_hidden)
+                VALUES (%s, 'Amount', 'string', false)
+            """, (table_id,))
+
+        summary, deleted = bulk_upsert_temporal_with_summary(
+            cur, 'columns', model_id, [column_row(new_id, 'Sales', 'Amount')], 2)
+
+        assert summary == {'added': 0, 'updated': 0, 'unchanged': 1, 'deleted': 0, 'total_processed': 1}
+        assert deleted == []
+        assert current_columns(cur, model_id) == [('Sales', 'Amount', 'string', new_id)]
+        cur.execute("SELECT count(*) FROM catalog.pbi_columns")
+        assert cur.fetchone() == (2,)
@@ -0,0 +1,114 @@
+from pbi_cataloger import extract_dax_references, resolve_dax_references, tokenize_dax
+
+MEASURES = {
+    "total sales": ("Sales", "Total Sales"),
+    "margin %": ("Sales", "Margin %"),
+}
+COLUMNS = {
+    ("sales", "amount"): ("Sales", "Amount"),
+    ("sales", "cost"): ("Sales", "Cost"),
+    ("date", "year"): ("Date", "Year"),
+    ("customer list", "name"): ("Customer List", "Name"),
+}
+
+
+def test_tokenize_drops_comments_and_keeps_strings_whole():
+    tokens = tokenize_dax('// regel\nSUM ( Sales[Amount] ) /* blok\n[Cost] */ & "a ""[x]"" b" -- einde')
+
+    assert tokens == [
+        ("word", "SUM"),
+        ("other", "("),
+        ("word", "Sales"),
+        ("bracket", "[Amount]"),
+        ("other", ")"),
+        ("other", "&"),
+        ("string", '"a ""[x]"" b"'),
+    ]
+
+
+def test_tokenize_empty_expression():
+    assert tokenize_dax(None) == []
+    assert tokenize_dax("") == []
+
+
+def test_unquoted_and_quoted_table_references():
+    references = extract_dax_references("SUM(Sales[Amount]) + COUNTROWS('Customer List') + MAX('Customer List'[Name])")
+
+    assert references == [("Sales", "Amount"), ("Customer List", "Name")]
+
+
+def test_quoted_table_with_escaped_quote_and_escaped_bracket():
+    references = extract_dax_references("SUM('Bob''s Table'[Net]]Amount])")
+
+    assert references == [("Bob's Table", "Net]Amount")]
+
+
+def test_unqualified_references_and_keywords_are_not_tables():
+    expression = """
+        VAR Base = [Total Sales]
+        RETURN
+            IF ( NOT [Margin %] > 0 && Base > 0, Base )
+    """
+
+    assert extract_dax_references(expression) == [(None, "Total Sales"), (None, "Margin %")]
+
+
+def test_references_in_comments_and_strings_are_ignored():
+    expression = '[Total Sales] // [Old Measure]\n & "[Not A Column]" /* Sales[Cost] */'
+
+    assert extract_dax_references(expression) == [(None, "Total Sales")]
+
+
+def test_references_are_distinct_in_order_of_appearance():
+    expression = "Sales[Amount] - Sales[Cost] + Sales[Amount] + [Total Sales] + [Total Sales]"
+
+    assert extract_dax_references(expression) == [("Sales", "Amount"), ("Sales", "Cost"), (None, "Total Sales")]
+
+
+def test_resolve_measures_and_home_table_columns():
+    resolved, unresolved = resolve_dax_references(
+        "Sales", [(None, "total sales"), (None, "Amount")], MEASURES, COLUMNS
+    )
+
+    assert resolved == [("measure", "Sales", "Total Sales"), ("column", "Sales", "Amount")]
+    assert unresolved == 0
+
+
+def test_resolve_qualified_columns_case_insensitively():
+    resolved, unresolved = resolve_dax_references("Sales", [("DATE", "year")], MEASURES, COLUMNS)
+
+    assert resolved == [("column", "Date", "Year")]
+    assert unresolved == 0
+
+
+def test_resolve_table_qualified_measure():
+    # Table[Measure] is valid DAX; it resolves to the measure when no such column exists
+    resolved, unresolved = resolve_dax_references("Date", [("Sales", "Margin %")], MEASURES, COLUMNS)
+
+    assert resolved == [("measure", "Sales", "Margin %")]
+    assert unresolved == 0
+
+
+def test_unqualified_column_of_another_table_is_unresolved():
+    resolved, unresolved = resolve_dax_references("Sales", [(None, "Year")], MEASURES, COLUMNS)
+
+    assert resolved == []
+    assert unresolved == 1
+
+
+def test_unresolved_references_are_counted_and_duplicates_collapsed():
+    references = [("Sales", "Amount"), ("sales", "AMOUNT"), ("Missing", "Column"), (None, "Gone Measure")]
+
+    resolved, unresolved = resolve_dax_references("Sales", references, MEASURES, COLUMNS)
+
+    assert resolved == [("column", "Sales", "Amount")]
+    assert unresolved == 2
+
+
+def test_extract_then_resolve_measure_expression():
+    expression = "DIVIDE ( [Total Sales] - SUM ( Sales[Cost] ), [Total Sales] ) // marge"
+
+    resolved, unresolved = resolve_dax_references("Sales", extract_dax_references(expression), MEASURES, COLUMNS)
+
+    assert resolved == [("measure", "Sales", "Total Sales"), ("column", "Sales", "Cost")]
+    assert unresolved == 0
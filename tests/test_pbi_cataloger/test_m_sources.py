@@ -0,0 +1,164 @@
+from pbi_cataloger import _normalize_server, extract_sql_tables, parse_m_sources
+
+
+def test_sql_database_with_schema_item_navigation():
+    m_code = '''
+        let
+            Source = Sql.Database("sql01.corp.local", "Sales"),
+            dbo_Orders = Source{[Schema="dbo",Item="Orders"]}[Data],
+            #"Removed Columns" = Table.RemoveColumns(dbo_Orders, {"Comment"})
+        in
+            #"Removed Columns"
+    '''
+
+    result = parse_m_sources(m_code)
+
+    assert result["source_kind"] == "sqlserver"
+    assert result["server"] == "sql01.corp.local"
+    assert result["database"] == "Sales"
+    assert result["tables"] == [("sql01.corp.local", "Sales", "dbo", "Orders")]
+    assert result["native_queries"] == 0
+
+
+def test_item_without_schema_uses_the_default_schema():
+    m_code = '''
+        let
+            Source = PostgreSQL.Database("pg01", "dwh"),
+            Customers = Source{[Item="customers"]}[Data]
+        in
+            Customers
+    '''
+
+    assert parse_m_sources(m_code)["tables"] == [("pg01", "dwh", "public", "customers")]
+
+
+def test_sql_databases_name_navigation_chain():
+    m_code = '''
+        let
+            Source = Sql.Databases("sql01"),
+            Sales = Source{[Name="Sales"]}[Data],
+            dbo_Customers = Sales{[Name="dbo"]}[Data]{[Name="Customers"]}[Data]
+        in
+            dbo_Customers
+    '''
+
+    result = parse_m_sources(m_code)
+
+    assert result["database"] is None
+    assert result["tables"] == [("sql01", "Sales", "dbo", "Customers")]
+
+
+def test_sql_databases_chain_with_kind_table_skips_the_schema_level():
+    m_code = '''
+        let
+            Source = Sql.Databases("sql01"),
+            Orders = Source{[Name="Sales"]}[Data]{[Name="Orders",Kind="Table"]}[Data]
+        in
+            Orders
+    '''
+
+    assert parse_m_sources(m_code)["tables"] == [("sql01", "Sales", "dbo", "Orders")]
+
+
+def test_quoted_step_names_are_followed():
+    m_code = '''
+        let
+            #"Bron DWH" = Sql.Database("sql01", "DWH"),
+            #"Fact Sales" = #"Bron DWH"{[Schema="fact",Item="Sales"]}[Data]
+        in
+            #"Fact Sales"
+    '''
+
+    assert parse_m_sources(m_code)["tables"] == [("sql01", "DWH", "fact", "Sales")]
+
+
+def test_query_option_is_parsed_as_native_sql():
+    m_code = '''
+        let
+            Source = Sql.Database("sql01", "Sales", [Query="SELECT o.* FROM dbo.Orders o JOIN [ref].[Region] r ON r.id = o.region_id"])
+        in
+            Source
+    '''
+
+    result = parse_m_sources(m_code)
+
+    assert result["native_queries"] == 1
+    assert result["tables"] == [("sql01", "Sales", "dbo", "Orders"), ("sql01", "Sales", "ref", "Region")]
+
+
+def test_value_native_query_on_a_source_step():
+    m_code = '''
+        let
+            Source = Sql.Database("sql01", "Sales"),
+            Result = Value.NativeQuery(Source, "SELECT * FROM Customers c JOIN Other.dbo.Regions r ON 1 = 1", null, [EnableFolding=true])
+        in
+            Result
+    '''
+
+    result = parse_m_sources(m_code)
+
+    assert result["native_queries"] == 1
+    assert result["tables"] == [("sql01", "Sales", "dbo", "Customers"), ("sql01", "Other", "dbo", "Regions")]
+
+
+def test_comments_and_strings_do_not_create_sources():
+    m_code = '''
+        let
+            // Source = Sql.Database("old", "Legacy"),
+            Source = Sql.Database("sql01", "Sales"),
+            Note = "Sql.Database(""fake"", ""db"")",
+            Orders = Source{[Schema="dbo",Item="Orders"]}[Data]
+        in
+            Orders
+    '''
+
+    result = parse_m_sources(m_code)
+
+    assert result["server"] == "sql01"
+    assert result["tables"] == [("sql01", "Sales", "dbo", "Orders")]
+
+
+def test_unresolved_m_code():
+    result = parse_m_sources('let Source = Csv.Document(File.Contents("c:\\\\data.csv")) in Source')
+
+    assert result == {"source_kind": None, "server": None, "database": None, "tables": [], "native_queries": 0}
+    assert parse_m_sources(None)["tables"] == []
+
+
+def test_extract_sql_tables_qualification_levels():
+    sql = "SELECT * FROM Orders o JOIN sales.Lines l ON 1 = 1 JOIN [Other].[dbo].[Regions] r ON 1 = 1"
+
+    assert extract_sql_tables(sql, "dbo") == [
+        (None, "dbo", "Orders"),
+        (None, "sales", "Lines"),
+        ("Other", "dbo", "Regions"),
+    ]
+
+
+def test_extract_sql_tables_skips_ctes_functions_and_temp_tables():
+    sql = '''
+        WITH recent AS (SELECT * FROM dbo.Orders WHERE date > '2024-01-01'),
+             totals AS (SELECT * FROM recent)
+        SELECT *
+        FROM totals
+        JOIN dbo.fn_Regions(1) f ON 1 = 1
+        JOIN #staging s ON 1 = 1
+        JOIN @lookup l ON 1 = 1
+        -- JOIN dbo.Commented c ON 1 = 1
+        /* FROM dbo.Blocked */
+    '''
+
+    assert extract_sql_tables(sql, "dbo") == [(None, "dbo", "Orders")]
+
+
+def test_extract_sql_tables_is_distinct():
+    sql = "SELECT * FROM dbo.Orders a JOIN dbo.Orders b ON a.id = b.parent_id"
+
+    assert extract_sql_tables(sql) == [(None, "dbo", "Orders")]
+
+
+def test_normalize_server():
+    assert _normalize_server("tcp:Srv.database.windows.net,1433") == "srv.database.windows.net"
+    assert _normalize_server(" SQL01:5432 ") == "sql01"
+    assert _normalize_server("sql01") == "sql01"
+    assert _normalize_server(None) == ""
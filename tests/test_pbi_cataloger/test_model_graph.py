@@ -0,0 +1,101 @@
+from pbi_cataloger import write_pbi_model_graph
+
+ORDERS_M = 'let Source = Sql.Database("sql01", "DW"), Orders = Source{[Schema="dbo", Item="orders"]}[Data] in Orders'
+
+
+def add_model(cur, name, measures):
+    """A current model with table Sales (column Amount, one partition) and the given {measure: dax}."""
+    cur.execute("INSERT INTO catalog.pbi_models (model_name) VALUES (%s) RETURNING id", (name,))
+    model_id = cur.fetchone()[0]
+    cur.execute("INSERT INTO catalog.pbi_tables (model_id, table_name) VALUES (%s, 'Sales') RETURNING id", (model_id,))
+    table_id = cur.fetchone()[0]
+    cur.execute("""
+        INSERT INTO catalog.pbi_columns (semantic_table_id, column_name, data_type) VALUES (%s, 'Amount', 'decimal')
+    """, (table_id,))
+    cur.execute("""
+        INSERT INTO catalog.pbi_m_code (semantic_table_id, partition_name, m_expression) VALUES (%s, 'Sales', %s)
+    """, (table_id, ORDERS_M))
+    for measure, dax in measures.items():
+        cur.execute("""
+            INSERT INTO catalog.pbi_measures (semantic_table_id, measure_name, dax_expression) VALUES (%s, %s, %s)
+        """, (table_id, measure, dax))
+    return model_id, table_id
+
+
+def add_dw_table(cur):
+    nodes = [('DB_DATABASE', 'DW', 'db/sql01/DW'), ('DB_SCHEMA', 'dbo', 'db/sql01/DW/dbo'),
+             ('DB_TABLE', 'orders', 'db/sql01/DW/dbo/orders')]
+    node_ids = []
+    for node_type, name, qualified_name in nodes:
+        cur.execute("""
+            INSERT INTO catalog.nodes (node_type, name, qualified_name) VALUES (%s, %s, %s) RETURNING node_id
+        """, (node_type, name, qualified_name))
+        node_ids.append(cur.fetchone()[0])
+    database_id, schema_id, table_id = node_ids
+    cur.execute("INSERT INTO catalog.node_database VALUES (%s, 'sql01', 'DW')", (database_id,))
+    cur.execute("INSERT INTO catalog.node_schema VALUES (%s, %s, 'dbo')", (schema_id, database_id))
+    cur.execute("INSERT INTO catalog.node_table VALUES (%s, %s, 'orders', 'TABLE')", (table_id, schema_id))
+
+
+def edges(cur, model_name):
+    cur.execute("""
+        SELECT e.edge_id, s.qualified_name, d.qualified_name, e.edge_type, e.last_seen_run_id
+        FROM rel.edge e
+        JOIN catalog.nodes s ON s.node_id = e.src_node_id
+        JOIN catalog.nodes d ON d.node_id = e.dst_node_id
+        WHERE s.qualified_name LIKE %s
+    """, (f"pbi/{model_name}/%",))
+    return {(src, dst, edge_type): (edge_id, run_id) for edge_id, src, dst, edge_type, run_id in cur.fetchall()}
+
+
+def test_graph_edges_are_kept_when_seen_and_removed_when_gone(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        add_dw_table(cur)
+        model_id, table_id = add_model(cur, 'Sales', {'Total': 'SUM(Sales[Amount])', 'Margin': '[Total] * 0.2'})
+        archive_id, _ = add_model(cur, 'Sales_archive', {'Total': 'SUM(Sales[Amount])'})
+
+        summary = write_pbi_model_graph(cur, model_id, 'Sales', 1)
+        write_pbi_model_graph(cur, archive_id, 'Sales_archive', 1)
+        assert (summary['measure_edges'], summary['column_edges'], summary['source_edges']) == (1, 1, 1)
+        first = edges(cur, 'Sales')
+        assert set(first) == {
+            ('pbi/Sales/Sales[Total]', 'pbi/Sales/Sales[Amount]', 'DAX_COLUMN_REF'),
+            ('pbi/Sales/Sales[Margin]', 'pbi/Sales/Sales[Total]', 'DAX_MEASURE_REF'),
+            ('pbi/Sales/Sales/Sales', 'db/sql01/DW/dbo/orders', 'M_SOURCE_TABLE'),
+        }
+
+        cur.execute("""
+            UPDATE catalog.pbi_measures SET dax_expression = 'SUM(Sales[Amount]) * 0.2'
+            WHERE semantic_table_id = %s AND measure_name = 'Margin'
+        """, (table_id,))
+        write_pbi_model_graph(cur, model_id, 'Sales', 2)
+        second = edges(cur, 'Sales')
+        assert set(second) == {
+            ('pbi/Sales/Sales[Total]', 'pbi/Sales/Sales[Amount]', 'DAX_COLUMN_REF'),
+            ('pbi/Sales/Sales[Margin]', 'pbi/Sales/Sales[Amount]', 'DAX_COLUMN_REF'),
+            ('pbi/Sales/Sales/Sales', 'db/sql01/DW/dbo/orders', 'M_SOURCE_TABLE'),
+        }
+        # Unchanged edges are the same rows, only marked seen
+        unchanged = ('pbi/Sales/Sales[Total]', 'pbi/Sales/Sales[Amount]', 'DAX_COLUMN_REF')
+        assert second[unchanged] == (first[unchanged][0], 2)
+        # The other model's edges are out of scope
+        assert len(edges(cur, 'Sales_archive')) == 2
+
+
+def test_graph_marks_objects_that_left_the_model_deleted(catalog_conn):
+    with catalog_conn.cursor() as cur:
+        model_id, table_id = add_model(cur, 'Sales', {'Total': 'SUM(Sales[Amount])', 'Margin': '[Total] * 0.2'})
+        write_pbi_model_graph(cur, model_id, 'Sales', 1)
+
+        cur.execute("""
+            UPDATE catalog.pbi_measures SET is_current = false
+            WHERE semantic_table_id = %s AND measure_name = 'Margin'
+        """, (table_id,))
+        summary = write_pbi_model_graph(cur, model_id, 'Sales', 2)
+
+        assert summary['nodes_deleted'] == 1
+        cur.execute("SELECT qualified_name FROM catalog.nodes WHERE deleted_in_run_id = 2")
+        assert cur.fetchall() == [('pbi/Sales/Sales[Margin]',)]
+        assert set(edges(cur, 'Sales')) == {
+            ('pbi/Sales/Sales[Total]', 'pbi/Sales/Sales[Amount]', 'DAX_COLUMN_REF'),
+        }
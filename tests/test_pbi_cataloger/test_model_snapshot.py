@@ -0,0 +1,47 @@
+import os
+
+from pbi_cataloger import insert_model, load_tmdl_manifest, parse_semantic_model, write_semantic_model
+
+SALES_TMDL = "table Sales\n\tcolumn Amount\n\t\tdataType: decimal\n\tcolumn Qty\n\t\tdataType: int64\n"
+# Same table, columns in another order: other file hash, same canonical digest
+SALES_TMDL_REORDERED = "table Sales\n\tcolumn Qty\n\t\tdataType: int64\n\tcolumn Amount\n\t\tdataType: decimal\n"
+
+
+def add_definition(root):
+    definition = root / "Sales" / "Sales.SemanticModel" / "definition"
+    (definition / "tables").mkdir(parents=True)
+    (definition / "tables" / "Sales.tmdl").write_text(SALES_TMDL)
+    return definition
+
+
+def catalog_model(conn, definition, catalog_run_id):
+    with conn.cursor() as cur:
+        model_id = insert_model(cur, "Sales", catalog_run_id)
+        manifest = load_tmdl_manifest(cur, model_id)
+    result = write_semantic_model(conn, model_id, "Sales", parse_semantic_model(definition, manifest), catalog_run_id)
+    conn.commit()
+    return model_id, result
+
+
+def test_unchanged_snapshot_skips_the_write(tmp_path, catalog_conn):
+    definition = add_definition(tmp_path)
+    model_id, (summary, _, unchanged) = catalog_model(catalog_conn, definition, 1)
+    assert (summary['tables_added'], summary['columns_added'], unchanged) == (1, 2, False)
+
+    table_file = definition / "tables" / "Sales.tmdl"
+    table_file.write_text(SALES_TMDL_REORDERED)
+    os.utime(table_file, (1_700_000_000, 1_700_000_000))
+    _, (summary, counts, unchanged) = catalog_model(catalog_conn, definition, 2)
+
+    assert unchanged is True
+    assert not any(summary.values()) and not any(counts.values())
+    with catalog_conn.cursor() as cur:
+        cur.execute("SELECT catalog_run_id, snapshot_status FROM catalog.pbi_models WHERE id = %s", (model_id,))
+        assert cur.fetchone() == (2, 'unchanged')
+        # The manifest follows the file, so the next run skips it on size and mtime
+        cur.execute("SELECT file_mtime, catalog_run_id FROM catalog.pbi_tmdl_manifest WHERE model_id = %s", (model_id,))
+        assert cur.fetchall() == [(1_700_000_000, 2)]
+        cur.execute("SELECT DISTINCT catalog_run_id FROM catalog.pbi_tables")
+        assert cur.fetchall() == [(1,)]
+        cur.execute("SELECT DISTINCT catalog_run_id FROM catalog.pbi_columns")
+        assert cur.fetchall() == [(1,)]
@@ -0,0 +1,53 @@
+import pbi_cataloger
+from pbi_cataloger import (
+    discover_semantic_models,
+    process_powerbi_projects,
+)
+
+SALES_TMDL = "table Sales\n\tcolumn Amount\n\t\tdataType: decimal\n\tcolumn Qty\n\t\tdataType: int64\n"
+
+
+def add_project(root, folder, model_name, tables):
+    """Create folder/<model_name>.SemanticModel/definition/tables with {file_name: content}; returns definition."""
+    definition = root / folder / f"{model_name}.SemanticModel" / "definition"
+    (definition / "tables").mkdir(parents=True)
+    for file_name, content in tables.items():
+        (definition / "tables" / file_name).write_bytes(content if isinstance(content, bytes) else content.encode())
+    return definition
+
+
+def test_discover_semantic_models(tmp_path):
+    sales = add_project(tmp_path, "Sales", "Sales", {})
+    finance = add_project(tmp_path, "teams/finance", "Finance", {})
+    (tmp_path / "Draft" / "Draft.SemanticModel").mkdir(parents=True)  # no definition folder
+    (tmp_path / "Notes.SemanticModel").write_text("not a folder")
+
+    assert discover_semantic_models(tmp_path) == [("Sales", sales), ("Finance", finance)]
+
+
+def test_project_failures_are_recorded_per_project(tmp_path, catalog_conn, catalog_dsn, monkeypatch):
+    monkeypatch.setattr(pbi_cataloger, "CATALOG_DB_CONFIG", {'dsn': catalog_dsn})
+    sales = add_project(tmp_path, "Sales", "Sales", {"Sales.tmdl": SALES_TMDL})
+    broken = add_project(tmp_path, "Broken", "Broken", {"Sales.tmdl": b"table Sales\n\xff\xfe"})
+    copy = add_project(tmp_path, "copy", "Sales", {"Sales.tmdl": SALES_TMDL})
+
+    summary, counts, completed, failed = process_powerbi_projects(
+        [("Sales", sales), ("Broken", broken), ("Sales", copy)], catalog_run_id=1, workers=2)
+
+    assert (completed, failed) == (1, 2)
+    assert (summary['tables_added'], counts['columns_processed']) == (1, 2)
+    with catalog_conn.cursor() as cur:
+        cur.execute("""
+            SELECT project_folder, model_name, status, error_message, completed_at IS NOT NULL
+            FROM catalog.pbi_catalog_run_projects WHERE catalog_run_id = 1
+        """)
+        projects = {row[0]: row[1:] for row in cur.fetchall()}
+        cur.execute("SELECT model_name FROM catalog.pbi_models ORDER BY model_name")
+        models = cur.fetchall()
+    assert projects[str(sales)] == ("Sales", "completed", None, True)
+    assert projects[str(copy)] == ("Sales", "failed", "Duplicate semantic model name: Sales", True)
+    model_name, status, error_message, completed = projects[str(broken)]
+    assert (model_name, status, completed) == ("Broken", "failed", True)
+    assert error_message.startswith("Parse error:")
+    # The broken project was registered, the duplicate never was
+    assert models == [("Broken",), ("Sales",)]
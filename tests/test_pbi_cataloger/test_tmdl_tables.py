@@ -0,0 +1,157 @@
+import os
+
+from pbi_cataloger import canonical_digest, parse_changed_tmdl_tables, parse_tmdl_table, read_tmdl_file
+
+SALES_TMDL = """table Sales
+\tlineageTag: 1a2b
+\tdisplayFolder: Feiten
+
+\tcolumn Amount
+\t\tdataType: decimal
+\t\tsourceColumn: amount
+
+\tcolumn Cost
+\t\tdataType: decimal
+\t\tisHidden
+
+\tpartition Sales = m
+\t\tmode: import
+\t\tsource =
+\t\t\t\tlet
+\t\t\t\t    Source = Sql.Database("sql01", "Sales")
+\t\t\t\tin
+\t\t\t\t    Source
+
+\tmeasure 'Total Sales' = SUM(Sales[Amount])
+\t\tformatString: #,0
+
+\tmeasure Margin =
+\t\t\tVAR Revenue = [Total Sales]
+\t\t\tRETURN
+\t\t\t\tRevenue - SUM(Sales[Cost])
+\t\tformatString: 0.00
+\t\tdisplayFolder: KPI
+\t\tlineageTag: 9f8e
+"""
+
+
+def test_parse_table_columns_partitions_and_properties():
+    table = parse_tmdl_table(SALES_TMDL.splitlines())
+
+    assert table["name"] == "Sales"
+    assert table["display_folder"] == "Feiten"
+    assert table["is_hidden"] is None
+    assert [column["name"] for column in table["columns"]] == ["Amount", "Cost"]
+    assert table["columns"][0]["sourceColumn"] == "amount"
+    assert [partition["name"] for partition in table["partitions"]] == ["Sales"]
+    assert table["partitions"][0]["mode"] == "import"
+    assert 'Sql.Database("sql01", "Sales")' in table["partitions"][0]["m_expression"]
+
+
+def test_final_block_measure_is_not_dropped():
+    # Regression: the last measure of a file used to be lost when nothing followed it
+    table = parse_tmdl_table(SALES_TMDL.splitlines())
+
+    assert [measure["name"] for measure in table["measures"]] == ["Total Sales", "Margin"]
+    margin = table["measures"][-1]
+    assert margin["expression"] == "VAR Revenue = [Total Sales]\nRETURN\nRevenue - SUM(Sales[Cost])"
+    assert margin["formatString"] == "0.00"
+    assert margin["displayFolder"] == "KPI"
+    assert margin["lineageTag"] == "9f8e"
+
+
+def test_final_inline_measure_without_metadata():
+    table = parse_tmdl_table(["table Kpi", "", "\tmeasure Count = COUNTROWS(Sales)"])
+
+    assert table["measures"] == [{"name": "Count", "expression": "COUNTROWS(Sales)"}]
+    assert table["columns"] == [] and table["partitions"] == []
+
+
+def _write(path, content, mtime=None):
+    path.write_text(content, encoding="utf-8")
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+
+def _manifest_entry(path):
+    lines, content_hash = read_tmdl_file(path)
+    table = parse_tmdl_table(lines)
+    table["file_name"] = path.name
+    stat = path.stat()
+    return (stat.st_size, stat.st_mtime, content_hash, canonical_digest(table))
+
+
+def test_manifest_skips_files_with_unchanged_size_and_mtime(tmp_path):
+    sales = _write(tmp_path / "Sales.tmdl", SALES_TMDL, mtime=1_700_000_000)
+    manifest = {"Sales.tmdl": _manifest_entry(sales)}
+
+    tables, entries, removed, skipped = parse_changed_tmdl_tables(tmp_path, manifest)
+
+    assert tables == [] and entries == {} and removed == set()
+    assert skipped == 1
+
+
+def test_manifest_touched_file_with_same_content_only_refreshes_the_entry(tmp_path):
+    sales = _write(tmp_path / "Sales.tmdl", SALES_TMDL, mtime=1_700_000_000)
+    manifest = {"Sales.tmdl": _manifest_entry(sales)}
+    os.utime(sales, (1_700_000_500, 1_700_000_500))
+
+    tables, entries, removed, skipped = parse_changed_tmdl_tables(tmp_path, manifest)
+
+    assert tables == [] and skipped == 1
+    size, mtime, content_hash, canonical_hash = entries["Sales.tmdl"]
+    assert mtime == 1_700_000_500
+    assert (content_hash, canonical_hash) == manifest["Sales.tmdl"][2:]
+
+
+def test_manifest_changed_file_is_parsed(tmp_path):
+    sales = _write(tmp_path / "Sales.tmdl", SALES_TMDL, mtime=1_700_000_000)
+    manifest = {"Sales.tmdl": _manifest_entry(sales)}
+    _write(sales, SALES_TMDL + "\n\tmeasure Extra = 1\n", mtime=1_700_000_500)
+
+    tables, entries, removed, skipped = parse_changed_tmdl_tables(tmp_path, manifest)
+
+    assert skipped == 0
+    assert [table["file_name"] for table in tables] == ["Sales.tmdl"]
+    assert [measure["name"] for measure in tables[0]["measures"]] == ["Total Sales", "Margin", "Extra"]
+    assert entries["Sales.tmdl"][2] != manifest["Sales.tmdl"][2]
+    assert entries["Sales.tmdl"][3] == canonical_digest(tables[0])
+
+
+def test_manifest_entry_without_canonical_hash_is_parsed_again(tmp_path):
+    sales = _write(tmp_path / "Sales.tmdl", SALES_TMDL, mtime=1_700_000_000)
+    manifest = {"Sales.tmdl": _manifest_entry(sales)[:3] + (None,)}
+
+    tables, entries, removed, skipped = parse_changed_tmdl_tables(tmp_path, manifest)
+
+    assert len(tables) == 1 and skipped == 0
+    assert entries["Sales.tmdl"][3] is not None
+
+
+def test_force_full_parses_everything_and_new_and_removed_files_are_reported(tmp_path):
+    sales = _write(tmp_path / "Sales.tmdl", SALES_TMDL, mtime=1_700_000_000)
+    _write(tmp_path / "Date.tmdl", "table Date\n\tcolumn Year\n\t\tdataType: int64\n")
+    manifest = {"Sales.tmdl": _manifest_entry(sales), "Old.tmdl": (1, 1.0, "x", "y")}
+
+    tables, _, removed, skipped = parse_changed_tmdl_tables(tmp_path, manifest)
+    assert [table["name"] for table in tables] == ["Date"]
+    assert removed == {"Old.tmdl"} and skipped == 1
+
+    tables, _, removed, skipped = parse_changed_tmdl_tables(tmp_path, manifest, force_full=True)
+    assert sorted(table["name"] for table in tables) == ["Date", "Sales"]
+    assert removed == {"Old.tmdl"} and skipped == 0
+
+
+def test_file_names_limit_the_check_to_the_changed_files(tmp_path):
+    _write(tmp_path / "Sales.tmdl", SALES_TMDL, mtime=1_700_000_000)
+    _write(tmp_path / "Date.tmdl", "table Date\n\tcolumn Year\n\t\tdataType: int64\n")
+    manifest = {"Old.tmdl": (1, 1.0, "x", "y"), "Gone.tmdl": (1, 1.0, "x", "y")}
+
+    tables, entries, removed, skipped = parse_changed_tmdl_tables(
+        tmp_path, manifest, file_names={"Date.tmdl", "Gone.tmdl", "Never.tmdl"})
+
+    # Sales.tmdl is not listed and Old.tmdl is not checked, so neither is parsed nor removed
+    assert [table["name"] for table in tables] == ["Date"]
+    assert set(entries) == {"Date.tmdl"}
+    assert removed == {"Gone.tmdl"} and skipped == 0
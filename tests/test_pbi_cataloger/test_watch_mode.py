@@ -0,0 +1,90 @@
+import psycopg2
+
+import pbi_cataloger
+from pbi_cataloger import ModelChangeDebouncer, recatalog_changed_model
+
+SALES = "/pbi/Sales.SemanticModel/definition"
+FINANCE = "/pbi/Finance.SemanticModel/definition"
+
+
+def test_burst_of_saves_is_coalesced_per_model():
+    debouncer = ModelChangeDebouncer(quiet_seconds=2, max_delay_seconds=30)
+
+    assert debouncer.add(f"{SALES}/tables/Sales.tmdl", now=0)
+    assert debouncer.add(f"{SALES}/tables/Date.tmdl", now=0.5)
+    assert debouncer.add(f"{SALES}/tables/Sales.tmdl", now=1)
+    assert debouncer.add(f"{SALES}/relationships.tmdl", now=1.5)
+
+    ready = debouncer.pop_ready(now=3.5)
+    assert list(ready) == [SALES]
+    assert ready[SALES]['tables'] == {"Sales.tmdl", "Date.tmdl"}
+    assert ready[SALES]['relationships'] is True
+    assert debouncer.pop_ready(now=10) == {}
+
+
+def test_changes_wait_for_the_quiet_period():
+    debouncer = ModelChangeDebouncer(quiet_seconds=2, max_delay_seconds=30)
+    debouncer.add(f"{SALES}/tables/Sales.tmdl", now=0)
+    debouncer.add(f"{SALES}/tables/Sales.tmdl", now=1.5)
+
+    assert debouncer.pop_ready(now=3) == {}
+    assert list(debouncer.pop_ready(now=3.5)) == [SALES]
+
+
+def test_continuous_saves_are_released_after_the_max_delay():
+    debouncer = ModelChangeDebouncer(quiet_seconds=2, max_delay_seconds=5)
+    for second in range(6):
+        debouncer.add(f"{SALES}/tables/Sales.tmdl", now=second)
+
+    assert list(debouncer.pop_ready(now=5.5)) == [SALES]
+
+
+def test_models_are_released_separately():
+    debouncer = ModelChangeDebouncer(quiet_seconds=2, max_delay_seconds=30)
+    debouncer.add(f"{SALES}/tables/Sales.tmdl", now=0)
+    debouncer.add(f"{FINANCE}/tables/Ledger.tmdl", now=1.5)
+
+    first = debouncer.pop_ready(now=2.5)
+    assert list(first) == [SALES]
+    second = debouncer.pop_ready(now=3.5)
+    assert list(second) == [FINANCE]
+    assert second[FINANCE]['tables'] == {"Ledger.tmdl"} and second[FINANCE]['relationships'] is False
+
+
+def test_files_the_cataloger_does_not_read_are_ignored():
+    debouncer = ModelChangeDebouncer()
+
+    assert not debouncer.add(f"{SALES}/model.tmdl", now=0)
+    assert not debouncer.add(f"{SALES}/tables/Sales.tmdl.tmp", now=0)
+    assert not debouncer.add(f"{SALES}/cultures/en-US.tmdl", now=0)
+    assert not debouncer.add("/pbi/Sales.Report/definition/tables/Sales.tmdl", now=0)
+    assert debouncer.pop_ready(now=100) == {}
+
+
+def test_recatalog_parses_only_the_changed_files_and_keeps_one_log(tmp_path, catalog_conn, catalog_dsn, monkeypatch):
+    tables_dir = tmp_path / "Sales.SemanticModel" / "definition" / "tables"
+    tables_dir.mkdir(parents=True)
+    (tables_dir / "Sales.tmdl").write_text("table Sales\n\tcolumn Amount\n\t\tdataType: decimal\n", encoding="utf-8")
+    (tables_dir / "Date.tmdl").write_text("table Date\n\tcolumn Year\n\t\tdataType: int64\n", encoding="utf-8")
+    monkeypatch.setattr(pbi_cataloger, "get_catalog_connection", lambda: psycopg2.connect(catalog_dsn))
+
+    def setup_logging_per_change(*args):
+        raise AssertionError("watch mode sets up logging once")
+    monkeypatch.setattr(pbi_cataloger, "setup_logging_with_run_id", setup_logging_per_change)
+
+    connection_info = {'id': 1, 'name': 'Local models'}
+    for changed in ("Date.tmdl", "Sales.tmdl"):
+        result = recatalog_changed_model(connection_info, tables_dir.parent, {'tables': {changed}, 'relationships': False},
+                                         log_filename="data_catalog/logfiles/powerbi_semanticmodel/watch.log")
+        assert result is not None
+
+    with catalog_conn.cursor() as cur:
+        cur.execute("SELECT table_name, catalog_run_id FROM catalog.pbi_tables WHERE is_current ORDER BY table_name")
+        tables = cur.fetchall()
+        cur.execute("SELECT id, run_status, log_filename FROM catalog.pbi_catalog_runs ORDER BY id")
+        runs = cur.fetchall()
+    # Each change parsed its own file only; Date was not compared (or deleted) when Sales changed
+    assert tables == [("Date", runs[0][0]), ("Sales", runs[1][0])]
+    assert [(status, log) for _, status, log in runs] == [
+        ("completed", "data_catalog/logfiles/powerbi_semanticmodel/watch.log")
+    ] * 2
@@ -0,0 +1,210 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+import psycopg2
+import pytest
+
+import pbi_service_ingestion
+from pbi_cataloger import parse_m_sources
+from pbi_service_ingestion import (
+    PowerBIServiceClient,
+    PowerBIServiceError,
+    process_powerbi_service,
+    scanner_dataset_to_parsed,
+)
+
+RECORDED_RESPONSES = Path(__file__).parent / "recorded_scanner_responses.json"
+
+
+class ScannerStub(ThreadingHTTPServer):
+    """Replays the recorded responses per request key; the last response of a key repeats."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), ScannerStubHandler)
+        self.responses = json.loads(RECORDED_RESPONSES.read_text(encoding="utf-8"))
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1.0/myorg"
+
+    def next_response(self, key):
+        with self.lock:
+            self.requests.append(key)
+            recorded = self.responses.get(key)
+            if not recorded:
+                return {"status": 404, "body": {"error": {"code": "NotRecorded", "key": key}}}
+            return recorded.pop(0) if len(recorded) > 1 else recorded[0]
+
+
+class ScannerStubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, method):
+        url = urlsplit(self.path)
+        key = f"{method} {url.path}"
+        if method == "GET" and url.query:
+            key += "?" + "&".join(f"{k}={v}" for k, v in sorted(parse_qsl(url.query)))
+        if method == "POST":
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            key += " " + ",".join(body["workspaces"])
+
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        try:
+            time.sleep(0.02)  # keep requests in flight long enough to overlap
+            if self.headers.get("Authorization") != "Bearer test-token":
+                response = {"status": 401, "body": {"error": {"code": "TokenExpired"}}}
+            else:
+                response = self.server.next_response(key)
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+        payload = json.dumps(response["body"]).encode("utf-8")
+        self.send_response(response["status"])
+        for header, value in response.get("headers", {}).items():
+            self.send_header(header, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._reply("GET")
+
+    def do_POST(self):
+        self._reply("POST")
+
+
+@pytest.fixture
+def stub():
+    server = ScannerStub()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_client(stub, access_token="test-token", max_concurrency=2):
+    return PowerBIServiceClient(access_token, base_url=stub.base_url, max_concurrency=max_concurrency,
+                                max_attempts=3, backoff_seconds=0, scan_poll_seconds=0)
+
+
+def test_iter_workspaces_pages_and_skips_deleted(stub):
+    with make_client(stub) as client:
+        workspace_ids = [workspace["id"] for workspace in client.iter_workspaces(page_size=2)]
+
+    assert workspace_ids == ["ws-1", "ws-2", "ws-3"]
+    assert [key for key in stub.requests if "admin/groups" in key] == [
+        "GET /v1.0/myorg/admin/groups?$skip=0&$top=2",
+        "GET /v1.0/myorg/admin/groups?$skip=2&$top=2",
+        "GET /v1.0/myorg/admin/groups?$skip=4&$top=2",
+    ]
+
+
+def test_iter_datasets_streams_scan_results_with_retries(stub):
+    with make_client(stub) as client:
+        workspace_ids = (workspace["id"] for workspace in client.iter_workspaces(page_size=2))
+        datasets = [(workspace["name"], dataset["name"])
+                    for workspace, dataset in client.iter_datasets(workspace_ids, batch_size=2)]
+
+    assert sorted(datasets) == [("Finance", "Revenue"), ("Operations", "Stock"), ("Sales", "Pipeline")]
+    # 429 on getInfo and 503 on scanStatus were retried
+    assert stub.requests.count("POST /v1.0/myorg/admin/workspaces/getInfo ws-1,ws-2") == 2
+    assert stub.requests.count("GET /v1.0/myorg/admin/workspaces/scanStatus/scan-b") == 2
+    assert stub.requests.count("GET /v1.0/myorg/admin/workspaces/scanStatus/scan-a") == 2
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 2])
+def test_requests_are_bounded_by_max_concurrency(stub, max_concurrency):
+    with make_client(stub, max_concurrency=max_concurrency) as client:
+        list(client.iter_datasets(["ws-1", "ws-2", "ws-3"], batch_size=2))
+
+    assert 1 <= stub.max_in_flight <= max_concurrency
+
+
+def test_client_errors_are_not_retried(stub):
+    with make_client(stub, access_token="expired") as client:
+        with pytest.raises(PowerBIServiceError) as error:
+            list(client.iter_workspaces(page_size=2))
+
+    assert error.value.status_code == 401
+    assert len(stub.requests) == 0  # rejected before replaying
+
+
+def test_scanner_dataset_to_parsed_matches_tmdl_shape(stub):
+    with make_client(stub) as client:
+        datasets = {dataset["name"]: dataset for _, dataset in client.iter_datasets(["ws-1", "ws-2"])}
+
+    parsed = scanner_dataset_to_parsed(datasets["Revenue"])
+    assert parsed["tables_complete"] is True
+    assert parsed["relationships_parsed"] is True
+    assert set(parsed["table_digests"]) == {"Sales", "Customer"}
+
+    sales = next(table for table in parsed["tables"] if table["name"] == "Sales")
+    assert [column["name"] for column in sales["columns"]] == ["OrderDate", "Amount", "CustomerKey"]
+    assert sales["columns"][2]["is_hidden"] is True
+    assert sales["measures"][0]["expression"] == "SUM(Sales[Amount])"
+    assert sales["partitions"][0]["name"] == "Sales"
+    assert parse_m_sources(sales["partitions"][0]["m_expression"])["tables"] == [
+        ("dwh.example.local", "dwh", "dbo", "Sales")
+    ]
+    assert parsed["relationships"][0]["toTable"] == "Customer"
+
+    # Without schema in the scan result nothing may be written (it would delete the cataloged model)
+    assert scanner_dataset_to_parsed(datasets["Pipeline"]) is None
+
+
+def record_failed_scan(stub, workspace_ids, error):
+    """Let the scan of workspace_ids end with status Failed."""
+    stub.responses[f"POST /v1.0/myorg/admin/workspaces/getInfo {','.join(workspace_ids)}"] = [
+        {"status": 202, "body": {"id": "scan-failed", "status": "NotStarted"}}
+    ]
+    stub.responses["GET /v1.0/myorg/admin/workspaces/scanStatus/scan-failed"] = [
+        {"status": 200, "body": {"id": "scan-failed", "status": "Failed", "error": error}}
+    ]
+
+
+def test_failed_scans_are_skipped_and_reported(stub):
+    record_failed_scan(stub, ["ws-8", "ws-7"], "CapacityNotActive")
+    failed = []
+    with make_client(stub) as client:
+        # ws-8/ws-7: scan status Failed; ws-9: getInfo is not recorded (HTTP 404, not retried)
+        datasets = [dataset["name"] for _, dataset in client.iter_datasets(
+            ["ws-1", "ws-2", "ws-8", "ws-7", "ws-9"], batch_size=2,
+            on_scan_failed=lambda batch, error: failed.append((batch, type(error), getattr(error, "status_code", None)))
+        )]
+
+    assert sorted(datasets) == ["Pipeline", "Revenue"]
+    assert sorted(failed) == [(["ws-8", "ws-7"], PowerBIServiceError, None), (["ws-9"], PowerBIServiceError, 404)]
+
+
+def test_process_records_failed_scans_and_continues(stub, catalog_conn, catalog_dsn, monkeypatch):
+    monkeypatch.setattr(pbi_service_ingestion, "get_catalog_connection", lambda: psycopg2.connect(catalog_dsn))
+    with make_client(stub) as client:
+        _, _, models_completed, models_failed = process_powerbi_service(client, 7, ["ws-1", "ws-2", "ws-9"], batch_size=2)
+
+    assert (models_completed, models_failed) == (1, 1)
+    with catalog_conn.cursor() as cur:
+        cur.execute("""
+            SELECT project_folder, model_name, status, error_message LIKE 'Scan failed:%%'
+            FROM catalog.pbi_catalog_run_projects
+            WHERE catalog_run_id = 7
+            ORDER BY project_folder
+        """)
+        rows = cur.fetchall()
+    assert [(status, model_name) for _, model_name, status, _ in rows] == [
+        ("completed", "Finance.Revenue"), ("skipped", "Sales.Pipeline"), ("failed", None)
+    ]
+    assert rows[-1][0] == "powerbi://ws-9" and rows[-1][3] is True